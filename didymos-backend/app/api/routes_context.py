@@ -5,6 +5,7 @@ from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 from typing import List, Optional
 from app.services.vector_service import hybrid_search, vector_search, graph_search
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -52,7 +53,7 @@ async def search_context(
         )
 
     try:
-        results = hybrid_search(query=query, note_id=note_id, k=k)
+        results = await asyncio.to_thread(hybrid_search, query=query, note_id=note_id, k=k)
 
         return ContextResponse(
             status="success",
@@ -79,7 +80,7 @@ async def search_vector_only(
     벡터 유사도 검색만 수행
     """
     try:
-        results = vector_search(query=query, k=k)
+        results = await asyncio.to_thread(vector_search, query=query, k=k)
 
         return ContextResponse(
             status="success",
@@ -105,7 +106,7 @@ async def search_graph_only(
     그래프 연결 검색만 수행
     """
     try:
-        results = graph_search(note_id=note_id, limit=limit)
+        results = await asyncio.to_thread(graph_search, note_id=note_id, limit=limit)
 
         return ContextResponse(
             status="success",
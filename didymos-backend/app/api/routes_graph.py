@@ -1,7 +1,7 @@
 """
 Graph Visualization API 라우터
 """
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 from app.services.graph_visualization_service import (
@@ -11,14 +11,15 @@ from app.services.graph_visualization_service import (
     get_entity_graph
 )
 from app.services.cluster_service import (
-    compute_clusters_louvain,
-    compute_clusters_semantic,
     get_cached_clusters,
-    save_cluster_cache,
+    get_cached_cluster,
     invalidate_cluster_cache,
-    generate_llm_summaries,
-    is_cluster_cache_stale
+    is_cluster_cache_stale,
+    normalize_cluster_method,
+    compute_vault_clusters
 )
+from app.services.cluster_refresh import cluster_refresher, refresh_key
+from app.services.cooccurrence_service import is_cooccurrence_ready_async, rebuild_vault_cooccurrence
 from app.services.entity_cluster_service import (
     compute_entity_clusters_hybrid,
     get_cluster_detail,
@@ -31,22 +32,24 @@ from app.schemas.cluster import (
     ClusterComputeRequest,
     ClusterUpdateRequest
 )
-from app.db.neo4j_bolt import Neo4jBoltClient
+from app.db.neo4j_bolt import Neo4jBoltClient, AsyncNeo4jBoltClient
+from app.db.neo4j import get_neo4j_client, get_async_neo4j_client
+from app.services.vault_version import vault_versions
+from app.utils.etag import vault_not_modified, drop_etag
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
+router = APIRouter(prefix="/graph", tags=["graph"])
 
-def get_neo4j_client():
-    """Neo4j 클라이언트 의존성"""
-    from app.config import settings
-    return Neo4jBoltClient(
-        uri=settings.neo4j_uri,
-        username=settings.neo4j_username,
-        password=settings.neo4j_password
-    )
 
-router = APIRouter(prefix="/graph", tags=["graph"])
+async def _bump_vault_version(vault_id: str) -> None:
+    """엔티티/클러스터 수정 후 Vault 버전 증가 (버전 기반 캐시와 ETag 무효화)"""
+    try:
+        await asyncio.to_thread(vault_versions.bump, get_neo4j_client(), vault_id)
+    except Exception as e:
+        logger.warning(f"Failed to bump vault version for {vault_id}: {e}")
 
 
 class GraphNode(BaseModel):
@@ -89,7 +92,7 @@ async def get_note_graph_view(
     - depth: 탐색 깊이 (1~3)
     """
     try:
-        graph_data = get_note_graph_vis(note_id=note_id, hops=depth)
+        graph_data = await asyncio.to_thread(get_note_graph_vis, note_id=note_id, hops=depth)
 
         return GraphResponse(
             status="success",
@@ -121,7 +124,8 @@ async def get_user_graph_view(
     - limit: 최대 노드 개수 (기본 100, 최대 5000)
     """
     try:
-        graph_data = get_user_graph(
+        graph_data = await asyncio.to_thread(
+            get_user_graph,
             user_id=user_id,
             vault_id=vault_id,
             limit=limit
@@ -155,7 +159,8 @@ async def get_entities_graph_view(
     - limit: 최대 엔티티 개수
     """
     try:
-        graph_data = get_entity_graph(
+        graph_data = await asyncio.to_thread(
+            get_entity_graph,
             entity_type=entity_type,
             limit=limit
         )
@@ -178,6 +183,8 @@ async def get_entities_graph_view(
 
 @router.get("/vault/clustered", response_model=ClusteredGraphResponse)
 async def get_clustered_vault_graph(
+    request: Request,
+    response: Response,
     vault_id: str = Query(..., description="Vault ID"),
     user_token: str = Query(..., description="User token"),
     folder_prefix: str = Query(None, description="폴더 경로 필터 (예: '1_프로젝트/', '2_연구/')"),
@@ -197,6 +204,9 @@ async def get_clustered_vault_graph(
     - include_llm: LLM 요약 포함 여부
     - warmup: 백그라운드 캐시 워밍업 (응답 즉시 반환)
 
+    Vault가 변경되어 캐시가 오래되었으면 캐시를 즉시 반환하고(stale=true) 백그라운드에서
+    한 번만 재계산합니다. 완료는 /vault/clustered/refresh-status로 확인합니다.
+
     **응답 예시:**
     ```json
     {
@@ -221,28 +231,33 @@ async def get_clustered_vault_graph(
     ```
     """
     try:
-        # Warmup 모드: 백그라운드에서 캐시 생성, 즉시 응답 반환
-        if warmup:
-            import asyncio
-            from concurrent.futures import ThreadPoolExecutor
-
-            def background_warmup():
-                try:
-                    logger.info(f"🔥 Background warmup started for vault {vault_id}")
-                    result = compute_clusters_semantic(
-                        client=client,
-                        vault_id=vault_id,
-                        target_clusters=target_clusters
-                    )
-                    if result.get("clusters"):
-                        save_cluster_cache(client, vault_id, result["clusters"], result["method"], edges=result.get("edges", []))
-                        logger.info(f"✅ Background warmup completed for vault {vault_id}")
-                except Exception as e:
-                    logger.error(f"Background warmup failed: {e}")
-
-            executor = ThreadPoolExecutor(max_workers=1)
-            executor.submit(background_warmup)
+        method_normalized = normalize_cluster_method(method)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid clustering method")
+
+    key = refresh_key(vault_id, folder_prefix, method_normalized, target_clusters)
+
+    # 같은 Vault 버전이면 304 (워밍업/강제 재계산 요청은 항상 처리)
+    if not warmup and not force_recompute:
+        not_modified = await vault_not_modified(request, response, vault_id)
+        if not_modified:
+            return not_modified
+
+    def compute():
+        return compute_vault_clusters(
+            client,
+            vault_id,
+            method=method_normalized,
+            target_clusters=target_clusters,
+            folder_prefix=folder_prefix,
+            include_llm=include_llm
+        )
 
+    try:
+        # Warmup 모드: 백그라운드에서 캐시 생성 (같은 키의 재계산이 실행 중이면 공유), 즉시 응답 반환
+        if warmup:
+            logger.info(f"🔥 Background warmup requested for vault {vault_id}")
+            cluster_refresher.schedule(key, compute)
             return ClusteredGraphResponse(
                 status="warming_up",
                 level=1,
@@ -251,17 +266,25 @@ async def get_clustered_vault_graph(
                 clusters=[],
                 edges=[],
                 last_computed="warmup_in_progress",
-                computation_method="background_warmup"
+                computation_method="background_warmup",
+                refreshing=True
             )
 
-        # 캐시 키에 folder_prefix 포함
-        cache_key = f"{vault_id}:{folder_prefix or 'all'}"
-
-        # 캐시 확인 (folder_prefix가 있으면 캐시 스킵 - 폴더별 캐시는 별도 구현 필요)
-        if not force_recompute and not folder_prefix:
-            cached = get_cached_clusters(client, vault_id)
-            if cached and not is_cluster_cache_stale(client, vault_id, cached.get("computed_at")):
-                logger.info(f"✅ Returning cached clusters for vault {vault_id}")
+        # 캐시 확인 (폴더 필터/방법/목표 클러스터 수별 캐시)
+        # 오래된 캐시는 즉시 반환하고(stale) 백그라운드에서 한 번만 재계산
+        if not force_recompute:
+            cached = await asyncio.to_thread(
+                get_cached_clusters, client, vault_id, folder_prefix, method_normalized, target_clusters
+            )
+            if cached:
+                stale = is_cluster_cache_stale(cached)
+                if stale:
+                    logger.info(f"♻️ Cache stale for vault {vault_id}, serving stale and refreshing in background")
+                    cluster_refresher.schedule(key, compute)
+                    # 재계산이 끝나도 Vault 버전은 그대로이므로 stale 응답은 재검증 대상에서 제외
+                    drop_etag(response)
+                else:
+                    logger.info(f"✅ Returning cached clusters for vault {vault_id}")
                 return ClusteredGraphResponse(
                     status="success",
                     level=1,
@@ -270,63 +293,21 @@ async def get_clustered_vault_graph(
                     clusters=cached["clusters"],
                     edges=cached.get("edges", []),
                     last_computed=cached["computed_at"],
-                    computation_method=cached["method"]
+                    computation_method=cached["method"],
+                    stale=stale,
+                    refreshing=cluster_refresher.is_running(key)
                 )
-            elif cached:
-                logger.info(f"♻️ Cache stale for vault {vault_id}, recomputing...")
-
-        # 클러스터 계산 (방법 선택)
-        folder_info = f" in folder '{folder_prefix}'" if folder_prefix else ""
-        logger.info(f"🔄 Computing clusters for vault {vault_id}{folder_info} using method={method}")
-        method_normalized = method.lower()
-
-        if method_normalized in ["semantic", "auto"]:
-            result = compute_clusters_semantic(
-                client=client,
-                vault_id=vault_id,
-                target_clusters=target_clusters,
-                folder_prefix=folder_prefix
-            )
-        elif method_normalized in ["type_based", "type"]:
-            result = compute_clusters_louvain(
-                client=client,
-                vault_id=vault_id,
-                target_clusters=target_clusters,
-                folder_prefix=folder_prefix
-            )
-        else:
-            raise HTTPException(status_code=400, detail="Invalid clustering method")
-
-        # 의미론적 클러스터링이 실패했거나 결과가 없으면 폴백
-        if method_normalized in ["semantic", "auto"] and (not result.get("clusters")):
-            logger.info("Semantic clustering returned no clusters. Falling back to type-based.")
-            result = compute_clusters_louvain(
-                client=client,
-                vault_id=vault_id,
-                target_clusters=target_clusters,
-                folder_prefix=folder_prefix
-            )
-            result["method"] = "semantic_fallback"
-
-        clusters = result["clusters"]
-        edges = result.get("edges", [])
 
-        # LLM 요약 생성 (옵션)
-        if include_llm and len(clusters) > 0:
-            logger.info("🤖 Generating LLM summaries with GPT-5 Mini...")
-            clusters = generate_llm_summaries(client, vault_id, clusters)
-
-        # 캐시 저장 (folder_prefix 없을 때만)
-        if not folder_prefix:
-            save_cluster_cache(client, vault_id, clusters, result["method"], edges=edges)
+        # 캐시가 없으면 동기 계산 (동시에 들어온 같은 키의 요청은 하나의 계산을 공유)
+        result = await cluster_refresher.run(key, compute)
 
         return ClusteredGraphResponse(
             status="success",
             level=1,
-            cluster_count=len(clusters),
+            cluster_count=len(result["clusters"]),
             total_nodes=result["total_nodes"],
-            clusters=clusters,
-            edges=edges,
+            clusters=result["clusters"],
+            edges=result.get("edges", []),
             last_computed=result["computed_at"],
             computation_method=result["method"]
         )
@@ -339,6 +320,72 @@ async def get_clustered_vault_graph(
         )
 
 
+@router.get("/vault/clustered/refresh-status")
+async def get_cluster_refresh_status(
+    vault_id: str = Query(..., description="Vault ID"),
+    user_token: str = Query(..., description="User token"),
+    folder_prefix: str = Query(None, description="폴더 경로 필터"),
+    method: str = Query("semantic", description="클러스터링 방법"),
+    target_clusters: int = Query(10, ge=3, le=50, description="목표 클러스터 개수"),
+    wait_seconds: float = Query(0, ge=0, le=60, description="재계산이 진행 중이면 완료까지 최대 대기 시간 (long-poll)")
+):
+    """
+    백그라운드 클러스터 재계산 상태
+
+    stale=true 응답이나 warmup 이후 폴링하고, state가 done이면 /vault/clustered를 다시 조회합니다.
+    wait_seconds를 주면 재계산이 끝나거나 시간이 다 될 때까지 응답을 보류합니다.
+
+    - state: running | done | failed | idle (이 프로세스에서 재계산 기록 없음)
+    """
+    try:
+        key = refresh_key(vault_id, folder_prefix, normalize_cluster_method(method), target_clusters)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid clustering method")
+
+    status = await cluster_refresher.wait(key, wait_seconds)
+    return {
+        "vault_id": vault_id,
+        "folder_prefix": folder_prefix,
+        "method": key[2],
+        "target_clusters": target_clusters,
+        **(status or {"state": "idle"})
+    }
+
+
+@router.get("/vault/clustered/clusters/{cluster_id}")
+async def get_clustered_vault_cluster(
+    cluster_id: str,
+    vault_id: str = Query(..., description="Vault ID"),
+    user_token: str = Query(..., description="User token"),
+    folder_prefix: str = Query(None, description="폴더 경로 필터"),
+    method: str = Query("semantic", description="클러스터링 방법"),
+    target_clusters: int = Query(10, ge=3, le=50, description="목표 클러스터 개수"),
+    client: Neo4jBoltClient = Depends(get_neo4j_client)
+) -> Dict[str, Any]:
+    """
+    캐시된 클러스터 하나의 상세 (전체 멤버 노트/엔티티 포함)
+
+    /vault/clustered와 같은 folder_prefix/method/target_clusters로 계산된 결과에서 조회하며,
+    다른 클러스터 데이터는 읽지 않습니다.
+    """
+    try:
+        method_normalized = normalize_cluster_method(method)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid clustering method")
+
+    try:
+        cluster = await asyncio.to_thread(
+            get_cached_cluster, client, vault_id, cluster_id, folder_prefix, method_normalized, target_clusters
+        )
+    except Exception as e:
+        logger.error(f"Failed to get cluster {cluster_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to get cluster: {str(e)}")
+
+    if cluster is None:
+        raise HTTPException(status_code=404, detail="Cluster not found in cache")
+    return {"status": "success", "cluster": cluster}
+
+
 @router.post("/vault/clustered/invalidate")
 async def invalidate_clusters(
     vault_id: str = Query(..., description="Vault ID"),
@@ -351,9 +398,10 @@ async def invalidate_clusters(
     - vault_id: Vault ID
     """
     try:
-        success = invalidate_cluster_cache(client, vault_id)
+        success = await asyncio.to_thread(invalidate_cluster_cache, client, vault_id)
 
         if success:
+            await _bump_vault_version(vault_id)
             return {"status": "success", "message": "Cluster cache invalidated"}
         else:
             raise HTTPException(status_code=500, detail="Failed to invalidate cache")
@@ -383,6 +431,9 @@ async def reset_vault_entities(
     ⚠️ 이 작업은 되돌릴 수 없습니다!
     """
     try:
+        # 0. 클러스터 캐시 무효화 (IN_CLUSTER 관계가 남아 있으면 엔티티가 고아로 판정되지 않음)
+        await asyncio.to_thread(invalidate_cluster_cache, client, vault_id)
+
         # 1. Vault에 연결된 엔티티와 관계 삭제
         cypher_delete_entities = """
         MATCH (v:Vault {id: $vault_id})-[:HAS_NOTE]->(n:Note)-[m:MENTIONS]->(e)
@@ -394,9 +445,12 @@ async def reset_vault_entities(
         RETURN count(e) as deleted_entities
         """
 
-        result1 = client.query(cypher_delete_entities, {"vault_id": vault_id})
+        result1 = await asyncio.to_thread(client.query, cypher_delete_entities, {"vault_id": vault_id})
         deleted_entities = result1[0]["deleted_entities"] if result1 else 0
 
+        # 삭제된 MENTIONS를 CO_OCCURS에 반영 (남은 관계 때문에 고아 정리에서 빠지지 않도록)
+        await asyncio.to_thread(rebuild_vault_cooccurrence, client, vault_id)
+
         # 2. 고아 엔티티 정리 (다른 vault에서도 사용되지 않는 경우)
         cypher_cleanup_orphans = """
         MATCH (e)
@@ -406,7 +460,7 @@ async def reset_vault_entities(
         RETURN count(e) as orphans_deleted
         """
 
-        result2 = client.query(cypher_cleanup_orphans, {})
+        result2 = await asyncio.to_thread(client.query, cypher_cleanup_orphans, {})
         orphans_deleted = result2[0]["orphans_deleted"] if result2 else 0
 
         # 3. 엔티티 간 관계도 정리
@@ -420,14 +474,13 @@ async def reset_vault_entities(
         RETURN count(r) as relations_deleted
         """
 
-        result3 = client.query(cypher_delete_entity_relations, {"vault_id": vault_id})
+        result3 = await asyncio.to_thread(client.query, cypher_delete_entity_relations, {"vault_id": vault_id})
         relations_deleted = result3[0]["relations_deleted"] if result3 else 0
 
-        # 4. 클러스터 캐시 무효화
-        invalidate_cluster_cache(client, vault_id)
-
         logger.info(f"🔴 Reset entities for vault {vault_id}: {deleted_entities} entities, {orphans_deleted} orphans, {relations_deleted} relations")
 
+        await _bump_vault_version(vault_id)
+
         return {
             "status": "success",
             "message": "Vault entities reset complete",
@@ -446,15 +499,21 @@ async def reset_vault_entities(
 
 @router.get("/vault/folders")
 async def get_vault_folders(
+    request: Request,
+    response: Response,
     vault_id: str = Query(..., description="Vault ID"),
     user_token: str = Query(..., description="User token"),
-    client: Neo4jBoltClient = Depends(get_neo4j_client)
+    client: AsyncNeo4jBoltClient = Depends(get_async_neo4j_client)
 ):
     """
     Vault 내 폴더 목록 조회 (PARA 노트 기법 지원)
 
     폴더별 노트 개수와 함께 반환합니다.
     """
+    not_modified = await vault_not_modified(request, response, vault_id)
+    if not_modified:
+        return not_modified
+
     try:
         # 노트 경로에서 폴더 추출
         cypher = """
@@ -466,7 +525,7 @@ async def get_vault_folders(
         ORDER BY note_count DESC
         """
 
-        result = client.query(cypher, {"vault_id": vault_id})
+        result = await client.query(cypher, {"vault_id": vault_id})
 
         folders = [
             {"folder": r["folder"], "note_count": r["note_count"]}
@@ -491,44 +550,44 @@ async def get_vault_folders(
 @router.get("/debug/stats")
 async def get_debug_stats(
     vault_id: str = Query(..., description="Vault ID"),
-    client: Neo4jBoltClient = Depends(get_neo4j_client)
+    client: AsyncNeo4jBoltClient = Depends(get_async_neo4j_client)
 ):
     """
     디버그용: Neo4j 데이터 통계 확인
     """
     try:
         # 1. Vault 존재 확인
-        vault_check = client.query(
+        vault_check = await client.query(
             "MATCH (v:Vault {id: $vault_id}) RETURN v.id AS id",
             {"vault_id": vault_id}
         )
 
         # 2. 전체 Note 수
-        total_notes = client.query(
+        total_notes = await client.query(
             "MATCH (n:Note) RETURN count(n) AS count",
             {}
         )
 
         # 3. Vault에 연결된 Note 수
-        vault_notes = client.query(
+        vault_notes = await client.query(
             "MATCH (v:Vault {id: $vault_id})-[:HAS_NOTE]->(n:Note) RETURN count(n) AS count",
             {"vault_id": vault_id}
         )
 
         # 4. 임베딩이 있는 Note 수
-        notes_with_embedding = client.query(
+        notes_with_embedding = await client.query(
             "MATCH (v:Vault {id: $vault_id})-[:HAS_NOTE]->(n:Note) WHERE n.embedding IS NOT NULL RETURN count(n) AS count",
             {"vault_id": vault_id}
         )
 
         # 5. 전체 Vault 목록
-        all_vaults = client.query(
+        all_vaults = await client.query(
             "MATCH (v:Vault) RETURN v.id AS id LIMIT 10",
             {}
         )
 
         # 6. 엔티티 수 (Topic, Project, Task, Person)
-        entity_counts = client.query(
+        entity_counts = await client.query(
             """
             MATCH (v:Vault {id: $vault_id})-[:HAS_NOTE]->(n:Note)-[:MENTIONS]->(e)
             WHERE e:Topic OR e:Project OR e:Task OR e:Person
@@ -539,7 +598,7 @@ async def get_debug_stats(
         )
 
         # 7. Note-Entity MENTIONS 관계 수
-        mentions_count = client.query(
+        mentions_count = await client.query(
             """
             MATCH (v:Vault {id: $vault_id})-[:HAS_NOTE]->(n:Note)-[m:MENTIONS]->(e)
             RETURN count(m) AS count
@@ -611,33 +670,33 @@ async def get_entity_node_stats() -> Dict[str, Any]:
     Note: Graphiti uses 'Entity' label (NOT 'EntityNode')
     """
     try:
-        client = get_neo4j_client()
+        client = get_async_neo4j_client()
 
         # 모든 노드 레이블 조회
-        all_labels = client.query("CALL db.labels() YIELD label RETURN label ORDER BY label", {})
+        all_labels = await client.query("CALL db.labels() YIELD label RETURN label ORDER BY label", {})
 
         # Entity 전체 수 (Graphiti uses 'Entity' label)
-        total = client.query("MATCH (e:Entity) RETURN count(e) as count", {})
+        total = await client.query("MATCH (e:Entity) RETURN count(e) as count", {})
 
         # Episodic 노드 수 (Graphiti episodes)
-        episodic_count = client.query("MATCH (e:Episodic) RETURN count(e) as count", {})
+        episodic_count = await client.query("MATCH (e:Episodic) RETURN count(e) as count", {})
 
         # PKM 레이블이 있는 Entity
-        with_pkm = client.query("""
+        with_pkm = await client.query("""
             MATCH (e:Entity)
             WHERE e:Topic OR e:Project OR e:Task OR e:Person
             RETURN count(e) as count
         """, {})
 
         # PKM 레이블이 없는 Entity
-        without_pkm = client.query("""
+        without_pkm = await client.query("""
             MATCH (e:Entity)
             WHERE NOT e:Topic AND NOT e:Project AND NOT e:Task AND NOT e:Person
             RETURN count(e) as count
         """, {})
 
         # PKM 타입별 통계
-        by_type = client.query("""
+        by_type = await client.query("""
             MATCH (e:Entity)
             WHERE e:Topic OR e:Project OR e:Task OR e:Person
             WITH CASE
@@ -650,13 +709,13 @@ async def get_entity_node_stats() -> Dict[str, Any]:
         """, {})
 
         # Note -> Entity MENTIONS 관계 수
-        note_entity_mentions = client.query("""
+        note_entity_mentions = await client.query("""
             MATCH (n:Note)-[m:MENTIONS]->(e:Entity)
             RETURN count(m) as count
         """, {})
 
         # Episodic -> Entity MENTIONS 관계 수 (Graphiti)
-        episodic_entity_mentions = client.query("""
+        episodic_entity_mentions = await client.query("""
             MATCH (ep:Episodic)-[m:MENTIONS]->(e:Entity)
             RETURN count(m) as count
         """, {})
@@ -679,6 +738,8 @@ async def get_entity_node_stats() -> Dict[str, Any]:
 
 @router.get("/vault/entities")
 async def get_vault_entity_graph(
+    request: Request,
+    response: Response,
     vault_id: str = Query(..., description="Vault ID"),
     user_token: str = Query(..., description="User token"),
     limit: int = Query(200, description="Maximum entities to return", ge=10, le=1000),
@@ -694,8 +755,12 @@ async def get_vault_entity_graph(
     - Entity = 노드 (타입별 색상: Topic=파랑, Project=초록, Person=주황, Task=빨강)
     - RELATES_TO = 엣지 (의미론적 연결)
     """
+    not_modified = await vault_not_modified(request, response, vault_id)
+    if not_modified:
+        return not_modified
+
     try:
-        client = get_neo4j_client()
+        client = get_async_neo4j_client()
 
         # Step 1: Entity들 조회 (RELATES_TO 관계가 있는 것)
         # Graphiti는 Episodic-[:MENTIONS]->Entity 구조를 사용하므로
@@ -720,7 +785,7 @@ async def get_vault_entity_graph(
         LIMIT $limit
         """
 
-        entities = client.query(cypher_entities, {
+        entities = await client.query(cypher_entities, {
             "vault_id": vault_id,
             "min_connections": min_connections,
             "limit": limit
@@ -749,7 +814,7 @@ async def get_vault_entity_graph(
             r.fact as fact
         """
 
-        relations = client.query(cypher_relations, {"entity_ids": entity_ids})
+        relations = await client.query(cypher_relations, {"entity_ids": entity_ids})
 
         # Step 3: 노드 데이터 구성
         nodes = []
@@ -791,7 +856,7 @@ async def get_vault_entity_graph(
             WHERE e.uuid IN $entity_ids
             RETURN e.uuid as entity_id, collect(DISTINCT n.note_id)[..5] as note_ids
             """
-            note_results = client.query(cypher_notes, {"entity_ids": entity_ids})
+            note_results = await client.query(cypher_notes, {"entity_ids": entity_ids})
             for nr in (note_results or []):
                 note_connections[nr["entity_id"]] = nr["note_ids"]
 
@@ -821,6 +886,8 @@ async def get_vault_entity_graph(
 
 @router.get("/vault/entity-clusters")
 async def get_entity_clusters(
+    request: Request,
+    response: Response,
     vault_id: str = Query(..., description="Vault ID"),
     user_token: str = Query(..., description="User token"),
     folder_prefix: str = Query(None, description="폴더 경로 필터 (예: '1_프로젝트/'). 해당 폴더 노트의 엔티티만 클러스터링"),
@@ -867,11 +934,16 @@ async def get_entity_clusters(
     }
     ```
     """
+    not_modified = await vault_not_modified(request, response, vault_id)
+    if not_modified:
+        return not_modified
+
     try:
         folder_info = f" for folder '{folder_prefix}'" if folder_prefix else ""
         logger.info(f"Computing entity clusters for vault {vault_id}{folder_info} (min_connections={min_connections})")
 
-        result = compute_entity_clusters_hybrid(
+        result = await asyncio.to_thread(
+            compute_entity_clusters_hybrid,
             client=client,
             min_cluster_size=min_cluster_size,
             resolution=resolution,
@@ -900,7 +972,7 @@ async def cleanup_orphan_entities(
     vault_id: str = Query(..., description="Vault ID"),
     user_token: str = Query(..., description="User token"),
     dry_run: bool = Query(True, description="미리보기 모드 (실제 삭제 안함)"),
-    client: Neo4jBoltClient = Depends(get_neo4j_client)
+    client: AsyncNeo4jBoltClient = Depends(get_async_neo4j_client)
 ) -> Dict[str, Any]:
     """
     고아 엔티티 정리
@@ -919,7 +991,7 @@ async def cleanup_orphan_entities(
           AND NOT (e)<-[:MENTIONS]-(:Episodic)
         RETURN e.uuid as uuid, e.name as name
         """
-        orphan_entities = client.query(cypher_orphan_entities, {})
+        orphan_entities = await client.query(cypher_orphan_entities, {})
 
         if dry_run:
             return {
@@ -939,11 +1011,13 @@ async def cleanup_orphan_entities(
         DELETE r, e
         RETURN count(e) as count
         """
-        cleanup_result = client.query(cypher_cleanup_orphans, {})
+        cleanup_result = await client.query(cypher_cleanup_orphans, {})
         deleted_entities = cleanup_result[0]["count"] if cleanup_result else 0
 
         logger.info(f"🧹 Cleaned up {deleted_entities} orphan entities")
 
+        await _bump_vault_version(vault_id)
+
         return {
             "status": "success",
             "message": f"Cleaned up {deleted_entities} orphan entities",
@@ -957,7 +1031,7 @@ async def cleanup_orphan_entities(
 
 @router.get("/debug/entity-relations")
 async def debug_entity_relations(
-    client: Neo4jBoltClient = Depends(get_neo4j_client)
+    client: AsyncNeo4jBoltClient = Depends(get_async_neo4j_client)
 ) -> Dict[str, Any]:
     """
     디버그용: Entity 간 관계 타입 확인
@@ -970,7 +1044,7 @@ async def debug_entity_relations(
         ORDER BY count DESC
         LIMIT 20
         """
-        results = client.query(cypher, {})
+        results = await client.query(cypher, {})
 
         # 샘플 관계 조회
         cypher_sample = """
@@ -979,7 +1053,7 @@ async def debug_entity_relations(
                r.fact as fact
         LIMIT 10
         """
-        samples = client.query(cypher_sample, {})
+        samples = await client.query(cypher_sample, {})
 
         return {
             "status": "success",
@@ -1002,7 +1076,12 @@ async def debug_entity_relations(
 class EntityClusterDetailRequest(BaseModel):
     """클러스터 상세 조회 요청"""
     cluster_name: str
-    entity_uuids: List[str]
+    entity_uuids: List[str] = []
+    # entity_uuids 대신 /vault/clustered 캐시의 클러스터로 지정 (IN_CLUSTER 멤버 사용)
+    cluster_id: Optional[str] = None
+    folder_prefix: Optional[str] = None
+    method: str = "semantic"
+    target_clusters: int = 10
 
 
 @router.post("/vault/entity-clusters/detail")
@@ -1017,7 +1096,21 @@ async def get_entity_cluster_detail_by_uuids(
 
     프론트엔드에서 저장한 entity_uuids를 직접 전달받아 상세 정보를 반환합니다.
     클러스터링 결과의 일관성을 보장합니다.
+    entity_uuids 없이 cluster_id를 주면 저장된 클러스터의 IN_CLUSTER 엔티티를 사용합니다.
     """
+    if not request.entity_uuids and request.cluster_id:
+        try:
+            method_normalized = normalize_cluster_method(request.method)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid clustering method")
+        cluster = await asyncio.to_thread(
+            get_cached_cluster, client, vault_id, request.cluster_id,
+            request.folder_prefix, method_normalized, request.target_clusters
+        )
+        if cluster is None:
+            raise HTTPException(status_code=404, detail="Cluster not found in cache")
+        request.entity_uuids = [e["uuid"] for e in cluster["entities"] if e.get("uuid")]
+
     try:
         uuids = request.entity_uuids
         cluster_name = request.cluster_name
@@ -1039,7 +1132,7 @@ async def get_entity_cluster_detail_by_uuids(
         ORDER BY internal_connections DESC
         """
 
-        results = client.query(cypher, {"uuids": uuids})
+        results = await asyncio.to_thread(client.query, cypher, {"uuids": uuids})
 
         entities = []
         type_distribution = {}
@@ -1070,7 +1163,7 @@ async def get_entity_cluster_detail_by_uuids(
                COALESCE(r.weight, 1.0) as weight
         """
 
-        edge_results = client.query(cypher_edges, {"uuids": uuids})
+        edge_results = await asyncio.to_thread(client.query, cypher_edges, {"uuids": uuids})
 
         edges = []
         for row in edge_results or []:
@@ -1110,7 +1203,7 @@ async def get_entity_cluster_detail_by_uuids(
         LIMIT 50
         """
 
-        note_results = client.query(cypher_notes, {"uuids": uuids})
+        note_results = await asyncio.to_thread(client.query, cypher_notes, {"uuids": uuids})
 
         related_notes = []
         for row in note_results or []:
@@ -1155,12 +1248,14 @@ async def get_entity_cluster_detail_by_uuids(
 
 @router.get("/vault/entity-note-graph")
 async def get_entity_note_graph(
+    request: Request,
+    response: Response,
     vault_id: str = Query(..., description="Vault ID"),
     user_token: str = Query(..., description="User token"),
     folder_prefix: str = Query(None, description="폴더 경로 필터"),
     limit: int = Query(100, description="최대 엔티티 수", ge=10, le=500),
     min_note_connections: int = Query(2, description="최소 노트 연결 수 (2 = 2개 이상 노트에서 언급된 엔티티만)", ge=1),
-    client: Neo4jBoltClient = Depends(get_neo4j_client)
+    client: AsyncNeo4jBoltClient = Depends(get_async_neo4j_client)
 ) -> Dict[str, Any]:
     """
     Entity-Note 연결 그래프 (2nd Brain 시각화용)
@@ -1188,6 +1283,10 @@ async def get_entity_note_graph(
     }
     ```
     """
+    not_modified = await vault_not_modified(request, response, vault_id)
+    if not_modified:
+        return not_modified
+
     try:
         # 폴더 필터 조건
         folder_condition = "n.note_id STARTS WITH $folder_prefix AND" if folder_prefix else ""
@@ -1251,7 +1350,7 @@ async def get_entity_note_graph(
             "limit": limit
         }
 
-        entities_result = client.query(cypher_entities, params)
+        entities_result = await client.query(cypher_entities, params)
 
         if not entities_result:
             return {
@@ -1338,7 +1437,7 @@ async def get_entity_note_graph(
                    n.title as title,
                    n.path as path
             """
-            notes_result = client.query(cypher_notes, {"note_ids": list(all_note_ids)})
+            notes_result = await client.query(cypher_notes, {"note_ids": list(all_note_ids)})
 
             for row in notes_result or []:
                 notes.append({
@@ -1391,10 +1490,12 @@ async def get_entity_note_graph(
 
 @router.get("/vault/thinking-insights")
 async def get_thinking_insights(
+    request: Request,
+    response: Response,
     vault_id: str = Query(..., description="Vault ID"),
     user_token: str = Query(..., description="User token"),
     folder_prefix: str = Query(None, description="폴더 경로 필터"),
-    client: Neo4jBoltClient = Depends(get_neo4j_client)
+    client: AsyncNeo4jBoltClient = Depends(get_async_neo4j_client)
 ) -> Dict[str, Any]:
     """
     사고 패턴 인사이트 (Palantir Foundry 스타일)
@@ -1427,6 +1528,10 @@ async def get_thinking_insights(
     }
     ```
     """
+    not_modified = await vault_not_modified(request, response, vault_id, daily=True)
+    if not_modified:
+        return not_modified
+
     try:
         folder_condition = "n.note_id STARTS WITH $folder_prefix AND" if folder_prefix else ""
         params = {"folder_prefix": folder_prefix or ""}
@@ -1454,7 +1559,7 @@ async def get_thinking_insights(
         LIMIT 15
         """
 
-        focus_result = client.query(cypher_focus, params)
+        focus_result = await client.query(cypher_focus, params)
         focus_areas = []
         for row in focus_result or []:
             focus_areas.append({
@@ -1466,23 +1571,38 @@ async def get_thinking_insights(
             })
 
         # 2. 브릿지 개념 (Bridge Concepts): 여러 다른 엔티티들을 연결하는 허브
-        cypher_bridge = f"""
-        MATCH (n:Note)-[:MENTIONS]->(e1:Entity)
-        WHERE {folder_condition} e1.name IS NOT NULL
-        WITH n, e1
-        MATCH (n)-[:MENTIONS]->(e2:Entity)
-        WHERE e2.uuid <> e1.uuid AND e2.name IS NOT NULL
-        WITH e1, count(DISTINCT e2) as connected_entities, collect(DISTINCT e2.name)[..5] as connections
-        WHERE connected_entities >= 3
-        RETURN e1.uuid as uuid,
-               e1.name as name,
-               connected_entities,
-               connections
-        ORDER BY connected_entities DESC
-        LIMIT 10
-        """
+        # 폴더 필터가 없고 CO_OCCURS 인덱스가 준비된 Vault는 미리 계산된 동시 출현 관계 사용
+        if not folder_prefix and await is_cooccurrence_ready_async(client, vault_id):
+            cypher_bridge = """
+            MATCH (e1:Entity)-[:CO_OCCURS {vault_id: $vault_id}]-(e2:Entity)
+            WHERE e1.name IS NOT NULL AND e2.name IS NOT NULL
+            WITH e1, count(DISTINCT e2) as connected_entities, collect(DISTINCT e2.name)[..5] as connections
+            WHERE connected_entities >= 3
+            RETURN e1.uuid as uuid,
+                   e1.name as name,
+                   connected_entities,
+                   connections
+            ORDER BY connected_entities DESC
+            LIMIT 10
+            """
+        else:
+            cypher_bridge = f"""
+            MATCH (n:Note)-[:MENTIONS]->(e1:Entity)
+            WHERE {folder_condition} e1.name IS NOT NULL
+            WITH n, e1
+            MATCH (n)-[:MENTIONS]->(e2:Entity)
+            WHERE e2.uuid <> e1.uuid AND e2.name IS NOT NULL
+            WITH e1, count(DISTINCT e2) as connected_entities, collect(DISTINCT e2.name)[..5] as connections
+            WHERE connected_entities >= 3
+            RETURN e1.uuid as uuid,
+                   e1.name as name,
+                   connected_entities,
+                   connections
+            ORDER BY connected_entities DESC
+            LIMIT 10
+            """
 
-        bridge_result = client.query(cypher_bridge, params)
+        bridge_result = await client.query(cypher_bridge, {**params, "vault_id": vault_id})
         bridge_concepts = []
         for row in bridge_result or []:
             bridge_concepts.append({
@@ -1509,7 +1629,7 @@ async def get_thinking_insights(
         LIMIT 15
         """
 
-        isolated_result = client.query(cypher_isolated, params)
+        isolated_result = await client.query(cypher_isolated, params)
         isolated_areas = []
         for row in isolated_result or []:
             isolated_areas.append({
@@ -1539,7 +1659,7 @@ async def get_thinking_insights(
         ORDER BY entity_count DESC
         """
 
-        dist_result = client.query(cypher_distribution, params)
+        dist_result = await client.query(cypher_distribution, params)
         type_distribution = {}
         for row in dist_result or []:
             type_distribution[row["type"]] = {
@@ -1562,7 +1682,7 @@ async def get_thinking_insights(
             LIMIT 5
             """
 
-            unconnected = client.query(cypher_unconnected, {"uuids": top_entities})
+            unconnected = await client.query(cypher_unconnected, {"uuids": top_entities})
             for row in unconnected or []:
                 exploration_suggestions.append({
                     "area1": row["name1"],
@@ -1596,7 +1716,7 @@ async def get_thinking_insights(
         LIMIT 20
         """
 
-        trends_result = client.query(cypher_time_trends, params)
+        trends_result = await client.query(cypher_time_trends, params)
 
         time_trends = {
             "recent_topics": [],      # 최근 7일 활발
@@ -1654,7 +1774,7 @@ async def get_thinking_insights(
         RETURN total_notes, connected_notes
         """
 
-        health_result = client.query(cypher_health_simple, params)
+        health_result = await client.query(cypher_health_simple, params)
         total_notes_count = 0
         connected_notes_count = 0
 
@@ -1675,7 +1795,7 @@ async def get_thinking_insights(
         RETURN avg(entity_count) as avg_connections, max(entity_count) as max_connections
         """
 
-        density_result = client.query(cypher_density, params)
+        density_result = await client.query(cypher_density, params)
         avg_connections = 0.0
         max_connections = 0
 
@@ -1743,7 +1863,7 @@ async def get_thinking_insights(
         LIMIT 10
         """
 
-        tasks_result = client.query(cypher_tasks, params)
+        tasks_result = await client.query(cypher_tasks, params)
         priority_tasks = []
         for row in tasks_result or []:
             context = ""
@@ -1810,7 +1930,7 @@ async def reclassify_pkm_types(
     - 빈 타입(Goal=0, Concept=0 등) 채우기
     """
     try:
-        from app.services.hybrid_graphiti_service import classify_entity_to_pkm_type
+        from app.services.hybrid_graphiti_service import classify_entity_to_pkm_type, apply_pkm_labels_bulk
 
         # Step 1: 모든 Entity 조회
         cypher_all_entities = """
@@ -1820,7 +1940,7 @@ async def reclassify_pkm_types(
         LIMIT $batch_size
         """
 
-        entities = client.query(cypher_all_entities, {"batch_size": batch_size})
+        entities = await asyncio.to_thread(client.query, cypher_all_entities, {"batch_size": batch_size})
 
         if not entities:
             return {
@@ -1838,9 +1958,9 @@ async def reclassify_pkm_types(
             "Person": 0, "changed": 0, "unchanged": 0, "errors": 0
         }
 
+        changed_by_type: Dict[str, List[str]] = {}
         for entity in entities:
             try:
-                uuid = entity["uuid"]
                 name = entity["name"]
                 summary = entity.get("summary", "")
                 current_type = entity.get("current_type", "Topic")
@@ -1853,18 +1973,7 @@ async def reclassify_pkm_types(
 
                 if new_type != current_type:
                     stats["changed"] += 1
-
-                    # 기존 PKM 레이블 제거하고 새 레이블 추가
-                    cypher_update = f"""
-                    MATCH (e:Entity {{uuid: $uuid}})
-                    REMOVE e:Goal, e:Project, e:Task, e:Topic, e:Concept, e:Question, e:Insight, e:Resource, e:Person
-                    SET e:{new_type}
-                    SET e.pkm_type = $pkm_type
-                    SET e.pkm_reclassified_at = datetime()
-                    RETURN e.name as name
-                    """
-
-                    client.query(cypher_update, {"uuid": uuid, "pkm_type": new_type})
+                    changed_by_type.setdefault(new_type, []).append(entity["uuid"])
                 else:
                     stats["unchanged"] += 1
 
@@ -1872,8 +1981,17 @@ async def reclassify_pkm_types(
                 logger.error(f"Error reclassifying {entity.get('name')}: {e}")
                 stats["errors"] += 1
 
+        # 기존 PKM 레이블 제거 후 새 레이블 추가 (타입별 UNWIND 한 번)
+        try:
+            await asyncio.to_thread(apply_pkm_labels_bulk, client, changed_by_type, reclassify=True)
+        except Exception as e:
+            logger.error(f"Error applying reclassified labels: {e}")
+            stats["errors"] += stats["changed"]
+
         logger.info(f"✅ Reclassification complete: {stats}")
 
+        await _bump_vault_version(vault_id)
+
         return {
             "status": "success",
             "message": f"Reclassified {len(entities)} entities",
@@ -1923,6 +2041,8 @@ async def migrate_note_mentions(
         # Step 2: Note-Entity MENTIONS 관계 생성
         mentions_result = await create_mentions_from_episodes(vault_id, batch_size)
 
+        await _bump_vault_version(vault_id)
+
         return {
             "status": "success",
             "pkm_labels": label_result,
@@ -1934,6 +2054,26 @@ async def migrate_note_mentions(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/vault/rebuild-cooccurrence")
+async def rebuild_cooccurrence(
+    vault_id: str = Query(..., description="Vault ID"),
+    user_token: str = Query(..., description="User token"),
+    client: Neo4jBoltClient = Depends(get_neo4j_client)
+) -> Dict[str, Any]:
+    """
+    엔티티 CO_OCCURS 인덱스 백필
+
+    노트 처리 시 증분 갱신되므로 기존 Vault에 한 번만 실행하면 됩니다.
+    완료 전에는 중심성/브릿지 개념/타입 기반 클러스터링이 기존 셀프 조인으로 계산됩니다.
+    """
+    try:
+        result = await asyncio.to_thread(rebuild_vault_cooccurrence, client, vault_id)
+        return {"status": "success", **result}
+    except Exception as e:
+        logger.error(f"Co-occurrence rebuild error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # =============================================================================
 # Palantir-Style Bidirectional Feedback APIs
 # Kinetic Layer (UI) ↔ Semantic Layer (Neo4j) 양방향 동기화
@@ -1961,7 +2101,7 @@ async def update_entity_pkm_type(
     request: EntityPkmTypeUpdateRequest,
     vault_id: str = Query(..., description="Vault ID"),
     user_token: str = Query(..., description="User token"),
-    client: Neo4jBoltClient = Depends(get_neo4j_client)
+    client: AsyncNeo4jBoltClient = Depends(get_async_neo4j_client)
 ) -> Dict[str, Any]:
     """
     🔄 Palantir-Style Bidirectional Feedback: Entity PKM Type 업데이트
@@ -2000,7 +2140,7 @@ async def update_entity_pkm_type(
         new_type = request.new_pkm_type
 
         # 기존 엔티티 확인
-        check_result = client.query(
+        check_result = await client.query(
             "MATCH (e:Entity {uuid: $uuid}) RETURN e.name as name, e.pkm_type as current_type",
             {"uuid": entity_uuid}
         )
@@ -2022,10 +2162,12 @@ async def update_entity_pkm_type(
         RETURN e.name as name, e.pkm_type as new_type
         """
 
-        update_result = client.query(cypher_update, {"uuid": entity_uuid, "pkm_type": new_type})
+        update_result = await client.query(cypher_update, {"uuid": entity_uuid, "pkm_type": new_type})
 
         logger.info(f"🔄 Bidirectional update: Entity '{entity_name}' type changed {old_type} → {new_type}")
 
+        await _bump_vault_version(vault_id)
+
         return {
             "status": "success",
             "message": f"Entity type updated: {old_type} → {new_type}",
@@ -2050,7 +2192,7 @@ async def update_entity_summary(
     request: EntitySummaryUpdateRequest,
     vault_id: str = Query(..., description="Vault ID"),
     user_token: str = Query(..., description="User token"),
-    client: Neo4jBoltClient = Depends(get_neo4j_client)
+    client: AsyncNeo4jBoltClient = Depends(get_async_neo4j_client)
 ) -> Dict[str, Any]:
     """
     🔄 Entity Summary 업데이트 (사용자 피드백)
@@ -2063,7 +2205,7 @@ async def update_entity_summary(
         new_summary = request.new_summary
 
         # 기존 엔티티 확인
-        check_result = client.query(
+        check_result = await client.query(
             "MATCH (e:Entity {uuid: $uuid}) RETURN e.name as name, e.summary as old_summary",
             {"uuid": entity_uuid}
         )
@@ -2083,10 +2225,12 @@ async def update_entity_summary(
         RETURN e.name as name, e.summary as summary
         """
 
-        client.query(cypher_update, {"uuid": entity_uuid, "new_summary": new_summary})
+        await client.query(cypher_update, {"uuid": entity_uuid, "new_summary": new_summary})
 
         logger.info(f"🔄 Bidirectional update: Entity '{entity_name}' summary updated")
 
+        await _bump_vault_version(vault_id)
+
         return {
             "status": "success",
             "message": "Entity summary updated",
@@ -2111,7 +2255,7 @@ async def bulk_update_entity_types(
     request: BulkEntityUpdateRequest,
     vault_id: str = Query(..., description="Vault ID"),
     user_token: str = Query(..., description="User token"),
-    client: Neo4jBoltClient = Depends(get_neo4j_client)
+    client: AsyncNeo4jBoltClient = Depends(get_async_neo4j_client)
 ) -> Dict[str, Any]:
     """
     🔄 여러 Entity PKM Type 일괄 업데이트
@@ -2152,7 +2296,7 @@ async def bulk_update_entity_types(
                 RETURN e.name as name
                 """
 
-                result = client.query(cypher_update, {"uuid": entity_uuid, "pkm_type": new_type})
+                result = await client.query(cypher_update, {"uuid": entity_uuid, "pkm_type": new_type})
 
                 if result:
                     success_count += 1
@@ -2167,6 +2311,9 @@ async def bulk_update_entity_types(
 
         logger.info(f"🔄 Bulk update: {success_count} success, {error_count} errors")
 
+        if success_count:
+            await _bump_vault_version(vault_id)
+
         return {
             "status": "success" if error_count == 0 else "partial",
             "total": len(updates),
@@ -2188,7 +2335,7 @@ async def get_user_modifications(
     vault_id: str = Query(..., description="Vault ID"),
     user_token: str = Query(..., description="User token"),
     limit: int = Query(50, description="Maximum results", ge=10, le=200),
-    client: Neo4jBoltClient = Depends(get_neo4j_client)
+    client: AsyncNeo4jBoltClient = Depends(get_async_neo4j_client)
 ) -> Dict[str, Any]:
     """
     📊 사용자 수정 이력 조회
@@ -2215,7 +2362,7 @@ async def get_user_modifications(
         LIMIT $limit
         """
 
-        results = client.query(cypher, {"limit": limit})
+        results = await client.query(cypher, {"limit": limit})
 
         modifications = []
         for row in results or []:
@@ -2251,7 +2398,7 @@ async def get_user_modifications(
 async def debug_graph_structure(
     vault_id: str = Query(..., description="Vault ID"),
     user_token: str = Query(..., description="User token"),
-    client: Neo4jBoltClient = Depends(get_neo4j_client)
+    client: AsyncNeo4jBoltClient = Depends(get_async_neo4j_client)
 ) -> Dict[str, Any]:
     """
     디버그용: 그래프 데이터 구조 확인
@@ -2262,35 +2409,35 @@ async def debug_graph_structure(
     """
     try:
         # 1. Episodic 샘플
-        episodic_sample = client.query("""
+        episodic_sample = await client.query("""
             MATCH (ep:Episodic)
             RETURN ep.name as name, ep.uuid as uuid, labels(ep) as labels
             LIMIT 5
         """, {})
 
         # 2. Episodic -> Entity MENTIONS 관계
-        ep_entity_mentions = client.query("""
+        ep_entity_mentions = await client.query("""
             MATCH (ep:Episodic)-[m:MENTIONS]->(e:Entity)
             RETURN ep.name as ep_name, e.name as entity_name, e.uuid as entity_uuid
             LIMIT 10
         """, {})
 
         # 3. Note -> Entity MENTIONS 관계
-        note_entity_mentions = client.query("""
+        note_entity_mentions = await client.query("""
             MATCH (n:Note)-[m:MENTIONS]->(e:Entity)
             RETURN n.note_id as note_id, e.name as entity_name, e.uuid as entity_uuid
             LIMIT 10
         """, {})
 
         # 4. Note 샘플
-        note_sample = client.query("""
+        note_sample = await client.query("""
             MATCH (n:Note)
             RETURN n.note_id as note_id, n.title as title
             LIMIT 5
         """, {})
 
         # 5. Entity 노드 수
-        entity_count = client.query("""
+        entity_count = await client.query("""
             MATCH (e:Entity)
             RETURN count(e) as count
         """, {})
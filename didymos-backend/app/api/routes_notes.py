@@ -1,13 +1,23 @@
 """
 Notes API Router
 """
-from fastapi import APIRouter, HTTPException, status, Query, BackgroundTasks
-from app.schemas.note import NoteSyncRequest, NoteSyncResponse
+from typing import Optional
+from fastapi import APIRouter, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
+from app.schemas.note import NoteSyncRequest, NoteSyncResponse, NoteBatchSyncRequest
 from app.schemas.context import NoteContextResponse
-from app.db.neo4j import get_neo4j_client
-from app.services.graph_service import get_note, get_all_notes
+from app.db.neo4j import get_async_neo4j_client
+from app.services.graph_service import (
+    get_note,
+    get_notes_page,
+    count_vault_notes,
+    NOTE_LIST_FIELDS,
+)
 from app.services.note_service import note_service
+from app.services.job_queue import note_job_queue
 from app.utils.auth import get_user_id_from_token
+import asyncio
+import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,11 +26,11 @@ router = APIRouter(prefix="/notes", tags=["notes"])
 
 
 @router.post("/sync", response_model=NoteSyncResponse)
-async def sync_note(payload: NoteSyncRequest, background_tasks: BackgroundTasks):
+async def sync_note(payload: NoteSyncRequest):
     """
     Note Synchronization API
     Syncs User, Vault, Note nodes to Neo4j.
-    AI processing (Entity extraction + embedding) runs in background.
+    AI processing (Entity extraction + embedding) is enqueued on the job queue.
     """
     try:
         user_id = get_user_id_from_token(payload.user_token)
@@ -29,8 +39,7 @@ async def sync_note(payload: NoteSyncRequest, background_tasks: BackgroundTasks)
             user_id=user_id,
             vault_id=payload.vault_id,
             note_data=payload.note.model_dump(exclude_none=True),
-            privacy_mode=payload.privacy_mode,
-            background_tasks=background_tasks
+            privacy_mode=payload.privacy_mode
         )
 
         return NoteSyncResponse(**result)
@@ -42,13 +51,55 @@ async def sync_note(payload: NoteSyncRequest, background_tasks: BackgroundTasks)
         )
 
 
+@router.post("/sync/batch")
+async def sync_notes_batch(payload: NoteBatchSyncRequest):
+    """
+    Bulk Note Synchronization API
+    Upserts up to 500 notes in one transaction and streams per-note status
+    as NDJSON (one JSON object per line). The last line has type "summary".
+    AI processing for the batch is enqueued on the job queue.
+    """
+    user_id = get_user_id_from_token(payload.user_token)
+    notes = [note.model_dump(exclude_none=True) for note in payload.notes]
+
+    async def event_stream():
+        try:
+            async for event in note_service.sync_notes_batch(
+                user_id=user_id,
+                vault_id=payload.vault_id,
+                notes=notes,
+                privacy_mode=payload.privacy_mode
+            ):
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+        except Exception as e:
+            logger.error(f"Batch sync failed: {e}")
+            yield json.dumps({"type": "summary", "status": "error", "message": str(e)}) + "\n"
+
+    # application/x-ndjson은 SelectiveGZipMiddleware가 압축하지 않으므로 줄 단위로 바로 전달됨
+    return StreamingResponse(
+        event_stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/queue/stats")
+async def get_queue_stats():
+    """
+    Note AI job queue stats
+    Queue depth by status, oldest pending age, and wait/run time percentiles
+    of recently finished jobs.
+    """
+    return await asyncio.to_thread(note_job_queue.stats)
+
+
 @router.get("/get/{note_id}")
 async def get_note_by_id(note_id: str):
     """
     Get note by ID
     """
-    client = get_neo4j_client()
-    note = get_note(client, note_id)
+    client = get_async_neo4j_client()
+    note = await get_note(client, note_id)
 
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
@@ -61,27 +112,47 @@ async def list_notes(
     user_token: str,
     vault_id: str,
     limit: int = Query(50, ge=1, le=500, description="Limit"),
-    offset: int = Query(0, ge=0, description="Offset")
+    offset: int = Query(0, ge=0, description="Offset (legacy; prefer cursor)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(
+        None,
+        description=f"Comma-separated fields to return ({', '.join(NOTE_LIST_FIELDS)}); default all"
+    ),
+    include_total: bool = Query(True, description="Include the vault note count")
 ):
     """
-    List notes for a Vault (Pagination)
+    List notes for a Vault (keyset pagination, newest first)
+
+    Pass the returned next_cursor to fetch the following page; it is null on the last page.
     """
-    client = get_neo4j_client()
+    client = get_async_neo4j_client()
     user_id = get_user_id_from_token(user_token)
 
-    # Note: DB-level pagination is better, but keeping existing logic for now
-    all_notes = get_all_notes(client, user_id, vault_id)
-    paginated_notes = all_notes[offset:offset + limit]
+    field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+
+    try:
+        page, total = await asyncio.gather(
+            get_notes_page(
+                client, user_id, vault_id,
+                limit=limit, cursor=cursor, offset=offset, fields=field_list
+            ),
+            count_vault_notes(client, user_id, vault_id) if include_total else asyncio.sleep(0)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    return {
+    response = {
         "user_id": user_id,
         "vault_id": vault_id,
-        "total": len(all_notes),
-        "count": len(paginated_notes),
+        "count": len(page["notes"]),
         "limit": limit,
         "offset": offset,
-        "notes": paginated_notes
+        "next_cursor": page["next_cursor"],
+        "notes": page["notes"]
     }
+    if include_total:
+        response["total"] = total
+    return response
 
 
 @router.get("/context/{note_id:path}", response_model=NoteContextResponse)
@@ -90,7 +161,7 @@ async def get_context(note_id: str, user_token: str):
     Get note context (Topics/Projects/Tasks + Related Notes)
     """
     try:
-        context = note_service.get_context(note_id)
+        context = await asyncio.to_thread(note_service.get_context, note_id)
         return NoteContextResponse(**context)
     except Exception as e:
         logger.error(f"Failed to get context for note {note_id}: {e}")
@@ -106,7 +177,7 @@ async def get_note_graph(note_id: str, user_token: str, hops: int = 1):
     Get note graph (vis-network format)
     """
     try:
-        return note_service.get_graph(note_id, hops)
+        return await asyncio.to_thread(note_service.get_graph, note_id, hops)
     except Exception as e:
         logger.error(f"Failed to get graph for note {note_id}: {e}")
         raise HTTPException(
@@ -126,7 +197,7 @@ async def delete_note(
     """
     try:
         user_id = get_user_id_from_token(user_token)
-        return note_service.delete_note(note_id, user_id)
+        return await asyncio.to_thread(note_service.delete_note, note_id, user_id)
     except Exception as e:
         logger.error(f"Failed to delete note {note_id}: {e}")
         raise HTTPException(
@@ -1,11 +1,14 @@
 """
 패턴 분석 API 라우터
 """
-from fastapi import APIRouter, HTTPException, Query
+import asyncio
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from app.services.analysis_fanout import AnalysisPoolSaturated
 from app.services.pattern_service import analyze_vault_patterns
 from app.services.recommendation_service import get_recommendations
 from app.services.weakness_service import analyze_weaknesses
 from app.utils.auth import get_user_id_from_token
+from app.utils.etag import vault_not_modified, drop_etag
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,7 +17,7 @@ router = APIRouter(prefix="/patterns", tags=["patterns"])
 
 
 @router.get("/analyze/{user_token}/{vault_id}")
-async def get_vault_patterns(user_token: str, vault_id: str):
+async def get_vault_patterns(request: Request, response: Response, user_token: str, vault_id: str):
     """
     Vault 패턴 분석
 
@@ -24,10 +27,14 @@ async def get_vault_patterns(user_token: str, vault_id: str):
         - orphan_notes: 고립된 노트
         - stats: 통계 정보
     """
+    not_modified = await vault_not_modified(request, response, vault_id)
+    if not_modified:
+        return not_modified
+
     try:
         user_id = get_user_id_from_token(user_token)
 
-        patterns = analyze_vault_patterns(user_id, vault_id)
+        patterns = await asyncio.to_thread(analyze_vault_patterns, user_id, vault_id)
 
         return {
             "status": "success",
@@ -46,6 +53,8 @@ async def get_vault_patterns(user_token: str, vault_id: str):
 
 @router.get("/recommendations/{user_token}/{vault_id}")
 async def get_vault_recommendations(
+    request: Request,
+    response: Response,
     user_token: str,
     vault_id: str,
     note_id: str = Query(None, description="특정 노트에 대한 추천")
@@ -57,15 +66,28 @@ async def get_vault_recommendations(
         - suggested_connections: 연결 제안 (note_id가 있을 때)
         - priority_tasks: 우선순위 Task
         - missing_connections: 놓친 연결
+        - analysis_status: 추천별 상태 (ok / timed_out / failed)와 부분 결과 여부
+
+    분석 스레드 풀이 포화 상태면 503 (Retry-After)
     """
+    # Task 마감일 기준 점수는 날짜에 따라 달라지므로 날짜도 ETag에 포함
+    not_modified = await vault_not_modified(request, response, vault_id, daily=True)
+    if not_modified:
+        return not_modified
+
     try:
         user_id = get_user_id_from_token(user_token)
 
-        recommendations = get_recommendations(
+        # 추천들은 분석 전용 스레드 풀에서 동시에 실행 (이벤트 루프는 막지 않음)
+        recommendations = await asyncio.to_thread(
+            get_recommendations,
             user_id=user_id,
             vault_id=vault_id,
             note_id=note_id
         )
+        # 시간 초과/실패가 섞인 부분 결과는 재사용하지 않음
+        if recommendations["analysis_status"]["partial"]:
+            drop_etag(response)
 
         return {
             "status": "success",
@@ -75,6 +97,13 @@ async def get_vault_recommendations(
             "recommendations": recommendations
         }
 
+    except AnalysisPoolSaturated as e:
+        logger.warning(f"Recommendations failed: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, round(e.retry_after)))}
+        )
     except Exception as e:
         logger.error(f"Recommendations failed: {e}")
         raise HTTPException(
@@ -84,7 +113,7 @@ async def get_vault_recommendations(
 
 
 @router.get("/weaknesses/{user_token}/{vault_id}")
-async def get_vault_weaknesses(user_token: str, vault_id: str):
+async def get_vault_weaknesses(request: Request, response: Response, user_token: str, vault_id: str):
     """
     약점 분석
     "The chain is only as strong as its weakest link" 원칙
@@ -94,11 +123,23 @@ async def get_vault_weaknesses(user_token: str, vault_id: str):
         - total_weakness_score: 전체 약점 점수
         - critical_weakness: 가장 심각한 약점
         - strengthening_plan: 보완 계획
+        - analysis_status: 탐지별 상태 (ok / timed_out / failed)와 부분 결과 여부
+
+    분석 스레드 풀이 포화 상태면 503 (Retry-After)
     """
+    # 방치/overdue 판단은 날짜에 따라 달라지므로 날짜도 ETag에 포함
+    not_modified = await vault_not_modified(request, response, vault_id, daily=True)
+    if not_modified:
+        return not_modified
+
     try:
         user_id = get_user_id_from_token(user_token)
 
-        weakness_analysis = analyze_weaknesses(user_id, vault_id)
+        # 탐지들은 분석 전용 스레드 풀에서 동시에 실행 (느린 탐지는 timed_out 부분 결과)
+        weakness_analysis = await asyncio.to_thread(analyze_weaknesses, user_id, vault_id)
+        # 시간 초과/실패가 섞인 부분 결과는 재사용하지 않음
+        if weakness_analysis["analysis_status"]["partial"]:
+            drop_etag(response)
 
         return {
             "status": "success",
@@ -107,6 +148,13 @@ async def get_vault_weaknesses(user_token: str, vault_id: str):
             "weakness_analysis": weakness_analysis
         }
 
+    except AnalysisPoolSaturated as e:
+        logger.warning(f"Weakness analysis failed: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, round(e.retry_after)))}
+        )
     except Exception as e:
         logger.error(f"Weakness analysis failed: {e}")
         raise HTTPException(
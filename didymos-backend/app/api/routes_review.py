@@ -1,39 +1,47 @@
 """
 Weekly Review API 라우터
 """
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
+import asyncio
 import logging
 
-from app.db.neo4j import get_neo4j_client
+from app.db.neo4j import get_async_neo4j_client
 from app.schemas import WeeklyReviewResponse, WeeklyReviewRecord
 from app.services.review_service import (
     get_weekly_review,
     save_weekly_review,
     list_review_history,
 )
-from app.utils.cache import TTLCache
+from app.services.vault_version import vault_versions
+from app.utils.cache import TTLCache, shared_l2_backend
+from app.utils.etag import vault_not_modified
 from app.utils.auth import get_user_id_from_token
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/review", tags=["review"])
-review_cache = TTLCache(ttl_seconds=300)  # 5분으로 연장
+review_cache = TTLCache(ttl_seconds=300, namespace="weekly_review", l2=shared_l2_backend())  # 5분으로 연장
 
 
 @router.get("/weekly", response_model=WeeklyReviewResponse)
-async def weekly_review(vault_id: str, user_token: str):
+async def weekly_review(request: Request, response: Response, vault_id: str, user_token: str):
     """
-    주간 리뷰 데이터 반환
+    주간 리뷰 데이터 반환 (Vault 버전 + 날짜가 같으면 304)
     """
+    not_modified = await vault_not_modified(request, response, vault_id, daily=True)
+    if not_modified:
+        return not_modified
+
     try:
-        client = get_neo4j_client()
-        cached = review_cache.get(vault_id)
+        client = get_async_neo4j_client()
+        version = await asyncio.to_thread(vault_versions.current, vault_id)
+        cached = review_cache.get(vault_id, version=version)
         if cached:
             return cached
 
-        data = get_weekly_review(client, vault_id)
+        data = await get_weekly_review(client, vault_id)
         resp = WeeklyReviewResponse(**data)
-        review_cache.set(vault_id, resp)
+        review_cache.set(vault_id, resp, version=version)
         return resp
     except Exception as e:
         logger.error(f"Weekly review failed: {e}")
@@ -48,10 +56,11 @@ async def save_weekly(vault_id: str, user_token: str):
     주간 리뷰 생성 후 히스토리에 저장
     """
     try:
-        client = get_neo4j_client()
-        data = get_weekly_review(client, vault_id)
-        review_cache.set(vault_id, WeeklyReviewResponse(**data))
-        review_id = save_weekly_review(client, vault_id, data)
+        client = get_async_neo4j_client()
+        version = await asyncio.to_thread(vault_versions.current, vault_id)
+        data = await get_weekly_review(client, vault_id)
+        review_cache.set(vault_id, WeeklyReviewResponse(**data), version=version)
+        review_id = await save_weekly_review(client, vault_id, data)
         if not review_id:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -73,8 +82,8 @@ async def review_history(vault_id: str, user_token: str, limit: int = 5):
     저장된 리뷰 히스토리 조회
     """
     try:
-        client = get_neo4j_client()
-        history = list_review_history(client, vault_id, limit=limit)
+        client = get_async_neo4j_client()
+        history = await list_review_history(client, vault_id, limit=limit)
         return [WeeklyReviewRecord(**item) for item in history]
     except Exception as e:
         logger.error(f"List review history failed: {e}")
@@ -6,7 +6,7 @@ from typing import Optional
 import logging
 
 from app.schemas.task import TaskUpdate, TaskOut
-from app.db.neo4j import get_neo4j_client
+from app.db.neo4j import get_async_neo4j_client
 from app.services.task_service import update_task, list_tasks
 from app.utils.auth import get_user_id_from_token
 
@@ -21,9 +21,9 @@ async def update_task_endpoint(task_id: str, updates: TaskUpdate, user_token: st
     Task 업데이트 (status / priority)
     """
     try:
-        client = get_neo4j_client()
+        client = get_async_neo4j_client()
 
-        success = update_task(client, task_id, updates.model_dump(exclude_none=True))
+        success = await update_task(client, task_id, updates.model_dump(exclude_none=True))
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
@@ -50,8 +50,8 @@ async def list_tasks_endpoint(
     Task 목록 조회
     """
     try:
-        client = get_neo4j_client()
-        tasks = list_tasks(client, vault_id, status, priority)
+        client = get_async_neo4j_client()
+        tasks = await list_tasks(client, vault_id, status, priority)
         return tasks
     except Exception as e:
         logger.error(f"Error listing tasks: {e}")
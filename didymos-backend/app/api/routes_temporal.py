@@ -196,10 +196,10 @@ async def get_stale_knowledge(
         )
 
     try:
-        from app.db.neo4j import get_neo4j_client
+        from app.db.neo4j import get_async_neo4j_client
         from datetime import timedelta
 
-        client = get_neo4j_client()
+        client = get_async_neo4j_client()
         cutoff_date = datetime.now() - timedelta(days=days)
 
         # Graphiti Entity 노드에서 오래된 것 조회
@@ -227,7 +227,7 @@ async def get_stale_knowledge(
                days_since_access
         """
 
-        results = client.query(cypher, {
+        results = await client.query(cypher, {
             "cutoff_date": cutoff_date.isoformat(),
             "limit": limit
         })
@@ -361,9 +361,9 @@ async def mark_knowledge_reviewed(request: MarkReviewedRequest):
         )
 
     try:
-        from app.db.neo4j import get_neo4j_client
+        from app.db.neo4j import get_async_neo4j_client
 
-        client = get_neo4j_client()
+        client = get_async_neo4j_client()
 
         # last_accessed 업데이트
         cypher = """
@@ -372,7 +372,7 @@ async def mark_knowledge_reviewed(request: MarkReviewedRequest):
         RETURN e.uuid AS uuid, e.name AS name, e.last_accessed AS last_accessed
         """
 
-        results = client.query(cypher, {"uuid": request.uuid})
+        results = await client.query(cypher, {"uuid": request.uuid})
 
         if not results:
             raise HTTPException(status_code=404, detail="Entity not found")
@@ -413,9 +413,9 @@ async def mark_knowledge_reviewed_batch(uuids: list[str]):
         )
 
     try:
-        from app.db.neo4j import get_neo4j_client
+        from app.db.neo4j import get_async_neo4j_client
 
-        client = get_neo4j_client()
+        client = get_async_neo4j_client()
 
         # 일괄 업데이트
         cypher = """
@@ -425,7 +425,7 @@ async def mark_knowledge_reviewed_batch(uuids: list[str]):
         RETURN count(e) AS updated_count
         """
 
-        results = client.query(cypher, {"uuids": uuids})
+        results = await client.query(cypher, {"uuids": uuids})
         updated_count = results[0].get("updated_count", 0) if results else 0
 
         return {
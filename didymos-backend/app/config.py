@@ -22,9 +22,72 @@ class Settings(BaseSettings):
     aura_instanceid: str = ""
     aura_instancename: str = ""
 
+    # Neo4j 커넥션 풀 (앱 전체가 하나의 드라이버를 공유)
+    neo4j_max_pool_size: int = 50
+    neo4j_acquisition_timeout: float = 30.0  # 풀에서 커넥션 획득 대기 (초)
+    neo4j_max_connection_lifetime: int = 3000  # AuraDB 유휴 종료(60분) 이전에 재생성 (초)
+
     # OpenAI
     openai_api_key: str
 
+    # Note Embedding Pipeline (배치 임베딩)
+    embedding_provider: str = "openai"  # openai | local (오프라인 벤치마크/개발용)
+    embedding_batch_max_notes: int = 64  # 이만큼 모이면 즉시 flush
+    embedding_batch_max_tokens: int = 100_000  # embed_documents 요청당 토큰 한도
+    embedding_batch_window_seconds: float = 2.0  # 최대 대기 시간
+
+    # Note AI Job Queue (SQLite 영속 큐 + 워커)
+    job_queue_path: str = "data/note_jobs.sqlite"  # 영구 디스크 경로여야 재시작 후에도 대기 작업 유지
+    job_worker_embedded: bool = True  # False면 API는 큐에 넣기만 함 (python -m app.worker 별도 실행)
+    job_worker_max_in_flight: int = 16  # 워커당 동시 처리 작업 수
+    job_llm_concurrency: int = 2  # 프로세스당 LLM 추출 동시 호출 수
+    job_max_attempts: int = 5
+    job_backoff_base_seconds: float = 5.0
+    job_backoff_max_seconds: float = 300.0
+    job_poll_interval_seconds: float = 1.0
+    job_lease_seconds: float = 600.0  # 이 시간 이상 running이면 워커 종료로 보고 재대기
+
+    # Cache Invalidation (Vault 버전 카운터)
+    cache_pubsub_url: str = ""  # 예: redis://localhost:6379/0 - 레플리카 간 무효화 전파
+    vault_version_refresh_seconds: float = 5.0  # pub/sub 없을 때 로컬 버전 재조회 주기
+    cache_l2_url: str = ""  # TTLCache 공유 L2: redis://... 또는 sqlite:///data/cache_l2.sqlite (비우면 L1만)
+
+    # LLM Response Cache (프롬프트 해시 → 응답)
+    llm_cache_enabled: bool = True
+    llm_cache_path: str = "data/llm_cache.sqlite"
+    llm_cache_ttl_hours: float = 720.0  # 30일
+    llm_cache_max_entries: int = 10_000
+
+    # LLM Dispatcher (공유 비동기 호출 + 토큰 버킷, 한도는 응답 헤더로 갱신)
+    llm_provider: str = "openai"  # openai | fake (오프라인 벤치마크/개발용)
+    llm_max_concurrency: int = 8  # 프로세스당 동시 LLM 요청 수
+    llm_requests_per_minute: int = 500  # 헤더 수신 전 초기 한도
+    llm_tokens_per_minute: int = 200_000
+    llm_max_retries: int = 5
+    llm_retry_base_seconds: float = 1.0
+    llm_retry_max_seconds: float = 60.0
+    llm_vault_requests_per_hour: int = 0  # Vault별 예산 (0이면 무제한)
+    llm_vault_tokens_per_hour: int = 0
+
+    # Semantic Clustering (UMAP + HDBSCAN 증분 모드)
+    cluster_incremental_enabled: bool = True
+    cluster_model_dir: str = "data/cluster_models"  # 학습된 reducer/clusterer 저장 위치
+    cluster_model_max_loaded: int = 8  # 메모리에 유지할 모델 수 (Vault × 폴더, 초과 시 LRU 제거)
+    cluster_model_max_files: int = 256  # 디스크에 유지할 모델 파일 수 (초과 시 오래 안 쓴 파일 삭제)
+    cluster_refit_new_fraction: float = 0.2  # 학습 이후 새/변경 노트 비율이 넘으면 전체 재학습
+    cluster_refit_drift_threshold: float = 0.5  # 증분 배정 노트 중 노이즈 비율이 넘으면 전체 재학습
+    cluster_refit_max_age_hours: float = 168.0  # 모델 최대 사용 기간
+    cluster_cache_ttl_hours: float = 12.0  # Vault 전체 클러스터 캐시 TTL
+    cluster_folder_cache_ttl_hours: float = 6.0  # 폴더별 클러스터 캐시 TTL
+    cluster_cache_max_entries: int = 16  # Vault당 ClusterCache 노드 수 (초과 시 LRU 삭제)
+
+    # Vault Graph Snapshot (패턴/약점/추천 분석 공용 인메모리 그래프)
+    graph_snapshot_max_vaults: int = 8  # 프로세스당 보관할 Vault 스냅샷 수 (초과 시 LRU 제거)
+
+    # Analysis Fan-out (약점/추천 분석 병렬 실행)
+    analysis_max_workers: int = 16  # 분석 전용 스레드 풀 크기
+    analysis_timeout_seconds: float = 10.0  # 분석별 제한 시간 (초과 시 timed_out 부분 결과)
+
     # Graphiti Temporal KG (Hybrid Mode)
     # Graphiti extracts EntityNode, then we add PKM labels (Topic/Project/Task/Person)
     # This enables both Graphiti's temporal features and PKM clustering compatibility
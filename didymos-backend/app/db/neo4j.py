@@ -1,36 +1,124 @@
 """
 Neo4j 연결 관리 (Bolt 사용)
+
+앱 전체가 하나의 드라이버(커넥션 풀)를 공유합니다.
+main.lifespan에서 생성하고 종료 시 close_neo4j_client()로 닫습니다.
+async 라우트는 get_async_neo4j_client()의 비동기 드라이버를 사용합니다.
 """
-from app.db.neo4j_bolt import Neo4jBoltClient
+import threading
+from typing import Any, Dict
+
+from app.db.neo4j_bolt import Neo4jBoltClient, AsyncNeo4jBoltClient
 from app.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Global client instance
+# Global client instances (shared driver registry)
 _neo4j_client = None
+_async_neo4j_client = None
+_client_lock = threading.Lock()
 
 
 def get_neo4j_client() -> Neo4jBoltClient:
     """
-    Neo4j Bolt 클라이언트 반환
+    공유 Neo4j Bolt 클라이언트 반환
+
+    FastAPI 의존성(Depends)과 서비스 코드 모두 이 함수를 사용합니다.
+    lifespan 밖(스크립트 등)에서 호출되면 최초 호출 시 생성합니다.
     """
     global _neo4j_client
     if _neo4j_client is None:
-        try:
-            _neo4j_client = Neo4jBoltClient(
-                uri=settings.neo4j_uri,
-                username=settings.neo4j_username,
-                password=settings.neo4j_password,
-                database=settings.neo4j_database
-            )
-            logger.info("Neo4j Bolt client created successfully")
-        except Exception as e:
-            logger.error(f"Failed to create Neo4j client: {e}")
-            raise e
+        with _client_lock:
+            if _neo4j_client is None:
+                try:
+                    _neo4j_client = Neo4jBoltClient(
+                        uri=settings.neo4j_uri,
+                        username=settings.neo4j_username,
+                        password=settings.neo4j_password,
+                        database=settings.neo4j_database,
+                        max_connection_pool_size=settings.neo4j_max_pool_size,
+                        connection_acquisition_timeout=settings.neo4j_acquisition_timeout,
+                        max_connection_lifetime=settings.neo4j_max_connection_lifetime,
+                    )
+                    logger.info("Neo4j Bolt client created successfully")
+                except Exception as e:
+                    logger.error(f"Failed to create Neo4j client: {e}")
+                    raise e
     return _neo4j_client
 
 
+def get_async_neo4j_client() -> AsyncNeo4jBoltClient:
+    """
+    공유 비동기 Neo4j Bolt 클라이언트 반환
+
+    async 드라이버는 생성 시 연결하지 않으므로 이벤트 루프 밖에서도 생성 가능하며,
+    실제 커넥션은 첫 쿼리 시 해당 루프에서 열립니다.
+    """
+    global _async_neo4j_client
+    if _async_neo4j_client is None:
+        with _client_lock:
+            if _async_neo4j_client is None:
+                try:
+                    _async_neo4j_client = AsyncNeo4jBoltClient(
+                        uri=settings.neo4j_uri,
+                        username=settings.neo4j_username,
+                        password=settings.neo4j_password,
+                        database=settings.neo4j_database,
+                        max_connection_pool_size=settings.neo4j_max_pool_size,
+                        connection_acquisition_timeout=settings.neo4j_acquisition_timeout,
+                        max_connection_lifetime=settings.neo4j_max_connection_lifetime,
+                    )
+                    logger.info("Neo4j Async Bolt client created successfully")
+                except Exception as e:
+                    logger.error(f"Failed to create async Neo4j client: {e}")
+                    raise e
+    return _async_neo4j_client
+
+
+def close_neo4j_client():
+    """
+    공유 드라이버 종료 (애플리케이션 shutdown 시 호출)
+    """
+    global _neo4j_client
+    with _client_lock:
+        if _neo4j_client is not None:
+            _neo4j_client.close()
+            _neo4j_client = None
+            logger.info("Neo4j Bolt client closed")
+
+
+async def close_async_neo4j_client():
+    """
+    공유 비동기 드라이버 종료 (애플리케이션 shutdown 시 호출)
+    """
+    global _async_neo4j_client
+    client = _async_neo4j_client
+    _async_neo4j_client = None
+    if client is not None:
+        await client.close()
+        logger.info("Neo4j Async Bolt client closed")
+
+
+def get_neo4j_metrics() -> Dict[str, Any]:
+    """
+    커넥션 풀 설정과 라우트별 쿼리 메트릭 반환 (sync / async 드라이버별)
+    """
+    def _describe(client) -> Dict[str, Any]:
+        if client is None:
+            return {"status": "not_initialized", "pool": {}, "routes": {}}
+        return {
+            "status": "initialized",
+            "pool": dict(client.pool_config),
+            "routes": client.metrics.snapshot(),
+        }
+
+    return {
+        "sync": _describe(_neo4j_client),
+        "async": _describe(_async_neo4j_client),
+    }
+
+
 def init_indices():
     """
     초기 인덱스 생성 및 연결 확인
@@ -79,6 +167,10 @@ def create_indexes(client):
 
         # 하위 호환성 (기존 Person)
         "CREATE CONSTRAINT person_id IF NOT EXISTS FOR (p:Person) REQUIRE p.id IS UNIQUE",
+
+        # 엔티티 동시 출현 인덱스 (Vault별 CO_OCCURS 관계 조회)
+        "CREATE INDEX co_occurs_vault IF NOT EXISTS FOR ()-[c:CO_OCCURS]-() ON (c.vault_id)",
+        "CREATE INDEX co_occurs_pair IF NOT EXISTS FOR ()-[c:CO_OCCURS]-() ON (c.vault_id, c.pair)",
     ]
     for cypher in constraints:
         try:
@@ -2,34 +2,79 @@
 Neo4j Bolt 드라이버 클라이언트
 HTTP Query API 대신 Bolt를 사용해 쿼리를 실행합니다.
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import logging
-from neo4j import GraphDatabase, Driver
+import time
+from neo4j import GraphDatabase, Driver, AsyncGraphDatabase, AsyncDriver
+
+from app.utils.metrics import QueryMetrics, current_route
 
 logger = logging.getLogger(__name__)
 
 
+def _build_pool_config(
+    max_connection_pool_size: int,
+    connection_acquisition_timeout: float,
+    max_connection_lifetime: Optional[int],
+) -> Dict[str, Any]:
+    """드라이버 커넥션 풀 옵션 구성"""
+    config = {
+        "max_connection_pool_size": max_connection_pool_size,
+        "connection_acquisition_timeout": connection_acquisition_timeout,
+    }
+    if max_connection_lifetime:
+        config["max_connection_lifetime"] = max_connection_lifetime
+    return config
+
+
 class Neo4jBoltClient:
     """Neo4j Bolt 쿼리 클라이언트"""
 
-    def __init__(self, uri: str, username: str, password: str, database: str = "neo4j"):
+    def __init__(
+        self,
+        uri: str,
+        username: str,
+        password: str,
+        database: str = "neo4j",
+        max_connection_pool_size: int = 100,
+        connection_acquisition_timeout: float = 60.0,
+        max_connection_lifetime: Optional[int] = None,
+    ):
         self.database = database
         self.uri = self._normalize_uri(uri)
-        self.driver: Driver = GraphDatabase.driver(self.uri, auth=(username, password))
-        logger.info(f"Neo4j Bolt Client initialized: {self.uri} / db={database}")
+        self.pool_config = _build_pool_config(
+            max_connection_pool_size, connection_acquisition_timeout, max_connection_lifetime
+        )
+        self.driver: Driver = GraphDatabase.driver(
+            self.uri,
+            auth=(username, password),
+            **self.pool_config
+        )
+        self.metrics = QueryMetrics()
+        logger.info(
+            f"Neo4j Bolt Client initialized: {self.uri} / db={database} "
+            f"(pool={max_connection_pool_size}, acquire_timeout={connection_acquisition_timeout}s)"
+        )
 
     def query(self, cypher: str, params: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """
         Cypher 쿼리를 실행하고 dict 리스트로 반환
         """
         params = params or {}
+        started = time.perf_counter()
+        ok = False
         try:
             with self.driver.session(database=self.database) as session:
                 result = session.run(cypher, params)
-                return [record.data() for record in result]
+                records = [record.data() for record in result]
+            ok = True
+            return records
         except Exception as e:
             logger.error(f"Query execution error: {e}")
             raise
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.metrics.record(current_route.get(), elapsed_ms, ok)
 
     def verify_connectivity(self) -> bool:
         """연결 확인"""
@@ -58,3 +103,71 @@ class Neo4jBoltClient:
         if uri.startswith("neo4j://"):
             return uri.replace("neo4j://", "bolt://")
         return uri
+
+
+class AsyncNeo4jBoltClient:
+    """
+    Neo4j Bolt 비동기 쿼리 클라이언트
+
+    Neo4jBoltClient와 동일한 query() 계약(dict 리스트 반환)을 가지며,
+    async 라우트에서 이벤트 루프를 막지 않도록 neo4j async 드라이버를 사용합니다.
+    """
+
+    def __init__(
+        self,
+        uri: str,
+        username: str,
+        password: str,
+        database: str = "neo4j",
+        max_connection_pool_size: int = 100,
+        connection_acquisition_timeout: float = 60.0,
+        max_connection_lifetime: Optional[int] = None,
+    ):
+        self.database = database
+        self.uri = Neo4jBoltClient._normalize_uri(uri)
+        self.pool_config = _build_pool_config(
+            max_connection_pool_size, connection_acquisition_timeout, max_connection_lifetime
+        )
+        self.driver: AsyncDriver = AsyncGraphDatabase.driver(
+            self.uri,
+            auth=(username, password),
+            **self.pool_config
+        )
+        self.metrics = QueryMetrics()
+        logger.info(f"Neo4j Async Bolt Client initialized: {self.uri} / db={database}")
+
+    async def query(self, cypher: str, params: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        """
+        Cypher 쿼리를 비동기로 실행하고 dict 리스트로 반환
+        """
+        params = params or {}
+        started = time.perf_counter()
+        ok = False
+        try:
+            async with self.driver.session(database=self.database) as session:
+                result = await session.run(cypher, params)
+                records = [record.data() async for record in result]
+            ok = True
+            return records
+        except Exception as e:
+            logger.error(f"Async query execution error: {e}")
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.metrics.record(current_route.get(), elapsed_ms, ok)
+
+    async def verify_connectivity(self) -> bool:
+        """연결 확인"""
+        try:
+            await self.driver.verify_connectivity()
+            return True
+        except Exception as e:
+            logger.error(f"Async connectivity check failed: {e}")
+            return False
+
+    async def close(self):
+        """드라이버 종료"""
+        try:
+            await self.driver.close()
+        except Exception as e:
+            logger.error(f"Error closing async driver: {e}")
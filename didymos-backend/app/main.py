@@ -3,10 +3,17 @@ Didymos FastAPI Application
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
-from app.db.neo4j import init_indices
+from app.db.neo4j import (
+    init_indices,
+    close_neo4j_client,
+    close_async_neo4j_client,
+    get_neo4j_metrics,
+)
 from app.config import settings
+from app.utils.metrics import RouteLabelMiddleware
+from app.utils.etag import VaultETagMiddleware
+from app.utils.compression import SelectiveGZipMiddleware
 from app.api import routes_notes, routes_context, routes_tasks, routes_review, routes_graph, routes_pattern, routes_temporal, routes_search
 import logging
 
@@ -22,6 +29,10 @@ async def lifespan(app: FastAPI):
     logger.info("Starting Didymos API...")
     init_indices()
 
+    # Cross-replica cache invalidation (no-op without CACHE_PUBSUB_URL)
+    from app.services.vault_version import vault_versions
+    vault_versions.start()
+
     # Initialize Graphiti if enabled
     if settings.use_graphiti:
         try:
@@ -33,8 +44,21 @@ async def lifespan(app: FastAPI):
             logger.error(f"❌ Failed to initialize Graphiti: {e}")
             # Continue without Graphiti - fallback to legacy
 
+    # Start embedded note AI job worker (disable to run `python -m app.worker` separately)
+    if settings.job_worker_embedded:
+        from app.services.job_queue import note_job_worker
+        note_job_worker.start()
+
     yield
 
+    # Shutdown: Stop job worker first (running jobs finish, pending jobs stay queued)
+    if settings.job_worker_embedded:
+        try:
+            from app.services.job_queue import note_job_worker
+            await note_job_worker.stop()
+        except Exception as e:
+            logger.error(f"Error stopping job worker: {e}")
+
     # Shutdown: Close Graphiti connection
     if settings.use_graphiti:
         try:
@@ -45,6 +69,19 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Error closing Graphiti: {e}")
 
+    # Shutdown: Flush pending note embeddings before closing the driver
+    try:
+        from app.services.embedding_pipeline import embedding_batcher
+        await embedding_batcher.close()
+    except Exception as e:
+        logger.error(f"Error flushing embedding batcher: {e}")
+
+    vault_versions.stop()
+
+    # Shutdown: Close shared Neo4j drivers
+    close_neo4j_client()
+    await close_async_neo4j_client()
+
     logger.info("Shutting down Didymos API...")
 
 
@@ -55,8 +92,14 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-# GZip 압축
-app.add_middleware(GZipMiddleware, minimum_size=500)
+# GZip 압축 (NDJSON/SSE 스트림은 줄 단위로 바로 전달되도록 제외)
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=500)
+
+# 라우트별 Neo4j 쿼리 메트릭 라벨링
+app.add_middleware(RouteLabelMiddleware)
+
+# 계산 중 Vault 버전이 바뀐 응답의 ETag 제거
+app.add_middleware(VaultETagMiddleware)
 
 # CORS 설정
 app.add_middleware(
@@ -97,6 +140,56 @@ async def health_check():
     }
 
 
+@app.get("/metrics/neo4j")
+async def neo4j_metrics():
+    """공유 Neo4j 드라이버 풀 설정 및 라우트별 쿼리 메트릭"""
+    return get_neo4j_metrics()
+
+
+@app.get("/metrics/llm-cache")
+async def llm_cache_metrics():
+    """LLM 응답 캐시 적중/미스 및 절감 비용"""
+    import asyncio
+    from app.services.llm_cache import llm_cache
+    return await asyncio.to_thread(llm_cache.snapshot)
+
+
+@app.get("/metrics/llm")
+async def llm_metrics():
+    """LLM 디스패처 버킷 잔량/재시도/429/Vault별 사용량"""
+    from app.services.llm_dispatcher import llm_dispatcher
+    return llm_dispatcher.snapshot()
+
+
+@app.get("/metrics/graph-snapshots")
+async def graph_snapshot_metrics():
+    """Vault 그래프 스냅샷 캐시 적중/생성 시간/메모리"""
+    from app.services.graph_snapshot import graph_snapshots
+    return graph_snapshots.snapshot()
+
+
+@app.get("/metrics/analyses")
+async def analysis_metrics():
+    """약점/추천 분석별 실행 시간과 시간 초과/실패 횟수"""
+    from app.services.analysis_fanout import analysis_fanout
+    return analysis_fanout.snapshot()
+
+
+@app.get("/metrics/etag")
+async def etag_metrics():
+    """라우트별 조건부 GET 304 / 200 응답 수"""
+    from app.utils.etag import etag_metrics as snapshot_etags
+    return snapshot_etags()
+
+
+@app.get("/metrics/cache")
+async def cache_metrics():
+    """TTLCache namespace별 적중률/제거 수/추정 메모리"""
+    import asyncio
+    from app.utils.cache import cache_metrics as snapshot_caches
+    return await asyncio.to_thread(snapshot_caches)
+
+
 @app.get("/api/v1/test")
 async def test():
     """테스트 엔드포인트"""
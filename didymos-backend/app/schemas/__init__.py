@@ -1,7 +1,7 @@
 """
 Pydantic 스키마 모듈
 """
-from .note import NotePayload, NoteSyncRequest, NoteSyncResponse
+from .note import NotePayload, NoteSyncRequest, NoteSyncResponse, NoteBatchSyncRequest
 from .context import NoteContextResponse
 from .task import TaskUpdate, TaskOut
 from .review import WeeklyReviewResponse
@@ -11,6 +11,7 @@ __all__ = [
     "NotePayload",
     "NoteSyncRequest",
     "NoteSyncResponse",
+    "NoteBatchSyncRequest",
     "NoteContextResponse",
     "TaskUpdate",
     "TaskOut",
@@ -62,6 +62,8 @@ class ClusteredGraphResponse(BaseModel):
     edges: List[ClusterEdge]
     last_computed: str
     computation_method: str = Field(..., description="louvain, leiden, manual, hybrid")
+    stale: bool = Field(False, description="Vault 변경 이후의 오래된 캐시를 반환 (백그라운드 재계산 중)")
+    refreshing: bool = Field(False, description="백그라운드 재계산 진행 여부")
 
 
 class ClusterComputeRequest(BaseModel):
@@ -31,3 +31,15 @@ class NoteSyncResponse(BaseModel):
     status: str
     note_id: str
     message: Optional[str] = None
+    ai_status: Optional[str] = Field(default=None, description="none | skipped | scheduled | partial")
+    ai_skipped: int = Field(default=0, description="콘텐츠 해시가 같아 AI 처리를 건너뛴 노트 수")
+    sections_total: Optional[int] = None
+    sections_changed: Optional[int] = None
+
+
+class NoteBatchSyncRequest(BaseModel):
+    """노트 일괄 동기화 요청 (초기 Vault 임포트용)"""
+    user_token: str
+    vault_id: str
+    notes: List[NotePayload] = Field(..., min_length=1, max_length=500)
+    privacy_mode: str = Field(default="full", description="full | summary | metadata")
@@ -1,6 +1,6 @@
 """
 비즈니스 로직 서비스 모듈
 """
-from .graph_service import upsert_note, get_note, get_all_notes
+from .graph_service import upsert_note, upsert_notes, get_note, get_all_notes
 
-__all__ = ["upsert_note", "get_note", "get_all_notes"]
+__all__ = ["upsert_note", "upsert_notes", "get_note", "get_all_notes"]
@@ -0,0 +1,224 @@
+"""
+분석 팬아웃 (독립 분석 병렬 실행 + 분석별 타임아웃 + 부분 결과)
+
+analyze_weaknesses(탐지 5개)와 get_recommendations(분석 2~3개)는 서로 독립인 Neo4j 왕복을
+순서대로 실행해 응답 지연이 각 분석 시간의 합이었습니다.
+
+run_analyses는 분석들을 전용 스레드 풀에서 동시에 실행하고, 분석별 타임아웃 안에 끝난 결과만 모읍니다.
+- ok: 정상 완료
+- timed_out: 제한 시간 초과 (응답은 기본값으로 채우고, 스레드는 백그라운드에서 끝까지 실행)
+- failed: 예외 발생 (다른 분석 결과에는 영향 없음)
+
+제한 시간은 분석이 실행을 시작한 시점부터 셉니다. 시간 초과된 분석도 끝날 때까지 스레드를
+점유하므로, 남은 스레드가 요청의 분석 수보다 적으면 큐에 쌓지 않고 AnalysisPoolSaturated를
+발생시킵니다 (라우트는 503으로 응답).
+
+스냅샷 기반 분석들이 동시에 graph_snapshots.get을 호출해도 스냅샷은 한 번만 만들어집니다.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+STATUS_OK = "ok"
+STATUS_TIMED_OUT = "timed_out"
+STATUS_FAILED = "failed"
+
+# 시작 대기 중인 분석이 있을 때 확인 주기 (초)
+_START_POLL_SECONDS = 0.05
+
+
+class AnalysisPoolSaturated(Exception):
+    """분석 스레드 풀에 이 요청을 바로 실행할 여유가 없음 (시간 초과된 분석이 점유 중)"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AnalysisOutcome:
+    """분석 하나의 실행 결과"""
+
+    __slots__ = ("name", "status", "value", "elapsed_ms", "error")
+
+    def __init__(self, name: str, status: str, value: Any, elapsed_ms: float, error: Optional[str] = None):
+        self.name = name
+        self.status = status
+        self.value = value
+        self.elapsed_ms = elapsed_ms
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.status == STATUS_OK
+
+    def to_dict(self) -> Dict[str, Any]:
+        """응답용 상태 (값 제외)"""
+        data = {"status": self.status, "elapsed_ms": round(self.elapsed_ms, 1)}
+        if self.error:
+            data["error"] = self.error
+        return data
+
+
+class AnalysisFanout:
+    """독립 분석을 전용 스레드 풀에서 동시에 실행 (thread-safe)"""
+
+    def __init__(self, max_workers: int = 16, default_timeout: float = 10.0):
+        self.max_workers = max_workers
+        self.default_timeout = default_timeout
+        # 시간 초과된 분석이 기본 executor(asyncio.to_thread)를 점유하지 않도록 전용 풀 사용
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis")
+        self._lock = threading.Lock()
+        self._occupied = 0  # 제출 후 아직 끝나지 않은 분석 수 (시간 초과 후 계속 실행 중인 것 포함)
+        self._rejected = 0
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def run(
+        self,
+        analyses: Dict[str, Callable[[], Any]],
+        timeout: Optional[float] = None,
+        timeouts: Optional[Dict[str, float]] = None,
+        defaults: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, AnalysisOutcome]:
+        """
+        분석들을 동시에 실행하고 이름별 결과 반환
+
+        Args:
+            analyses: 이름 → 인자 없는 호출 가능 객체
+            timeout: 분석별 기본 제한 시간 (초, None이면 설정값)
+            timeouts: 이름별 제한 시간 (timeout보다 우선)
+            defaults: 시간 초과/실패 시 값 (없으면 None)
+
+        Returns:
+            이름 → AnalysisOutcome (analyses와 같은 순서)
+
+        Raises:
+            AnalysisPoolSaturated: 남은 스레드가 분석 수보다 적을 때 (아무것도 실행하지 않음)
+        """
+        timeout = self.default_timeout if timeout is None else timeout
+        timeouts = timeouts or {}
+        defaults = defaults or {}
+        limits = {name: timeouts.get(name, timeout) for name in analyses}
+
+        self._reserve(len(analyses), max(limits.values(), default=timeout))
+        submitted = time.perf_counter()
+        starts: Dict[str, float] = {}
+        futures = {}
+        for name, fn in analyses.items():
+            future = self._executor.submit(self._timed, fn, name, starts)
+            future.add_done_callback(self._release)
+            futures[name] = future
+
+        # 실행을 시작한 분석은 시작 시각 + 제한 시간까지 기다림
+        pending = dict(futures)
+        while pending:
+            now = time.perf_counter()
+            next_deadline = None
+            for name, future in list(pending.items()):
+                began = starts.get(name)
+                if future.done() or (began is not None and now >= began + limits[name]):
+                    del pending[name]
+                elif began is not None:
+                    deadline = began + limits[name]
+                    next_deadline = deadline if next_deadline is None else min(next_deadline, deadline)
+            if not pending:
+                break
+            waited = _START_POLL_SECONDS if len(starts) < len(futures) else next_deadline - now
+            wait(list(pending.values()), timeout=max(waited, 0), return_when=FIRST_COMPLETED)
+
+        outcomes: Dict[str, AnalysisOutcome] = {}
+        for name, future in futures.items():
+            if future.done():
+                value, error, elapsed_ms = future.result()
+                if error is None:
+                    outcome = AnalysisOutcome(name, STATUS_OK, value, elapsed_ms)
+                else:
+                    logger.error(f"Analysis '{name}' failed: {error}")
+                    outcome = AnalysisOutcome(name, STATUS_FAILED, defaults.get(name), elapsed_ms, error)
+            else:
+                elapsed_ms = (time.perf_counter() - starts.get(name, submitted)) * 1000
+                logger.warning(f"Analysis '{name}' timed out after {elapsed_ms:.0f}ms")
+                outcome = AnalysisOutcome(name, STATUS_TIMED_OUT, defaults.get(name), elapsed_ms)
+            outcomes[name] = outcome
+            self._record(outcome)
+
+        return outcomes
+
+    def _reserve(self, count: int, retry_after: float) -> None:
+        """요청의 분석 수만큼 스레드 확보 (부족하면 AnalysisPoolSaturated)"""
+        with self._lock:
+            if self._occupied + count > self.max_workers:
+                self._rejected += 1
+                raise AnalysisPoolSaturated(
+                    f"Analysis pool saturated ({self._occupied}/{self.max_workers} threads busy)",
+                    retry_after=retry_after,
+                )
+            self._occupied += count
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._occupied -= 1
+
+    @staticmethod
+    def _timed(fn: Callable[[], Any], name: str, starts: Dict[str, float]):
+        started = time.perf_counter()
+        starts[name] = started
+        try:
+            return fn(), None, (time.perf_counter() - started) * 1000
+        except Exception as e:
+            return None, str(e)[:500], (time.perf_counter() - started) * 1000
+
+    def _record(self, outcome: AnalysisOutcome) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(
+                outcome.name,
+                {STATUS_OK: 0, STATUS_TIMED_OUT: 0, STATUS_FAILED: 0, "ms_total": 0.0, "ms_max": 0.0},
+            )
+            stats[outcome.status] += 1
+            stats["ms_total"] += outcome.elapsed_ms
+            stats["ms_max"] = max(stats["ms_max"], outcome.elapsed_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """메트릭 (/metrics/analyses)"""
+        with self._lock:
+            stats = {name: dict(s) for name, s in self._stats.items()}
+        analyses = {}
+        for name, s in stats.items():
+            runs = s[STATUS_OK] + s[STATUS_TIMED_OUT] + s[STATUS_FAILED]
+            analyses[name] = {
+                "runs": runs,
+                STATUS_OK: s[STATUS_OK],
+                STATUS_TIMED_OUT: s[STATUS_TIMED_OUT],
+                STATUS_FAILED: s[STATUS_FAILED],
+                "avg_ms": round(s["ms_total"] / runs, 1) if runs else 0.0,
+                "max_ms": round(s["ms_max"], 1),
+            }
+        with self._lock:
+            occupied, rejected = self._occupied, self._rejected
+        return {
+            "max_workers": self.max_workers,
+            "busy_threads": occupied,
+            "rejected_requests": rejected,
+            "default_timeout_seconds": self.default_timeout,
+            "analyses": analyses,
+        }
+
+
+def outcome_statuses(outcomes: Dict[str, AnalysisOutcome]) -> Dict[str, Any]:
+    """응답에 붙일 분석별 상태와 부분 결과 여부"""
+    return {
+        "partial": any(not o.ok for o in outcomes.values()),
+        "analyses": {name: o.to_dict() for name, o in outcomes.items()},
+    }
+
+
+# Global instance
+analysis_fanout = AnalysisFanout(
+    max_workers=settings.analysis_max_workers,
+    default_timeout=settings.analysis_timeout_seconds,
+)
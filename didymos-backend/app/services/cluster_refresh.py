@@ -0,0 +1,110 @@
+"""
+클러스터 백그라운드 재계산 (stale-while-revalidate)
+
+/graph/vault/clustered는 오래된 캐시가 있으면 즉시 반환(stale=true)하고 재계산을 예약합니다.
+같은 (vault, folder, method, target_clusters) 키의 재계산은 프로세스 내에서 하나만 실행되며,
+그동안 들어온 요청(캐시가 없는 동기 요청 포함)은 실행 중인 작업을 공유합니다.
+클라이언트는 /graph/vault/clustered/refresh-status로 완료를 폴링하거나
+wait_seconds로 완료까지 대기(long-poll)할 수 있습니다.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (vault_id, folder_prefix, method, target_clusters)
+RefreshKey = Tuple[str, str, str, int]
+
+# 완료된 재계산 상태 보존 시간 (refresh-status 조회용)
+_STATUS_RETENTION_SECONDS = 3600
+
+
+def refresh_key(vault_id: str, folder_prefix: Optional[str], method: str, target_clusters: int) -> RefreshKey:
+    return (vault_id, folder_prefix or "", method, target_clusters)
+
+
+class ClusterRefreshCoordinator:
+    """키별 단일 비동기 재계산 작업 관리 (이벤트 루프 스레드에서 사용)"""
+
+    def __init__(self):
+        self._tasks: Dict[RefreshKey, asyncio.Task] = {}
+        self._status: Dict[RefreshKey, Dict[str, Any]] = {}
+
+    def schedule(self, key: RefreshKey, compute: Callable[[], Dict[str, Any]]) -> "asyncio.Task":
+        """
+        재계산 예약 (같은 키가 실행 중이면 기존 작업 반환)
+
+        Args:
+            key: refresh_key(...)
+            compute: 스레드에서 실행할 동기 계산 함수
+        """
+        task = self._tasks.get(key)
+        if task is not None and not task.done():
+            return task
+
+        self._prune()
+        self._status[key] = {
+            "state": "running",
+            "started_at": time.time(),
+            "finished_at": None,
+            "error": None,
+        }
+        task = asyncio.get_running_loop().create_task(self._run(key, compute))
+        # 아무도 기다리지 않는 백그라운드 작업의 예외는 상태에만 기록
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._tasks[key] = task
+        return task
+
+    async def run(self, key: RefreshKey, compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """재계산 실행 후 결과 대기 (요청이 취소되어도 작업은 계속 진행)"""
+        return await asyncio.shield(self.schedule(key, compute))
+
+    async def _run(self, key: RefreshKey, compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        status = self._status[key]
+        try:
+            result = await asyncio.to_thread(compute)
+            status.update(state="done", computed_at=result.get("computed_at"))
+            logger.info(f"✅ Cluster refresh completed for {key}")
+            return result
+        except Exception as e:
+            status.update(state="failed", error=str(e)[:500])
+            logger.error(f"Cluster refresh failed for {key}: {e}")
+            raise
+        finally:
+            status["finished_at"] = time.time()
+            self._tasks.pop(key, None)
+
+    def is_running(self, key: RefreshKey) -> bool:
+        task = self._tasks.get(key)
+        return task is not None and not task.done()
+
+    async def wait(self, key: RefreshKey, timeout: float) -> Optional[Dict[str, Any]]:
+        """실행 중인 재계산이 끝날 때까지 최대 timeout초 대기 후 상태 반환"""
+        task = self._tasks.get(key)
+        if task is not None and timeout > 0:
+            try:
+                await asyncio.wait_for(asyncio.shield(task), timeout)
+            except Exception:
+                pass  # 시간 초과/실패 여부는 상태로 확인
+        return self.status(key)
+
+    def status(self, key: RefreshKey) -> Optional[Dict[str, Any]]:
+        status = self._status.get(key)
+        if status is None:
+            return None
+        now = time.time()
+        return {
+            **status,
+            "elapsed_seconds": round((status["finished_at"] or now) - status["started_at"], 2),
+        }
+
+    def _prune(self):
+        cutoff = time.time() - _STATUS_RETENTION_SECONDS
+        for key in [k for k, s in self._status.items() if s["finished_at"] and s["finished_at"] < cutoff]:
+            del self._status[key]
+
+
+# Global instance
+cluster_refresher = ClusterRefreshCoordinator()
@@ -12,8 +12,11 @@ import logging
 from datetime import datetime, timedelta
 import json
 import numpy as np
+from scipy import sparse
 from collections import defaultdict
 
+from app.config import settings
+
 logger = logging.getLogger(__name__)
 
 # 의미론적으로 무의미한 일반 엔티티 블랙리스트
@@ -41,174 +44,159 @@ except ImportError:
     logger.warning("UMAP or HDBSCAN not available. Semantic clustering disabled.")
 
 
-def compute_entity_graph_centrality(
+def compute_entity_graph_centrality_batch(
     client,
-    note_ids: List[str],
+    cluster_notes: Dict[Any, List[str]],
     include_types: List[str] = ["Topic", "Project", "Task", "Person"],
     vault_total_notes: int = None,
     include_entity_node: bool = True
-) -> Dict[str, Dict[str, Any]]:
+) -> Dict[Any, Dict[str, Dict[str, Any]]]:
     """
-    그래프 구조 기반 엔티티 중요도 계산 (IDF 가중치 포함)
+    그래프 구조 기반 엔티티 중요도 계산 (IDF 가중치 포함, 여러 클러스터를 한 번에)
 
     노트 간 연결성을 분석하여 "다리" 역할을 하는 엔티티에 높은 점수 부여:
     1. degree_centrality: 연결된 노트 수
     2. bridge_score: 서로 다른 노트들을 연결하는 정도
     3. co_occurrence_score: 다른 엔티티들과 함께 등장하는 빈도
-    4. idf_weight: 전체 vault에서 희소할수록 높은 가중치 (TF-IDF의 IDF)
+    4. idf_weight: 클러스터 노트의 절반 이상에 등장하면 감점
+    블랙리스트(GENERIC_ENTITY_BLACKLIST) 엔티티는 점수의 10%만 반영합니다.
+
+    모든 클러스터 노트의 노트-엔티티 incidence를 한 번의 쿼리로 가져와 희소 행렬로 만들고,
+    degree / co-occurrence / bridge / IDF 점수를 클러스터 전체에 대해 행렬 연산으로 계산합니다.
+    각 노트는 하나의 클러스터에만 속하므로 열을 (클러스터, 엔티티) 쌍으로 잡으면
+    B^T B가 클러스터별 동시 출현 행렬의 블록 대각 행렬이 됩니다.
+    동시 출현은 클러스터 노트 안에서만 셉니다.
 
     Args:
         client: Neo4j 클라이언트
-        note_ids: 분석할 노트 ID 리스트
+        cluster_notes: {클러스터 키: 노트 ID 리스트} (노트는 한 클러스터에만 속해야 함)
         include_types: 포함할 엔티티 타입
         vault_total_notes: 전체 vault의 노트 수 (IDF 계산용)
         include_entity_node: Graphiti EntityNode도 포함할지 여부
 
     Returns:
-        {entity_id: {name, type, centrality_score, degree, bridge_score, co_occurrence, idf_weight}}
+        {클러스터 키: {entity_id: {name, type, degree, connected_notes, centrality_score,
+        degree_centrality, co_occurrence_count, co_occurrence_score, bridge_score, idf_weight,
+        is_generic}}} (엔티티가 없는 클러스터는 빈 dict)
     """
-    if not note_ids:
-        return {}
+    results: Dict[Any, Dict[str, Dict[str, Any]]] = {key: {} for key in cluster_notes}
+    cluster_keys = [key for key, notes in cluster_notes.items() if notes]
+    if not cluster_keys:
+        return results
+
+    note_index: Dict[str, int] = {}
+    note_cluster = []
+    for c, key in enumerate(cluster_keys):
+        for note_id in cluster_notes[key]:
+            if note_id not in note_index:
+                note_index[note_id] = len(note_cluster)
+                note_cluster.append(c)
+    note_cluster = np.asarray(note_cluster, dtype=np.int64)
+    note_ids = list(note_index)
+    total_notes = np.array([len(cluster_notes[key]) for key in cluster_keys], dtype=float)
 
-    # PKM 타입 필터 + Entity (Graphiti) 지원
     type_conditions = [f"'{t}' IN labels(entity)" for t in include_types]
     if include_entity_node:
-        # Entity with PKM labels (hybrid mode) - Graphiti uses 'Entity' label
         type_conditions.append("'Entity' IN labels(entity)")
     type_filter = " OR ".join(type_conditions)
 
-    # Step 1: 각 엔티티의 degree (연결된 노트 수) 계산
-    cypher_degree = f"""
+    # Step 1: 전체 노트의 노트-엔티티 incidence (엔티티당 한 행)
+    cypher_incidence = f"""
     MATCH (note:Note)-[:MENTIONS]->(entity)
     WHERE note.note_id IN $note_ids AND ({type_filter})
-    WITH entity,
-         entity.id as entity_id,
-         entity.name as entity_name,
-         labels(entity)[0] as entity_type,
-         COLLECT(DISTINCT note.note_id) as connected_notes
-    RETURN entity_id,
-           COALESCE(entity_name, entity_id) as entity_name,
-           entity_type,
-           SIZE(connected_notes) as degree,
-           connected_notes
+    RETURN entity.id as entity_id,
+           COALESCE(entity.name, entity.id) as entity_name,
+           labels(entity)[0] as entity_type,
+           COLLECT(DISTINCT note.note_id) as connected_notes
     """
-
-    degree_result = client.query(cypher_degree, {"note_ids": note_ids})
-
-    if not degree_result:
-        return {}
-
-    # 엔티티별 연결 정보 수집
-    entity_info = {}
-    entity_notes = {}  # entity_id -> set of note_ids
-
-    for row in degree_result:
+    rows = client.query(cypher_incidence, {"note_ids": note_ids}) or []
+    if not rows:
+        return results
+
+    # 엔티티 속성/블랙리스트 여부는 엔티티당 한 번만 계산
+    entity_ids, entity_names, entity_types, entity_generic = [], [], [], []
+    inc_notes, inc_entities = [], []
+    for e, row in enumerate(rows):
         entity_id = row["entity_id"]
-        entity_info[entity_id] = {
-            "name": row["entity_name"],
-            "type": row["entity_type"],
-            "degree": row["degree"],
-            "connected_notes": set(row["connected_notes"])
-        }
-        entity_notes[entity_id] = set(row["connected_notes"])
-
-    # Step 2: Co-occurrence 분석 (같은 노트에 등장하는 엔티티 쌍)
-    # 많은 다른 엔티티와 함께 등장하는 엔티티 = 허브 역할
-    cypher_cooccurrence = f"""
-    MATCH (note:Note)-[:MENTIONS]->(e1)
-    MATCH (note)-[:MENTIONS]->(e2)
-    WHERE note.note_id IN $note_ids
-      AND ({type_filter.replace('entity', 'e1')})
-      AND ({type_filter.replace('entity', 'e2')})
-      AND e1.id < e2.id
-    WITH e1.id as entity1, e2.id as entity2, COUNT(DISTINCT note) as shared_notes
-    WHERE shared_notes > 0
-    RETURN entity1, entity2, shared_notes
-    """
-
-    cooccurrence_result = client.query(cypher_cooccurrence, {"note_ids": note_ids})
-
-    # 각 엔티티의 co-occurrence 파트너 수 계산
-    co_occurrence_count = defaultdict(int)
-    co_occurrence_strength = defaultdict(float)  # 연결 강도 합산
-
-    for row in (cooccurrence_result or []):
-        e1, e2 = row["entity1"], row["entity2"]
-        shared = row["shared_notes"]
-        co_occurrence_count[e1] += 1
-        co_occurrence_count[e2] += 1
-        co_occurrence_strength[e1] += shared
-        co_occurrence_strength[e2] += shared
-
-    # Step 3: Bridge Score + IDF 가중치 계산
-    # 서로 다른 노트 그룹을 연결하는 엔티티에 높은 점수
-    # 단, 전체 vault에서 너무 많이 등장하는 엔티티는 IDF로 감점
-
-    total_notes = len(note_ids)
-    max_degree = max((info["degree"] for info in entity_info.values()), default=1)
-    max_cooccurrence = max(co_occurrence_count.values(), default=1)
-
-    # IDF 계산용 vault 전체 노트 수 (없으면 클러스터 노트 수 사용)
-    vault_size = vault_total_notes if vault_total_notes else total_notes
-
-    for entity_id, info in entity_info.items():
-        degree = info["degree"]
-        entity_name = info.get("name", entity_id)
-
-        # 블랙리스트 체크 - 일반적인 엔티티는 낮은 점수
-        is_generic = entity_name.lower() in GENERIC_ENTITY_BLACKLIST or entity_id.lower() in GENERIC_ENTITY_BLACKLIST
-        generic_penalty = 0.1 if is_generic else 1.0
-
-        # Degree centrality (정규화)
-        degree_centrality = degree / max(total_notes, 1)
-
-        # Co-occurrence score (정규화)
-        co_count = co_occurrence_count.get(entity_id, 0)
-        co_score = co_count / max(max_cooccurrence, 1)
-
-        # Bridge score: 연결 강도의 분산 (많은 노트에 고르게 등장할수록 높음)
-        connected = info["connected_notes"]
-        if len(connected) > 1:
-            # 연결된 노트들이 분산되어 있을수록 bridge score 높음
-            bridge_score = min(1.0, len(connected) / max(3, total_notes * 0.2))
-        else:
-            bridge_score = 0.0
-
-        # IDF 가중치: 전체 vault에서 희소할수록 높음
-        # log(N / df) where N=총 문서수, df=엔티티가 등장하는 문서수
-        # 모든 노트에 등장하면 idf=0, 일부에만 등장하면 idf 높음
-        if vault_size > 0 and degree > 0:
-            # 클러스터 내 비율이 너무 높으면 감점 (50% 이상 노트에 등장 시)
-            cluster_coverage = degree / total_notes
-            if cluster_coverage > 0.5:
-                # 클러스터의 50% 이상 노트에 등장 = 너무 일반적
-                idf_weight = max(0.3, 1.0 - (cluster_coverage - 0.5) * 1.5)
-            else:
-                idf_weight = 1.0
-        else:
-            idf_weight = 1.0
-
-        # 종합 중심성 점수 (가중 합산 + IDF + 블랙리스트 패널티)
-        # degree: 30%, co-occurrence: 25%, bridge: 25%, idf: 20%
-        raw_centrality = (
-            0.30 * degree_centrality +
-            0.25 * co_score +
-            0.25 * bridge_score +
-            0.20 * idf_weight
+        entity_name = row["entity_name"]
+        entity_ids.append(entity_id)
+        entity_names.append(entity_name)
+        entity_types.append(row["entity_type"])
+        entity_generic.append(
+            str(entity_name).lower() in GENERIC_ENTITY_BLACKLIST
+            or str(entity_id).lower() in GENERIC_ENTITY_BLACKLIST
         )
+        for note_id in row["connected_notes"]:
+            inc_notes.append(note_index[note_id])
+            inc_entities.append(e)
+
+    inc_notes = np.asarray(inc_notes, dtype=np.int64)
+    inc_entities = np.asarray(inc_entities, dtype=np.int64)
+    n_entities = len(rows)
+
+    # Step 2: 열 = (클러스터, 엔티티) 쌍, 클러스터 순으로 정렬된 compact 인덱스
+    pair_codes = note_cluster[inc_notes] * n_entities + inc_entities
+    pairs, pair_cols = np.unique(pair_codes, return_inverse=True)
+    pair_cluster = pairs // n_entities
+    pair_entity = pairs % n_entities
+
+    incidence = sparse.csr_matrix(
+        (np.ones(len(pair_cols)), (inc_notes, pair_cols)),
+        shape=(len(note_ids), len(pairs))
+    )
 
-        # 블랙리스트 패널티 적용
-        centrality_score = raw_centrality * generic_penalty
-
-        info["degree_centrality"] = degree_centrality
-        info["co_occurrence_count"] = co_count
-        info["co_occurrence_score"] = co_score
-        info["bridge_score"] = bridge_score
-        info["idf_weight"] = idf_weight
-        info["is_generic"] = is_generic
-        info["centrality_score"] = centrality_score
+    # Degree: 클러스터 내 연결된 노트 수
+    degree = np.asarray(incidence.sum(axis=0)).ravel()
+
+    # Co-occurrence: 같은 클러스터 노트에 함께 등장하는 다른 엔티티 수 (블록 대각 행렬의 비대각 nnz)
+    cooccurrence = (incidence.T @ incidence).tocsr()
+    cooccurrence.setdiag(0)
+    cooccurrence.eliminate_zeros()
+    co_count = np.diff(cooccurrence.indptr).astype(float)
+
+    cluster_starts = np.flatnonzero(np.r_[True, pair_cluster[1:] != pair_cluster[:-1]])
+    max_co = np.maximum.reduceat(co_count, cluster_starts)
+    max_co = np.repeat(np.maximum(max_co, 1.0), np.diff(np.r_[cluster_starts, len(pairs)]))
+
+    # Step 3: 점수 (degree 30%, co-occurrence 25%, bridge 25%, idf 20%, 블랙리스트 패널티)
+    cluster_total = total_notes[pair_cluster]
+    degree_centrality = degree / np.maximum(cluster_total, 1)
+    co_score = co_count / max_co
+    bridge_score = np.where(
+        degree > 1,
+        np.minimum(1.0, degree / np.maximum(3, cluster_total * 0.2)),
+        0.0
+    )
+    coverage = degree / np.maximum(cluster_total, 1)
+    idf_weight = np.where(coverage > 0.5, np.maximum(0.3, 1.0 - (coverage - 0.5) * 1.5), 1.0)
+    is_generic = np.asarray(entity_generic, dtype=bool)[pair_entity]
+    centrality = (
+        0.30 * degree_centrality +
+        0.25 * co_score +
+        0.25 * bridge_score +
+        0.20 * idf_weight
+    ) * np.where(is_generic, 0.1, 1.0)
+
+    # Step 4: 클러스터별 결과 구성 (connected_notes는 CSC 열 슬라이스)
+    by_column = incidence.tocsc()
+    for col in range(len(pairs)):
+        e = pair_entity[col]
+        notes = by_column.indices[by_column.indptr[col]:by_column.indptr[col + 1]]
+        results[cluster_keys[pair_cluster[col]]][entity_ids[e]] = {
+            "name": entity_names[e],
+            "type": entity_types[e],
+            "degree": int(degree[col]),
+            "connected_notes": {note_ids[i] for i in notes},
+            "degree_centrality": float(degree_centrality[col]),
+            "co_occurrence_count": int(co_count[col]),
+            "co_occurrence_score": float(co_score[col]),
+            "bridge_score": float(bridge_score[col]),
+            "idf_weight": float(idf_weight[col]),
+            "is_generic": bool(is_generic[col]),
+            "centrality_score": float(centrality[col]),
+        }
 
-    return entity_info
+    return results
 
 
 def find_cluster_hub_entities(
@@ -353,18 +341,29 @@ def compute_clusters_louvain(
         type_filter_e1 = " OR ".join([f"'{t}' IN labels(e1)" for t in include_types])
         type_filter_e2 = " OR ".join([f"'{t}' IN labels(e2)" for t in include_types])
 
-        cypher_relations = f"""
-        MATCH (v:Vault {{id: $vault_id}})-[:HAS_NOTE]->(note:Note)
-        MATCH (note)-[:MENTIONS]->(e1)
-        MATCH (note)-[:MENTIONS]->(e2)
-        WHERE id(e1) < id(e2)
-          AND ({type_filter_e1})
-          AND ({type_filter_e2})
-          {folder_filter}
-        WITH e1, e2, COUNT(DISTINCT note) as shared_notes
-        WHERE shared_notes > 0
-        RETURN e1.id as from_id, e2.id as to_id, shared_notes as weight
-        """
+        from app.services.cooccurrence_service import is_cooccurrence_ready
+
+        if not folder_prefix and is_cooccurrence_ready(client, vault_id):
+            # 미리 계산된 CO_OCCURS 관계 (폴더 필터는 Vault 단위 인덱스로 표현할 수 없어 셀프 조인 사용)
+            cypher_relations = f"""
+            MATCH (e1)-[c:CO_OCCURS {{vault_id: $vault_id}}]->(e2)
+            WHERE ({type_filter_e1})
+              AND ({type_filter_e2})
+            RETURN e1.id as from_id, e2.id as to_id, c.weight as weight
+            """
+        else:
+            cypher_relations = f"""
+            MATCH (v:Vault {{id: $vault_id}})-[:HAS_NOTE]->(note:Note)
+            MATCH (note)-[:MENTIONS]->(e1)
+            MATCH (note)-[:MENTIONS]->(e2)
+            WHERE id(e1) < id(e2)
+              AND ({type_filter_e1})
+              AND ({type_filter_e2})
+              {folder_filter}
+            WITH e1, e2, COUNT(DISTINCT note) as shared_notes
+            WHERE shared_notes > 0
+            RETURN e1.id as from_id, e2.id as to_id, shared_notes as weight
+            """
 
         relations = client.query(cypher_relations, params)
 
@@ -448,12 +447,14 @@ def compute_clusters_semantic(
     target_clusters: int = 10,
     include_types: List[str] = ["Topic", "Project", "Task", "Person"],
     folder_prefix: str = None,
-    include_entity_node: bool = True
+    include_entity_node: bool = True,
+    incremental: Optional[bool] = None
 ) -> Dict[str, Any]:
     """
     UMAP + HDBSCAN을 사용한 의미론적 클러스터링
 
     노트 임베딩을 기반으로 클러스터링한 후, 각 클러스터에서 언급된 엔티티를 집계
+    증분 모드에서는 저장된 모델로 새/변경 노트만 배정하고, 임계값을 넘으면 전체 재학습
 
     Args:
         client: Neo4j Bolt 클라이언트
@@ -462,6 +463,7 @@ def compute_clusters_semantic(
         include_types: 클러스터링에 포함할 노드 타입
         folder_prefix: 폴더 경로 필터 (예: '1_프로젝트/')
         include_entity_node: Graphiti EntityNode도 포함할지 여부
+        incremental: 증분 모드 사용 여부 (None이면 설정값, False면 전체 재학습)
 
     Returns:
         클러스터 데이터
@@ -530,43 +532,19 @@ def compute_clusters_semantic(
 
         logger.info(f"Found {len(embeddings)} notes with embeddings (shape: {embeddings.shape})")
 
-        # Step 3: UMAP 차원 축소
-        logger.info("Running UMAP dimensionality reduction...")
-
-        # UMAP 파라미터 동적 조정
-        n_samples = len(embeddings)
-        n_components = min(5, n_samples - 1)  # 샘플 수보다 작게
-        n_neighbors = max(2, min(15, n_samples - 1))  # 최소 2, 최대 15
-
-        reducer = umap.UMAP(
-            n_components=n_components,
-            n_neighbors=n_neighbors,
-            min_dist=0.1,
-            metric='cosine',
-            random_state=42
+        # Step 3-4: UMAP 차원 축소 + HDBSCAN 클러스터링
+        # 학습된 모델이 있으면 새/변경 노트만 transform + approximate_predict로 배정
+        from app.services.semantic_cluster_model import assign_semantic_labels
+
+        if incremental is None:
+            incremental = settings.cluster_incremental_enabled
+        cluster_labels, clustering_info = assign_semantic_labels(
+            vault_id=vault_id,
+            note_ids=note_ids,
+            embeddings=embeddings,
+            folder_prefix=folder_prefix,
+            full_refit=not incremental
         )
-        reduced_embeddings = reducer.fit_transform(embeddings)
-
-        logger.info(f"UMAP completed: {embeddings.shape} → {reduced_embeddings.shape}")
-
-        # Step 4: HDBSCAN 클러스터링
-        logger.info("Running HDBSCAN clustering...")
-
-        # 더 세분화된 클러스터링을 위한 파라미터 조정
-        # - min_cluster_size: 작을수록 더 많은 작은 클러스터 허용
-        # - min_samples: 1이면 노이즈 최소화
-        # - cluster_selection_epsilon: 작을수록 더 세분화됨
-        n_samples = len(embeddings)
-        min_cluster_size = max(5, n_samples // 50)  # 더 작은 클러스터 허용 (5개 또는 노트의 2%)
-
-        clusterer = hdbscan.HDBSCAN(
-            min_cluster_size=min_cluster_size,
-            min_samples=2,
-            cluster_selection_epsilon=0.1,  # 더 세분화
-            cluster_selection_method='eom',  # Excess of Mass - 계층적 클러스터링에 적합
-            metric='euclidean'
-        )
-        cluster_labels = clusterer.fit_predict(reduced_embeddings)
 
         # 클러스터 개수 (노이즈 제외)
         unique_labels = set(cluster_labels)
@@ -589,6 +567,17 @@ def compute_clusters_semantic(
         # Step 5: 각 클러스터에서 그래프 중심성 기반 엔티티 분석
         # mention_count 대신 centrality_score로 중요도 결정
         clusters = []
+        cluster_members = {}  # cluster id -> 전체 노트 ID (note_ids는 샘플)
+
+        # 모든 클러스터의 중심성을 한 번의 쿼리 + 희소 행렬 연산으로 계산
+        cluster_entity_info = compute_entity_graph_centrality_batch(
+            client=client,
+            cluster_notes={
+                cluster_id: [note_ids[i] for i in np.flatnonzero(cluster_labels == cluster_id)]
+                for cluster_id in unique_labels
+            },
+            include_types=include_types
+        )
 
         for cluster_id in sorted(unique_labels):
             # 클러스터에 속한 노트들
@@ -600,11 +589,7 @@ def compute_clusters_semantic(
             ]
 
             # 그래프 중심성 분석 (핵심 변경점!)
-            entity_info = compute_entity_graph_centrality(
-                client=client,
-                note_ids=cluster_note_ids,
-                include_types=include_types
-            )
+            entity_info = cluster_entity_info.get(cluster_id)
 
             if not entity_info:
                 continue  # 엔티티가 없는 클러스터는 스킵
@@ -642,6 +627,7 @@ def compute_clusters_semantic(
                 for eid, name, score in hub_entities
             ]
 
+            cluster_members[f"cluster_{cluster_id + 1}"] = cluster_note_ids
             clusters.append({
                 "id": f"cluster_{cluster_id + 1}",
                 "name": cluster_name,
@@ -684,8 +670,11 @@ def compute_clusters_semantic(
         return {
             "clusters": clusters,
             "edges": edges,
+            "cluster_members": cluster_members,
             "total_nodes": total_entities,
             "method": "umap_hdbscan",
+            "clustering_mode": clustering_info["mode"],
+            "clustering_stats": clustering_info,
             "computed_at": datetime.utcnow().isoformat()
         }
 
@@ -884,49 +873,135 @@ def _build_cluster_edges(clusters: List[Dict[str, Any]]) -> List[Dict[str, Any]]
     return edges
 
 
-def get_cached_clusters(client, vault_id: str) -> Optional[Dict[str, Any]]:
+def cluster_cache_key(
+    folder_prefix: Optional[str] = None,
+    method: str = "semantic",
+    target_clusters: int = 10
+) -> str:
+    """ClusterCache 키 (Vault 안에서 폴더 필터/방법/목표 클러스터 수별로 구분)"""
+    return f"{folder_prefix or ''}|{method}|{target_clusters}"
+
+
+# Cluster 노드에 JSON 문자열로 저장하는 필드 (Neo4j 속성은 맵/맵 리스트를 저장할 수 없음)
+_CLUSTER_JSON_FIELDS = ("contains_types", "hub_entities")
+
+# 멤버십은 IN_CLUSTER 관계로 저장하므로 Cluster 노드 속성에서 제외
+_CLUSTER_MEMBER_FIELDS = ("entity_ids",)
+
+# 조회 시 ClusterCache.last_accessed는 이 시간(초)보다 오래되었을 때만 갱신
+# (LRU 정리에는 이 정도 해상도면 충분하고, 캐시 조회를 쓰기 트랜잭션으로 만들지 않음)
+CLUSTER_CACHE_TOUCH_SECONDS = 600
+
+
+def _cluster_node_props(cluster: Dict[str, Any], position: int) -> Dict[str, Any]:
+    """클러스터 dict → Cluster 노드 속성 (중첩 구조는 JSON 문자열, 필드 이름은 json_fields에 기록)"""
+    props: Dict[str, Any] = {"position": position}
+    json_fields = []
+    for field, value in cluster.items():
+        if field in _CLUSTER_MEMBER_FIELDS or value is None:
+            continue
+        if field in _CLUSTER_JSON_FIELDS or isinstance(value, dict) or (
+            isinstance(value, list) and any(isinstance(v, (dict, list)) for v in value)
+        ):
+            props[field] = json.dumps(value, ensure_ascii=False)
+            json_fields.append(field)
+        else:
+            props[field] = value
+    props["json_fields"] = json_fields
+    return props
+
+
+def _cluster_from_node(props: Dict[str, Any]) -> Dict[str, Any]:
+    """Cluster 노드 속성 → 클러스터 dict"""
+    cluster = dict(props)
+    cluster.pop("position", None)
+    for field in cluster.pop("json_fields", None) or []:
+        if isinstance(cluster.get(field), str):
+            cluster[field] = json.loads(cluster[field])
+    return cluster
+
+
+def get_cached_clusters(
+    client,
+    vault_id: str,
+    folder_prefix: Optional[str] = None,
+    method: str = "semantic",
+    target_clusters: int = 10
+) -> Optional[Dict[str, Any]]:
     """
-    캐시된 클러스터 데이터 가져오기
+    캐시된 클러스터 데이터 가져오기 (읽기 전용 쿼리)
+
+    LRU 정리용 조회 시각(last_accessed)은 CLUSTER_CACHE_TOUCH_SECONDS보다 오래되었을 때만
+    별도 쿼리로 갱신합니다.
+
+    ClusterCache 요약 노드와 HAS_CLUSTER로 연결된 Cluster 노드, 클러스터 간 CLUSTER_EDGE를
+    한 쿼리로 읽습니다. entity_ids는 IN_CLUSTER 관계에서 가져옵니다.
 
     Args:
         client: Neo4j Bolt 클라이언트
         vault_id: Vault ID
+        folder_prefix: 폴더 필터 (없으면 Vault 전체)
+        method: 정규화된 클러스터링 방법 (normalize_cluster_method)
+        target_clusters: 목표 클러스터 개수
 
     Returns:
         캐시된 클러스터 데이터 또는 None
     """
     try:
         cypher = """
-        MATCH (v:Vault {id: $vault_id})-[:HAS_CLUSTER_CACHE]->(cache:ClusterCache)
-        WHERE datetime(cache.expires_at) > datetime()
-        RETURN cache.data as data,
+        MATCH (v:Vault {id: $vault_id})-[:HAS_CLUSTER_CACHE]->(cache:ClusterCache {key: $key})
+        OPTIONAL MATCH (cache)-[:HAS_CLUSTER]->(c:Cluster)
+        WITH v, cache, c ORDER BY c.position
+        WITH v, cache, collect(c {.*, entity_ids: [(e)-[:IN_CLUSTER]->(c) WHERE e.id IS NOT NULL | e.id]}) AS clusters
+        RETURN clusters,
+               [(cache)-[:HAS_CLUSTER]->(a:Cluster)-[r:CLUSTER_EDGE]->(b:Cluster) |
+                   {from: a.id, to: b.id, relation_type: r.relation_type, weight: r.weight}] AS edges,
+               cache.data as data,
                cache.computed_at as computed_at,
-               cache.method as method
-        ORDER BY cache.computed_at DESC
+               cache.method as method,
+               cache.vault_version as vault_version,
+               coalesce(v.version, 0) as current_version,
+               datetime(cache.expires_at) <= datetime() as expired,
+               coalesce(cache.last_accessed < datetime() - duration({seconds: $touch_seconds}), true) as touch
         LIMIT 1
         """
 
-        result = client.query(cypher, {"vault_id": vault_id})
+        key = cluster_cache_key(folder_prefix, method, target_clusters)
+        result = client.query(cypher, {
+            "vault_id": vault_id,
+            "key": key,
+            "touch_seconds": CLUSTER_CACHE_TOUCH_SECONDS
+        })
 
         if result and len(result) > 0:
             cache_data = result[0]
-            raw_data = json.loads(cache_data["data"])
+            if cache_data.get("touch"):
+                _touch_cluster_cache(client, vault_id, key)
             computed_at = cache_data["computed_at"]
             if not isinstance(computed_at, str):
                 computed_at = str(computed_at)
 
-            if isinstance(raw_data, dict) and "clusters" in raw_data:
-                clusters = raw_data.get("clusters", [])
-                edges = raw_data.get("edges", [])
-            else:
-                clusters = raw_data
-                edges = []
+            clusters = [_cluster_from_node(c) for c in cache_data.get("clusters") or []]
+            edges = cache_data.get("edges") or []
+
+            # 이전 형식 (전체 결과를 JSON 문자열 하나로 저장) 캐시
+            if not clusters and cache_data.get("data"):
+                raw_data = json.loads(cache_data["data"])
+                if isinstance(raw_data, dict) and "clusters" in raw_data:
+                    clusters = raw_data.get("clusters", [])
+                    edges = raw_data.get("edges", [])
+                else:
+                    clusters = raw_data
+                    edges = []
 
             return {
                 "clusters": clusters,
                 "edges": edges,
                 "computed_at": computed_at,
                 "method": cache_data["method"],
+                "vault_version": cache_data.get("vault_version"),
+                "current_version": cache_data.get("current_version"),
+                "expired": bool(cache_data.get("expired")),
                 "from_cache": True
             }
 
@@ -937,51 +1012,212 @@ def get_cached_clusters(client, vault_id: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+def _touch_cluster_cache(client, vault_id: str, key: str):
+    """ClusterCache 조회 시각 갱신 (실패해도 조회 결과에는 영향 없음)"""
+    try:
+        client.query(
+            """
+            MATCH (:Vault {id: $vault_id})-[:HAS_CLUSTER_CACHE]->(cache:ClusterCache {key: $key})
+            SET cache.last_accessed = datetime()
+            """,
+            {"vault_id": vault_id, "key": key}
+        )
+    except Exception as e:
+        logger.warning(f"Failed to touch cluster cache {key}: {e}")
+
+
+def get_cached_cluster(
+    client,
+    vault_id: str,
+    cluster_id: str,
+    folder_prefix: Optional[str] = None,
+    method: str = "semantic",
+    target_clusters: int = 10
+) -> Optional[Dict[str, Any]]:
+    """
+    캐시된 클러스터 하나와 전체 멤버 조회 (다른 클러스터는 읽지 않음)
+
+    Returns:
+        클러스터 dict + notes [{note_id, title}] + entities [{id, uuid, name, type}], 없으면 None
+    """
+    cypher = """
+    MATCH (:Vault {id: $vault_id})-[:HAS_CLUSTER_CACHE]->(cache:ClusterCache {key: $key})
+          -[:HAS_CLUSTER]->(c:Cluster {id: $cluster_id})
+    RETURN c {.*} AS cluster,
+           cache.computed_at AS computed_at,
+           [(n:Note)-[:IN_CLUSTER]->(c) | {note_id: n.note_id, title: n.title}] AS notes,
+           [(e)-[:IN_CLUSTER]->(c) WHERE NOT e:Note |
+               {id: e.id, uuid: e.uuid, name: coalesce(e.name, e.id), type: labels(e)[0]}] AS entities
+    """
+    result = client.query(cypher, {
+        "vault_id": vault_id,
+        "key": cluster_cache_key(folder_prefix, method, target_clusters),
+        "cluster_id": cluster_id
+    })
+    if not result:
+        return None
+
+    row = result[0]
+    cluster = _cluster_from_node(row["cluster"])
+    cluster["entity_ids"] = [e["id"] for e in row["entities"] if e.get("id")]
+    cluster["notes"] = row["notes"]
+    cluster["entities"] = row["entities"]
+    cluster["computed_at"] = str(row["computed_at"]) if row.get("computed_at") is not None else None
+    return cluster
+
+
 def save_cluster_cache(
     client,
     vault_id: str,
     clusters: List[Dict],
     method: str,
-    ttl_hours: int = 12,
-    edges: Optional[List[Dict]] = None
+    ttl_hours: Optional[float] = None,
+    edges: Optional[List[Dict]] = None,
+    vault_version: Optional[int] = None,
+    folder_prefix: Optional[str] = None,
+    cache_method: Optional[str] = None,
+    target_clusters: int = 10,
+    cluster_members: Optional[Dict[str, List[str]]] = None
 ) -> bool:
     """
     클러스터 데이터 캐시 저장
 
+    (folder_prefix, cache_method, target_clusters)별 ClusterCache 요약 노드 아래에
+    클러스터마다 Cluster 노드를 만들고, 멤버 노트/엔티티는 IN_CLUSTER 관계,
+    클러스터 간 관계는 CLUSTER_EDGE로 저장합니다 (한 트랜잭션).
+    Vault당 cluster_cache_max_entries개를 넘으면 가장 오래 조회되지 않은 캐시부터 삭제합니다.
+
     Args:
         client: Neo4j Bolt 클라이언트
         vault_id: Vault ID
         clusters: 클러스터 데이터
-        method: 클러스터링 방법
-        ttl_hours: 캐시 유효 시간 (시간)
+        method: 클러스터링 결과 방법 (예: semantic_fallback)
+        ttl_hours: 캐시 유효 시간 (시간, 없으면 Vault 전체/폴더별 설정값)
+        vault_version: 계산에 사용한 데이터의 Vault 버전 (계산 시작 전에 읽은 값, 없으면 현재 버전)
+        folder_prefix: 폴더 필터 (없으면 Vault 전체)
+        cache_method: 요청한 클러스터링 방법 (캐시 키, 없으면 method)
+        target_clusters: 목표 클러스터 개수 (캐시 키)
+        cluster_members: 클러스터 id → 전체 멤버 노트 ID (없으면 클러스터의 note_ids)
 
     Returns:
         성공 여부
     """
+    if ttl_hours is None:
+        ttl_hours = settings.cluster_folder_cache_ttl_hours if folder_prefix else settings.cluster_cache_ttl_hours
+
     try:
         cypher = """
         MATCH (v:Vault {id: $vault_id})
-        MERGE (v)-[:HAS_CLUSTER_CACHE]->(cache:ClusterCache)
-        SET cache.data = $data,
-            cache.method = $method,
+        MERGE (v)-[:HAS_CLUSTER_CACHE]->(cache:ClusterCache {key: $key})
+        SET cache.method = $method,
+            cache.folder_prefix = $folder_prefix,
+            cache.target_clusters = $target_clusters,
+            cache.cluster_count = size($clusters),
+            cache.vault_version = coalesce($vault_version, v.version, 0),
             cache.computed_at = datetime(),
-            cache.expires_at = datetime() + duration({hours: $ttl_hours})
-        RETURN cache
+            cache.last_accessed = datetime(),
+            cache.expires_at = datetime() + duration({seconds: toInteger($ttl_hours * 3600)})
+        REMOVE cache.data
+        WITH v, cache
+        CALL {
+            WITH cache
+            MATCH (cache)-[:HAS_CLUSTER]->(old:Cluster)
+            DETACH DELETE old
+            RETURN count(*) AS removed
+        }
+        CALL {
+            WITH cache
+            UNWIND $clusters AS props
+            CREATE (cache)-[:HAS_CLUSTER]->(c:Cluster)
+            SET c = props
+            RETURN count(c) AS created
+        }
+        CALL {
+            WITH cache
+            UNWIND $note_members AS m
+            MATCH (cache)-[:HAS_CLUSTER]->(c:Cluster {id: m.cluster_id})
+            UNWIND m.note_ids AS note_id
+            MATCH (n:Note {note_id: note_id})
+            CREATE (n)-[:IN_CLUSTER]->(c)
+            RETURN count(*) AS note_links
+        }
+        CALL {
+            WITH v, cache
+            MATCH (v)-[:HAS_NOTE]->(:Note)-[:MENTIONS]->(e)
+            WHERE e.id IN $entity_ids
+            WITH DISTINCT cache, e
+            UNWIND $entity_clusters[e.id] AS cluster_id
+            MATCH (cache)-[:HAS_CLUSTER]->(c:Cluster {id: cluster_id})
+            CREATE (e)-[:IN_CLUSTER]->(c)
+            RETURN count(*) AS entity_links
+        }
+        CALL {
+            WITH cache
+            UNWIND $edges AS edge
+            MATCH (cache)-[:HAS_CLUSTER]->(a:Cluster {id: edge.from})
+            MATCH (cache)-[:HAS_CLUSTER]->(b:Cluster {id: edge.to})
+            CREATE (a)-[:CLUSTER_EDGE {relation_type: edge.relation_type, weight: edge.weight}]->(b)
+            RETURN count(*) AS edge_links
+        }
+        // LRU: 키 없는 이전 형식 캐시와 최대 개수를 넘는 캐시 삭제 (Cluster 노드 포함)
+        CALL {
+            WITH v
+            MATCH (v)-[:HAS_CLUSTER_CACHE]->(old:ClusterCache)
+            WITH old ORDER BY coalesce(old.last_accessed, old.computed_at) ASC
+            WITH collect(old) AS caches
+            WITH [c IN caches WHERE c.key IS NULL] AS legacy,
+                 [c IN caches WHERE c.key IS NOT NULL] AS keyed
+            WITH legacy + keyed[..CASE WHEN size(keyed) > $max_entries THEN size(keyed) - $max_entries ELSE 0 END] AS evict
+            UNWIND evict AS old
+            OPTIONAL MATCH (old)-[:HAS_CLUSTER]->(oc:Cluster)
+            DETACH DELETE oc, old
+            RETURN count(DISTINCT old) AS evicted
+        }
+        RETURN cache.key AS key, created, note_links, entity_links, evicted
         """
 
-        payload = {
-            "clusters": clusters,
-            "edges": edges or []
-        }
+        note_members = [
+            {"cluster_id": c["id"], "note_ids": (cluster_members or {}).get(c["id"], c.get("note_ids") or [])}
+            for c in clusters
+        ]
+        entity_clusters: Dict[str, List[str]] = defaultdict(list)
+        for c in clusters:
+            for entity_id in c.get("entity_ids") or []:
+                entity_clusters[entity_id].append(c["id"])
 
         params = {
             "vault_id": vault_id,
-            "data": json.dumps(payload),
+            "key": cluster_cache_key(folder_prefix, cache_method or method, target_clusters),
+            "clusters": [_cluster_node_props(c, i) for i, c in enumerate(clusters)],
+            "note_members": note_members,
+            "entity_ids": list(entity_clusters),
+            "entity_clusters": dict(entity_clusters),
+            "edges": [
+                {
+                    "from": e.get("from") or e.get("from_"),
+                    "to": e["to"],
+                    "relation_type": e.get("relation_type", "RELATED_TO"),
+                    "weight": e.get("weight", 1.0)
+                }
+                for e in edges or []
+            ],
             "method": method,
-            "ttl_hours": ttl_hours
+            "folder_prefix": folder_prefix,
+            "target_clusters": target_clusters,
+            "ttl_hours": ttl_hours,
+            "vault_version": vault_version,
+            "max_entries": settings.cluster_cache_max_entries
         }
 
         result = client.query(cypher, params)
+        if result:
+            row = result[0]
+            logger.info(
+                f"Saved {row.get('created')} clusters for vault {vault_id} "
+                f"({row.get('note_links')} note / {row.get('entity_links')} entity memberships)"
+            )
+            if row.get("evicted"):
+                logger.info(f"Evicted {row['evicted']} cluster cache entries for vault {vault_id}")
         return result is not None and len(result) > 0
 
     except Exception as e:
@@ -991,7 +1227,7 @@ def save_cluster_cache(
 
 def invalidate_cluster_cache(client, vault_id: str) -> bool:
     """
-    클러스터 캐시 무효화
+    클러스터 캐시 무효화 (ClusterCache와 Cluster 노드 삭제)
 
     Args:
         client: Neo4j Bolt 클라이언트
@@ -1003,7 +1239,8 @@ def invalidate_cluster_cache(client, vault_id: str) -> bool:
     try:
         cypher = """
         MATCH (v:Vault {id: $vault_id})-[:HAS_CLUSTER_CACHE]->(cache:ClusterCache)
-        DETACH DELETE cache
+        OPTIONAL MATCH (cache)-[:HAS_CLUSTER]->(c:Cluster)
+        DETACH DELETE c, cache
         """
 
         client.query(cypher, {"vault_id": vault_id})
@@ -1014,38 +1251,17 @@ def invalidate_cluster_cache(client, vault_id: str) -> bool:
         return False
 
 
-def is_cluster_cache_stale(client, vault_id: str, computed_at: Optional[str]) -> bool:
+def is_cluster_cache_stale(cached: Dict[str, Any]) -> bool:
     """
-    캐시가 최신 노트 업데이트보다 오래되었는지 판단
-    """
-    if not computed_at:
-        return True
-
-    try:
-        computed_dt = _parse_datetime(computed_at)
-        if not computed_dt:
-            return True
-
-        cypher = """
-        MATCH (v:Vault {id: $vault_id})-[:HAS_NOTE]->(n:Note)
-        WITH max(n.updated_at) AS last_updated
-        RETURN last_updated
-        """
-        result = client.query(cypher, {"vault_id": vault_id})
-        if not result or len(result) == 0 or result[0].get("last_updated") is None:
-            return False
+    캐시가 계산된 이후 Vault가 변경되었는지 판단 (버전 비교, O(1))
 
-        last_updated = result[0]["last_updated"]
-        if isinstance(last_updated, str):
-            last_updated = _parse_datetime(last_updated)
-
-        if isinstance(last_updated, datetime):
-            return last_updated > computed_dt
-
-        return False
-    except Exception as e:
-        logger.error(f"Failed to check cache staleness: {e}")
+    get_cached_clusters가 캐시와 현재 Vault 버전을 같은 쿼리에서 함께 읽어 옵니다.
+    버전 정보가 없는 이전 형식의 캐시나 TTL이 지난 캐시는 오래된 것으로 봅니다.
+    """
+    cached_version = cached.get("vault_version")
+    if cached_version is None or cached.get("expired"):
         return True
+    return cached_version != cached.get("current_version", 0)
 
 
 def generate_llm_summaries(
@@ -1090,7 +1306,7 @@ def generate_llm_summaries(
                 cluster['sample_notes'] = []
 
         # GPT-5 Mini로 일괄 요약 생성
-        clusters_with_summaries = generate_batch_cluster_summaries(clusters)
+        clusters_with_summaries = generate_batch_cluster_summaries(clusters, vault_id=vault_id)
 
         logger.info(f"✅ LLM summaries generated for {len(clusters_with_summaries)} clusters")
         return clusters_with_summaries
@@ -1104,3 +1320,81 @@ def generate_llm_summaries(
             if 'key_insights' not in cluster:
                 cluster['key_insights'] = ["LLM 요약 생성 실패", "나중에 다시 시도하세요."]
         return clusters
+
+
+def normalize_cluster_method(method: str) -> str:
+    """클러스터링 방법 이름 정규화 ("semantic" 또는 "type_based", 알 수 없으면 ValueError)"""
+    method_normalized = (method or "semantic").lower()
+    if method_normalized in ["semantic", "auto"]:
+        return "semantic"
+    if method_normalized in ["type_based", "type"]:
+        return "type_based"
+    raise ValueError(f"Invalid clustering method: {method}")
+
+
+def compute_vault_clusters(
+    client,
+    vault_id: str,
+    method: str = "semantic",
+    target_clusters: int = 10,
+    folder_prefix: Optional[str] = None,
+    include_llm: bool = False
+) -> Dict[str, Any]:
+    """
+    Vault 클러스터 계산 + 캐시 저장
+
+    /graph/vault/clustered의 동기 계산과 백그라운드 재계산이 공유하는 경로입니다.
+    의미론적 클러스터링 결과가 없으면 타입 기반으로 폴백합니다.
+
+    Returns:
+        compute_clusters_* 결과 (LLM 요약 옵션 반영)
+    """
+    method_normalized = normalize_cluster_method(method)
+
+    # 계산 중 들어온 변경은 다음 요청에서 감지되도록 시작 전 버전 기록
+    from app.services.vault_version import vault_versions
+    vault_version = vault_versions.refresh(vault_id, client)
+
+    folder_info = f" in folder '{folder_prefix}'" if folder_prefix else ""
+    logger.info(f"🔄 Computing clusters for vault {vault_id}{folder_info} using method={method_normalized}")
+
+    if method_normalized == "semantic":
+        result = compute_clusters_semantic(
+            client=client,
+            vault_id=vault_id,
+            target_clusters=target_clusters,
+            folder_prefix=folder_prefix
+        )
+    else:
+        result = compute_clusters_louvain(
+            client=client,
+            vault_id=vault_id,
+            target_clusters=target_clusters,
+            folder_prefix=folder_prefix
+        )
+
+    # 의미론적 클러스터링이 실패했거나 결과가 없으면 폴백
+    if method_normalized == "semantic" and not result.get("clusters"):
+        logger.info("Semantic clustering returned no clusters. Falling back to type-based.")
+        result = compute_clusters_louvain(
+            client=client,
+            vault_id=vault_id,
+            target_clusters=target_clusters,
+            folder_prefix=folder_prefix
+        )
+        result["method"] = "semantic_fallback"
+
+    # LLM 요약 생성 (옵션)
+    if include_llm and result["clusters"]:
+        logger.info("🤖 Generating LLM summaries with GPT-5 Mini...")
+        result["clusters"] = generate_llm_summaries(client, vault_id, result["clusters"])
+
+    # 캐시 저장 (폴더/방법/목표 클러스터 수별)
+    save_cluster_cache(
+        client, vault_id, result["clusters"], result["method"],
+        edges=result.get("edges", []), vault_version=vault_version,
+        folder_prefix=folder_prefix, cache_method=method_normalized, target_clusters=target_clusters,
+        cluster_members=result.pop("cluster_members", None)
+    )
+
+    return result
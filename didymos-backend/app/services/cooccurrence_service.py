@@ -0,0 +1,238 @@
+"""
+엔티티 동시 출현(co-occurrence) 인덱스
+
+중심성/브릿지 개념/Louvain 관계 계산은 매 요청마다
+(note)-[:MENTIONS]->(e1), (note)-[:MENTIONS]->(e2) 셀프 조인으로 동시 출현을 세었습니다
+(노트당 엔티티 수의 제곱). 이 모듈은 Vault별로
+    (e1)-[:CO_OCCURS {vault_id, pair, weight, last_seen}]->(e2)
+관계를 미리 만들어 두고, 노트의 MENTIONS가 바뀔 때마다 증분 갱신합니다.
+
+- weight: 두 엔티티를 함께 언급하는 Vault 내 노트 수
+- pair: 두 엔티티 키를 정렬해 이은 문자열 (방향은 키 오름차순, 조회는 방향 없이)
+- 엔티티 키는 uuid(Graphiti) 또는 "라벨:id"(온톨로지 노드)입니다. elementId는
+  트랜잭션 밖에서 보장되지 않고 삭제된 노드의 값이 재사용되므로 저장하지 않습니다.
+- 노트마다 마지막으로 반영한 엔티티 키 목록(Note.cooccur_keys)을 저장해,
+  갱신 시 추가/삭제된 엔티티가 만드는 쌍만 더하거나 뺍니다.
+
+기존 Vault는 rebuild_vault_cooccurrence로 한 번 채워야 하며, 완료 전에는
+(Vault.cooccurrence_schema가 현재 버전이 아니면) 읽는 쪽이 기존 셀프 조인으로 계산합니다.
+"""
+import logging
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# rebuild 시 한 트랜잭션에서 처리할 노트 수
+REBUILD_BATCH_SIZE = 200
+
+# 저장 형식 버전 (elementId 기반이던 이전 인덱스는 rebuild 전까지 사용하지 않음)
+COOCCURRENCE_SCHEMA = 2
+
+# 다른 갱신과 겹쳐 반영되지 않은 노트를 다시 시도하는 횟수
+MAX_UPDATE_ATTEMPTS = 3
+
+PAIR_SEPARATOR = "|"
+
+# 노트의 현재 MENTIONS 엔티티 키와 마지막으로 반영한 키
+COOCCURRENCE_STATE_QUERY = """
+UNWIND $note_ids AS note_id
+MATCH (v:Vault)-[:HAS_NOTE]->(n:Note {note_id: note_id})
+OPTIONAL MATCH (n)-[:MENTIONS]->(e)
+WITH v, n, collect(DISTINCT coalesce(e.uuid, head(labels(e)) + ':' + e.id)) AS current
+RETURN n.note_id AS note_id, v.id AS vault_id,
+       coalesce(n.cooccur_keys, []) AS previous, current
+"""
+
+# 읽은 뒤 노트의 MENTIONS나 반영 상태가 바뀌었으면 건너뛰고(applied에서 빠짐) 다시 읽습니다
+COOCCURRENCE_APPLY_QUERY = """
+UNWIND $notes AS note
+MATCH (n:Note {note_id: note.note_id})
+OPTIONAL MATCH (n)-[:MENTIONS]->(e)
+WITH note, n, collect(DISTINCT {key: coalesce(e.uuid, head(labels(e)) + ':' + e.id), node: e}) AS mentioned
+WITH note, n, [m IN mentioned WHERE m.key IS NOT NULL] AS mentioned
+WHERE coalesce(n.cooccur_keys, []) = note.previous
+  AND (note.clear OR size(mentioned) = size(note.current))
+  AND all(k IN note.current WHERE any(m IN mentioned WHERE m.key = k))
+SET n.cooccur_keys = note.current
+WITH note, mentioned
+CALL {
+    WITH note, mentioned
+    UNWIND note.added AS pair
+    WITH note, pair,
+         [m IN mentioned WHERE m.key = pair.x][0].node AS ex,
+         [m IN mentioned WHERE m.key = pair.y][0].node AS ey
+    MERGE (ex)-[c:CO_OCCURS {vault_id: note.vault_id, pair: pair.key}]->(ey)
+    ON CREATE SET c.weight = 1
+    ON MATCH SET c.weight = c.weight + 1
+    SET c.last_seen = datetime()
+    RETURN count(c) AS pairs_added
+}
+CALL {
+    WITH note
+    UNWIND note.removed AS pair
+    MATCH ()-[c:CO_OCCURS {vault_id: note.vault_id, pair: pair.key}]->()
+    SET c.weight = c.weight - 1
+    WITH c WHERE c.weight <= 0
+    DELETE c
+    RETURN count(*) AS pairs_deleted
+}
+RETURN collect(note.note_id) AS applied, sum(pairs_added) AS pairs_added, sum(pairs_deleted) AS pairs_deleted
+"""
+
+# 준비 완료가 확인된 Vault (한 번 준비되면 증분 갱신으로 유지되므로 다시 조회하지 않음)
+_ready_vaults: Set[str] = set()
+
+
+def _pairs(keys: List[str], others: Iterable[str]) -> List[Tuple[str, str]]:
+    """keys 안의 쌍과 keys × others 쌍 (키 오름차순)"""
+    pairs = []
+    for i, a in enumerate(keys):
+        for b in list(keys[i + 1:]) + list(others):
+            pairs.append((a, b) if a < b else (b, a))
+    return pairs
+
+
+def cooccurrence_delta(previous: List[str], current: List[str]) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+    """
+    이전/현재 엔티티 키 집합에서 weight를 더하고 뺄 엔티티 쌍 계산
+
+    Returns:
+        (added_pairs, removed_pairs) - 각 쌍은 (작은 키, 큰 키)
+    """
+    previous_set, current_set = set(previous), set(current)
+    kept = sorted(previous_set & current_set)
+    added = _pairs(sorted(current_set - previous_set), kept)
+    removed = _pairs(sorted(previous_set - current_set), kept)
+    return added, removed
+
+
+def _pair_params(pairs: List[Tuple[str, str]]) -> List[Dict[str, str]]:
+    return [{"x": x, "y": y, "key": f"{x}{PAIR_SEPARATOR}{y}"} for x, y in pairs]
+
+
+def update_note_cooccurrence(client, note_ids: List[str], clear: bool = False) -> Dict[str, int]:
+    """
+    노트들의 현재 MENTIONS를 CO_OCCURS에 반영 (이전 반영분과의 차이만)
+
+    Args:
+        client: Neo4j 클라이언트
+        note_ids: MENTIONS가 바뀐 노트 ID 리스트
+        clear: True면 노트의 기여분을 모두 제거 (노트 삭제 전 호출)
+
+    Returns:
+        {"notes", "pairs_added", "pairs_deleted"}
+    """
+    totals = {"notes": 0, "pairs_added": 0, "pairs_deleted": 0}
+    pending = list(note_ids)
+    for _ in range(MAX_UPDATE_ATTEMPTS):
+        if not pending:
+            break
+        rows = client.query(COOCCURRENCE_STATE_QUERY, {"note_ids": pending}) or []
+        notes = []
+        for row in rows:
+            previous = list(row["previous"])
+            current = [] if clear else sorted(set(row["current"]))
+            added, removed = cooccurrence_delta(previous, current)
+            notes.append({
+                "note_id": row["note_id"],
+                "vault_id": row["vault_id"],
+                "previous": previous,
+                "current": current,
+                "clear": clear,
+                "added": _pair_params(added),
+                "removed": _pair_params(removed),
+            })
+        if not notes:
+            break
+
+        result = client.query(COOCCURRENCE_APPLY_QUERY, {"notes": notes})
+        row = result[0] if result else {}
+        applied = set(row.get("applied") or [])
+        totals["notes"] += len(applied)
+        totals["pairs_added"] += row.get("pairs_added") or 0
+        totals["pairs_deleted"] += row.get("pairs_deleted") or 0
+        pending = [note["note_id"] for note in notes if note["note_id"] not in applied]
+
+    if pending:
+        logger.warning(f"Co-occurrence not applied for {len(pending)} notes changed concurrently")
+    return totals
+
+
+def update_cooccurrence_safely(client, note_ids: List[str], clear: bool = False):
+    """update_note_cooccurrence (실패해도 호출한 작업은 계속 진행)"""
+    try:
+        update_note_cooccurrence(client, note_ids, clear=clear)
+    except Exception as e:
+        logger.warning(f"Failed to update co-occurrence for {len(note_ids)} notes: {e}")
+
+
+def rebuild_vault_cooccurrence(client, vault_id: str, batch_size: int = REBUILD_BATCH_SIZE) -> Dict[str, Any]:
+    """
+    Vault의 CO_OCCURS를 지우고 전체 노트에서 다시 채움
+
+    재구성 중에는 읽는 쪽이 셀프 조인을 사용하고, 완료되면 Vault.cooccurrence_schema를
+    설정해 인덱스를 사용하게 합니다. 이전 형식(elementId 목록)의 상태도 여기서 정리됩니다.
+    """
+    _ready_vaults.discard(vault_id)
+    client.query(
+        "MATCH (v:Vault {id: $vault_id}) REMOVE v.cooccurrence_schema, v.cooccurrence_ready",
+        {"vault_id": vault_id}
+    )
+    client.query(
+        """
+        MATCH ()-[c:CO_OCCURS {vault_id: $vault_id}]->()
+        CALL { WITH c DELETE c } IN TRANSACTIONS OF 10000 ROWS
+        """,
+        {"vault_id": vault_id}
+    )
+    rows = client.query(
+        """
+        MATCH (:Vault {id: $vault_id})-[:HAS_NOTE]->(n:Note)
+        REMOVE n.cooccur_keys, n.cooccur_entities
+        RETURN n.note_id AS note_id
+        """,
+        {"vault_id": vault_id}
+    )
+    note_ids = [r["note_id"] for r in rows or []]
+
+    totals = {"notes": 0, "pairs_added": 0, "pairs_deleted": 0}
+    for start in range(0, len(note_ids), batch_size):
+        stats = update_note_cooccurrence(client, note_ids[start:start + batch_size])
+        for key in totals:
+            totals[key] += stats[key]
+
+    client.query(
+        "MATCH (v:Vault {id: $vault_id}) SET v.cooccurrence_schema = $schema",
+        {"vault_id": vault_id, "schema": COOCCURRENCE_SCHEMA}
+    )
+    _ready_vaults.add(vault_id)
+    logger.info(f"✅ Co-occurrence index rebuilt for vault {vault_id}: {totals}")
+    return {"vault_id": vault_id, **totals}
+
+
+READY_QUERY = """
+MATCH (v:Vault {id: $vault_id})
+RETURN coalesce(v.cooccurrence_schema, 0) = $schema AS ready
+"""
+
+
+def is_cooccurrence_ready(client, vault_id: str) -> bool:
+    """Vault의 CO_OCCURS 인덱스가 현재 형식으로 백필되었는지 여부"""
+    if vault_id in _ready_vaults:
+        return True
+    result = client.query(READY_QUERY, {"vault_id": vault_id, "schema": COOCCURRENCE_SCHEMA})
+    if result and result[0]["ready"]:
+        _ready_vaults.add(vault_id)
+        return True
+    return False
+
+
+async def is_cooccurrence_ready_async(client, vault_id: str) -> bool:
+    """is_cooccurrence_ready (AsyncNeo4jBoltClient용)"""
+    if vault_id in _ready_vaults:
+        return True
+    result = await client.query(READY_QUERY, {"vault_id": vault_id, "schema": COOCCURRENCE_SCHEMA})
+    if result and result[0]["ready"]:
+        _ready_vaults.add(vault_id)
+        return True
+    return False
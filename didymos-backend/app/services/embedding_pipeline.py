@@ -0,0 +1,278 @@
+"""
+노트 임베딩 배치 파이프라인
+
+store_note_embedding은 노트마다 embed_query 1회 + DB 쓰기 1회를 수행합니다.
+이 모듈은 대기 중인 노트를 개수/시간 창 기준으로 모아
+- tiktoken으로 토큰 수를 계산해 요청당 토큰 한도를 넘지 않도록 배치를 나누고
+- embed_documents 한 번으로 배치를 임베딩한 뒤
+- UNWIND 한 번으로 벡터를 기록합니다.
+
+임베딩 제공자는 교체 가능하며(EMBEDDING_PROVIDER=openai | local),
+local 제공자는 네트워크 없이 결정적 벡터를 생성해 오프라인 벤치마크에 사용합니다.
+"""
+import asyncio
+import hashlib
+import logging
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.db.neo4j import get_neo4j_client
+
+logger = logging.getLogger(__name__)
+
+# tiktoken은 선택적 의존성 (없으면 문자 수 기반 추정)
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # ImportError 또는 인코딩 파일 다운로드 실패
+    _ENCODING = None
+
+EMBEDDING_DIMENSIONS = 1536  # text-embedding-3-small / note_embeddings 인덱스
+MAX_INPUT_TOKENS = 8191  # OpenAI 임베딩 입력 1건당 최대 토큰
+MAX_BATCH_INPUTS = 2048  # OpenAI 임베딩 요청 1건당 최대 입력 수
+
+
+def count_tokens(text: str) -> int:
+    """텍스트 토큰 수 (tiktoken이 없으면 대략 3자당 1토큰)"""
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return max(1, len(text) // 3)
+
+
+def truncate_to_tokens(text: str, max_tokens: int = MAX_INPUT_TOKENS) -> Tuple[str, int]:
+    """입력 1건 토큰 한도에 맞게 자르고 (텍스트, 토큰 수) 반환"""
+    if _ENCODING is not None:
+        tokens = _ENCODING.encode(text, disallowed_special=())
+        if len(tokens) > max_tokens:
+            return _ENCODING.decode(tokens[:max_tokens]), max_tokens
+        return text, len(tokens)
+    estimated = count_tokens(text)
+    if estimated > max_tokens:
+        return text[:max_tokens * 3], max_tokens
+    return text, estimated
+
+
+def plan_token_batches(
+    token_counts: List[int],
+    max_batch_tokens: int,
+    max_batch_inputs: int = MAX_BATCH_INPUTS
+) -> List[List[int]]:
+    """
+    입력 인덱스를 요청 단위 배치로 분할 (순서 유지, 그리디)
+
+    Returns:
+        [[index, ...], ...]
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+    for index, tokens in enumerate(token_counts):
+        if current and (current_tokens + tokens > max_batch_tokens or len(current) >= max_batch_inputs):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(index)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+class OpenAIEmbeddingProvider:
+    """vector_service의 OpenAIEmbeddings(text-embedding-3-small) 사용"""
+
+    name = "openai"
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        from app.services.vector_service import embeddings
+        return embeddings.embed_documents(texts)
+
+
+class LocalHashEmbeddingProvider:
+    """
+    네트워크 없이 동작하는 결정적 임베딩 (해싱 트릭 + L2 정규화)
+
+    의미적 품질은 없으므로 벤치마크/개발 환경 전용입니다.
+    """
+
+    name = "local"
+
+    def __init__(self, dimensions: int = EMBEDDING_DIMENSIONS):
+        self.dimensions = dimensions
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        for token in text.lower().split():
+            digest = hashlib.md5(token.encode("utf-8")).digest()
+            index = int.from_bytes(digest[:4], "little") % self.dimensions
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+
+def get_embedding_provider(name: Optional[str] = None):
+    """설정된 임베딩 제공자 반환"""
+    name = (name or settings.embedding_provider).lower()
+    if name == "local":
+        return LocalHashEmbeddingProvider()
+    return OpenAIEmbeddingProvider()
+
+
+def write_embeddings(client, rows: List[Dict[str, Any]]) -> int:
+    """
+    노트 임베딩을 UNWIND 한 번으로 기록
+
+    Args:
+        client: Neo4j 클라이언트 (Bolt)
+        rows: [{"note_id": ..., "embedding": [...]}, ...]
+
+    Returns:
+        기록된 노트 수
+    """
+    if not rows:
+        return 0
+    cypher = """
+    UNWIND $rows AS row
+    MATCH (n:Note {note_id: row.note_id})
+    SET n.embedding = row.embedding
+    SET n.embedding_updated_at = datetime()
+    RETURN count(n) AS count
+    """
+    result = client.query(cypher, {"rows": rows})
+    return result[0]["count"] if result else 0
+
+
+class EmbeddingBatcher:
+    """
+    임베딩 요청을 모아 배치로 처리하는 비동기 큐
+
+    submit()은 노트가 속한 배치가 기록될 때까지 기다린 뒤 성공 여부를 반환합니다.
+    max_batch_notes개가 모이거나 window_seconds가 지나면 flush합니다.
+    같은 note_id가 대기 중이면 최신 내용으로 교체합니다.
+    """
+
+    def __init__(
+        self,
+        provider=None,
+        client=None,
+        max_batch_notes: int = 64,
+        max_batch_tokens: int = 100_000,
+        window_seconds: float = 2.0,
+    ):
+        self._provider = provider
+        self._client = client
+        self.max_batch_notes = max_batch_notes
+        self.max_batch_tokens = max_batch_tokens
+        self.window_seconds = window_seconds
+
+        self._pending: Dict[str, Tuple[str, List[asyncio.Future]]] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.stats = {"notes": 0, "api_calls": 0, "db_writes": 0, "errors": 0}
+
+    @property
+    def provider(self):
+        if self._provider is None:
+            self._provider = get_embedding_provider()
+        return self._provider
+
+    @property
+    def client(self):
+        return self._client or get_neo4j_client()
+
+    async def submit(self, note_id: str, content: str) -> bool:
+        """노트 임베딩 요청 (배치 기록 완료까지 대기)"""
+        if not content or len(content.strip()) < 10:
+            logger.info(f"Content too short for embedding: {note_id}")
+            return False
+
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        _, waiters = self._pending.get(note_id, ("", []))
+        self._pending[note_id] = (content, waiters + [future])
+
+        if len(self._pending) >= self.max_batch_notes:
+            self._wakeup.set()
+        return await future
+
+    async def flush(self):
+        """대기 중인 모든 요청을 즉시 처리"""
+        while self._pending:
+            pending, self._pending = self._pending, {}
+            await self._process(pending)
+
+    async def close(self):
+        """워커 종료 (처리 중인 배치와 남은 요청을 기록한 뒤 종료)"""
+        worker = self._worker
+        if worker is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await worker
+            self._worker = None
+        await self.flush()
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._stopping = False
+            self._wakeup = asyncio.Event()
+            self._worker = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.window_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if not self._pending:
+                continue
+            pending, self._pending = self._pending, {}
+            try:
+                await self._process(pending)
+            except Exception as e:
+                logger.error(f"Embedding batch worker error: {e}", exc_info=True)
+
+    async def _process(self, pending: Dict[str, Tuple[str, List[asyncio.Future]]]):
+        note_ids = list(pending.keys())
+        texts: List[str] = []
+        token_counts: List[int] = []
+        for note_id in note_ids:
+            text, tokens = truncate_to_tokens(pending[note_id][0])
+            texts.append(text)
+            token_counts.append(tokens)
+
+        results: Dict[str, bool] = {}
+        try:
+            for batch in plan_token_batches(token_counts, self.max_batch_tokens):
+                batch_ids = [note_ids[i] for i in batch]
+                try:
+                    vectors = await asyncio.to_thread(self.provider.embed_documents, [texts[i] for i in batch])
+                    self.stats["api_calls"] += 1
+                    rows = [{"note_id": nid, "embedding": vec} for nid, vec in zip(batch_ids, vectors)]
+                    await asyncio.to_thread(write_embeddings, self.client, rows)
+                    self.stats["db_writes"] += 1
+                    self.stats["notes"] += len(rows)
+                    logger.info(f"✅ Embeddings stored for {len(rows)} notes ({sum(token_counts[i] for i in batch)} tokens)")
+                    results.update({nid: True for nid in batch_ids})
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    logger.error(f"Error storing embedding batch ({len(batch_ids)} notes): {e}")
+                    results.update({nid: False for nid in batch_ids})
+        finally:
+            # 취소되더라도 대기 중인 submit()이 멈추지 않도록 항상 결과를 전달
+            for note_id, (_, waiters) in pending.items():
+                for future in waiters:
+                    if not future.done():
+                        future.set_result(results.get(note_id, False))
+
+
+# Global instance
+embedding_batcher = EmbeddingBatcher(
+    max_batch_notes=settings.embedding_batch_max_notes,
+    max_batch_tokens=settings.embedding_batch_max_tokens,
+    window_seconds=settings.embedding_batch_window_seconds,
+)
@@ -1,10 +1,16 @@
 """
 Neo4j 그래프 서비스
 Bolt 클라이언트를 사용한 그래프 데이터 관리
+
+조회 함수(get_note, get_all_notes, get_notes_page, count_vault_notes)는 AsyncNeo4jBoltClient를 받는 코루틴입니다.
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+import base64
+import json
 import logging
 
+from app.services.vault_version import vault_versions
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,6 +32,35 @@ def upsert_note(
     Returns:
         성공 여부
     """
+    saved = upsert_notes(client, user_id, vault_id, [note_data])
+    if saved:
+        logger.info(f"✅ Note saved: {saved[0]['note_id']}")
+        return True
+    return False
+
+
+def upsert_notes(
+    client,
+    user_id: str,
+    vault_id: str,
+    notes: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """
+    여러 노트를 UNWIND 한 번(단일 트랜잭션)으로 저장
+
+    Args:
+        client: Neo4j 클라이언트 (Bolt)
+        user_id: 사용자 ID
+        vault_id: Vault ID
+        notes: 노트 데이터 리스트 (upsert_note의 note_data와 동일한 형식)
+
+    Returns:
+        저장된 노트 리스트 (실패 시 빈 리스트)
+        [{"note_id", "content_hash", "section_hashes", "vault_version"}] - 해시는 마지막 AI 처리 시점 값
+    """
+    if not notes:
+        return []
+
     try:
         cypher = """
         MERGE (u:User {id: $user_id})
@@ -34,53 +69,108 @@ def upsert_note(
         MERGE (v:Vault {id: $vault_id})
           ON CREATE SET v.created_at = datetime()
         MERGE (u)-[:OWNS]->(v)
+        SET v.version = coalesce(v.version, 0) + 1,
+            // 노트 수 카운터 (카운터 도입 전 Vault는 첫 저장 때 한 번 계산)
+            v.note_count = CASE WHEN v.note_count IS NULL
+                                THEN COUNT { (v)-[:HAS_NOTE]->(:Note) }
+                                ELSE v.note_count END
 
-        MERGE (n:Note {note_id: $note_id})
+        WITH v
+        UNWIND $notes AS note
+        MERGE (n:Note {note_id: note.note_id})
           ON CREATE SET
-            n.title = $title,
-            n.path = $path,
-            n.created_at = $created_at,
-            n.updated_at = $updated_at,
-            n.tags = $tags
+            n.title = note.title,
+            n.path = note.path,
+            n.created_at = note.created_at,
+            n.updated_at = note.updated_at,
+            n.tags = note.tags
           ON MATCH SET
-            n.title = $title,
-            n.path = $path,
-            n.updated_at = $updated_at,
-            n.tags = $tags
+            n.title = note.title,
+            n.path = note.path,
+            n.updated_at = note.updated_at,
+            n.tags = note.tags
 
         MERGE (v)-[:HAS_NOTE]->(n)
-        RETURN n.note_id AS note_id
+          ON CREATE SET v.note_count = v.note_count + 1
+        RETURN n.note_id AS note_id,
+               n.content_hash AS content_hash,
+               n.section_hashes AS section_hashes,
+               v.version AS vault_version
         """
 
         params = {
             "user_id": user_id,
             "vault_id": vault_id,
-            "note_id": note_data["note_id"],
-            "title": note_data["title"],
-            "path": note_data["path"],
-            "tags": note_data.get("tags", []),
-            "created_at": note_data["created_at"],
-            "updated_at": note_data["updated_at"],
+            "notes": [
+                {
+                    "note_id": note_data["note_id"],
+                    "title": note_data["title"],
+                    "path": note_data["path"],
+                    "tags": note_data.get("tags", []),
+                    "created_at": note_data["created_at"],
+                    "updated_at": note_data["updated_at"],
+                }
+                for note_data in notes
+            ],
         }
 
         result = client.query(cypher, params)
+        if result:
+            # Vault 버전은 같은 트랜잭션에서 1 증가 → 캐시 무효화 전파
+            vault_versions.changed(vault_id, result[0]["vault_version"], [row["note_id"] for row in result])
+        return result or []
 
-        if result and len(result) > 0:
-            logger.info(f"✅ Note saved: {result[0].get('note_id')}")
-            return True
-        return False
+    except Exception as e:
+        logger.error(f"Error saving notes: {e}")
+        return []
+
+
+def mark_note_processed(
+    client,
+    note_id: str,
+    content_hash: str,
+    section_hashes: List[str],
+) -> bool:
+    """
+    AI 처리(엔티티 추출 + 임베딩)가 끝난 콘텐츠의 해시를 기록
+
+    다음 동기화에서 해시가 같으면 AI 처리를 건너뜁니다.
+
+    Args:
+        client: Neo4j 클라이언트 (Bolt)
+        note_id: 노트 ID
+        content_hash: 정규화된 본문 해시
+        section_hashes: 섹션별 해시
+
+    Returns:
+        성공 여부
+    """
+    try:
+        cypher = """
+        MATCH (n:Note {note_id: $note_id})
+        SET n.content_hash = $content_hash,
+            n.section_hashes = $section_hashes,
+            n.processed_at = datetime()
+        RETURN n.note_id AS note_id
+        """
+        result = client.query(cypher, {
+            "note_id": note_id,
+            "content_hash": content_hash,
+            "section_hashes": section_hashes,
+        })
+        return bool(result)
 
     except Exception as e:
-        logger.error(f"Error saving note: {e}")
+        logger.error(f"Error marking note processed: {e}")
         return False
 
 
-def get_note(client, note_id: str) -> Optional[Dict[str, Any]]:
+async def get_note(client, note_id: str) -> Optional[Dict[str, Any]]:
     """
     노트 ID로 노트 조회
 
     Args:
-        client: Neo4j 클라이언트 (Bolt)
+        client: Neo4j 비동기 클라이언트 (AsyncNeo4jBoltClient)
         note_id: 노트 ID
 
     Returns:
@@ -97,7 +187,7 @@ def get_note(client, note_id: str) -> Optional[Dict[str, Any]]:
                toString(n.updated_at) AS updated_at
         """
 
-        result = client.query(cypher, {"note_id": note_id})
+        result = await client.query(cypher, {"note_id": note_id})
 
         if result and len(result) > 0:
             return result[0]
@@ -108,12 +198,12 @@ def get_note(client, note_id: str) -> Optional[Dict[str, Any]]:
         return None
 
 
-def get_all_notes(client, user_id: str, vault_id: str) -> list:
+async def get_all_notes(client, user_id: str, vault_id: str) -> list:
     """
     특정 Vault의 모든 노트 조회
 
     Args:
-        client: Neo4j 클라이언트 (Bolt)
+        client: Neo4j 비동기 클라이언트 (AsyncNeo4jBoltClient)
         user_id: 사용자 ID
         vault_id: Vault ID
 
@@ -132,9 +222,137 @@ def get_all_notes(client, user_id: str, vault_id: str) -> list:
         ORDER BY n.updated_at DESC
         """
 
-        result = client.query(cypher, {"user_id": user_id, "vault_id": vault_id})
+        result = await client.query(cypher, {"user_id": user_id, "vault_id": vault_id})
         return result if result else []
 
     except Exception as e:
         logger.error(f"Error fetching notes: {e}")
         return []
+
+
+# 노트 목록 응답에 선택 가능한 필드 → Cypher 식
+NOTE_LIST_FIELDS = {
+    "note_id": "n.note_id",
+    "title": "n.title",
+    "path": "n.path",
+    "tags": "n.tags",
+    "created_at": "toString(n.created_at)",
+    "updated_at": "toString(n.updated_at)",
+}
+
+
+def encode_note_cursor(updated_at: str, note_id: str) -> str:
+    """목록의 마지막 노트 (updated_at, note_id)를 불투명한 커서 문자열로 인코딩"""
+    raw = json.dumps([updated_at, note_id], ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_note_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    encode_note_cursor의 역변환
+
+    Raises:
+        ValueError: 형식이 잘못된 커서
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        updated_at, note_id = json.loads(raw.decode("utf-8"))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(updated_at, str) or not isinstance(note_id, str):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return updated_at, note_id
+
+
+async def get_notes_page(
+    client,
+    user_id: str,
+    vault_id: str,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+    fields: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Vault 노트 목록 한 페이지 조회 (updated_at DESC, note_id DESC 키셋 페이지네이션)
+
+    정렬/필터/LIMIT을 Cypher에서 처리해 페이지 크기만큼만 전송합니다.
+    updated_at이 없는 노트는 마지막에 옵니다.
+
+    Args:
+        client: Neo4j 비동기 클라이언트 (AsyncNeo4jBoltClient)
+        user_id: 사용자 ID
+        vault_id: Vault ID
+        limit: 페이지 크기
+        cursor: 이전 페이지의 next_cursor (이 노트 다음부터 조회)
+        offset: 건너뛸 노트 수 (커서 이후 기준, 기존 offset 방식 호환용)
+        fields: 반환할 필드 (NOTE_LIST_FIELDS 중, None이면 전체)
+
+    Returns:
+        {"notes": [...], "next_cursor": 다음 페이지 커서 또는 None}
+
+    Raises:
+        ValueError: 잘못된 커서 또는 필드
+    """
+    fields = list(NOTE_LIST_FIELDS) if fields is None else fields
+    unknown = [f for f in fields if f not in NOTE_LIST_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    after_updated, after_note_id = decode_note_cursor(cursor) if cursor else (None, None)
+
+    projection = ",\n               ".join(f"{NOTE_LIST_FIELDS[f]} AS {f}" for f in fields)
+    cypher = f"""
+    MATCH (u:User {{id: $user_id}})-[:OWNS]->(v:Vault {{id: $vault_id}})-[:HAS_NOTE]->(n:Note)
+    WITH n, coalesce(toString(n.updated_at), '') AS sort_updated
+    WHERE $after_updated IS NULL
+       OR sort_updated < $after_updated
+       OR (sort_updated = $after_updated AND n.note_id < $after_note_id)
+    RETURN {projection},
+           sort_updated AS _sort_updated,
+           n.note_id AS _sort_note_id
+    ORDER BY sort_updated DESC, n.note_id DESC
+    SKIP $offset
+    LIMIT $limit
+    """
+
+    # 한 개 더 가져와 다음 페이지 존재 여부 확인
+    rows = await client.query(cypher, {
+        "user_id": user_id,
+        "vault_id": vault_id,
+        "after_updated": after_updated,
+        "after_note_id": after_note_id,
+        "offset": offset,
+        "limit": limit + 1,
+    }) or []
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_note_cursor(rows[-1]["_sort_updated"], rows[-1]["_sort_note_id"])
+
+    notes = [{f: row.get(f) for f in fields} for row in rows]
+    return {"notes": notes, "next_cursor": next_cursor}
+
+
+async def count_vault_notes(client, user_id: str, vault_id: str) -> int:
+    """
+    Vault 노트 수 (upsert_notes/delete_note가 관리하는 Vault.note_count 카운터)
+
+    카운터 도입 전 Vault는 다음 저장 때 카운터가 생기므로 그 전까지만 직접 셉니다.
+
+    Args:
+        client: Neo4j 비동기 클라이언트 (AsyncNeo4jBoltClient)
+        user_id: 사용자 ID
+        vault_id: Vault ID
+
+    Returns:
+        노트 수 (Vault가 없으면 0)
+    """
+    cypher = """
+    MATCH (u:User {id: $user_id})-[:OWNS]->(v:Vault {id: $vault_id})
+    RETURN CASE WHEN v.note_count IS NULL
+                THEN COUNT { (v)-[:HAS_NOTE]->(:Note) }
+                ELSE v.note_count END AS note_count
+    """
+    result = await client.query(cypher, {"user_id": user_id, "vault_id": vault_id})
+    return int(result[0]["note_count"] or 0) if result else 0
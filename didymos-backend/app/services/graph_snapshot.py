@@ -0,0 +1,362 @@
+"""
+Vault 그래프 스냅샷 (패턴/약점/추천 분석의 공용 데이터 소스)
+
+analyze_vault_patterns, find_isolated_topics, find_weak_clusters, detect_knowledge_gaps,
+find_missing_connections는 같은 Vault 그래프의 겹치는 부분을 각자 다른 Cypher로 다시 읽었습니다
+(/patterns/weaknesses 하나가 Vault 전체 쿼리 5개 이상).
+
+이 모듈은 Vault당 한 번 두 개의 쿼리로 그래프를 읽어 정수 인덱스 기반 스냅샷을 만듭니다.
+- 노트/엔티티 속성: 인덱스로 접근하는 배열 (note_ids[i], note_titles[i], entity_names[e], ...)
+- 노트 → 노트 링크: CSR (indptr/indices) + 관계 타입 코드 배열 (타입이 다른 중복 링크 유지)
+- MENTIONS: 엔티티 × 노트 CSR 희소 행렬 (mentions는 노트 × 엔티티 전치)
+
+스냅샷은 생성 시점의 Vault 버전을 기록하고, (user_id, vault_id)별 LRU 캐시에 보관됩니다.
+Vault 버전이 바뀌면 다음 조회 때 다시 만들어지며, 같은 Vault를 동시에 요청하면 한 번만 만듭니다.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from app.config import settings
+from app.services.vault_version import vault_versions
+
+logger = logging.getLogger(__name__)
+
+# 엔티티 레이블 비트마스크
+LABEL_BITS = {"Topic": 1, "Project": 2, "Task": 4, "Person": 8, "Entity": 16}
+
+SnapshotKey = Tuple[str, str]  # (user_id, vault_id)
+
+_NOTES_QUERY = """
+MATCH (u:User {id: $user_id})-[:OWNS]->(v:Vault {id: $vault_id})-[:HAS_NOTE]->(n:Note)
+OPTIONAL MATCH (n)-[r]->(related:Note)
+RETURN n.note_id AS note_id,
+       n.title AS title,
+       n.path AS path,
+       n.updated_at AS updated_at,
+       collect({to: related.note_id, type: type(r)}) AS links
+"""
+
+_MENTIONS_QUERY = """
+MATCH (u:User {id: $user_id})-[:OWNS]->(v:Vault {id: $vault_id})-[:HAS_NOTE]->(n:Note)-[:MENTIONS]->(e)
+RETURN elementId(e) AS element_id,
+       coalesce(e.name, e.id) AS name,
+       labels(e) AS labels,
+       collect(DISTINCT n.note_id) AS note_ids
+"""
+
+
+def _csr_arrays(rows: np.ndarray, cols: np.ndarray, n_rows: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(rows, cols)를 행 우선으로 정렬한 CSR indptr/indices와 정렬 순서 (중복 유지)"""
+    order = np.lexsort((cols, rows))
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+    return indptr, cols[order], order
+
+
+class VaultGraphSnapshot:
+    """Vault 그래프의 읽기 전용 정수 인덱스 스냅샷"""
+
+    def __init__(
+        self,
+        vault_id: str,
+        version: int,
+        note_ids: List[str],
+        note_titles: List[Optional[str]],
+        note_paths: List[Optional[str]],
+        note_updated_at: List[Optional[str]],
+        link_rows: np.ndarray,
+        link_cols: np.ndarray,
+        link_types: np.ndarray,
+        rel_types: List[str],
+        entity_keys: List[str],
+        entity_names: List[Optional[str]],
+        entity_labels: np.ndarray,
+        mention_entities: np.ndarray,
+        mention_notes: np.ndarray,
+    ):
+        self.vault_id = vault_id
+        self.version = version
+        self.built_at = time.time()
+
+        # 노트 속성 (인덱스 = 노트 번호)
+        self.note_ids = note_ids
+        self.note_titles = note_titles
+        self.note_paths = note_paths
+        self.note_updated_at = note_updated_at
+        self.note_index: Dict[str, int] = {note_id: i for i, note_id in enumerate(note_ids)}
+
+        # 노트 → 노트 링크 CSR (link_types[k] = rel_types 코드)
+        n = len(note_ids)
+        self.rel_types = rel_types
+        self.link_indptr, self.link_indices, order = _csr_arrays(link_rows, link_cols, n)
+        self.link_types = link_types[order]
+        self._link_sources = np.repeat(np.arange(n, dtype=np.int64), np.diff(self.link_indptr))
+
+        # 엔티티 속성 (인덱스 = 엔티티 번호)
+        self.entity_keys = entity_keys
+        self.entity_names = entity_names
+        self.entity_labels = entity_labels
+
+        # MENTIONS: 엔티티 × 노트 / 노트 × 엔티티
+        ones = np.ones(len(mention_entities), dtype=np.int32)
+        self.entity_notes = sparse.csr_matrix(
+            (ones, (mention_entities, mention_notes)), shape=(len(entity_keys), n)
+        )
+        self.entity_notes.sum_duplicates()
+        self.entity_notes.data[:] = 1
+        self.mentions = self.entity_notes.T.tocsr()
+
+        self._matrices: Dict[Tuple[Any, bool], sparse.csr_matrix] = {}
+
+    # ------------------------------------------------------------------ sizes
+
+    @property
+    def note_count(self) -> int:
+        return len(self.note_ids)
+
+    @property
+    def entity_count(self) -> int:
+        return len(self.entity_keys)
+
+    @property
+    def link_count(self) -> int:
+        return len(self.link_indices)
+
+    # ------------------------------------------------------------------ links
+
+    def _type_mask(self, types: Optional[Iterable[str]]) -> Optional[np.ndarray]:
+        if types is None:
+            return None
+        codes = [self.rel_types.index(t) for t in types if t in self.rel_types]
+        return np.isin(self.link_types, codes)
+
+    def note_links(self, types: Optional[Iterable[str]] = None) -> List[Tuple[str, str]]:
+        """(from_note_id, to_note_id) 리스트 (types가 주어지면 해당 관계 타입만)"""
+        mask = self._type_mask(types)
+        sources, targets = self._link_sources, self.link_indices
+        if mask is not None:
+            sources, targets = sources[mask], targets[mask]
+        ids = self.note_ids
+        return [(ids[a], ids[b]) for a, b in zip(sources.tolist(), targets.tolist())]
+
+    def typed_note_links(self) -> List[Tuple[str, str, str]]:
+        """(from_note_id, to_note_id, rel_type) 리스트"""
+        ids, rel_types = self.note_ids, self.rel_types
+        return [
+            (ids[a], ids[b], rel_types[t])
+            for a, b, t in zip(self._link_sources.tolist(), self.link_indices.tolist(), self.link_types.tolist())
+        ]
+
+    def note_link_matrix(self, types: Optional[Iterable[str]] = None, symmetric: bool = False) -> sparse.csr_matrix:
+        """노트 × 노트 0/1 인접 행렬 (중복 링크는 하나로, symmetric이면 방향 무시), 타입별로 캐시"""
+        key = (tuple(sorted(types)) if types is not None else None, symmetric)
+        matrix = self._matrices.get(key)
+        if matrix is not None:
+            return matrix
+        mask = self._type_mask(types)
+        sources, targets = self._link_sources, self.link_indices
+        if mask is not None:
+            sources, targets = sources[mask], targets[mask]
+        n = self.note_count
+        matrix = sparse.csr_matrix((np.ones(len(sources)), (sources, targets)), shape=(n, n))
+        if symmetric:
+            matrix = matrix + matrix.T
+        matrix = matrix.tocsr()
+        matrix.sum_duplicates()
+        matrix.data[:] = 1.0
+        self._matrices[key] = matrix
+        return matrix
+
+    # ------------------------------------------------------------------ entities
+
+    def entities_with_label(self, label: str) -> np.ndarray:
+        """레이블(Topic 등)을 가진 엔티티 번호 배열"""
+        return np.flatnonzero(self.entity_labels & LABEL_BITS[label])
+
+    def notes_of_entity(self, entity: int) -> np.ndarray:
+        """엔티티를 언급하는 노트 번호 배열 (노트 번호 오름차순)"""
+        start, end = self.entity_notes.indptr[entity], self.entity_notes.indptr[entity + 1]
+        return self.entity_notes.indices[start:end]
+
+    def entity_degrees(self) -> np.ndarray:
+        """엔티티별 언급 노트 수"""
+        return np.diff(self.entity_notes.indptr)
+
+    # ------------------------------------------------------------------ stats
+
+    def nbytes(self) -> int:
+        """대략적인 메모리 사용량 (배열 + 문자열)"""
+        arrays = [
+            self.link_indptr, self.link_indices, self.link_types, self._link_sources, self.entity_labels,
+            self.entity_notes.data, self.entity_notes.indices, self.entity_notes.indptr,
+            self.mentions.data, self.mentions.indices, self.mentions.indptr,
+        ]
+        strings = sum(len(s or "") for s in self.note_ids + self.note_titles + self.entity_names)
+        return int(sum(a.nbytes for a in arrays) + strings * 2)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "vault_id": self.vault_id,
+            "version": self.version,
+            "notes": self.note_count,
+            "entities": self.entity_count,
+            "links": self.link_count,
+            "mentions": int(self.entity_notes.nnz),
+            "age_seconds": round(time.time() - self.built_at, 1),
+            "approx_bytes": self.nbytes(),
+        }
+
+
+def build_vault_snapshot(client, user_id: str, vault_id: str, version: int) -> VaultGraphSnapshot:
+    """Neo4j에서 쿼리 두 번으로 Vault 스냅샷 생성"""
+    params = {"user_id": user_id, "vault_id": vault_id}
+
+    note_rows = client.query(_NOTES_QUERY, params) or []
+    note_ids: List[str] = []
+    note_titles, note_paths, note_updated = [], [], []
+    raw_links: List[Tuple[int, str, str]] = []
+    for row in note_rows:
+        note_id = row.get("note_id")
+        if note_id is None:
+            continue
+        i = len(note_ids)
+        note_ids.append(note_id)
+        note_titles.append(row.get("title"))
+        note_paths.append(row.get("path"))
+        note_updated.append(row.get("updated_at"))
+        for link in row.get("links") or []:
+            if link and link.get("to"):
+                raw_links.append((i, link["to"], link.get("type")))
+
+    note_index = {note_id: i for i, note_id in enumerate(note_ids)}
+    rel_types: List[str] = []
+    rel_codes: Dict[str, int] = {}
+    link_rows, link_cols, link_types = [], [], []
+    for i, to_note, rel_type in raw_links:
+        j = note_index.get(to_note)
+        if j is None:
+            continue  # Vault 밖의 노트로 가는 링크
+        code = rel_codes.get(rel_type)
+        if code is None:
+            code = rel_codes[rel_type] = len(rel_types)
+            rel_types.append(rel_type)
+        link_rows.append(i)
+        link_cols.append(j)
+        link_types.append(code)
+
+    mention_rows = client.query(_MENTIONS_QUERY, params) or []
+    entity_keys, entity_names, entity_labels = [], [], []
+    mention_entities, mention_notes = [], []
+    for row in mention_rows:
+        e = len(entity_keys)
+        entity_keys.append(row["element_id"])
+        entity_names.append(row.get("name"))
+        entity_labels.append(sum(LABEL_BITS.get(label, 0) for label in row.get("labels") or []))
+        for note_id in row.get("note_ids") or []:
+            j = note_index.get(note_id)
+            if j is not None:
+                mention_entities.append(e)
+                mention_notes.append(j)
+
+    return VaultGraphSnapshot(
+        vault_id=vault_id,
+        version=version,
+        note_ids=note_ids,
+        note_titles=note_titles,
+        note_paths=note_paths,
+        note_updated_at=note_updated,
+        link_rows=np.asarray(link_rows, dtype=np.int64),
+        link_cols=np.asarray(link_cols, dtype=np.int64),
+        link_types=np.asarray(link_types, dtype=np.int16),
+        rel_types=rel_types,
+        entity_keys=entity_keys,
+        entity_names=entity_names,
+        entity_labels=np.asarray(entity_labels, dtype=np.int16),
+        mention_entities=np.asarray(mention_entities, dtype=np.int64),
+        mention_notes=np.asarray(mention_notes, dtype=np.int64),
+    )
+
+
+class GraphSnapshotCache:
+    """(user_id, vault_id)별 스냅샷 LRU 캐시 (Vault 버전으로 유효성 판단, thread-safe)"""
+
+    def __init__(self, max_entries: int = 8):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[SnapshotKey, VaultGraphSnapshot]" = OrderedDict()
+        self._building: Dict[SnapshotKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "builds": 0, "evictions": 0, "build_ms_total": 0.0}
+
+    def get(self, user_id: str, vault_id: str, client=None) -> VaultGraphSnapshot:
+        """현재 Vault 버전의 스냅샷 반환 (없거나 오래되었으면 생성)"""
+        if client is None:
+            from app.db.neo4j import get_neo4j_client
+            client = get_neo4j_client()
+
+        key = (user_id, vault_id)
+        version = vault_versions.current(vault_id, client)
+        with self._lock:
+            snapshot = self._entries.get(key)
+            if snapshot is not None and snapshot.version == version:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return snapshot
+            self.stats["misses"] += 1
+            build_lock = self._building.setdefault(key, threading.Lock())
+
+        # 같은 Vault의 동시 요청은 한 번만 생성
+        with build_lock:
+            with self._lock:
+                snapshot = self._entries.get(key)
+                if snapshot is not None and snapshot.version == version:
+                    self._entries.move_to_end(key)
+                    return snapshot
+
+            started = time.perf_counter()
+            snapshot = build_vault_snapshot(client, user_id, vault_id, version)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            logger.info(f"Built graph snapshot for vault {vault_id} v{version}: "
+                        f"{snapshot.note_count} notes, {snapshot.entity_count} entities, "
+                        f"{snapshot.link_count} links in {elapsed_ms:.0f}ms")
+
+            with self._lock:
+                self.stats["builds"] += 1
+                self.stats["build_ms_total"] += elapsed_ms
+                self._entries[key] = snapshot
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.stats["evictions"] += 1
+                self._building.pop(key, None)
+            return snapshot
+
+    def invalidate(self, vault_id: str, *_args):
+        """Vault의 스냅샷 제거 (vault_versions 리스너로도 사용)"""
+        with self._lock:
+            for key in [k for k in self._entries if k[1] == vault_id]:
+                del self._entries[key]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """메트릭 (/metrics/graph-snapshots)"""
+        with self._lock:
+            entries = list(self._entries.values())
+            stats = dict(self.stats)
+        stats["build_ms_total"] = round(stats["build_ms_total"], 1)
+        return {
+            **stats,
+            "entries": len(entries),
+            "max_entries": self.max_entries,
+            "vaults": [s.summary() for s in entries],
+        }
+
+
+# Global instance
+graph_snapshots = GraphSnapshotCache(max_entries=settings.graph_snapshot_max_vaults)
+# 버전이 바뀐 Vault의 스냅샷은 다음 조회를 기다리지 않고 바로 메모리에서 해제
+vault_versions.add_listener(graph_snapshots.invalidate)
@@ -1,6 +1,7 @@
 """
 그래프 시각화 서비스
 """
+from typing import Any, Dict, List, Optional
 from app.db.neo4j import get_neo4j_client
 import logging
 
@@ -16,6 +17,7 @@ def get_note_graph(note_id: str, depth: int = 1):
 
         cypher = """
         MATCH path = (n:Note {note_id: $note_id})-[r*1..2]-(connected)
+        WHERE NONE(rel IN relationships(path) WHERE type(rel) = 'IN_CLUSTER')
         WITH nodes(path) AS pathNodes, relationships(path) AS pathRels
         UNWIND pathNodes AS node
         WITH DISTINCT node, pathRels
@@ -72,69 +74,106 @@ def get_note_graph(note_id: str, depth: int = 1):
         return {"nodes": [], "edges": []}
 
 
-def get_note_graph_vis(note_id: str, hops: int = 1):
+# 노트 ego-network 전체를 한 번의 왕복으로 조회 (타입별 CALL 서브쿼리)
+# 서브쿼리는 그룹 키 없이 collect하므로 매칭이 없어도 빈 리스트로 한 행을 반환
+NOTE_GRAPH_VIS_QUERY = """
+MATCH (n:Note {note_id: $note_id})
+CALL {
+    WITH n
+    MATCH (n)-[:MENTIONS]->(t:Topic)
+    RETURN collect(DISTINCT {id: t.id, label: coalesce(t.name, t.id)}) AS topics
+}
+CALL {
+    WITH n
+    MATCH (n)-[:MENTIONS]->(p:Project)
+    RETURN collect(DISTINCT {id: p.id, label: coalesce(p.name, p.id), status: coalesce(p.status, 'unknown')}) AS projects
+}
+CALL {
+    WITH n
+    MATCH (n)-[:MENTIONS]->(t:Task)
+    WITH t LIMIT 10
+    RETURN collect({id: t.id, label: coalesce(t.title, t.id), priority: coalesce(t.priority, 'normal')}) AS tasks
+}
+CALL {
+    WITH n
+    MATCH (n)-[:MENTIONS]->(t:Topic)<-[:MENTIONS]-(related:Note)
+    WHERE $hops >= 2 AND n <> related
+    WITH related, count(t) AS common
+    ORDER BY common DESC
+    LIMIT 5
+    RETURN collect({id: related.note_id, label: coalesce(related.title, related.note_id)}) AS related_notes
+}
+CALL {
+    WITH n
+    MATCH (n)-[:MENTIONS]->(e1)-[r]->(e2)
+    WHERE type(r) IN ['RELATED_TO', 'PART_OF', 'HAS_TASK', 'ASSIGNED_TO', 'BROADER', 'NARROWER']
+    RETURN collect({
+        from_id: e1.id,
+        from_type: labels(e1)[0],
+        to_id: e2.id,
+        to_type: labels(e2)[0],
+        rel_type: type(r)
+    }) AS entity_rels
+}
+RETURN n.note_id AS id,
+       coalesce(n.title, n.note_id) AS label,
+       topics, projects, tasks, related_notes, entity_rels
+"""
+
+_PROJECT_COLORS = {
+    "active": {"background": "#F59E0B", "border": "#D97706"},
+    "paused": {"background": "#6B7280", "border": "#4B5563"},
+    "done": {"background": "#10B981", "border": "#059669"},
+}
+
+_TASK_COLORS = {
+    "high": {"background": "#EF4444", "border": "#DC2626"},
+    "medium": {"background": "#F59E0B", "border": "#D97706"},
+    "low": {"background": "#6B7280", "border": "#4B5563"},
+}
+
+
+class _VisGraph:
     """
-    vis-network 친화적인 스타일 포함 그래프 데이터
+    vis-network 그래프 조립기
+
+    노드는 id 기준(나중 값 우선), 엣지는 (from, to, label) 기준으로 추가 시점에 중복을 걸러
+    조립 후 다시 순회하며 중복 제거할 필요가 없습니다.
     """
-    try:
-        client = get_neo4j_client()
-        nodes = []
-        edges = []
-
-        center = _get_center_node(client, note_id)
-        if center:
-            nodes.append(center)
-
-        topic_nodes, topic_edges = _get_topics(client, note_id)
-        nodes.extend(topic_nodes)
-        edges.extend(topic_edges)
-
-        project_nodes, project_edges = _get_projects(client, note_id)
-        nodes.extend(project_nodes)
-        edges.extend(project_edges)
-
-        task_nodes, task_edges = _get_tasks(client, note_id)
-        nodes.extend(task_nodes)
-        edges.extend(task_edges)
-
-        if hops >= 2:
-            related_nodes, related_edges = _get_related_notes(client, note_id)
-            nodes.extend(related_nodes)
-            edges.extend(related_edges)
-
-        # Entity 간 관계 추가 (RELATED_TO, PART_OF 등)
-        entity_rel_edges = _get_entity_relationships(client, note_id)
-        edges.extend(entity_rel_edges)
-
-        uniq_nodes = {}
-        for n in nodes:
-            if n and n.get("id"):
-                uniq_nodes[n["id"]] = n
-
-        uniq_edges = []
-        seen = set()
-        for e in edges:
-            key = (e.get("from"), e.get("to"), e.get("label", ""))
-            if e.get("from") and e.get("to") and key not in seen:
-                seen.add(key)
-                uniq_edges.append(e)
-
-        return {"nodes": list(uniq_nodes.values()), "edges": uniq_edges}
-    except Exception as e:
-        logger.error(f"Error building vis graph for note {note_id}: {e}")
-        return {"nodes": [], "edges": []}
 
+    def __init__(self):
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.edges: List[Dict[str, Any]] = []
+        self._edge_keys = set()
 
-def _get_center_node(client, note_id: str):
-    cypher = """
-    MATCH (n:Note {note_id: $note_id})
-    RETURN n.note_id AS id, coalesce(n.title, n.note_id) AS label
+    def add_node(self, node: Dict[str, Any]):
+        if node.get("id"):
+            self.nodes[node["id"]] = node
+
+    def add_edge(self, edge: Dict[str, Any]):
+        key = (edge.get("from"), edge.get("to"), edge.get("label", ""))
+        if edge.get("from") and edge.get("to") and key not in self._edge_keys:
+            self._edge_keys.add(key)
+            self.edges.append(edge)
+
+    def to_dict(self) -> Dict[str, List[Dict[str, Any]]]:
+        return {"nodes": list(self.nodes.values()), "edges": self.edges}
+
+
+def build_note_graph_vis(note_id: str, record: Optional[Dict[str, Any]], hops: int = 1) -> Dict[str, Any]:
+    """
+    NOTE_GRAPH_VIS_QUERY 결과 한 행을 vis-network 형식으로 변환
+
+    Args:
+        note_id: 중심 노트 ID
+        record: 쿼리 결과 행 (노트가 없으면 None)
+        hops: 2 이상이면 관련 노트 포함
     """
-    res = client.query(cypher, {"note_id": note_id}) or []
-    if not res:
-        return None
-    record = res[0]
-    return {
+    graph = _VisGraph()
+    if not record:
+        return graph.to_dict()
+
+    graph.add_node({
         "id": record.get("id"),
         "label": record.get("label"),
         "shape": "box",
@@ -142,177 +181,91 @@ def _get_center_node(client, note_id: str):
         "font": {"color": "#FFFFFF"},
         "size": 30,
         "group": "note",
-    }
-
+    })
 
-def _get_topics(client, note_id: str):
-    cypher = """
-    MATCH (n:Note {note_id: $note_id})-[r:MENTIONS]->(t:Topic)
-    RETURN t.id AS id, coalesce(t.name, t.id) AS label, coalesce(r.confidence, 1.0) AS weight
-    """
-    records = client.query(cypher, {"note_id": note_id}) or []
-    nodes = []
-    edges = []
-    for record in records:
-        base_id = record.get("id")
-        nodes.append({
-            "id": f"topic_{base_id}",
-            "label": record.get("label"),
+    for topic in record.get("topics") or []:
+        node_id = f"topic_{topic.get('id')}"
+        graph.add_node({
+            "id": node_id,
+            "label": topic.get("label"),
             "shape": "dot",
             "color": {"background": "#10B981", "border": "#059669"},
             "size": 20,
             "group": "topic",
         })
-        edges.append({
-            "from": note_id,
-            "to": f"topic_{base_id}",
-            "label": "mentions",
-            "arrows": "to",
-            "color": "#9CA3AF",
-        })
-    return nodes, edges
-
+        graph.add_edge({"from": note_id, "to": node_id, "label": "mentions", "arrows": "to", "color": "#9CA3AF"})
 
-def _get_projects(client, note_id: str):
-    cypher = """
-    MATCH (n:Note {note_id: $note_id})-[:MENTIONS]->(p:Project)
-    RETURN p.id AS id, coalesce(p.name, p.id) AS label, coalesce(p.status, 'unknown') AS status
-    """
-    records = client.query(cypher, {"note_id": note_id}) or []
-    nodes = []
-    edges = []
-    for record in records:
-        status = record.get("status", "unknown")
-        color = {
-            "active": {"background": "#F59E0B", "border": "#D97706"},
-            "paused": {"background": "#6B7280", "border": "#4B5563"},
-            "done": {"background": "#10B981", "border": "#059669"},
-        }.get(status, {"background": "#F59E0B", "border": "#D97706"})
-        base_id = record.get("id")
-        nodes.append({
-            "id": f"project_{base_id}",
-            "label": record.get("label"),
+    for project in record.get("projects") or []:
+        node_id = f"project_{project.get('id')}"
+        graph.add_node({
+            "id": node_id,
+            "label": project.get("label"),
             "shape": "box",
-            "color": color,
+            "color": _PROJECT_COLORS.get(project.get("status"), _PROJECT_COLORS["active"]),
             "size": 20,
             "group": "project",
         })
-        edges.append({
-            "from": note_id,
-            "to": f"project_{base_id}",
-            "label": "project",
-            "arrows": "to",
-            "color": "#9CA3AF",
-            "dashes": True,
+        graph.add_edge({
+            "from": note_id, "to": node_id, "label": "project",
+            "arrows": "to", "color": "#9CA3AF", "dashes": True,
         })
-    return nodes, edges
 
-
-def _get_tasks(client, note_id: str):
-    cypher = """
-    MATCH (n:Note {note_id: $note_id})-[:MENTIONS]->(t:Task)
-    RETURN t.id AS id, coalesce(t.title, t.id) AS label, coalesce(t.priority, 'normal') AS priority
-    LIMIT 10
-    """
-    records = client.query(cypher, {"note_id": note_id}) or []
-    nodes = []
-    edges = []
-    for record in records:
-        priority = record.get("priority", "normal")
-        color = {
-            "high": {"background": "#EF4444", "border": "#DC2626"},
-            "medium": {"background": "#F59E0B", "border": "#D97706"},
-            "low": {"background": "#6B7280", "border": "#4B5563"},
-        }.get(priority, {"background": "#6B7280", "border": "#4B5563"})
-        base_id = record.get("id")
-        nodes.append({
-            "id": f"task_{base_id}",
-            "label": (record.get("label") or "")[:30],
+    for task in record.get("tasks") or []:
+        node_id = f"task_{task.get('id')}"
+        graph.add_node({
+            "id": node_id,
+            "label": (task.get("label") or "")[:30],
             "shape": "diamond",
-            "color": color,
+            "color": _TASK_COLORS.get(task.get("priority"), _TASK_COLORS["low"]),
             "size": 15,
             "group": "task",
         })
-        edges.append({
-            "from": note_id,
-            "to": f"task_{base_id}",
-            "label": "task",
-            "arrows": "to",
-            "color": "#9CA3AF",
-        })
-    return nodes, edges
-
-
-def _get_related_notes(client, note_id: str):
-    cypher = """
-    MATCH (n:Note {note_id: $note_id})-[:MENTIONS]->(t:Topic)<-[:MENTIONS]-(related:Note)
-    WHERE n <> related
-    WITH related, COUNT(t) AS common
-    ORDER BY common DESC
-    LIMIT 5
-    RETURN related.note_id AS id, coalesce(related.title, related.note_id) AS label
-    """
-    records = client.query(cypher, {"note_id": note_id}) or []
-    nodes = []
-    edges = []
-    for record in records:
-        rid = record.get("id")
-        nodes.append({
-            "id": rid,
-            "label": record.get("label"),
-            "shape": "box",
-            "color": {"background": "#818CF8", "border": "#6366F1"},
-            "size": 20,
-            "group": "note",
-        })
-        edges.append({
-            "from": note_id,
-            "to": rid,
-            "label": "related",
+        graph.add_edge({"from": note_id, "to": node_id, "label": "task", "arrows": "to", "color": "#9CA3AF"})
+
+    if hops >= 2:
+        for related in record.get("related_notes") or []:
+            graph.add_node({
+                "id": related.get("id"),
+                "label": related.get("label"),
+                "shape": "box",
+                "color": {"background": "#818CF8", "border": "#6366F1"},
+                "size": 20,
+                "group": "note",
+            })
+            graph.add_edge({
+                "from": note_id, "to": related.get("id"), "label": "related",
+                "arrows": "to", "color": "#9CA3AF", "dashes": True,
+            })
+
+    # Entity 간 관계 (RELATED_TO, PART_OF 등) - ID에 타입 prefix 추가 (topic_, project_, task_)
+    for rel in record.get("entity_rels") or []:
+        from_type = (rel.get("from_type") or "").lower()
+        to_type = (rel.get("to_type") or "").lower()
+        from_id = rel.get("from_id")
+        to_id = rel.get("to_id")
+        graph.add_edge({
+            "from": f"{from_type}_{from_id}" if from_type else from_id,
+            "to": f"{to_type}_{to_id}" if to_type else to_id,
+            "label": (rel.get("rel_type") or "").lower().replace("_", " "),
             "arrows": "to",
-            "color": "#9CA3AF",
+            "color": "#6B7280",
             "dashes": True,
         })
-    return nodes, edges
+
+    return graph.to_dict()
 
 
-def _get_entity_relationships(client, note_id: str):
+def get_note_graph_vis(note_id: str, hops: int = 1):
     """
-    노트에 연결된 엔티티 간의 관계 가져오기 (RELATED_TO, PART_OF 등)
+    vis-network 친화적인 스타일 포함 그래프 데이터 (쿼리 1회)
     """
-    cypher = """
-    MATCH (n:Note {note_id: $note_id})-[:MENTIONS]->(e1)
-    MATCH (e1)-[r]->(e2)
-    WHERE type(r) IN ['RELATED_TO', 'PART_OF', 'HAS_TASK', 'ASSIGNED_TO', 'BROADER', 'NARROWER']
-    RETURN
-        e1.id AS from_id,
-        labels(e1)[0] AS from_type,
-        e2.id AS to_id,
-        labels(e2)[0] AS to_type,
-        type(r) AS rel_type
-    """
-    records = client.query(cypher, {"note_id": note_id}) or []
-    edges = []
-    for record in records:
-        from_id = record.get("from_id")
-        from_type = record.get("from_type", "").lower()
-        to_id = record.get("to_id")
-        to_type = record.get("to_type", "").lower()
-        rel_type = record.get("rel_type")
-
-        # Entity ID에 타입 prefix 추가 (topic_, project_, task_)
-        from_prefixed = f"{from_type}_{from_id}" if from_type else from_id
-        to_prefixed = f"{to_type}_{to_id}" if to_type else to_id
-
-        edges.append({
-            "from": from_prefixed,
-            "to": to_prefixed,
-            "label": rel_type.lower().replace("_", " "),
-            "arrows": "to",
-            "color": "#6B7280",
-            "dashes": True,
-        })
-    return edges
+    try:
+        client = get_neo4j_client()
+        records = client.query(NOTE_GRAPH_VIS_QUERY, {"note_id": note_id, "hops": hops}) or []
+        return build_note_graph_vis(note_id, records[0] if records else None, hops)
+    except Exception as e:
+        logger.error(f"Error building vis graph for note {note_id}: {e}")
+        return {"nodes": [], "edges": []}
 
 
 def get_user_graph(user_id: str, vault_id: str = None, limit: int = 100):
@@ -12,10 +12,11 @@ Phase 14: ToolsRetriever 통합 (Agentic RAG)
 
 참고: https://neo4j.com/docs/neo4j-graphrag-python/current/
 """
+import asyncio
 import logging
 from typing import Optional, List, Dict, Any
-from neo4j import GraphDatabase
 from app.config import settings
+from app.db.neo4j import get_neo4j_client
 
 logger = logging.getLogger(__name__)
 
@@ -142,11 +143,8 @@ class GraphRAGRetrieverService:
         if not GRAPHRAG_AVAILABLE:
             raise RuntimeError("neo4j-graphrag is not installed")
 
-        # Neo4j 드라이버 생성
-        self.driver = GraphDatabase.driver(
-            self._normalize_uri(settings.neo4j_uri),
-            auth=(settings.neo4j_username, settings.neo4j_password)
-        )
+        # 공유 Neo4j 드라이버 재사용 (커넥션 풀 공유)
+        self.driver = get_neo4j_client().driver
 
         # OpenAI 임베딩 & LLM 초기화
         self.embedder = OpenAIEmbeddings(
@@ -174,13 +172,6 @@ class GraphRAGRetrieverService:
             cls._instance = cls()
         return cls._instance
 
-    @staticmethod
-    def _normalize_uri(uri: str) -> str:
-        """AuraDB 호환 URI 변환"""
-        if uri.startswith("neo4j+s://"):
-            return uri.replace("neo4j+s://", "neo4j+ssc://")
-        return uri
-
     @property
     def vector_retriever(self) -> VectorRetriever:
         """VectorRetriever (lazy initialization)"""
@@ -285,7 +276,8 @@ class GraphRAGRetrieverService:
         """
         try:
             # 검색 실행
-            results = self.vector_retriever.search(
+            results = await asyncio.to_thread(
+                self.vector_retriever.search,
                 query_text=query,
                 top_k=top_k
             )
@@ -340,7 +332,8 @@ class GraphRAGRetrieverService:
             검색된 노트 + 그래프 컨텍스트
         """
         try:
-            results = self.vector_cypher_retriever.search(
+            results = await asyncio.to_thread(
+                self.vector_cypher_retriever.search,
                 query_text=query,
                 top_k=top_k
             )
@@ -395,7 +388,7 @@ class GraphRAGRetrieverService:
             생성된 Cypher 쿼리 + 검색 결과
         """
         try:
-            results = self.text2cypher_retriever.search(query_text=query)
+            results = await asyncio.to_thread(self.text2cypher_retriever.search, query_text=query)
 
             # 결과 구조화
             response = {
@@ -449,7 +442,7 @@ class GraphRAGRetrieverService:
 
         try:
             # ToolsRetriever가 자동으로 최적 retriever 선택
-            results = self.tools_retriever.search(query_text=query)
+            results = await asyncio.to_thread(self.tools_retriever.search, query_text=query)
 
             # 결과 구조화
             response = {
@@ -514,9 +507,8 @@ class GraphRAGRetrieverService:
             raise ValueError(f"Unknown search mode: {mode}")
 
     def close(self):
-        """드라이버 종료"""
-        if self.driver:
-            self.driver.close()
+        """공유 드라이버 참조 해제 (드라이버 종료는 lifespan에서 담당)"""
+        self.driver = None
 
 
 # 편의 함수
@@ -264,6 +264,120 @@ def classify_entity_to_pkm_type(entity_name: str, entity_summary: str = None) ->
     return "Topic"
 
 
+# =============================================================================
+# Bulk writers (UNWIND 기반 배치 쓰기)
+# 엔티티별 쿼리 대신 PKM 타입별로 한 번의 UNWIND 쿼리로 레이블/관계를 기록
+# =============================================================================
+
+_PKM_LABELS_CLAUSE = "e:Goal, e:Project, e:Task, e:Topic, e:Concept, e:Question, e:Insight, e:Resource, e:Person"
+
+
+def group_entities_by_pkm_type(
+    entities: List[Dict[str, Any]],
+    validate: bool = True
+) -> Dict[str, List[str]]:
+    """
+    엔티티 목록을 분류하여 PKM 타입별 uuid 리스트로 그룹화
+
+    Args:
+        entities: uuid, name, summary를 가진 엔티티 dict 리스트
+        validate: True면 is_valid_entity를 통과하지 못한 엔티티 제외
+
+    Returns:
+        {pkm_type: [uuid, ...]}
+    """
+    grouped: Dict[str, List[str]] = {}
+    for entity in entities or []:
+        name = entity.get("name") or entity["uuid"]
+        if validate and not is_valid_entity(name):
+            logger.debug(f"⏩ Skipping invalid entity: {name}")
+            continue
+        pkm_type = classify_entity_to_pkm_type(name, entity.get("summary", ""))
+        grouped.setdefault(pkm_type, []).append(entity["uuid"])
+    return grouped
+
+
+def apply_pkm_labels_bulk(
+    client,
+    uuids_by_type: Dict[str, List[str]],
+    reclassify: bool = False
+) -> Dict[str, int]:
+    """
+    PKM 타입별로 UNWIND 한 번씩 레이블을 추가 (타입 수만큼의 왕복)
+
+    Cypher는 레이블을 파라미터로 받을 수 없으므로 타입별로 쿼리를 분리하며,
+    레이블은 PKM_TYPES 화이트리스트로 검증합니다.
+
+    Args:
+        client: Neo4j 클라이언트 (Bolt)
+        uuids_by_type: {pkm_type: [uuid, ...]}
+        reclassify: True면 기존 PKM 레이블을 제거한 뒤 새 레이블 설정
+
+    Returns:
+        {pkm_type: 레이블이 적용된 엔티티 수}
+    """
+    allowed = set(PKM_TYPES + PKM_TYPES_LEGACY)
+    applied: Dict[str, int] = {}
+
+    for pkm_type, uuids in uuids_by_type.items():
+        if not uuids:
+            continue
+        if pkm_type not in allowed:
+            logger.warning(f"Unknown PKM type skipped: {pkm_type}")
+            continue
+
+        remove_clause = f"REMOVE {_PKM_LABELS_CLAUSE}" if reclassify else ""
+        timestamp_prop = "pkm_reclassified_at" if reclassify else "pkm_classified_at"
+        cypher = f"""
+        UNWIND $uuids AS uuid
+        MATCH (e:Entity {{uuid: uuid}})
+        {remove_clause}
+        SET e:{pkm_type}
+        SET e.pkm_type = $pkm_type
+        SET e.{timestamp_prop} = datetime()
+        RETURN count(e) as count
+        """
+        result = client.query(cypher, {"uuids": uuids, "pkm_type": pkm_type})
+        applied[pkm_type] = result[0]["count"] if result else 0
+
+    return applied
+
+
+def create_mentions_bulk(
+    client,
+    pairs: List[Dict[str, str]],
+    source: str
+) -> int:
+    """
+    Note → Entity MENTIONS 관계를 UNWIND 한 번으로 생성
+
+    Args:
+        client: Neo4j 클라이언트 (Bolt)
+        pairs: [{"note_id": ..., "entity_uuid": ...}, ...]
+        source: MENTIONS.source 값 (예: 'graphiti_migration')
+
+    Returns:
+        생성(또는 갱신)된 MENTIONS 수
+    """
+    if not pairs:
+        return 0
+
+    cypher = """
+    UNWIND $pairs AS pair
+    MATCH (n:Note {note_id: pair.note_id})
+    MATCH (e:Entity {uuid: pair.entity_uuid})
+    MERGE (n)-[m:MENTIONS]->(e)
+    SET m.created_at = datetime()
+    SET m.source = $source
+    RETURN count(m) as count
+    """
+    result = client.query(cypher, {"pairs": pairs, "source": source})
+
+    from app.services.cooccurrence_service import update_cooccurrence_safely
+    update_cooccurrence_safely(client, list({pair["note_id"] for pair in pairs}))
+    return result[0]["count"] if result else 0
+
+
 async def add_pkm_labels_to_graphiti_entities(
     vault_id: str = None,
     batch_size: int = 100
@@ -293,7 +407,7 @@ async def add_pkm_labels_to_graphiti_entities(
         LIMIT $batch_size
         """
 
-        entities = client.query(cypher_find, {"batch_size": batch_size})
+        entities = await asyncio.to_thread(client.query, cypher_find, {"batch_size": batch_size})
 
         if not entities:
             logger.info("No Entity without PKM labels found")
@@ -305,40 +419,21 @@ async def add_pkm_labels_to_graphiti_entities(
 
         logger.info(f"Found {len(entities)} Entities to classify")
 
-        # Step 2: 각 엔티티 분류 및 레이블 추가 (Core Ontology v2 - 8개 타입 + Person)
+        # Step 2: 타입별로 그룹화 후 UNWIND 배치로 레이블 추가 (Core Ontology v2 - 8개 타입 + Person)
         stats = {
             "Goal": 0, "Project": 0, "Task": 0, "Topic": 0,
             "Concept": 0, "Question": 0, "Insight": 0, "Resource": 0,
             "Person": 0, "errors": 0
         }
 
-        for entity in entities:
-            try:
-                uuid = entity["uuid"]
-                name = entity["name"] or uuid
-                summary = entity.get("summary", "")
-
-                # PKM 타입 분류
-                pkm_type = classify_entity_to_pkm_type(name, summary)
-
-                # 레이블 추가
-                cypher_add_label = f"""
-                MATCH (e:Entity {{uuid: $uuid}})
-                SET e:{pkm_type}
-                SET e.pkm_type = $pkm_type
-                SET e.pkm_classified_at = datetime()
-                RETURN e.name as name
-                """
-
-                result = client.query(cypher_add_label, {"uuid": uuid, "pkm_type": pkm_type})
-
-                if result:
-                    stats[pkm_type] += 1
-                    logger.debug(f"Added {pkm_type} label to: {name}")
-
-            except Exception as e:
-                logger.error(f"Error adding label to {entity.get('name')}: {e}")
-                stats["errors"] += 1
+        uuids_by_type = group_entities_by_pkm_type(entities, validate=False)
+        try:
+            applied = await asyncio.to_thread(apply_pkm_labels_bulk, client, uuids_by_type)
+            for pkm_type, count in applied.items():
+                stats[pkm_type] += count
+        except Exception as e:
+            logger.error(f"Error adding PKM labels in bulk: {e}")
+            stats["errors"] += len(entities)
 
         # Core Ontology v2 - 8개 타입 + Person
         all_types = PKM_TYPES + PKM_TYPES_LEGACY
@@ -363,7 +458,7 @@ async def add_pkm_labels_to_graphiti_entities(
 async def _count_unlabeled_entities(client) -> int:
     """PKM 레이블이 없는 Entity 수 조회 (Core Ontology v2 - 8개 타입)"""
     try:
-        result = client.query("""
+        result = await asyncio.to_thread(client.query, """
             MATCH (e:Entity)
             WHERE NOT e:Goal AND NOT e:Project AND NOT e:Task AND NOT e:Topic
               AND NOT e:Concept AND NOT e:Question AND NOT e:Insight AND NOT e:Resource
@@ -412,7 +507,7 @@ async def create_mentions_from_episodes(
         LIMIT $batch_size
         """
 
-        relations = client.query(cypher_find, {"batch_size": batch_size})
+        relations = await asyncio.to_thread(client.query, cypher_find, {"batch_size": batch_size})
 
         if not relations:
             logger.info("No new MENTIONS relationships to create")
@@ -424,32 +519,20 @@ async def create_mentions_from_episodes(
 
         logger.info(f"Found {len(relations)} MENTIONS relationships to create")
 
-        # Step 2: MENTIONS 관계 생성
+        # Step 2: MENTIONS 관계 생성 (배치 단위 UNWIND 한 번)
         created = 0
         errors = 0
 
-        for rel in relations:
-            try:
-                cypher_create = """
-                MATCH (n:Note {note_id: $note_id})
-                MATCH (e:Entity {uuid: $entity_uuid})
-                MERGE (n)-[m:MENTIONS]->(e)
-                SET m.created_at = datetime()
-                SET m.source = 'graphiti_migration'
-                RETURN count(m) as count
-                """
-
-                result = client.query(cypher_create, {
-                    "note_id": rel["note_id"],
-                    "entity_uuid": rel["entity_uuid"]
-                })
-
-                if result and result[0]["count"] > 0:
-                    created += 1
-
-            except Exception as e:
-                logger.error(f"Error creating MENTIONS: {e}")
-                errors += 1
+        try:
+            created = await asyncio.to_thread(
+                create_mentions_bulk,
+                client,
+                [{"note_id": rel["note_id"], "entity_uuid": rel["entity_uuid"]} for rel in relations],
+                source="graphiti_migration"
+            )
+        except Exception as e:
+            logger.error(f"Error creating MENTIONS: {e}")
+            errors = len(relations)
 
         logger.info(f"✅ Created {created} MENTIONS relationships")
 
@@ -577,33 +660,12 @@ async def process_note_hybrid(
         """
 
         episode_name = f"note_{note_id}"
-        entities = client.query(cypher_find_entities, {"episode_name": episode_name})
-
-        labeled_count = 0
-
-        for entity in (entities or []):
-            entity_name = entity["name"] or entity["uuid"]
-
-            # 기본 유효성 검사만 수행 (너무 짧거나 숫자만인 경우만 제외)
-            # 블랙리스트는 사용하지 않음 - min_connections 필터로 시각화 단계에서 처리
-            if not is_valid_entity(entity_name):
-                logger.debug(f"⏩ Skipping invalid entity: {entity_name}")
-                continue
-
-            pkm_type = classify_entity_to_pkm_type(
-                entity_name,
-                entity.get("summary", "")
-            )
-
-            cypher_add_label = f"""
-            MATCH (e:Entity {{uuid: $uuid}})
-            SET e:{pkm_type}
-            SET e.pkm_type = $pkm_type
-            SET e.pkm_classified_at = datetime()
-            """
+        entities = await asyncio.to_thread(client.query, cypher_find_entities, {"episode_name": episode_name})
 
-            client.query(cypher_add_label, {"uuid": entity["uuid"], "pkm_type": pkm_type})
-            labeled_count += 1
+        # 타입별 UNWIND 한 번씩 (엔티티 수가 아닌 타입 수만큼 왕복)
+        uuids_by_type = group_entities_by_pkm_type(entities)
+        applied = await asyncio.to_thread(apply_pkm_labels_bulk, client, uuids_by_type)
+        labeled_count = sum(applied.values())
 
         # Step 3: Note → Entity MENTIONS 관계 생성 (유효한 엔티티만)
         cypher_create_mentions = """
@@ -616,7 +678,7 @@ async def process_note_hybrid(
         RETURN count(m) as count
         """
 
-        mentions_result = client.query(cypher_create_mentions, {
+        mentions_result = await asyncio.to_thread(client.query, cypher_create_mentions, {
             "note_id": note_id,
             "episode_name": episode_name
         })
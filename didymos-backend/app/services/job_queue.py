@@ -0,0 +1,468 @@
+"""
+노트 AI 처리용 영속 작업 큐 (SQLite)
+
+FastAPI BackgroundTasks는 프로세스가 재시작되면 대기 중인 작업을 잃고,
+API 레플리카와 별도로 워커를 확장할 수 없습니다. 이 모듈은
+- note_id 기준 중복 제거 (대기 중이면 최신 버전으로 교체, 실행 중이면 끝난 뒤 최신 버전을 다시 처리)
+- 지수 백오프 + 지터 재시도, 최대 시도 초과 시 failed
+- 리스 만료(워커 비정상 종료) 작업 재대기. 수령할 때마다 새 리스 토큰을 발급하고
+  complete/fail은 토큰이 일치할 때만 반영하므로, 리스가 만료된 뒤 늦게 끝난 워커의 결과는 무시됩니다
+- 대기 시간/실행 시간 백분위 통계
+를 제공하며, 워커는 API 프로세스 내장 또는 `python -m app.worker`로 별도 실행합니다.
+
+SQLite 파일을 공유하는 같은 호스트의 프로세스끼리만 큐를 공유합니다
+(여러 호스트로 확장하려면 같은 인터페이스의 공유 저장소 구현으로 교체).
+"""
+import asyncio
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 완료된 작업의 지연 시간 기록 보존 개수 (백분위 계산용)
+HISTORY_LIMIT = 2000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS note_jobs (
+    note_id      TEXT PRIMARY KEY,
+    payload      TEXT NOT NULL,
+    status       TEXT NOT NULL,          -- pending | running | failed
+    version      INTEGER NOT NULL DEFAULT 1,
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    enqueued_at  REAL NOT NULL,
+    available_at REAL NOT NULL,
+    started_at   REAL,
+    worker_id    TEXT,
+    lease        TEXT,                   -- 수령 시 발급한 토큰 (complete/fail이 확인)
+    last_error   TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_note_jobs_status ON note_jobs (status, available_at);
+CREATE TABLE IF NOT EXISTS note_job_history (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    note_id     TEXT NOT NULL,
+    status      TEXT NOT NULL,           -- done | failed
+    attempts    INTEGER NOT NULL,
+    wait_ms     REAL NOT NULL,
+    run_ms      REAL NOT NULL,
+    finished_at REAL NOT NULL
+);
+"""
+
+
+def _percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return round(sorted_values[index], 1)
+
+
+class NoteJobQueue:
+    """SQLite 기반 노트 AI 처리 작업 큐 (thread-safe)"""
+
+    def __init__(
+        self,
+        path: str,
+        max_attempts: int = 5,
+        backoff_base_seconds: float = 5.0,
+        backoff_max_seconds: float = 300.0,
+    ):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(note_jobs)")}
+            if "lease" not in columns:
+                conn.execute("ALTER TABLE note_jobs ADD COLUMN lease TEXT")
+            self._conn = conn
+        return self._conn
+
+    def enqueue(self, job: Dict[str, Any]) -> int:
+        """
+        작업 추가 (note_id 기준 중복 제거, 최신 payload 우선)
+
+        실행 중인 작업이 있으면 running 상태로 둔 채 payload와 버전만 바꿉니다.
+        같은 노트를 두 워커가 동시에 처리하지 않도록, 새 버전은 실행 중이던 작업이
+        complete/fail로 끝날 때 pending으로 전환되어 다시 처리됩니다.
+
+        Returns:
+            작업 버전
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                """
+                INSERT INTO note_jobs (note_id, payload, status, version, attempts, enqueued_at, available_at)
+                VALUES (?, ?, 'pending', 1, 0, ?, ?)
+                ON CONFLICT(note_id) DO UPDATE SET
+                    payload = excluded.payload,
+                    status = CASE WHEN note_jobs.status = 'running' THEN 'running' ELSE 'pending' END,
+                    version = note_jobs.version + 1,
+                    attempts = CASE WHEN note_jobs.status = 'running' THEN note_jobs.attempts ELSE 0 END,
+                    enqueued_at = excluded.enqueued_at,
+                    available_at = excluded.available_at,
+                    last_error = NULL
+                RETURNING version
+                """,
+                (job["note_id"], json.dumps(job, ensure_ascii=False), now, now),
+            ).fetchone()
+            return row["version"]
+
+    def enqueue_many(self, jobs: List[Dict[str, Any]]) -> int:
+        """여러 작업을 한 트랜잭션으로 추가"""
+        if not jobs:
+            return 0
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    """
+                    INSERT INTO note_jobs (note_id, payload, status, version, attempts, enqueued_at, available_at)
+                    VALUES (?, ?, 'pending', 1, 0, ?, ?)
+                    ON CONFLICT(note_id) DO UPDATE SET
+                        payload = excluded.payload,
+                        status = CASE WHEN note_jobs.status = 'running' THEN 'running' ELSE 'pending' END,
+                        version = note_jobs.version + 1,
+                        attempts = CASE WHEN note_jobs.status = 'running' THEN note_jobs.attempts ELSE 0 END,
+                        enqueued_at = excluded.enqueued_at,
+                        available_at = excluded.available_at,
+                        last_error = NULL
+                    """,
+                    [(job["note_id"], json.dumps(job, ensure_ascii=False), now, now) for job in jobs],
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return len(jobs)
+
+    def claim(self, worker_id: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        실행 가능한 pending 작업을 최대 limit개 running으로 전환하고 반환
+        """
+        if limit <= 0:
+            return []
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    """
+                    SELECT note_id, payload, version, attempts, enqueued_at
+                    FROM note_jobs
+                    WHERE status = 'pending' AND available_at <= ?
+                    ORDER BY available_at
+                    LIMIT ?
+                    """,
+                    (now, limit),
+                ).fetchall()
+                leases = [uuid.uuid4().hex for _ in rows]
+                conn.executemany(
+                    """
+                    UPDATE note_jobs
+                    SET status = 'running', started_at = ?, worker_id = ?, lease = ?, attempts = attempts + 1
+                    WHERE note_id = ? AND version = ?
+                    """,
+                    [(now, worker_id, lease, row["note_id"], row["version"]) for row, lease in zip(rows, leases)],
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        return [
+            {
+                "note_id": row["note_id"],
+                "payload": json.loads(row["payload"]),
+                "version": row["version"],
+                "lease": lease,
+                "attempt": row["attempts"] + 1,
+                "enqueued_at": row["enqueued_at"],
+                "started_at": now,
+            }
+            for row, lease in zip(rows, leases)
+        ]
+
+    def complete(self, job: Dict[str, Any]) -> bool:
+        """
+        성공 처리 (처리 중 새 버전이 들어왔다면 새 버전을 pending으로 전환)
+
+        Returns:
+            반영 여부 (리스가 만료되어 다른 워커에 넘어간 작업이면 False)
+        """
+        finished = time.time()
+        with self._lock:
+            conn = self._connect()
+            if self._lease_lost(conn, job):
+                logger.warning(f"⏱️ Ignoring result of job with expired lease: {job['note_id'][:50]}")
+                return False
+            conn.execute(
+                "DELETE FROM note_jobs WHERE note_id = ? AND version = ? AND lease = ?",
+                (job["note_id"], job["version"], job["lease"]),
+            )
+            self._promote_newer(conn, job, finished)
+            self._record_history(conn, job, "done", finished)
+            return True
+
+    def fail(self, job: Dict[str, Any], error: str) -> bool:
+        """
+        실패 처리: 백오프 후 재시도, 최대 시도 초과 시 failed
+
+        처리 중 새 버전이 들어왔다면 실패한 버전 대신 새 버전을 바로 pending으로 전환합니다.
+
+        Returns:
+            반영 여부 (리스가 만료되어 다른 워커에 넘어간 작업이면 False)
+        """
+        finished = time.time()
+        attempt = job["attempt"]
+        with self._lock:
+            conn = self._connect()
+            if self._lease_lost(conn, job):
+                logger.warning(f"⏱️ Ignoring failure of job with expired lease: {job['note_id'][:50]}")
+                return False
+
+            if self._promote_newer(conn, job, finished):
+                logger.warning(f"🔁 Job failed but a newer version is queued: {job['note_id'][:50]}")
+                return True
+
+            if attempt >= self.max_attempts:
+                conn.execute(
+                    """
+                    UPDATE note_jobs SET status = 'failed', last_error = ?, worker_id = NULL, lease = NULL
+                    WHERE note_id = ? AND version = ? AND lease = ?
+                    """,
+                    (error[:1000], job["note_id"], job["version"], job["lease"]),
+                )
+                self._record_history(conn, job, "failed", finished)
+                logger.error(f"❌ Job failed permanently after {attempt} attempts: {job['note_id'][:50]}")
+                return True
+
+            delay = min(self.backoff_max_seconds, self.backoff_base_seconds * (2 ** (attempt - 1)))
+            delay *= random.uniform(0.5, 1.0)  # jitter
+            conn.execute(
+                """
+                UPDATE note_jobs SET status = 'pending', available_at = ?, last_error = ?, worker_id = NULL, lease = NULL
+                WHERE note_id = ? AND version = ? AND lease = ?
+                """,
+                (finished + delay, error[:1000], job["note_id"], job["version"], job["lease"]),
+            )
+            logger.warning(f"🔁 Job retry in {delay:.1f}s (attempt {attempt}): {job['note_id'][:50]}")
+            return True
+
+    @staticmethod
+    def _lease_lost(conn: sqlite3.Connection, job: Dict[str, Any]) -> bool:
+        """
+        작업이 다른 수령(리스 만료 후 재대기 → 재수령)으로 넘어갔는지 여부
+
+        실행 중에 새 버전이 들어와도 행은 running과 리스를 유지하므로 리스만 비교하면 됩니다.
+        """
+        row = conn.execute("SELECT lease FROM note_jobs WHERE note_id = ?", (job["note_id"],)).fetchone()
+        return row is None or row["lease"] != job["lease"]
+
+    @staticmethod
+    def _promote_newer(conn: sqlite3.Connection, job: Dict[str, Any], now: float) -> bool:
+        """실행 중 들어온 새 버전을 pending으로 전환 (새 버전이 없으면 False)"""
+        cursor = conn.execute(
+            """
+            UPDATE note_jobs SET status = 'pending', attempts = 0, available_at = ?, worker_id = NULL, lease = NULL
+            WHERE note_id = ? AND version > ? AND status = 'running' AND lease = ?
+            """,
+            (now, job["note_id"], job["version"], job["lease"]),
+        )
+        return cursor.rowcount > 0
+
+    def requeue_stale(self, lease_seconds: float) -> int:
+        """
+        리스가 만료된 running 작업을 pending으로 복구 (워커 비정상 종료 대비)
+
+        리스 토큰을 지우므로 아직 실행 중인 이전 워커가 나중에 끝나도 결과는 반영되지 않습니다.
+        """
+        cutoff = time.time() - lease_seconds
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute(
+                """
+                UPDATE note_jobs SET status = 'pending', available_at = ?, worker_id = NULL, lease = NULL
+                WHERE status = 'running' AND started_at < ?
+                """,
+                (time.time(), cutoff),
+            )
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        """큐 깊이와 최근 작업의 대기/실행 시간 백분위"""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            depth = {row["status"]: row["count"] for row in conn.execute(
+                "SELECT status, count(*) AS count FROM note_jobs GROUP BY status"
+            )}
+            oldest = conn.execute(
+                "SELECT min(enqueued_at) AS oldest FROM note_jobs WHERE status = 'pending'"
+            ).fetchone()["oldest"]
+            history = conn.execute(
+                "SELECT status, wait_ms, run_ms FROM note_job_history ORDER BY id DESC LIMIT ?",
+                (HISTORY_LIMIT,),
+            ).fetchall()
+
+        wait = sorted(row["wait_ms"] for row in history if row["status"] == "done")
+        run = sorted(row["run_ms"] for row in history if row["status"] == "done")
+        return {
+            "depth": {
+                "pending": depth.get("pending", 0),
+                "running": depth.get("running", 0),
+                "failed": depth.get("failed", 0),
+            },
+            "oldest_pending_age_s": round(now - oldest, 1) if oldest else 0.0,
+            "recent": {
+                "completed": len(wait),
+                "failed": sum(1 for row in history if row["status"] == "failed"),
+            },
+            "wait_ms": {p: _percentile(wait, n) for p, n in (("p50", 50), ("p95", 95), ("p99", 99))},
+            "run_ms": {p: _percentile(run, n) for p, n in (("p50", 50), ("p95", 95), ("p99", 99))},
+        }
+
+    def _record_history(self, conn: sqlite3.Connection, job: Dict[str, Any], status: str, finished: float):
+        conn.execute(
+            """
+            INSERT INTO note_job_history (note_id, status, attempts, wait_ms, run_ms, finished_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                job["note_id"], status, job["attempt"],
+                (job["started_at"] - job["enqueued_at"]) * 1000,
+                (finished - job["started_at"]) * 1000,
+                finished,
+            ),
+        )
+        conn.execute(
+            "DELETE FROM note_job_history WHERE id <= (SELECT max(id) FROM note_job_history) - ?",
+            (HISTORY_LIMIT,),
+        )
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class NoteJobWorker:
+    """
+    큐에서 작업을 가져와 NoteService.run_ai_pipeline을 실행하는 비동기 워커
+
+    제공자별 동시 실행 제한(LLM 추출 / 임베딩)은 NoteService의 세마포어가 담당하고,
+    워커는 그보다 넉넉한 max_in_flight만큼 작업을 가져와 임베딩 배치가 모이도록 합니다.
+    """
+
+    def __init__(
+        self,
+        queue: NoteJobQueue,
+        max_in_flight: int = 16,
+        poll_interval_seconds: float = 1.0,
+        lease_seconds: float = 600.0,
+    ):
+        self.queue = queue
+        self.max_in_flight = max_in_flight
+        self.poll_interval_seconds = poll_interval_seconds
+        self.lease_seconds = lease_seconds
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._tasks: set = set()
+        self._stopping = False
+        self._runner: Optional[asyncio.Task] = None
+
+    def start(self):
+        """현재 이벤트 루프에서 워커 시작"""
+        if self._runner is None or self._runner.done():
+            self._stopping = False
+            self._runner = asyncio.create_task(self.run())
+
+    async def stop(self, timeout: float = 30.0):
+        """새 작업 수령을 멈추고 실행 중인 작업을 기다린 뒤 종료"""
+        self._stopping = True
+        if self._runner is not None:
+            try:
+                await asyncio.wait_for(self._runner, timeout=timeout)
+            except asyncio.TimeoutError:
+                self._runner.cancel()
+            self._runner = None
+
+    async def run(self):
+        recovered = await asyncio.to_thread(self.queue.requeue_stale, self.lease_seconds)
+        if recovered:
+            logger.info(f"♻️ Requeued {recovered} stale note jobs")
+        logger.info(f"👷 Note job worker started: {self.worker_id}")
+
+        last_recovery = time.time()
+        while not self._stopping:
+            try:
+                if time.time() - last_recovery > self.lease_seconds:
+                    await asyncio.to_thread(self.queue.requeue_stale, self.lease_seconds)
+                    last_recovery = time.time()
+
+                free = self.max_in_flight - len(self._tasks)
+                jobs = await asyncio.to_thread(self.queue.claim, self.worker_id, free) if free > 0 else []
+                for job in jobs:
+                    task = asyncio.create_task(self._execute(job))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+                if not jobs:
+                    await asyncio.sleep(self.poll_interval_seconds)
+            except Exception as e:
+                logger.error(f"Note job worker loop error: {e}", exc_info=True)
+                await asyncio.sleep(self.poll_interval_seconds)
+
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        logger.info(f"👷 Note job worker stopped: {self.worker_id}")
+
+    async def _execute(self, job: Dict[str, Any]):
+        from app.services.note_service import note_service
+
+        try:
+            await note_service.run_ai_pipeline(**job["payload"])
+            await asyncio.to_thread(self.queue.complete, job)
+        except Exception as e:
+            logger.error(f"❌ Note job failed for {job['note_id'][:50]}: {e}", exc_info=True)
+            await asyncio.to_thread(self.queue.fail, job, str(e))
+
+
+# Global instances
+note_job_queue = NoteJobQueue(
+    path=settings.job_queue_path,
+    max_attempts=settings.job_max_attempts,
+    backoff_base_seconds=settings.job_backoff_base_seconds,
+    backoff_max_seconds=settings.job_backoff_max_seconds,
+)
+
+note_job_worker = NoteJobWorker(
+    queue=note_job_queue,
+    max_in_flight=settings.job_worker_max_in_flight,
+    poll_interval_seconds=settings.job_poll_interval_seconds,
+    lease_seconds=settings.job_lease_seconds,
+)
@@ -0,0 +1,173 @@
+"""
+LLM 응답 캐시 (프롬프트 해시 → 응답, SQLite)
+
+클러스터 요약과 프라이버시 모드 노트 요약은 입력 프롬프트가 바이트 단위로 같으면
+같은 응답을 재사용해도 됩니다. 모델/메시지/응답 형식을 해시한 키로 응답을 저장하고,
+TTL 만료와 최대 항목 수(최근 사용 순) 기준으로 정리합니다.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key          TEXT PRIMARY KEY,
+    model        TEXT NOT NULL,
+    response     TEXT NOT NULL,
+    cost_usd     REAL NOT NULL DEFAULT 0,
+    hits         INTEGER NOT NULL DEFAULT 0,
+    created_at   REAL NOT NULL,
+    last_access  REAL NOT NULL,
+    expires_at   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_access ON llm_cache (last_access);
+"""
+
+# 이 횟수의 저장마다 만료/초과 항목 정리
+_EVICT_EVERY = 50
+
+
+def prompt_key(model: str, messages: List[Dict[str, str]], **options: Any) -> str:
+    """모델 + 메시지 + 옵션의 SHA-256 (캐시 키)"""
+    payload = json.dumps(
+        {"model": model, "messages": messages, "options": options},
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite 기반 LLM 응답 캐시 (thread-safe)"""
+
+    def __init__(self, path: str, ttl_hours: float = 720.0, max_entries: int = 10_000):
+        self.path = path
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes = 0
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "cost_saved_usd": 0.0}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시된 응답 (없거나 만료되면 None)"""
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT response, cost_usd FROM llm_cache WHERE key = ? AND expires_at > ?",
+                    (key, now),
+                ).fetchone()
+                if row is None:
+                    self.stats["misses"] += 1
+                    return None
+                conn.execute(
+                    "UPDATE llm_cache SET hits = hits + 1, last_access = ? WHERE key = ?",
+                    (now, key),
+                )
+                self.stats["hits"] += 1
+                self.stats["cost_saved_usd"] += row["cost_usd"]
+                return row["response"]
+        except Exception as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            return None
+
+    def set(self, key: str, model: str, response: str, cost_usd: float = 0.0):
+        """응답 저장 (같은 키는 덮어씀)"""
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    """
+                    INSERT INTO llm_cache (key, model, response, cost_usd, hits, created_at, last_access, expires_at)
+                    VALUES (?, ?, ?, ?, 0, ?, ?, ?)
+                    ON CONFLICT(key) DO UPDATE SET
+                        response = excluded.response,
+                        cost_usd = excluded.cost_usd,
+                        created_at = excluded.created_at,
+                        last_access = excluded.last_access,
+                        expires_at = excluded.expires_at
+                    """,
+                    (key, model, response, cost_usd, now, now, now + self.ttl_seconds),
+                )
+                self.stats["writes"] += 1
+                self._writes += 1
+                if self._writes % _EVICT_EVERY == 0:
+                    self._evict(conn, now)
+        except Exception as e:
+            logger.warning(f"LLM cache write failed: {e}")
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> int:
+        """만료 항목 삭제 후 max_entries 초과분을 오래 안 쓴 순서로 삭제"""
+        expired = conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,)).rowcount
+        overflow = conn.execute(
+            """
+            DELETE FROM llm_cache WHERE key IN (
+                SELECT key FROM llm_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,),
+        ).rowcount
+        if expired or overflow:
+            logger.info(f"LLM cache evicted {expired} expired, {overflow} over limit")
+        return expired + overflow
+
+    def evict(self) -> int:
+        with self._lock:
+            return self._evict(self._connect(), time.time())
+
+    def snapshot(self) -> Dict[str, Any]:
+        """프로세스 카운터 + 저장된 항목 통계"""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        result = {
+            **self.stats,
+            "cost_saved_usd": round(self.stats["cost_saved_usd"], 6),
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+        }
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT count(*) AS entries, coalesce(sum(hits * cost_usd), 0) AS saved FROM llm_cache"
+                ).fetchone()
+            result["entries"] = row["entries"]
+            result["lifetime_cost_saved_usd"] = round(row["saved"], 6)
+        except Exception as e:
+            logger.warning(f"LLM cache stats failed: {e}")
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._connect().execute("DELETE FROM llm_cache")
+
+
+# Global instance
+llm_cache = LLMResponseCache(
+    path=settings.llm_cache_path,
+    ttl_hours=settings.llm_cache_ttl_hours,
+    max_entries=settings.llm_cache_max_entries,
+)
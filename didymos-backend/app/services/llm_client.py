@@ -1,34 +1,111 @@
 """
 LLM 클라이언트: 노트 요약 & 클러스터 인사이트 생성
 Phase 11: GPT-5 Mini를 사용한 클러스터 요약
+
+모든 호출은 공유 디스패처(llm_dispatcher)를 거쳐 토큰 버킷/Vault 예산/재시도가 적용됩니다.
 """
+import asyncio
 import logging
 import json
-from typing import Dict, List, Any
+from typing import Any, Callable, Dict, List, Optional
 from app.config import settings
+from app.services.llm_cache import llm_cache, prompt_key
+from app.services.llm_dispatcher import LLMResponse, llm_dispatcher
 
 logger = logging.getLogger(__name__)
 
-try:
-    from openai import OpenAI
-
-    client = OpenAI(api_key=settings.openai_api_key)
-except Exception as e:
-    client = None
-    logger.error(f"OpenAI client init failed: {e}")
+# gpt-5-mini 토큰 단가 (USD / 1K tokens, 비용 로깅 및 캐시 절감액 계산용)
+PROMPT_COST_PER_1K = 0.00015
+COMPLETION_COST_PER_1K = 0.0006
+
+def _cached_completion(key: str, model: str) -> Optional[str]:
+    cached = llm_cache.get(key)
+    if cached is not None:
+        logger.info(f"LLM cache hit ({model}, key={key[:12]})")
+    return cached
+
+
+def _finish_completion(
+    key: str,
+    model: str,
+    response: LLMResponse,
+    use_cache: bool,
+    validate: Optional[Callable[[str], Any]]
+) -> str:
+    """토큰 사용량 로깅 + (검증 통과 시) 캐시 저장"""
+    content = response.content
+    cost = (response.prompt_tokens * PROMPT_COST_PER_1K + response.completion_tokens * COMPLETION_COST_PER_1K) / 1000
+    if response.prompt_tokens or response.completion_tokens:
+        logger.info(f"LLM call ({model}): {response.prompt_tokens} in, "
+                   f"{response.completion_tokens} out, cost: ${cost:.4f}")
+
+    if use_cache and content:
+        if validate is not None:
+            validate(content)
+        llm_cache.set(key, model, content, cost)
+    return content
+
+
+def _chat_completion(
+    messages: List[Dict[str, str]],
+    model: str = "gpt-5-mini",
+    use_cache: bool = True,
+    validate: Optional[Callable[[str], Any]] = None,
+    vault_id: Optional[str] = None,
+    **options: Any
+) -> str:
+    """
+    Chat completion 호출 (프롬프트 해시 캐시 적용)
 
+    같은 모델/메시지/옵션이면 캐시된 응답을 반환합니다.
+    validate가 주어지면 예외 없이 통과한 응답만 캐시에 저장합니다.
+    vault_id가 주어지면 해당 Vault의 LLM 예산에서 차감합니다.
 
-def summarize_content(content: str) -> str:
+    Returns:
+        응답 메시지 content
+    """
+    use_cache = use_cache and settings.llm_cache_enabled
+    key = prompt_key(model, messages, **options)
+    if use_cache:
+        cached = _cached_completion(key, model)
+        if cached is not None:
+            return cached
+
+    response = llm_dispatcher.complete_sync(messages, model=model, vault_id=vault_id, **options)
+    return _finish_completion(key, model, response, use_cache, validate)
+
+
+async def _chat_completion_async(
+    messages: List[Dict[str, str]],
+    model: str = "gpt-5-mini",
+    use_cache: bool = True,
+    validate: Optional[Callable[[str], Any]] = None,
+    vault_id: Optional[str] = None,
+    **options: Any
+) -> str:
+    """_chat_completion (비동기)"""
+    use_cache = use_cache and settings.llm_cache_enabled
+    key = prompt_key(model, messages, **options)
+    if use_cache:
+        cached = _cached_completion(key, model)
+        if cached is not None:
+            return cached
+
+    response = await llm_dispatcher.complete(messages, model=model, vault_id=vault_id, **options)
+    return _finish_completion(key, model, response, use_cache, validate)
+
+
+def summarize_content(content: str, use_cache: bool = True) -> str:
     """
     프라이버시 모드용 노트 요약 (2-3문장)
-    Model: gpt-5-mini
+    Model: gpt-5-mini (같은 입력은 캐시된 요약 재사용)
     """
     if not content:
         return ""
-    if client is None:
+    if not llm_dispatcher.available:
         return content[:200]
     try:
-        response = client.chat.completions.create(
+        summary = _chat_completion(
             model="gpt-5-mini",
             messages=[
                 {
@@ -37,8 +114,8 @@ def summarize_content(content: str) -> str:
                 },
                 {"role": "user", "content": content[:1000]},
             ],
+            use_cache=use_cache,
         )
-        summary = response.choices[0].message.content
         logger.info(f"Content summarized: {len(content)} -> {len(summary)} chars")
         return summary
     except Exception as e:
@@ -46,57 +123,7 @@ def summarize_content(content: str) -> str:
         return content[:200]
 
 
-def generate_cluster_summary(cluster_data: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    클러스터 요약 및 인사이트 생성 (Phase 11)
-    Model: gpt-5-mini (고품질 추론)
-
-    Args:
-        cluster_data: 클러스터 정보
-            - id: 클러스터 ID
-            - name: 클러스터 이름
-            - node_count: 노드 개수
-            - contains_types: 포함된 노드 타입 (예: {"topic": 80, "note": 65})
-            - sample_entities: 샘플 엔티티 이름들 (최대 10개)
-            - recent_updates: 최근 7일 업데이트 수
-
-    Returns:
-        {
-            "summary": "2-3문장 요약",
-            "key_insights": ["인사이트1", "인사이트2", "인사이트3"],
-            "next_actions": ["액션1", "액션2"]
-        }
-    """
-    if client is None:
-        logger.warning("OpenAI client not available, returning placeholder")
-        return {
-            "summary": f"이 클러스터는 {cluster_data.get('node_count', 0)}개의 노드로 구성되어 있습니다.",
-            "key_insights": [
-                "OpenAI API 연결이 필요합니다.",
-                "환경 변수를 확인하세요.",
-                "Placeholder 인사이트입니다."
-            ],
-            "next_actions": [
-                "OpenAI API 설정을 완료하세요."
-            ]
-        }
-
-    try:
-        # 프롬프트 구성
-        recent_updates = cluster_data.get('recent_updates', 0)
-        sample_notes = cluster_data.get('sample_notes', [])
-
-        cluster_info = f"""
-클러스터 정보:
-- 이름: {cluster_data.get('name', 'Unknown')}
-- 노드 수: {cluster_data.get('node_count', 0)}개
-- 구성: {cluster_data.get('contains_types', {})}
-- 샘플 엔티티: {', '.join(cluster_data.get('sample_entities', [])[:10])}
-- 최근 7일 업데이트: {recent_updates}개
-- 샘플 노트: {', '.join(sample_notes[:5])}
-"""
-
-        system_prompt = """당신은 지식 관리 및 의사결정 지원 전문가입니다.
+_CLUSTER_SUMMARY_SYSTEM_PROMPT = """당신은 지식 관리 및 의사결정 지원 전문가입니다.
 사용자의 지식 베이스에서 발견된 클러스터를 분석하여, 사용자가 이 클러스터에서 주목해야 할 점과 다음 행동을 명확하게 제안해야 합니다.
 
 응답 형식 (JSON):
@@ -119,60 +146,161 @@ def generate_cluster_summary(cluster_data: Dict[str, Any]) -> Dict[str, Any]:
 - next_actions는 즉시 실행 가능한 구체적 행동 제안 (예: "관련 노트들을 하나의 프로젝트로 통합하세요")
 - 한국어로 작성"""
 
-        response = client.chat.completions.create(
-            model="gpt-5-mini",  # Phase 11: GPT-5 Mini
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": cluster_info}
-            ],
-            response_format={"type": "json_object"}  # JSON 모드
-        )
-
-        result = json.loads(response.choices[0].message.content)
-
-        # 토큰 사용량 로깅
-        usage = response.usage
-        cost = (usage.prompt_tokens * 0.00015 + usage.completion_tokens * 0.0006) / 1000
-        logger.info(f"Cluster summary generated: {usage.prompt_tokens} in, "
-                   f"{usage.completion_tokens} out, cost: ${cost:.4f}")
 
-        return {
-            "summary": result.get("summary", "요약 생성 실패"),
-            "key_insights": result.get("key_insights", [
-                "인사이트 생성 실패",
-                "응답 형식을 확인하세요.",
-                "다시 시도해주세요."
-            ]),
-            "next_actions": result.get("next_actions", [
-                "다시 시도해주세요."
-            ])
-        }
+def _cluster_summary_messages(cluster_data: Dict[str, Any]) -> List[Dict[str, str]]:
+    """클러스터 요약 프롬프트 구성"""
+    recent_updates = cluster_data.get('recent_updates', 0)
+    sample_notes = cluster_data.get('sample_notes', [])
 
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse GPT-5 response as JSON: {e}")
+    cluster_info = f"""
+클러스터 정보:
+- 이름: {cluster_data.get('name', 'Unknown')}
+- 노드 수: {cluster_data.get('node_count', 0)}개
+- 구성: {cluster_data.get('contains_types', {})}
+- 샘플 엔티티: {', '.join(cluster_data.get('sample_entities', [])[:10])}
+- 최근 7일 업데이트: {recent_updates}개
+- 샘플 노트: {', '.join(sample_notes[:5])}
+"""
+    return [
+        {"role": "system", "content": _CLUSTER_SUMMARY_SYSTEM_PROMPT},
+        {"role": "user", "content": cluster_info}
+    ]
+
+
+def _unavailable_summary(cluster_data: Dict[str, Any]) -> Dict[str, Any]:
+    logger.warning("OpenAI client not available, returning placeholder")
+    return {
+        "summary": f"이 클러스터는 {cluster_data.get('node_count', 0)}개의 노드로 구성되어 있습니다.",
+        "key_insights": [
+            "OpenAI API 연결이 필요합니다.",
+            "환경 변수를 확인하세요.",
+            "Placeholder 인사이트입니다."
+        ],
+        "next_actions": [
+            "OpenAI API 설정을 완료하세요."
+        ]
+    }
+
+
+def _parse_cluster_summary(content: str) -> Dict[str, Any]:
+    result = json.loads(content)
+
+    return {
+        "summary": result.get("summary", "요약 생성 실패"),
+        "key_insights": result.get("key_insights", [
+            "인사이트 생성 실패",
+            "응답 형식을 확인하세요.",
+            "다시 시도해주세요."
+        ]),
+        "next_actions": result.get("next_actions", [
+            "다시 시도해주세요."
+        ])
+    }
+
+
+def _failed_summary(cluster_data: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+    if isinstance(error, json.JSONDecodeError):
+        logger.error(f"Failed to parse GPT-5 response as JSON: {error}")
         return {
             "summary": f"클러스터 '{cluster_data.get('name')}'는 {cluster_data.get('node_count')}개의 노드로 구성되어 있습니다.",
             "key_insights": ["JSON 파싱 오류", "다시 시도하세요."]
         }
 
-    except Exception as e:
-        logger.error(f"Cluster summary generation error: {e}")
-        return {
-            "summary": f"이 클러스터는 {cluster_data.get('node_count', 0)}개의 노드로 구성되어 있습니다.",
-            "key_insights": [
-                "요약 생성 중 오류 발생",
-                str(e)[:100],
-                "나중에 다시 시도하세요."
-            ]
+    logger.error(f"Cluster summary generation error: {error}")
+    return {
+        "summary": f"이 클러스터는 {cluster_data.get('node_count', 0)}개의 노드로 구성되어 있습니다.",
+        "key_insights": [
+            "요약 생성 중 오류 발생",
+            str(error)[:100],
+            "나중에 다시 시도하세요."
+        ]
+    }
+
+
+def generate_cluster_summary(
+    cluster_data: Dict[str, Any],
+    use_cache: bool = True,
+    vault_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    클러스터 요약 및 인사이트 생성 (Phase 11)
+    Model: gpt-5-mini (고품질 추론)
+
+    프롬프트(클러스터 구성)가 이전과 같으면 캐시된 응답을 재사용합니다.
+
+    Args:
+        cluster_data: 클러스터 정보
+            - id: 클러스터 ID
+            - name: 클러스터 이름
+            - node_count: 노드 개수
+            - contains_types: 포함된 노드 타입 (예: {"topic": 80, "note": 65})
+            - sample_entities: 샘플 엔티티 이름들 (최대 10개)
+            - recent_updates: 최근 7일 업데이트 수
+        use_cache: LLM 응답 캐시 사용 여부
+        vault_id: LLM 예산을 차감할 Vault ID
+
+    Returns:
+        {
+            "summary": "2-3문장 요약",
+            "key_insights": ["인사이트1", "인사이트2", "인사이트3"],
+            "next_actions": ["액션1", "액션2"]
         }
+    """
+    if not llm_dispatcher.available:
+        return _unavailable_summary(cluster_data)
+
+    try:
+        content = _chat_completion(
+            model="gpt-5-mini",  # Phase 11: GPT-5 Mini
+            messages=_cluster_summary_messages(cluster_data),
+            use_cache=use_cache,
+            validate=json.loads,  # JSON 파싱 가능한 응답만 캐시
+            vault_id=vault_id,
+            response_format={"type": "json_object"}  # JSON 모드
+        )
+        return _parse_cluster_summary(content)
+    except Exception as e:
+        return _failed_summary(cluster_data, e)
+
+
+async def generate_cluster_summary_async(
+    cluster_data: Dict[str, Any],
+    use_cache: bool = True,
+    vault_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """generate_cluster_summary (비동기)"""
+    if not llm_dispatcher.available:
+        return _unavailable_summary(cluster_data)
+
+    try:
+        content = await _chat_completion_async(
+            model="gpt-5-mini",
+            messages=_cluster_summary_messages(cluster_data),
+            use_cache=use_cache,
+            validate=json.loads,
+            vault_id=vault_id,
+            response_format={"type": "json_object"}
+        )
+        return _parse_cluster_summary(content)
+    except Exception as e:
+        return _failed_summary(cluster_data, e)
 
 
-def generate_batch_cluster_summaries(clusters: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+async def generate_batch_cluster_summaries_async(
+    clusters: List[Dict[str, Any]],
+    use_cache: bool = True,
+    vault_id: Optional[str] = None
+) -> List[Dict[str, Any]]:
     """
-    여러 클러스터에 대해 일괄 요약 생성 (병렬 처리)
+    여러 클러스터에 대해 일괄 요약 생성 (동시 요청)
+
+    동시성과 호출 속도는 공유 디스패처의 토큰 버킷/동시 요청 한도가 결정합니다.
+    구성이 바뀌지 않은 클러스터는 캐시된 응답을 사용하므로 API 비용이 들지 않습니다.
 
     Args:
         clusters: 클러스터 리스트
+        use_cache: LLM 응답 캐시 사용 여부
+        vault_id: LLM 예산을 차감할 Vault ID
 
     Returns:
         요약이 추가된 클러스터 리스트
@@ -182,42 +310,41 @@ def generate_batch_cluster_summaries(clusters: List[Dict[str, Any]]) -> List[Dic
 
     logger.info(f"Generating summaries for {len(clusters)} clusters (parallel batch)...")
 
-    # 병렬 처리를 위해 asyncio 사용하지 않고 ThreadPoolExecutor 사용
-    from concurrent.futures import ThreadPoolExecutor, as_completed
     import time
 
     start_time = time.time()
+    hits_before = llm_cache.stats["hits"]
 
-    def process_cluster(idx_cluster):
-        idx, cluster = idx_cluster
+    async def process_cluster(idx: int, cluster: Dict[str, Any]):
         try:
             logger.info(f"Processing cluster {idx+1}/{len(clusters)}: {cluster.get('name')}")
-            result = generate_cluster_summary(cluster)
+            result = await generate_cluster_summary_async(cluster, use_cache=use_cache, vault_id=vault_id)
             cluster["summary"] = result["summary"]
             cluster["key_insights"] = result["key_insights"]
             cluster["next_actions"] = result.get("next_actions", [])
-            return cluster, None
         except Exception as e:
             logger.error(f"Failed to generate summary for cluster {cluster.get('id')}: {e}")
             cluster["summary"] = f"요약 생성 실패: {str(e)[:100]}"
             cluster["key_insights"] = ["요약 생성 실패"]
             cluster["next_actions"] = []
-            return cluster, str(e)
 
-    # 최대 3개씩 병렬 처리 (OpenAI API rate limit 고려)
-    max_workers = min(3, len(clusters))
-
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(process_cluster, (i, cluster)): i
-                  for i, cluster in enumerate(clusters)}
-
-        completed = 0
-        for future in as_completed(futures):
-            completed += 1
-            cluster, error = future.result()
-            if error:
-                logger.warning(f"Cluster processing had error: {error}")
+    await asyncio.gather(*(process_cluster(i, cluster) for i, cluster in enumerate(clusters)))
 
     elapsed = time.time() - start_time
-    logger.info(f"✅ Batch summary generation completed for {len(clusters)} clusters in {elapsed:.2f}s")
+    cache_hits = llm_cache.stats["hits"] - hits_before
+    logger.info(f"✅ Batch summary generation completed for {len(clusters)} clusters in {elapsed:.2f}s "
+                f"({cache_hits} from cache)")
     return clusters
+
+
+def generate_batch_cluster_summaries(
+    clusters: List[Dict[str, Any]],
+    use_cache: bool = True,
+    vault_id: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """generate_batch_cluster_summaries_async (동기 코드용, 디스패처 루프에서 실행)"""
+    if not clusters:
+        return clusters
+    return llm_dispatcher.run_sync(
+        generate_batch_cluster_summaries_async(clusters, use_cache=use_cache, vault_id=vault_id)
+    )
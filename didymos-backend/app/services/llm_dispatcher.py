@@ -0,0 +1,595 @@
+"""
+공유 비동기 LLM 디스패처 (토큰 버킷 + Vault 예산 + 재시도)
+
+클러스터 요약은 ThreadPoolExecutor(max_workers=3)와 동기 OpenAI 클라이언트로,
+엔티티 추출은 전역 락 + 고정 최소 간격(0.5초)으로 각자 호출 속도를 제한했습니다.
+이 모듈은 프로세스의 모든 LLM 호출을 하나의 디스패처로 모읍니다.
+
+- 요청/토큰 두 개의 토큰 버킷 (분당 한도). 응답의 x-ratelimit-* 헤더로 한도와 잔량을 갱신
+- Vault별 시간당 요청/토큰 예산 (LLM_VAULT_*_PER_HOUR, 0이면 무제한)
+- 429/일시 오류는 지수 백오프 + full jitter로 재시도 (retry-after 우선, 429는 모든 호출을 잠시 멈춤)
+- 제공자 교체 가능 (LLM_PROVIDER=openai | fake). fake는 네트워크 없이 지연과 서버 측 한도를
+  시뮬레이션해 경쟁 상황의 처리량을 오프라인으로 측정합니다 (benchmarks/bench_llm_dispatcher.py)
+
+디스패처 상태는 전용 이벤트 루프 스레드 하나가 소유하며,
+동기 코드(스레드)는 *_sync로, 비동기 코드는 await로 호출합니다.
+"""
+import asyncio
+import json
+import logging
+import random
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 응답 토큰 수 추정치 (max_completion_tokens가 없을 때, 실제 사용량으로 보정)
+DEFAULT_COMPLETION_TOKENS = 800
+
+# 메시지당 포맷 오버헤드 (OpenAI chat 형식)
+_MESSAGE_OVERHEAD_TOKENS = 4
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+class LLMResponse:
+    """LLM 응답 (content + 토큰 사용량 + 응답 헤더)"""
+
+    def __init__(
+        self,
+        content: str,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        headers: Optional[Dict[str, str]] = None
+    ):
+        self.content = content
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.headers = headers or {}
+
+
+class LLMRateLimitError(Exception):
+    """제공자 429 (retry_after: 서버가 알려준 대기 시간)"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.headers = headers or {}
+
+
+class LLMTransientError(Exception):
+    """재시도 가능한 일시 오류 (연결 실패, 타임아웃, 5xx)"""
+
+
+class LLMBudgetExceeded(Exception):
+    """Vault의 시간당 LLM 요청/토큰 예산 초과"""
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """OpenAI reset/retry 헤더 값("1s", "6m0s", "20ms", "1.5") → 초"""
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    parts = _DURATION_PART.findall(str(value))
+    if not parts:
+        return None
+    scale = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+    return sum(float(amount) * scale[unit] for amount, unit in parts)
+
+
+def _header_int(headers: Dict[str, str], name: str) -> Optional[int]:
+    try:
+        return int(float(headers[name]))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def retry_after_from_headers(headers: Dict[str, str]) -> Optional[float]:
+    """retry-after-ms / retry-after 헤더 (초)"""
+    if not headers:
+        return None
+    headers = {k.lower(): v for k, v in headers.items()}
+    if "retry-after-ms" in headers:
+        seconds = parse_duration(headers["retry-after-ms"])
+        return seconds / 1000 if seconds is not None else None
+    return parse_duration(headers.get("retry-after"))
+
+
+def estimate_tokens(messages: List[Dict[str, str]], completion_tokens: int = DEFAULT_COMPLETION_TOKENS) -> int:
+    """요청 1건이 소비할 토큰 수 추정 (프롬프트 + 예상 응답)"""
+    from app.services.embedding_pipeline import count_tokens
+
+    prompt = sum(count_tokens(m.get("content") or "") + _MESSAGE_OVERHEAD_TOKENS for m in messages)
+    return prompt + completion_tokens
+
+
+class TokenBucket:
+    """
+    분당 한도 토큰 버킷 (디스패처 루프 안에서만 사용)
+
+    잔량은 음수가 될 수 있으며(추정보다 많이 쓴 호출의 부채), 리필로 상환됩니다.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, amount: float) -> float:
+        """amount를 꺼낼 수 있을 때까지 남은 시간 (0이면 즉시, 용량보다 큰 요청은 가득 찰 때까지)"""
+        now = time.monotonic()
+        self._refill(now)
+        blocked = max(0.0, self._blocked_until - now)
+        shortfall = min(amount, self.capacity) - self.tokens
+        if shortfall <= 0:
+            return blocked
+        return max(blocked, shortfall / max(self.rate, 1e-9))
+
+    def take(self, amount: float):
+        self._refill(time.monotonic())
+        self.tokens -= amount
+
+    def observe(self, limit: Optional[int], remaining: Optional[int], reset_seconds: Optional[float]):
+        """x-ratelimit-* 헤더로 한도/잔량 갱신 (서버 값이 기준)"""
+        now = time.monotonic()
+        self._refill(now)
+        if limit:
+            self.capacity = float(limit)
+            self.rate = self.capacity / 60.0
+        if remaining is not None:
+            self.tokens = min(self.tokens, float(remaining))
+            if remaining <= 0 and reset_seconds:
+                self._blocked_until = max(self._blocked_until, now + reset_seconds)
+
+    def pause(self, seconds: float):
+        """429 수신 시 버킷을 비우고 seconds 동안 꺼내지 못하게 함"""
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0)
+        self._blocked_until = max(self._blocked_until, now + seconds)
+
+    def snapshot(self) -> Dict[str, float]:
+        # 다른 스레드에서 호출되므로 상태를 바꾸지 않고 계산만 함
+        now = time.monotonic()
+        available = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        return {
+            "per_minute": round(self.capacity, 1),
+            "available": round(available, 1),
+            "blocked_seconds": round(max(0.0, self._blocked_until - now), 2),
+        }
+
+
+class VaultBudget:
+    """Vault별 시간당 요청/토큰 예산 (고정 1시간 창, 0이면 무제한)"""
+
+    WINDOW_SECONDS = 3600
+
+    def __init__(self, requests_per_hour: int = 0, tokens_per_hour: int = 0):
+        self.requests_per_hour = requests_per_hour
+        self.tokens_per_hour = tokens_per_hour
+        self._usage: Dict[str, Dict[str, float]] = {}
+
+    def _window(self, vault_id: str) -> Dict[str, float]:
+        now = time.time()
+        usage = self._usage.get(vault_id)
+        if usage is None or now - usage["started_at"] >= self.WINDOW_SECONDS:
+            usage = {"started_at": now, "requests": 0, "tokens": 0}
+            self._usage[vault_id] = usage
+        return usage
+
+    def reserve(self, vault_id: Optional[str], tokens: int):
+        """예산 확인 후 요청 1건 + 추정 토큰 예약 (초과 시 LLMBudgetExceeded)"""
+        if not vault_id:
+            return
+        usage = self._window(vault_id)
+        if self.requests_per_hour and usage["requests"] + 1 > self.requests_per_hour:
+            raise LLMBudgetExceeded(f"Vault {vault_id} exceeded {self.requests_per_hour} LLM requests/hour")
+        if self.tokens_per_hour and usage["tokens"] + tokens > self.tokens_per_hour:
+            raise LLMBudgetExceeded(f"Vault {vault_id} exceeded {self.tokens_per_hour} LLM tokens/hour")
+        usage["requests"] += 1
+        usage["tokens"] += tokens
+
+    def adjust(self, vault_id: Optional[str], tokens: int):
+        """예약한 추정 토큰을 실제 사용량으로 보정"""
+        if not vault_id or vault_id not in self._usage:
+            return
+        usage = self._usage[vault_id]
+        usage["tokens"] = max(0, usage["tokens"] + tokens)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        now = time.time()
+        return {
+            vault_id: {"requests": int(u["requests"]), "tokens": int(u["tokens"])}
+            for vault_id, u in list(self._usage.items())
+            if now - u["started_at"] < self.WINDOW_SECONDS
+        }
+
+
+class OpenAILLMProvider:
+    """AsyncOpenAI chat.completions (응답 헤더 포함)"""
+
+    name = "openai"
+
+    def __init__(self):
+        from openai import AsyncOpenAI
+        self._client = AsyncOpenAI(api_key=settings.openai_api_key, max_retries=0)  # 재시도는 디스패처가 담당
+
+    async def complete(self, model: str, messages: List[Dict[str, str]], **options: Any) -> LLMResponse:
+        import openai
+
+        try:
+            raw = await self._client.chat.completions.with_raw_response.create(
+                model=model, messages=messages, **options
+            )
+        except openai.RateLimitError as e:
+            headers = dict(e.response.headers) if getattr(e, "response", None) is not None else {}
+            raise LLMRateLimitError(str(e), retry_after_from_headers(headers), headers) from e
+        except (openai.APIConnectionError, openai.InternalServerError) as e:
+            raise LLMTransientError(str(e)) from e
+
+        completion = raw.parse()
+        usage = getattr(completion, "usage", None)
+        return LLMResponse(
+            content=completion.choices[0].message.content,
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else 0,
+            headers=dict(raw.headers),
+        )
+
+
+class FakeLLMProvider:
+    """
+    네트워크 없이 동작하는 LLM 제공자 (벤치마크/개발용)
+
+    서버 측 분당 요청/토큰 한도를 60초 슬라이딩 윈도로 시뮬레이션해 초과 시 429를 내고,
+    OpenAI 형식의 x-ratelimit-* 헤더를 돌려줍니다. 응답 내용에는 의미가 없습니다.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        latency_s: float = 0.2,
+        requests_per_minute: int = 500,
+        tokens_per_minute: int = 200_000,
+        jitter: float = 0.2
+    ):
+        self.latency_s = latency_s
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.jitter = jitter
+        self._events: deque = deque()  # (timestamp, tokens)
+        self.calls = 0
+        self.rejected = 0
+
+    def _headers(self, now: float) -> Dict[str, str]:
+        used_tokens = sum(tokens for _, tokens in self._events)
+        reset = 60.0 - (now - self._events[0][0]) if self._events else 0.0
+        return {
+            "x-ratelimit-limit-requests": str(self.requests_per_minute),
+            "x-ratelimit-remaining-requests": str(max(0, self.requests_per_minute - len(self._events))),
+            "x-ratelimit-reset-requests": f"{reset:.3f}s",
+            "x-ratelimit-limit-tokens": str(self.tokens_per_minute),
+            "x-ratelimit-remaining-tokens": str(max(0, self.tokens_per_minute - used_tokens)),
+            "x-ratelimit-reset-tokens": f"{reset:.3f}s",
+        }
+
+    async def complete(self, model: str, messages: List[Dict[str, str]], **options: Any) -> LLMResponse:
+        from app.services.embedding_pipeline import count_tokens
+
+        prompt_tokens = sum(count_tokens(m.get("content") or "") for m in messages)
+        if options.get("response_format", {}).get("type") == "json_object":
+            content = json.dumps({
+                "summary": "Fake summary.",
+                "key_insights": ["Fake insight 1", "Fake insight 2", "Fake insight 3"],
+                "next_actions": ["Fake action"],
+            })
+        else:
+            content = "Fake response: " + (messages[-1].get("content") or "")[:80]
+        completion_tokens = count_tokens(content)
+        total = prompt_tokens + completion_tokens
+
+        now = time.monotonic()
+        while self._events and now - self._events[0][0] >= 60.0:
+            self._events.popleft()
+        used_tokens = sum(tokens for _, tokens in self._events)
+        if len(self._events) + 1 > self.requests_per_minute or used_tokens + total > self.tokens_per_minute:
+            self.rejected += 1
+            headers = self._headers(now)
+            retry_after = 60.0 - (now - self._events[0][0]) if self._events else 1.0
+            headers["retry-after"] = f"{retry_after:.3f}"
+            raise LLMRateLimitError("429 Too Many Requests (fake provider)", retry_after, headers)
+
+        self._events.append((now, total))
+        self.calls += 1
+        await asyncio.sleep(self.latency_s * random.uniform(1 - self.jitter, 1 + self.jitter))
+        return LLMResponse(content, prompt_tokens, completion_tokens, self._headers(time.monotonic()))
+
+
+def get_llm_provider(name: Optional[str] = None):
+    """설정된 LLM 제공자 반환"""
+    name = (name or settings.llm_provider).lower()
+    if name == "fake":
+        return FakeLLMProvider()
+    return OpenAILLMProvider()
+
+
+class LLMDispatcher:
+    """프로세스 공용 LLM 호출 디스패처"""
+
+    def __init__(
+        self,
+        provider=None,
+        max_concurrency: Optional[int] = None,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        retry_base_seconds: Optional[float] = None,
+        retry_max_seconds: Optional[float] = None,
+        vault_requests_per_hour: Optional[int] = None,
+        vault_tokens_per_hour: Optional[int] = None
+    ):
+        self._provider = provider
+        self._provider_error: Optional[str] = None
+        self.max_concurrency = max_concurrency or settings.llm_max_concurrency
+        self.max_retries = settings.llm_max_retries if max_retries is None else max_retries
+        self.retry_base_seconds = retry_base_seconds or settings.llm_retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds or settings.llm_retry_max_seconds
+        self.requests = TokenBucket(requests_per_minute or settings.llm_requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute or settings.llm_tokens_per_minute)
+        self.budget = VaultBudget(
+            settings.llm_vault_requests_per_hour if vault_requests_per_hour is None else vault_requests_per_hour,
+            settings.llm_vault_tokens_per_hour if vault_tokens_per_hour is None else vault_tokens_per_hour,
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._admission: Optional[asyncio.Lock] = None
+        self._in_flight = 0
+        self.stats = {
+            "requests": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "budget_rejected": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "wait_seconds": 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # 제공자 / 이벤트 루프
+    # ------------------------------------------------------------------
+
+    @property
+    def provider(self):
+        if self._provider is None:
+            self._provider = get_llm_provider()
+        return self._provider
+
+    @property
+    def available(self) -> bool:
+        """제공자 초기화 가능 여부 (OpenAI 패키지/키가 없으면 False)"""
+        if self._provider is not None:
+            return True
+        if self._provider_error is not None:
+            return False
+        try:
+            self.provider
+            return True
+        except Exception as e:
+            self._provider_error = str(e)
+            logger.error(f"LLM provider init failed: {e}")
+            return False
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=loop.run_forever, name="llm-dispatcher", daemon=True)
+                self._thread.start()
+                self._loop = loop
+            return self._loop
+
+    def run_sync(self, coro: Awaitable[Any]) -> Any:
+        """디스패처 루프에서 코루틴을 실행하고 결과를 기다림 (동기 코드/다른 스레드용)"""
+        loop = self._ensure_loop()
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("run_sync called from the dispatcher loop; await the coroutine instead")
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    async def _on_loop(self, coro: Awaitable[Any]) -> Any:
+        loop = self._ensure_loop()
+        if asyncio.get_running_loop() is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    # ------------------------------------------------------------------
+    # 공개 API
+    # ------------------------------------------------------------------
+
+    async def complete(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "gpt-5-mini",
+        vault_id: Optional[str] = None,
+        **options: Any
+    ) -> LLMResponse:
+        """Chat completion (토큰 버킷 + Vault 예산 + 재시도)"""
+        estimated = estimate_tokens(
+            messages, options.get("max_completion_tokens") or DEFAULT_COMPLETION_TOKENS
+        )
+        return await self._on_loop(self._dispatch(
+            lambda: self.provider.complete(model, messages, **options), estimated, vault_id
+        ))
+
+    def complete_sync(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "gpt-5-mini",
+        vault_id: Optional[str] = None,
+        **options: Any
+    ) -> LLMResponse:
+        """complete (동기 코드용)"""
+        return self.run_sync(self.complete(messages, model=model, vault_id=vault_id, **options))
+
+    async def call(self, fn: Callable[[], Any], estimated_tokens: int, vault_id: Optional[str] = None) -> Any:
+        """
+        임의의 동기 LLM 호출(예: LangChain 변환기)을 같은 한도 아래에서 스레드로 실행
+
+        응답 헤더/사용량을 알 수 없으므로 추정 토큰만 차감하고, 429는 예외 내용으로 판별합니다.
+        """
+        return await self._on_loop(self._dispatch(lambda: asyncio.to_thread(fn), estimated_tokens, vault_id))
+
+    def call_sync(self, fn: Callable[[], Any], estimated_tokens: int, vault_id: Optional[str] = None) -> Any:
+        """call (동기 코드용)"""
+        return self.run_sync(self.call(fn, estimated_tokens, vault_id))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """메트릭 (/metrics/llm)"""
+        return {
+            "provider": getattr(self._provider, "name", settings.llm_provider),
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            **{k: round(v, 2) if isinstance(v, float) else v for k, v in self.stats.items()},
+            "request_bucket": self.requests.snapshot(),
+            "token_bucket": self.tokens.snapshot(),
+            "vault_usage": self.budget.snapshot(),
+        }
+
+    # ------------------------------------------------------------------
+    # 내부 (디스패처 루프에서만 실행)
+    # ------------------------------------------------------------------
+
+    async def _acquire(self, estimated_tokens: int):
+        """요청 1개 + 추정 토큰을 버킷에서 꺼냄 (도착 순서대로)"""
+        if self._admission is None:
+            self._admission = asyncio.Lock()
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        started = time.monotonic()
+        async with self._admission:
+            while True:
+                wait = max(self.requests.delay(1), self.tokens.delay(estimated_tokens))
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            self.requests.take(1)
+            self.tokens.take(estimated_tokens)
+        self.stats["wait_seconds"] += time.monotonic() - started
+
+    def _observe(self, headers: Dict[str, str]):
+        if not headers:
+            return
+        headers = {k.lower(): v for k, v in headers.items()}
+        self.requests.observe(
+            _header_int(headers, "x-ratelimit-limit-requests"),
+            _header_int(headers, "x-ratelimit-remaining-requests"),
+            parse_duration(headers.get("x-ratelimit-reset-requests")),
+        )
+        self.tokens.observe(
+            _header_int(headers, "x-ratelimit-limit-tokens"),
+            _header_int(headers, "x-ratelimit-remaining-tokens"),
+            parse_duration(headers.get("x-ratelimit-reset-tokens")),
+        )
+
+    @staticmethod
+    def _classify(error: Exception) -> Tuple[Optional[str], Optional[float], Dict[str, str]]:
+        """(kind, retry_after, headers) - kind: "rate_limit" | "transient" | None(재시도 안 함)"""
+        if isinstance(error, LLMRateLimitError):
+            return "rate_limit", error.retry_after, error.headers
+        if isinstance(error, LLMTransientError):
+            return "transient", None, {}
+
+        # LangChain 등을 거쳐 올라온 openai 예외
+        response = getattr(error, "response", None)
+        headers = dict(getattr(response, "headers", None) or {})
+        status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+        name = type(error).__name__
+        text = str(error).lower()
+        if status == 429 or name == "RateLimitError" or "rate limit" in text or "rate_limit" in text \
+                or "429" in text or "too many" in text:
+            return "rate_limit", retry_after_from_headers(headers), headers
+        if name in ("APIConnectionError", "APITimeoutError", "InternalServerError") or (status or 0) >= 500:
+            return "transient", None, headers
+        return None, None, headers
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        """지수 백오프 + full jitter (retry_after가 있으면 그 이후로 분산)"""
+        ceiling = min(self.retry_max_seconds, self.retry_base_seconds * (2 ** attempt))
+        if retry_after is not None:
+            return min(self.retry_max_seconds, retry_after) + random.uniform(0, self.retry_base_seconds)
+        return random.uniform(0, ceiling)
+
+    async def _dispatch(
+        self,
+        factory: Callable[[], Awaitable[Any]],
+        estimated_tokens: int,
+        vault_id: Optional[str]
+    ) -> Any:
+        self.stats["requests"] += 1
+        try:
+            self.budget.reserve(vault_id, estimated_tokens)
+        except LLMBudgetExceeded:
+            self.stats["budget_rejected"] += 1
+            raise
+
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(estimated_tokens)
+            try:
+                async with self._semaphore:
+                    self._in_flight += 1
+                    try:
+                        result = await factory()
+                    finally:
+                        self._in_flight -= 1
+            except Exception as e:
+                kind, retry_after, headers = self._classify(e)
+                self._observe(headers)
+                if kind is None or attempt >= self.max_retries:
+                    self.stats["failed"] += 1
+                    self.budget.adjust(vault_id, -estimated_tokens)
+                    if kind == "rate_limit" and not isinstance(e, LLMRateLimitError):
+                        raise LLMRateLimitError(str(e), retry_after, headers) from e
+                    raise
+                delay = self._backoff(attempt, retry_after)
+                if kind == "rate_limit":
+                    # 서버가 거절했으므로 이 호출만이 아니라 모든 대기 호출을 멈춤
+                    self.stats["rate_limited"] += 1
+                    self.requests.pause(delay)
+                    self.tokens.pause(delay)
+                self.stats["retries"] += 1
+                logger.warning(f"LLM {kind} (attempt {attempt + 1}/{self.max_retries + 1}), "
+                               f"retrying in {delay:.2f}s: {str(e)[:200]}")
+                await asyncio.sleep(delay)
+                continue
+
+            if isinstance(result, LLMResponse):
+                self._observe(result.headers)
+                actual = result.prompt_tokens + result.completion_tokens
+                if actual:
+                    self.tokens.take(actual - estimated_tokens)
+                    self.budget.adjust(vault_id, actual - estimated_tokens)
+                self.stats["prompt_tokens"] += result.prompt_tokens
+                self.stats["completion_tokens"] += result.completion_tokens
+            self.stats["succeeded"] += 1
+            return result
+
+
+# Global instance
+llm_dispatcher = LLMDispatcher()
@@ -5,90 +5,227 @@ Handles business logic for note management, including synchronization and AI pro
 import asyncio
 import logging
 from datetime import datetime
-from typing import Optional, Dict, Any, List
-
-from fastapi import BackgroundTasks
+from typing import Optional, Dict, Any, List, AsyncIterator, Tuple
 
 from app.config import settings
 from app.db.neo4j import get_neo4j_client
-from app.services.graph_service import upsert_note, get_note, get_all_notes
+from app.services.graph_service import upsert_notes, mark_note_processed
 from app.services.llm_client import summarize_content
+from app.services.embedding_pipeline import embedding_batcher
+from app.services.job_queue import note_job_queue
+from app.services.vault_version import vault_versions
+from app.services.cooccurrence_service import update_cooccurrence_safely
 from app.services.context_service import get_note_context
 from app.services.graph_visualization_service import get_note_graph_vis
-from app.utils.cache import TTLCache
+from app.utils.cache import TTLCache, shared_l2_backend
+from app.utils.content_hash import (
+    content_hash as compute_content_hash,
+    section_hashes as compute_section_hashes,
+    changed_sections,
+)
 
 logger = logging.getLogger(__name__)
 
 # Feature flag for Graphiti
 USE_GRAPHITI = getattr(settings, 'use_graphiti', False)
 
-# Rate limiting: AI processing limit
-_ai_semaphore = asyncio.Semaphore(2)
-_AI_PROCESSING_DELAY = 1.0
+# Per-provider concurrency: LLM extraction calls per worker process
+# (embeddings are coalesced by embedding_batcher, one API call at a time)
+_llm_semaphore = asyncio.Semaphore(settings.job_llm_concurrency)
 
 
 class NoteService:
     def __init__(self):
-        self.context_cache = TTLCache(ttl_seconds=300)
-        self.graph_cache = TTLCache(ttl_seconds=300)
+        # Entries are stored with the vault version they were built at, so a version bump
+        # (local or from another replica) makes them misses without wiping L1/L2
+        self.context_cache = TTLCache(ttl_seconds=300, namespace="note_context", l2=shared_l2_backend())
+        self.graph_cache = TTLCache(ttl_seconds=300, namespace="note_graph", l2=shared_l2_backend())
+        # note_id -> vault_id (a note never moves between vaults)
+        self._note_vaults = TTLCache(ttl_seconds=3600, maxsize=10000, namespace="note_vault")
+
+    def _note_version(self, note_id: str) -> Optional[int]:
+        """
+        Current version of the vault that owns the note (None if the note has no vault).
+        """
+        vault_id = self._note_vaults.get(note_id)
+        client = get_neo4j_client()
+        if vault_id is None:
+            result = client.query(
+                "MATCH (v:Vault)-[:HAS_NOTE]->(:Note {note_id: $note_id}) RETURN v.id AS vault_id",
+                {"note_id": note_id}
+            )
+            if not result:
+                return None
+            vault_id = result[0]["vault_id"]
+            self._note_vaults.set(note_id, vault_id)
+        return vault_versions.current(vault_id, client)
 
     async def sync_note(
         self,
         user_id: str,
         vault_id: str,
         note_data: Dict[str, Any],
-        privacy_mode: str,
-        background_tasks: BackgroundTasks
+        privacy_mode: str
     ) -> Dict[str, Any]:
         """
-        Syncs a note to Neo4j and schedules background AI processing.
+        Syncs a note to Neo4j and enqueues AI processing on the durable job queue.
+        AI processing is skipped when the normalized content hash is unchanged.
         """
         client = get_neo4j_client()
-        
-        # 1. Save to Neo4j
-        success = upsert_note(
-            client=client,
-            user_id=user_id,
-            vault_id=vault_id,
-            note_data=note_data,
-        )
 
-        if not success:
+        # 1. Save to Neo4j (returns the hash recorded at the last AI processing)
+        saved = await asyncio.to_thread(upsert_notes, client, user_id, vault_id, [note_data])
+
+        if not saved:
             raise Exception("Failed to save note to database")
 
-        # 2. Prepare content for AI processing
-        content_for_ai = note_data.get("content", "")
-        if privacy_mode == "summary":
-            content_for_ai = summarize_content(content_for_ai)
-        elif privacy_mode == "metadata":
-            content_for_ai = ""
-
-        ai_scheduled = False
-        if content_for_ai:
-            background_tasks.add_task(
-                self.process_note_background,
-                note_id=note_data["note_id"],
-                content=content_for_ai,
-                tags=note_data.get("tags", []),
-                path=note_data.get("path", ""),
-                title=note_data.get("title", ""),
-                created_at=note_data.get("created_at", ""),
-                updated_at=note_data.get("updated_at", "")
-            )
-            ai_scheduled = True
-            logger.info(f"📋 AI processing scheduled for: {note_data['note_id'][:50]}...")
+        # 2. Decide AI processing from content hashes
+        ai_status, job, plan = await self._prepare_ai_job(note_data, privacy_mode, saved[0])
+
+        if job:
+            await asyncio.to_thread(note_job_queue.enqueue, job)
+            logger.info(f"📋 AI processing ({ai_status}) queued for: {note_data['note_id'][:50]}...")
 
         message = "Note synced successfully"
-        if ai_scheduled:
-            message += ". AI processing scheduled in background."
+        if ai_status == "scheduled":
+            message += ". AI processing queued."
+        elif ai_status == "partial":
+            message += f". AI processing scheduled for {plan['sections_changed']} changed section(s)."
+        elif ai_status == "skipped":
+            message += ". Content unchanged, AI processing skipped."
 
         return {
             "status": "success",
             "note_id": note_data["note_id"],
             "message": message,
+            "ai_status": ai_status,
+            "ai_skipped": 1 if ai_status == "skipped" else 0,
+            "sections_total": plan.get("sections_total"),
+            "sections_changed": plan.get("sections_changed"),
         }
 
-    async def process_note_background(
+    async def sync_notes_batch(
+        self,
+        user_id: str,
+        vault_id: str,
+        notes: List[Dict[str, Any]],
+        privacy_mode: str
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Syncs many notes in one UNWIND transaction and yields per-note status events.
+
+        AI jobs for all changed notes are enqueued in one queue transaction.
+        The final event has type "summary" with aggregate counts.
+        """
+        client = get_neo4j_client()
+
+        saved_rows = await asyncio.to_thread(upsert_notes, client, user_id, vault_id, notes)
+        saved = {row["note_id"]: row for row in saved_rows}
+
+        ai_jobs: List[Dict[str, Any]] = []
+        synced = 0
+        failed = 0
+        skipped = 0
+        partial = 0
+
+        for note_data in notes:
+            note_id = note_data["note_id"]
+            if note_id not in saved:
+                failed += 1
+                yield {"type": "note", "note_id": note_id, "status": "error", "message": "Failed to save note to database"}
+                continue
+
+            synced += 1
+            ai_status, job, _ = await self._prepare_ai_job(note_data, privacy_mode, saved[note_id])
+            if job:
+                ai_jobs.append(job)
+            if ai_status == "skipped":
+                skipped += 1
+            elif ai_status == "partial":
+                partial += 1
+
+            yield {
+                "type": "note",
+                "note_id": note_id,
+                "status": "success",
+                "ai_scheduled": job is not None,
+                "ai_status": ai_status,
+            }
+
+        if ai_jobs:
+            await asyncio.to_thread(note_job_queue.enqueue_many, ai_jobs)
+            logger.info(f"📋 AI processing queued for {len(ai_jobs)} notes (batch)")
+
+        yield {
+            "type": "summary",
+            "status": "success" if failed == 0 else "partial",
+            "total": len(notes),
+            "synced": synced,
+            "failed": failed,
+            "ai_scheduled": len(ai_jobs),
+            "ai_skipped": skipped,
+            "ai_partial": partial,
+        }
+
+    async def _prepare_ai_job(
+        self,
+        note_data: Dict[str, Any],
+        privacy_mode: str,
+        stored: Dict[str, Any]
+    ) -> Tuple[str, Optional[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Compares the note's normalized content hash with the hash stored at the
+        last AI processing and builds the job payload (run_ai_pipeline kwargs).
+
+        Returns:
+            (ai_status, job payload or None, plan)
+            ai_status is one of "none" | "skipped" | "scheduled" | "partial".
+        """
+        content = note_data.get("content", "")
+        if privacy_mode == "metadata" or not content:
+            return "none", None, {}
+
+        new_hash = compute_content_hash(content, salt=privacy_mode)
+        # Section-level reprocessing only applies to full content
+        new_sections = compute_section_hashes(content) if privacy_mode == "full" else []
+        plan = {"sections_total": len(new_sections), "sections_changed": len(new_sections)}
+
+        if stored.get("content_hash") == new_hash:
+            plan["sections_changed"] = 0
+            return "skipped", None, plan
+
+        ai_status = "scheduled"
+        extraction_content = None
+        previous_sections = stored.get("section_hashes") or []
+        if USE_GRAPHITI and new_sections and previous_sections:
+            # Graphiti keeps earlier episodes, so only changed sections need extraction
+            changed = changed_sections(content, previous_sections)
+            if len(changed) < len(new_sections):
+                ai_status = "partial"
+                extraction_content = "\n\n".join(changed)
+                plan["sections_changed"] = len(changed)
+
+        content_for_ai = content
+        if privacy_mode == "summary":
+            content_for_ai = await asyncio.to_thread(summarize_content, content)
+        if not content_for_ai:
+            return "none", None, plan
+
+        job = {
+            "note_id": note_data["note_id"],
+            "content": content_for_ai,
+            "tags": note_data.get("tags", []),
+            "path": note_data.get("path", ""),
+            "title": note_data.get("title", ""),
+            "created_at": note_data.get("created_at", ""),
+            "updated_at": note_data.get("updated_at", ""),
+            "extraction_content": extraction_content,
+            "content_hash": new_hash,
+            "section_hashes": new_sections,
+        }
+        return ai_status, job, plan
+
+    async def run_ai_pipeline(
         self,
         note_id: str,
         content: str,
@@ -96,70 +233,108 @@ class NoteService:
         path: str,
         title: str,
         created_at: str,
-        updated_at: str
+        updated_at: str,
+        extraction_content: Optional[str] = None,
+        content_hash: Optional[str] = None,
+        section_hashes: Optional[List[str]] = None
     ):
         """
-        Background AI processing: Entity extraction and Embedding generation.
-        """
-        async with _ai_semaphore:
-            await asyncio.sleep(_AI_PROCESSING_DELAY)
-
-            try:
-                logger.info(f"🔄 Background AI processing started for: {note_id[:50]}...")
-
-                # 1. Entity Extraction
-                if USE_GRAPHITI:
-                    from app.services.hybrid_graphiti_service import process_note_hybrid
-                    
-                    note_updated_at = datetime.now()
-                    if updated_at:
-                        try:
-                            updated_str = updated_at.replace('Z', '+00:00')
-                            note_updated_at = datetime.fromisoformat(updated_str)
-                        except (ValueError, AttributeError):
-                            pass
-
-                    hybrid_result = await process_note_hybrid(
-                        note_id=note_id,
-                        content=content,
-                        updated_at=note_updated_at,
-                        metadata={
-                            "tags": tags,
-                            "path": path,
-                            "title": title,
-                            "created_at": created_at
-                        }
-                    )
-                    extracted_nodes = hybrid_result.get("nodes_extracted", 0)
-                    pkm_labels = hybrid_result.get("pkm_labels_added", 0)
-                    mentions = hybrid_result.get("mentions_created", 0)
-                    logger.info(f"✅ Hybrid mode: {extracted_nodes} entities, {pkm_labels} PKM labels, {mentions} MENTIONS")
-                else:
-                    from app.services.ontology_service import process_note_to_graph
-                    extracted_nodes = process_note_to_graph(
-                        note_id=note_id,
-                        content=content,
-                        metadata={"tags": tags}
-                    )
-                    logger.info(f"✅ Extracted {extracted_nodes} entities from note")
-
-                # 2. Embedding Generation
-                from app.services.vector_service import store_note_embedding
-                embedding_created = store_note_embedding(
-                    note_id=note_id,
-                    content=content,
-                    metadata={"tags": tags}
-                )
-
-                if embedding_created:
-                    logger.info(f"✅ Embedding created for note: {note_id[:50]}")
-
-                # Invalidate caches
-                self.context_cache.clear(note_id)
-                self.graph_cache.clear_prefix(f"{note_id}:")
-
-            except Exception as e:
-                logger.error(f"❌ Background AI processing failed for {note_id[:50]}: {e}", exc_info=True)
+        AI processing for one queued note: Entity extraction and Embedding generation.
+        Called by the job queue worker; raises on failure so the job is retried.
+
+        extraction_content limits entity extraction to changed sections (the
+        embedding always uses the full content). On success the content hash is
+        recorded so unchanged re-syncs are skipped.
+        """
+        # 1. Entity Extraction (changed sections only when provided, bounded per LLM provider)
+        async with _llm_semaphore:
+            logger.info(f"🔄 AI processing started for: {note_id[:50]}...")
+            extraction_ok = await self._extract_entities(
+                note_id, content, extraction_content, tags, path, title, created_at, updated_at
+            )
+        if not extraction_ok:
+            raise RuntimeError("Entity extraction failed")
+
+        # 2. Embedding Generation (batched outside the semaphore so concurrent notes coalesce)
+        embedding_created = await embedding_batcher.submit(note_id, content)
+
+        if embedding_created:
+            logger.info(f"✅ Embedding created for note: {note_id[:50]}")
+        elif len(content.strip()) >= 10:
+            # too-short content never gets an embedding
+            raise RuntimeError("Embedding generation failed")
+
+        # 3. Record processed content hash, refresh entity co-occurrence for new MENTIONS
+        client = get_neo4j_client()
+        await asyncio.to_thread(update_cooccurrence_safely, client, [note_id])
+        if content_hash:
+            await asyncio.to_thread(
+                mark_note_processed,
+                client,
+                note_id=note_id,
+                content_hash=content_hash,
+                section_hashes=section_hashes or []
+            )
+
+        # 4. Bump the vault version (invalidates caches on every replica)
+        await asyncio.to_thread(vault_versions.bump_for_note, client, note_id)
+
+    async def _extract_entities(
+        self,
+        note_id: str,
+        content: str,
+        extraction_content: Optional[str],
+        tags: List[str],
+        path: str,
+        title: str,
+        created_at: str,
+        updated_at: str
+    ) -> bool:
+        """
+        Entity extraction (Graphiti hybrid or legacy ontology).
+        Returns False only when extraction reported an error.
+        """
+        if extraction_content is not None and not extraction_content.strip():
+            logger.info(f"⏩ No changed sections, skipping extraction for: {note_id[:50]}")
+            return True
+
+        if USE_GRAPHITI:
+            from app.services.hybrid_graphiti_service import process_note_hybrid
+
+            note_updated_at = datetime.now()
+            if updated_at:
+                try:
+                    updated_str = updated_at.replace('Z', '+00:00')
+                    note_updated_at = datetime.fromisoformat(updated_str)
+                except (ValueError, AttributeError):
+                    pass
+
+            hybrid_result = await process_note_hybrid(
+                note_id=note_id,
+                content=extraction_content or content,
+                updated_at=note_updated_at,
+                metadata={
+                    "tags": tags,
+                    "path": path,
+                    "title": title,
+                    "created_at": created_at
+                }
+            )
+            extracted_nodes = hybrid_result.get("nodes_extracted", 0)
+            pkm_labels = hybrid_result.get("pkm_labels_added", 0)
+            mentions = hybrid_result.get("mentions_created", 0)
+            logger.info(f"✅ Hybrid mode: {extracted_nodes} entities, {pkm_labels} PKM labels, {mentions} MENTIONS")
+            return hybrid_result.get("status") != "error"
+
+        from app.services.ontology_service import process_note_to_graph
+        extracted_nodes = await asyncio.to_thread(
+            process_note_to_graph,
+            note_id=note_id,
+            content=extraction_content or content,
+            metadata={"tags": tags}
+        )
+        logger.info(f"✅ Extracted {extracted_nodes} entities from note")
+        return True
 
     def delete_note(self, note_id: str, user_id: str) -> Dict[str, Any]:
         """
@@ -169,36 +344,41 @@ class NoteService:
             client = get_neo4j_client()
             logger.info(f"🗑️ Deleting note: {note_id}")
 
+            # Step 0: Remove the note's contribution to CO_OCCURS weights
+            update_cooccurrence_safely(client, [note_id], clear=True)
+
             # Step 1: Delete Note and relations
             cypher_delete_note = """
             MATCH (n:Note {note_id: $note_id})
             OPTIONAL MATCH (n)-[m:MENTIONS]->(e:Entity)
             OPTIONAL MATCH (v:Vault)-[h:HAS_NOTE]->(n)
-            DELETE m, h, n
-            RETURN count(n) as deleted_notes
+            WITH n, collect(DISTINCT m) AS mentions, collect(DISTINCT h) AS has_notes, collect(DISTINCT v) AS vaults
+            FOREACH (rel IN mentions + has_notes | DELETE rel)
+            DETACH DELETE n
+            FOREACH (v IN vaults | SET v.version = coalesce(v.version, 0) + 1,
+                                       v.note_count = CASE WHEN v.note_count > 0 THEN v.note_count - 1
+                                                           ELSE v.note_count END)
+            RETURN 1 AS deleted_notes,
+                   [v IN vaults | {vault_id: v.id, version: v.version}] AS vaults
             """
 
             result = client.query(cypher_delete_note, {"note_id": note_id})
             deleted_notes = result[0]["deleted_notes"] if result else 0
+            for vault in (result[0]["vaults"] if result else []):
+                vault_versions.changed(vault["vault_id"], vault["version"], [note_id])
 
             # Step 2: Cleanup orphans
             cypher_cleanup_orphan_entities = """
             MATCH (e:Entity)
             WHERE NOT (e)<-[:MENTIONS]-(:Note)
               AND NOT (e)<-[:MENTIONS]-(:Episodic)
-            WITH e
-            OPTIONAL MATCH (e)-[r:RELATES_TO]-()
-            DELETE r, e
+            DETACH DELETE e
             RETURN count(e) as orphans_deleted
             """
 
             cleanup_result = client.query(cypher_cleanup_orphan_entities, {})
             orphans_deleted = cleanup_result[0]["orphans_deleted"] if cleanup_result else 0
 
-            # Invalidate caches
-            self.context_cache.clear(note_id)
-            self.graph_cache.clear_prefix(f"{note_id}:")
-
             logger.info(f"✅ Note deleted: {note_id}, orphan entities cleaned: {orphans_deleted}")
 
             return {
@@ -216,12 +396,13 @@ class NoteService:
         """
         Get note context with caching.
         """
-        cached = self.context_cache.get(note_id)
+        version = self._note_version(note_id)
+        cached = self.context_cache.get(note_id, version=version)
         if cached:
             return cached
 
         context = get_note_context(note_id=note_id, content_preview=note_id)
-        self.context_cache.set(note_id, context)
+        self.context_cache.set(note_id, context, version=version)
         return context
 
     def get_graph(self, note_id: str, hops: int = 1) -> Dict[str, Any]:
@@ -229,12 +410,13 @@ class NoteService:
         Get note graph with caching.
         """
         cache_key = f"{note_id}:{hops}"
-        cached = self.graph_cache.get(cache_key)
+        version = self._note_version(note_id)
+        cached = self.graph_cache.get(cache_key, version=version)
         if cached:
             return cached
 
         graph = get_note_graph_vis(note_id=note_id, hops=hops)
-        self.graph_cache.set(cache_key, graph)
+        self.graph_cache.set(cache_key, graph, version=version)
         return graph
 
 # Global instance
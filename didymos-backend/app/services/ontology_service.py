@@ -2,21 +2,19 @@
 LangChain 기반 Text2Graph 서비스 (HTTP API 버전)
 """
 import re
-import time
-import threading
 from langchain_experimental.graph_transformers import LLMGraphTransformer
 from langchain_openai import ChatOpenAI
 from langchain_core.documents import Document
 from app.db.neo4j import get_neo4j_client
 from app.config import settings
+from app.services.cooccurrence_service import update_cooccurrence_safely
+from app.services.llm_dispatcher import LLMRateLimitError, estimate_tokens, llm_dispatcher
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Rate limiting을 위한 글로벌 락과 타임스탬프
-_llm_call_lock = threading.Lock()
-_last_llm_call_time = 0.0
-_MIN_INTERVAL_SECONDS = 0.5  # LLM 호출 사이 최소 간격 (500ms)
+# 추출 응답(노드 + 관계 JSON) 토큰 수 추정치
+_EXTRACTION_COMPLETION_TOKENS = 2000
 
 # 동의어 매핑 (정규화용)
 ENTITY_SYNONYMS = {
@@ -201,44 +199,20 @@ def filter_entities_by_relations(graph_doc) -> tuple:
 def _rate_limited_llm_call(doc):
     """
     Rate limiting이 적용된 LLM 호출
-    동시 호출을 제한하고, 429 에러 발생 시 재시도
+    공유 LLM 디스패처의 토큰 버킷 아래에서 실행하고, 429 에러 발생 시 재시도
     """
-    global _last_llm_call_time
-
-    max_retries = 3
-    base_delay = 2.0  # 초기 대기 시간 (초)
-
-    for attempt in range(max_retries):
-        try:
-            # Rate limiting: 이전 호출 후 최소 간격 보장
-            with _llm_call_lock:
-                elapsed = time.time() - _last_llm_call_time
-                if elapsed < _MIN_INTERVAL_SECONDS:
-                    sleep_time = _MIN_INTERVAL_SECONDS - elapsed
-                    logger.debug(f"Rate limiting: sleeping {sleep_time:.2f}s")
-                    time.sleep(sleep_time)
-                _last_llm_call_time = time.time()
-
-            # LLM 호출
-            return llm_transformer.convert_to_graph_documents([doc])
-
-        except Exception as e:
-            error_str = str(e).lower()
-
-            # Rate limit 에러 (429) 또는 관련 에러
-            if "rate" in error_str or "429" in error_str or "too many" in error_str:
-                delay = base_delay * (2 ** attempt)  # Exponential backoff
-                logger.warning(f"Rate limit hit (attempt {attempt + 1}/{max_retries}), "
-                             f"waiting {delay}s before retry...")
-                time.sleep(delay)
-                continue
-            else:
-                # 다른 에러는 즉시 raise
-                raise
-
-    # 모든 재시도 실패
-    logger.error(f"LLM call failed after {max_retries} retries due to rate limiting")
-    return None
+    try:
+        return llm_dispatcher.call_sync(
+            lambda: llm_transformer.convert_to_graph_documents([doc]),
+            estimated_tokens=estimate_tokens(
+                [{"role": "user", "content": doc.page_content}],
+                completion_tokens=_EXTRACTION_COMPLETION_TOKENS
+            )
+        )
+    except LLMRateLimitError as e:
+        # 모든 재시도 실패
+        logger.error(f"LLM call failed after retries due to rate limiting: {e}")
+        return None
 
 
 def process_note_to_graph(note_id: str, content: str, metadata: dict = None):
@@ -569,7 +543,7 @@ def deduplicate_entities(client, dry_run: bool = True) -> dict:
                 ON CREATE SET new.created_at = old.created_at, new.last_seen = datetime()
                 ON MATCH SET new.last_seen = datetime()
                 DELETE old
-                RETURN count(*) as migrated
+                RETURN count(*) as migrated, collect(DISTINCT note.note_id) as note_ids
                 """
                 result = client.query(cypher_migrate_mentions, {
                     "dup_id": dup_id,
@@ -577,6 +551,7 @@ def deduplicate_entities(client, dry_run: bool = True) -> dict:
                 })
                 if result:
                     stats["relations_migrated"] += result[0].get("migrated", 0)
+                    update_cooccurrence_safely(client, result[0].get("note_ids") or [])
 
                 # 다른 관계들도 이전 (RELATED_TO 등)
                 cypher_migrate_outgoing = f"""
@@ -632,9 +607,11 @@ def merge_duplicate_entities(client, source_id: str, target_id: str, entity_type
         ON CREATE SET new.created_at = old.created_at, new.last_seen = datetime()
         ON MATCH SET new.last_seen = datetime()
         DELETE old
-        RETURN count(*) as migrated
+        RETURN count(*) as migrated, collect(DISTINCT note.note_id) as note_ids
         """
-        client.query(cypher_migrate, {"source_id": source_id, "target_id": target_id})
+        result = client.query(cypher_migrate, {"source_id": source_id, "target_id": target_id})
+        if result:
+            update_cooccurrence_safely(client, result[0].get("note_ids") or [])
 
         # 2. 엔티티 간 관계 이전 (RELATED_TO 등)
         cypher_migrate_rels = f"""
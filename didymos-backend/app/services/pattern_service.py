@@ -1,30 +1,68 @@
 """
 그래프 패턴 분석 서비스
 - PageRank: 중요한 노트 찾기
-- Community Detection: 클러스터 찾기
+- Community Detection: 클러스터 찾기 (Union-Find 연결 요소 / Louvain)
 - Orphan Detection: 고립된 노트 찾기
 """
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Tuple
 from collections import defaultdict
 import logging
+import random
+
+import numpy as np
+from scipy import sparse
 
 logger = logging.getLogger(__name__)
 
 
+def build_csr_adjacency(
+    nodes: List[str],
+    edges: List[Tuple[str, str]]
+) -> Tuple[Dict[str, int], sparse.csr_matrix]:
+    """
+    노드/엣지 리스트를 CSR 인접 행렬로 변환 (행 = from, 열 = to)
+
+    노드 목록에 없는 엔드포인트의 엣지는 버리고, 중복 엣지는 하나로 취급합니다.
+
+    Returns:
+        ({node_id: index}, n x n CSR 행렬)
+    """
+    index: Dict[str, int] = {}
+    for node in nodes:
+        index.setdefault(node, len(index))
+    n = len(index)
+    pairs = [(index[f], index[t]) for f, t in edges if f in index and t in index]
+    if pairs:
+        rows, cols = np.array(pairs, dtype=np.int64).T
+    else:
+        rows = cols = np.empty(0, dtype=np.int64)
+    matrix = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n, n))
+    matrix.sum_duplicates()
+    matrix.data[:] = 1.0
+    return index, matrix
+
+
 def calculate_pagerank(
     nodes: List[str],
     edges: List[Tuple[str, str]],
     damping: float = 0.85,
-    iterations: int = 20
+    iterations: int = 100,
+    tol: float = 1e-6,
+    personalization: Optional[Dict[str, float]] = None
 ) -> Dict[str, float]:
     """
-    PageRank 알고리즘으로 노드 중요도 계산
+    PageRank 알고리즘으로 노드 중요도 계산 (CSR 희소 행렬 거듭제곱법)
+
+    나가는 링크가 없는 노드(dangling)의 점수는 personalization 분포로 재분배되므로
+    전체 점수 합은 1로 유지됩니다.
 
     Args:
         nodes: 노드 ID 리스트
         edges: (from, to) 튜플 리스트
         damping: damping factor (기본 0.85)
-        iterations: 반복 횟수
+        iterations: 최대 반복 횟수
+        tol: 수렴 기준 (반복 간 L1 변화량 < n * tol 이면 중단)
+        personalization: {node_id: 가중치} 텔레포트 분포 (없으면 균등)
 
     Returns:
         {node_id: pagerank_score} 딕셔너리
@@ -32,36 +70,86 @@ def calculate_pagerank(
     if not nodes:
         return {}
 
-    # 그래프 구조 생성
-    graph = defaultdict(list)
-    out_degree = defaultdict(int)
+    index, matrix = build_csr_adjacency(nodes, edges)
+    if matrix.shape[0] == 0:
+        return {}
+
+    node_ids = list(index)
+    rank = pagerank_csr(matrix, damping, iterations, tol, personalization, index)
+    return {node_ids[i]: float(score) for i, score in enumerate(rank)}
 
-    for from_node, to_node in edges:
-        graph[from_node].append(to_node)
-        out_degree[from_node] += 1
 
-    # 초기 PageRank 값 (모든 노드 균등)
-    n = len(nodes)
-    pagerank = {node: 1.0 / n for node in nodes}
+def pagerank_csr(
+    matrix: sparse.csr_matrix,
+    damping: float = 0.85,
+    iterations: int = 100,
+    tol: float = 1e-6,
+    personalization: Optional[Dict[str, float]] = None,
+    index: Optional[Dict[str, int]] = None
+) -> np.ndarray:
+    """
+    CSR 인접 행렬(행 = from, 0/1)에 대한 PageRank 거듭제곱법
 
-    # PageRank 반복 계산
+    Returns:
+        행 번호 순서의 PageRank 점수 배열
+    """
+    n = matrix.shape[0]
+
+    # 텔레포트 분포
+    if personalization and index:
+        teleport = np.zeros(n)
+        for node, weight in personalization.items():
+            if node in index and weight > 0:
+                teleport[index[node]] = weight
+        if teleport.sum() == 0:
+            teleport[:] = 1.0
+    else:
+        teleport = np.ones(n)
+    teleport /= teleport.sum()
+
+    # 행 정규화 전이 행렬의 전치 (열 = from) → rank 전파가 행렬-벡터 곱 한 번
+    out_degree = np.asarray(matrix.sum(axis=1)).ravel()
+    dangling = out_degree == 0
+    inv_out = np.divide(1.0, out_degree, out=np.zeros(n), where=~dangling)
+    transition_t = (sparse.diags(inv_out) @ matrix).T.tocsr()
+
+    rank = np.full(n, 1.0 / n)
     for _ in range(iterations):
-        new_pagerank = {}
+        previous = rank
+        rank = damping * (transition_t @ previous + previous[dangling].sum() * teleport) + (1 - damping) * teleport
+        if np.abs(rank - previous).sum() < n * tol:
+            break
 
-        for node in nodes:
-            # Random surfer model
-            rank = (1 - damping) / n
+    return rank
 
-            # 들어오는 링크로부터 PageRank 누적
-            for other_node in nodes:
-                if node in graph[other_node]:
-                    rank += damping * pagerank[other_node] / out_degree[other_node]
 
-            new_pagerank[node] = rank
+class UnionFind:
+    """
+    반복(비재귀) Union-Find (경로 압축 + 크기 기준 합치기)
+
+    재귀 DFS와 달리 큰 연결 요소에서도 재귀 한도에 걸리지 않습니다.
+    """
 
-        pagerank = new_pagerank
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+        self.size = [1] * size
 
-    return pagerank
+    def find(self, x: int) -> int:
+        root = x
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[x] != root:
+            self.parent[x], x = root, self.parent[x]
+        return root
+
+    def union(self, a: int, b: int):
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size[rb]
 
 
 def detect_communities(
@@ -69,42 +157,202 @@ def detect_communities(
     edges: List[Tuple[str, str]]
 ) -> Dict[str, int]:
     """
-    간단한 Community Detection (연결 요소 기반)
+    연결 요소 기반 Community Detection (Union-Find)
 
     Args:
         nodes: 노드 ID 리스트
         edges: (from, to) 튜플 리스트
 
     Returns:
-        {node_id: community_id} 딕셔너리
+        {node_id: community_id} 딕셔너리 (노드 등장 순서대로 번호 부여)
     """
     if not nodes:
         return {}
 
-    # 무향 그래프로 변환
-    graph = defaultdict(set)
+    index: Dict[str, int] = {}
+    for node in nodes:
+        index.setdefault(node, len(index))
+
+    uf = UnionFind(len(index))
     for from_node, to_node in edges:
-        graph[from_node].add(to_node)
-        graph[to_node].add(from_node)
+        if from_node in index and to_node in index:
+            uf.union(index[from_node], index[to_node])
+
+    root_ids: Dict[int, int] = {}
+    return {
+        node: root_ids.setdefault(uf.find(i), len(root_ids))
+        for node, i in index.items()
+    }
 
-    # DFS로 연결 요소 찾기
-    visited = set()
-    communities = {}
-    community_id = 0
 
-    def dfs(node: str, community: int):
-        visited.add(node)
-        communities[node] = community
-        for neighbor in graph[node]:
-            if neighbor not in visited:
-                dfs(neighbor, community)
+def _build_weighted_adjacency(
+    index: Dict[str, int],
+    edges: List[Tuple[str, str]]
+) -> List[Dict[int, float]]:
+    """무향 가중 인접 리스트 (중복 엣지는 하나로, self-loop 제외)"""
+    adjacency: List[Dict[int, float]] = [{} for _ in range(len(index))]
+    for from_node, to_node in edges:
+        a, b = index.get(from_node), index.get(to_node)
+        if a is None or b is None or a == b:
+            continue
+        adjacency[a][b] = 1.0
+        adjacency[b][a] = 1.0
+    return adjacency
+
+
+def _louvain_one_level(
+    adjacency: List[Dict[int, float]],
+    resolution: float,
+    rng: random.Random,
+    min_gain: float = 1e-4
+) -> Tuple[List[int], bool]:
+    """
+    Louvain 1단계: 모듈러리티 이득이 없을 때까지 노드를 이웃 커뮤니티로 이동
 
+    adjacency[i][i]는 집계된 내부 가중치(self-loop)입니다.
+    """
+    n = len(adjacency)
+    degree = [sum(w for j, w in adjacency[i].items() if j != i) + 2 * adjacency[i].get(i, 0.0) for i in range(n)]
+    m2 = sum(degree)
+    community = list(range(n))
+    if m2 == 0:
+        return community, False
+
+    total = degree[:]
+    order = list(range(n))
+    rng.shuffle(order)
+    improved = False
+
+    # 한 바퀴의 모듈러리티 증가량이 min_gain 미만이면 수렴으로 보고 중단 (긴 꼬리 방지)
+    sweep_gain = min_gain
+    while sweep_gain >= min_gain:
+        sweep_gain = 0.0
+        for i in order:
+            current = community[i]
+            weights: Dict[int, float] = {}
+            for j, w in adjacency[i].items():
+                if j != i:
+                    weights[community[j]] = weights.get(community[j], 0.0) + w
+
+            total[current] -= degree[i]
+            best = current
+            stay_gain = best_gain = weights.get(current, 0.0) - resolution * total[current] * degree[i] / m2
+            for candidate, w in weights.items():
+                gain = w - resolution * total[candidate] * degree[i] / m2
+                if gain > best_gain + 1e-12:
+                    best, best_gain = candidate, gain
+            total[best] += degree[i]
+
+            if best != current:
+                community[i] = best
+                sweep_gain += 2 * (best_gain - stay_gain) / m2
+                improved = True
+
+    return community, improved
+
+
+def detect_louvain_communities(
+    nodes: List[str],
+    edges: List[Tuple[str, str]],
+    resolution: float = 1.0,
+    max_levels: int = 10,
+    seed: int = 42
+) -> Dict[str, int]:
+    """
+    Louvain 모듈러리티 최적화 Community Detection
+
+    연결 요소 안에서도 밀집된 하위 그룹을 나눕니다. 엣지는 무향으로 취급합니다.
+
+    Args:
+        nodes: 노드 ID 리스트
+        edges: (from, to) 튜플 리스트
+        resolution: 값이 클수록 작은 커뮤니티
+        max_levels: 최대 집계 단계 수
+        seed: 노드 방문 순서 시드 (결과 재현용)
+
+    Returns:
+        {node_id: community_id} 딕셔너리 (커뮤니티 크기 내림차순 번호)
+    """
+    if not nodes:
+        return {}
+
+    index: Dict[str, int] = {}
     for node in nodes:
-        if node not in visited:
-            dfs(node, community_id)
-            community_id += 1
+        index.setdefault(node, len(index))
+
+    rng = random.Random(seed)
+    adjacency = _build_weighted_adjacency(index, edges)
+    membership = list(range(len(index)))  # 원래 노드 → 현재 단계 노드
+
+    for _ in range(max_levels):
+        community, improved = _louvain_one_level(adjacency, resolution, rng)
+        if not improved:
+            break
+
+        # 커뮤니티를 하나의 노드로 집계
+        relabel: Dict[int, int] = {}
+        for c in community:
+            relabel.setdefault(c, len(relabel))
+        aggregated: List[Dict[int, float]] = [{} for _ in range(len(relabel))]
+        for i, neighbors in enumerate(adjacency):
+            ci = relabel[community[i]]
+            for j, w in neighbors.items():
+                cj = relabel[community[j]]
+                if j == i:
+                    aggregated[ci][ci] = aggregated[ci].get(ci, 0.0) + w
+                elif ci == cj:
+                    aggregated[ci][ci] = aggregated[ci].get(ci, 0.0) + w / 2
+                else:
+                    aggregated[ci][cj] = aggregated[ci].get(cj, 0.0) + w
+        membership = [relabel[community[m]] for m in membership]
+        adjacency = aggregated
+
+    sizes = defaultdict(int)
+    for m in membership:
+        sizes[m] += 1
+    ranked = {c: rank for rank, c in enumerate(sorted(sizes, key=lambda c: (-sizes[c], c)))}
+    return {node: ranked[membership[i]] for node, i in index.items()}
+
+
+def summarize_communities(
+    communities_map: Dict[str, int],
+    edges: List[Tuple[str, str]]
+) -> List[Dict[str, Any]]:
+    """
+    커뮤니티별 크기와 내부 연결 밀집도를 한 번의 엣지 순회로 계산
 
-    return communities
+    내부 엣지는 무향 노드 쌍 기준으로 중복 없이 셉니다.
+
+    Returns:
+        [{"id", "notes", "size", "internal_edges", "possible_edges", "density"}, ...] (크기 내림차순)
+    """
+    groups = defaultdict(list)
+    for node, comm_id in communities_map.items():
+        groups[comm_id].append(node)
+
+    internal_pairs = defaultdict(set)
+    for from_node, to_node in edges:
+        comm_id = communities_map.get(from_node)
+        if comm_id is None or from_node == to_node or communities_map.get(to_node) != comm_id:
+            continue
+        internal_pairs[comm_id].add((from_node, to_node) if from_node < to_node else (to_node, from_node))
+
+    summary = []
+    for comm_id, note_list in groups.items():
+        size = len(note_list)
+        possible = size * (size - 1) // 2
+        internal = len(internal_pairs.get(comm_id, ()))
+        summary.append({
+            "id": comm_id,
+            "notes": note_list,
+            "size": size,
+            "internal_edges": internal,
+            "possible_edges": possible,
+            "density": internal / possible if possible else 0.0
+        })
+
+    summary.sort(key=lambda x: x["size"], reverse=True)
+    return summary
 
 
 def find_orphan_notes(
@@ -135,6 +383,22 @@ def find_orphan_notes(
     return orphans
 
 
+def fetch_vault_graph(
+    user_id: str,
+    vault_id: str
+) -> Tuple[List[str], List[Tuple[str, str, str]]]:
+    """
+    Vault의 노트와 노트 간 관계 (공용 그래프 스냅샷에서)
+
+    Returns:
+        (note_ids, [(from_note_id, to_note_id, rel_type), ...])
+    """
+    from app.services.graph_snapshot import graph_snapshots
+
+    snapshot = graph_snapshots.get(user_id, vault_id)
+    return list(snapshot.note_ids), snapshot.typed_note_links()
+
+
 def analyze_vault_patterns(
     user_id: str,
     vault_id: str
@@ -149,23 +413,13 @@ def analyze_vault_patterns(
     Returns:
         패턴 분석 결과
     """
-    from app.db.neo4j import get_neo4j_client
+    from app.services.graph_snapshot import graph_snapshots
 
-    client = get_neo4j_client()
+    # 1. Vault의 모든 노트와 관계 (공용 스냅샷)
+    snapshot = graph_snapshots.get(user_id, vault_id)
+    notes = snapshot.note_ids
 
-    # 1. Vault의 모든 노트와 관계 가져오기
-    cypher = """
-    MATCH (u:User {id: $user_id})-[:OWNS]->(v:Vault {id: $vault_id})-[:HAS_NOTE]->(n:Note)
-    OPTIONAL MATCH (n)-[r]->(related)
-    WHERE related:Note OR related:Topic OR related:Project OR related:Task
-    RETURN
-        collect(DISTINCT n.note_id) AS notes,
-        collect(DISTINCT {from: n.note_id, to: related.note_id, type: type(r)}) AS edges
-    """
-
-    result = client.query(cypher, {"user_id": user_id, "vault_id": vault_id})
-
-    if not result or len(result) == 0:
+    if not notes:
         return {
             "important_notes": [],
             "communities": [],
@@ -178,42 +432,26 @@ def analyze_vault_patterns(
             }
         }
 
-    notes = result[0].get("notes", [])
-    edges_raw = result[0].get("edges", [])
-
-    # None 제거
-    notes = [n for n in notes if n is not None]
-    edges = [(e["from"], e["to"]) for e in edges_raw
-             if e and e.get("from") and e.get("to")]
+    edges = snapshot.note_links()
+    matrix = snapshot.note_link_matrix()
 
-    # 2. PageRank 계산
-    pagerank_scores = calculate_pagerank(notes, edges)
+    # 2. PageRank 계산 (스냅샷 CSR 행렬 그대로 사용)
+    ranks = pagerank_csr(matrix)
 
     # 상위 10개 중요 노트
-    important_notes = sorted(
-        pagerank_scores.items(),
-        key=lambda x: x[1],
-        reverse=True
-    )[:10]
-
-    # 3. Community Detection
-    communities_map = detect_communities(notes, edges)
-
-    # Community별로 그룹화
-    community_groups = defaultdict(list)
-    for note, comm_id in communities_map.items():
-        community_groups[comm_id].append(note)
-
-    # 크기순 정렬
-    communities = sorted(
-        [{"id": comm_id, "notes": note_list, "size": len(note_list)}
-         for comm_id, note_list in community_groups.items()],
-        key=lambda x: x["size"],
-        reverse=True
-    )
-
-    # 4. 고립된 노트 찾기
-    orphan_notes = find_orphan_notes(notes, edges)
+    top = np.argsort(-ranks, kind="stable")[:10]
+    important_notes = [(notes[i], float(ranks[i])) for i in top]
+
+    # 3. Community Detection (Louvain) + 커뮤니티별 밀집도
+    communities_map = detect_louvain_communities(notes, edges)
+    communities = [
+        {**comm, "density": round(comm["density"], 3)}
+        for comm in summarize_communities(communities_map, edges)
+    ]
+
+    # 4. 고립된 노트 찾기 (들어오고 나가는 링크가 모두 없는 노트)
+    degree = np.diff(matrix.indptr) + np.bincount(matrix.indices, minlength=len(notes))
+    orphan_notes = [notes[i] for i in np.flatnonzero(degree == 0)]
 
     # 5. 통계
     stats = {
@@ -4,10 +4,12 @@
 - Task 우선순위: 중요도 + 마감일 기반
 - 놓친 연결: 같은 Topic을 다루지만 연결 안 된 노트
 """
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -65,7 +67,7 @@ def recommend_connections_for_note(
 
     except Exception as e:
         logger.error(f"Failed to get recommendations: {e}")
-        return []
+        raise
 
 
 def prioritize_tasks(
@@ -195,7 +197,7 @@ def prioritize_tasks(
 
     except Exception as e:
         logger.error(f"Failed to prioritize tasks: {e}")
-        return []
+        raise
 
 
 def find_missing_connections(
@@ -215,90 +217,103 @@ def find_missing_connections(
     Returns:
         연결 제안 리스트
     """
-    from app.db.neo4j import get_neo4j_client
-
-    client = get_neo4j_client()
-
-    cypher = """
-    MATCH (u:User {id: $user_id})-[:OWNS]->(v:Vault {id: $vault_id})
-    MATCH (v)-[:HAS_NOTE]->(n1:Note)-[:MENTIONS]->(topic:Topic)<-[:MENTIONS]-(n2:Note)
-    WHERE n1.note_id < n2.note_id
-      AND NOT (n1)-[:MENTIONS|:RELATES_TO]-(n2)
-    WITH n1, n2, collect(DISTINCT topic.name) AS shared_topics
-    WHERE size(shared_topics) >= 2
-    RETURN n1.note_id AS note1_id,
-           n1.title AS note1_title,
-           n2.note_id AS note2_id,
-           n2.title AS note2_title,
-           shared_topics,
-           size(shared_topics) AS topic_count
-    ORDER BY topic_count DESC
-    LIMIT $limit
-    """
+    from app.services.graph_snapshot import graph_snapshots
 
     try:
-        result = client.query(cypher, {
-            "user_id": user_id,
-            "vault_id": vault_id,
-            "limit": limit
-        })
+        snapshot = graph_snapshots.get(user_id, vault_id)
+        topics = snapshot.entities_with_label("Topic")
+        if len(topics) == 0:
+            return []
+
+        # 노트 쌍별 공유 Topic 수 (노트 × Topic incidence의 곱)
+        incidence = snapshot.mentions[:, topics].tocsr()
+        shared = (incidence @ incidence.T).tocoo()
+        mask = (shared.row < shared.col) & (shared.data >= 2)
+        rows, cols, counts = shared.row[mask], shared.col[mask], shared.data[mask]
+
+        # 이미 MENTIONS/RELATES_TO로 연결된 쌍 제외
+        if len(rows):
+            links = snapshot.note_link_matrix(types=("MENTIONS", "RELATES_TO"), symmetric=True)
+            unlinked = np.asarray(links[rows, cols]).ravel() == 0
+            rows, cols, counts = rows[unlinked], cols[unlinked], counts[unlinked]
 
         suggestions = []
-        for row in result:
+        for k in np.argsort(-counts, kind="stable")[:limit]:
+            i, j = int(rows[k]), int(cols[k])
+            if snapshot.note_ids[j] < snapshot.note_ids[i]:
+                i, j = j, i
+            common = np.intersect1d(
+                incidence.indices[incidence.indptr[i]:incidence.indptr[i + 1]],
+                incidence.indices[incidence.indptr[j]:incidence.indptr[j + 1]]
+            )
+            shared_topics = [snapshot.entity_names[topics[t]] for t in common]
+            topic_count = int(counts[k])
             suggestions.append({
-                "note1_id": row["note1_id"],
-                "note1_title": row.get("note1_title", row["note1_id"]),
-                "note2_id": row["note2_id"],
-                "note2_title": row.get("note2_title", row["note2_id"]),
-                "shared_topics": row["shared_topics"],
-                "topic_count": row["topic_count"],
-                "reason": f"Share {row['topic_count']} topics: {', '.join(row['shared_topics'][:3])}"
+                "note1_id": snapshot.note_ids[i],
+                "note1_title": snapshot.note_titles[i] or snapshot.note_ids[i],
+                "note2_id": snapshot.note_ids[j],
+                "note2_title": snapshot.note_titles[j] or snapshot.note_ids[j],
+                "shared_topics": shared_topics,
+                "topic_count": topic_count,
+                "reason": f"Share {topic_count} topics: {', '.join(shared_topics[:3])}"
             })
 
         return suggestions
 
     except Exception as e:
         logger.error(f"Failed to find missing connections: {e}")
-        return []
+        raise
 
 
 def get_recommendations(
     user_id: str,
     vault_id: str,
-    note_id: str = None
+    note_id: str = None,
+    timeout: Optional[float] = None
 ) -> Dict[str, Any]:
     """
     종합 추천 생성
 
+    추천들은 서로 독립이므로 동시에 실행하고, 제한 시간을 넘기거나 예외가 난 추천은
+    빈 결과 + status "timed_out"/"failed"로 채웁니다.
+
     Args:
         user_id: 사용자 ID
         vault_id: Vault ID
         note_id: (선택) 특정 노트에 대한 추천
+        timeout: 추천별 제한 시간 (초, None이면 설정값)
 
     Returns:
-        모든 추천 결과
+        모든 추천 결과 + 추천별 실행 상태 (analysis_status)
     """
-    recommendations = {}
+    from app.services.analysis_fanout import analysis_fanout, outcome_statuses
+
+    analyses = {}
 
     # 1. 특정 노트에 대한 연결 추천
     if note_id:
-        recommendations["suggested_connections"] = recommend_connections_for_note(
+        analyses["suggested_connections"] = lambda: recommend_connections_for_note(
             note_id=note_id,
             limit=5
         )
 
     # 2. 우선순위 Task
-    recommendations["priority_tasks"] = prioritize_tasks(
+    analyses["priority_tasks"] = lambda: prioritize_tasks(
         user_id=user_id,
         vault_id=vault_id,
         limit=10
     )
 
     # 3. 놓친 연결
-    recommendations["missing_connections"] = find_missing_connections(
+    analyses["missing_connections"] = lambda: find_missing_connections(
         user_id=user_id,
         vault_id=vault_id,
         limit=10
     )
 
+    outcomes = analysis_fanout.run(analyses, timeout=timeout)
+
+    recommendations = {name: outcome.value or [] for name, outcome in outcomes.items()}
+    recommendations["analysis_status"] = outcome_statuses(outcomes)
+
     return recommendations
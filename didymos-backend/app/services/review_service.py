@@ -2,6 +2,7 @@
 Weekly Review 서비스
 """
 from typing import List, Dict
+import asyncio
 import logging
 import uuid
 import json
@@ -9,18 +10,25 @@ import json
 logger = logging.getLogger(__name__)
 
 
-def get_weekly_review(client, vault_id: str) -> Dict:
+async def get_weekly_review(client, vault_id: str) -> Dict:
+    # 네 개의 조회는 서로 독립적이므로 동시에 실행
+    new_topics, forgotten_projects, overdue_tasks, most_active_notes = await asyncio.gather(
+        get_new_topics(client, vault_id, days=7),
+        get_forgotten_projects(client, vault_id, days=14),
+        get_overdue_tasks(client, vault_id),
+        get_most_active_notes(client, vault_id, days=7),
+    )
     return {
-        "new_topics": get_new_topics(client, vault_id, days=7),
-        "forgotten_projects": get_forgotten_projects(client, vault_id, days=14),
-        "overdue_tasks": get_overdue_tasks(client, vault_id),
-        "most_active_notes": get_most_active_notes(client, vault_id, days=7),
+        "new_topics": new_topics,
+        "forgotten_projects": forgotten_projects,
+        "overdue_tasks": overdue_tasks,
+        "most_active_notes": most_active_notes,
     }
 
 
-def get_new_topics(client, vault_id: str, days: int) -> List[Dict]:
+async def get_new_topics(client, vault_id: str, days: int) -> List[Dict]:
     try:
-        result = client.query(
+        result = await client.query(
             """
             MATCH (v:Vault {id: $vault_id})-[:HAS_NOTE]->(n:Note)-[:MENTIONS]->(t:Topic)
             WHERE datetime(n.updated_at) >= datetime() - duration({days: $days})
@@ -44,9 +52,9 @@ def get_new_topics(client, vault_id: str, days: int) -> List[Dict]:
         return []
 
 
-def get_forgotten_projects(client, vault_id: str, days: int) -> List[Dict]:
+async def get_forgotten_projects(client, vault_id: str, days: int) -> List[Dict]:
     try:
-        result = client.query(
+        result = await client.query(
             """
             MATCH (v:Vault {id: $vault_id})-[:HAS_NOTE]->(n:Note)-[:MENTIONS]->(p:Project)
             WITH p, max(datetime(n.updated_at)) AS last_updated
@@ -75,9 +83,9 @@ def get_forgotten_projects(client, vault_id: str, days: int) -> List[Dict]:
         return []
 
 
-def get_overdue_tasks(client, vault_id: str) -> List[Dict]:
+async def get_overdue_tasks(client, vault_id: str) -> List[Dict]:
     try:
-        result = client.query(
+        result = await client.query(
             """
             MATCH (v:Vault {id: $vault_id})-[:HAS_NOTE]->(n:Note)-[:MENTIONS]->(t:Task)
             WHERE coalesce(t.status, 'todo') IN ['todo', 'in_progress']
@@ -112,9 +120,9 @@ def get_overdue_tasks(client, vault_id: str) -> List[Dict]:
         return []
 
 
-def get_most_active_notes(client, vault_id: str, days: int) -> List[Dict]:
+async def get_most_active_notes(client, vault_id: str, days: int) -> List[Dict]:
     try:
-        result = client.query(
+        result = await client.query(
             """
             MATCH (v:Vault {id: $vault_id})-[:HAS_NOTE]->(n:Note)
             WHERE datetime(n.updated_at) >= datetime() - duration({days: $days})
@@ -137,13 +145,13 @@ def get_most_active_notes(client, vault_id: str, days: int) -> List[Dict]:
         return []
 
 
-def save_weekly_review(client, vault_id: str, review_data: Dict) -> str:
+async def save_weekly_review(client, vault_id: str, review_data: Dict) -> str:
     """
     리뷰 결과를 히스토리로 저장
     """
     review_id = str(uuid.uuid4())
     try:
-        client.query(
+        await client.query(
             """
             MERGE (r:WeeklyReview {id: $id})
             SET r.vault_id = $vault_id,
@@ -158,9 +166,9 @@ def save_weekly_review(client, vault_id: str, review_data: Dict) -> str:
         return ""
 
 
-def list_review_history(client, vault_id: str, limit: int = 5) -> List[Dict]:
+async def list_review_history(client, vault_id: str, limit: int = 5) -> List[Dict]:
     try:
-        result = client.query(
+        result = await client.query(
             """
             MATCH (r:WeeklyReview {vault_id: $vault_id})
             RETURN r.id AS id,
@@ -0,0 +1,309 @@
+"""
+증분 의미론적 클러스터링 (UMAP + HDBSCAN 모델 영속화)
+
+compute_clusters_semantic은 캐시 미스마다 모든 노트 임베딩으로
+UMAP.fit_transform + HDBSCAN.fit_predict를 다시 수행합니다 (10k 노트 기준 수 분).
+이 모듈은 학습된 reducer/clusterer를 Vault(+폴더)별로 디스크에 저장하고,
+- 새로 추가되었거나 임베딩이 바뀐 노트만 reducer.transform + hdbscan.approximate_predict로 배정
+- 삭제된 노트는 배정 목록에서 제거
+- 학습 이후 증분 배정 비율이나 드리프트(노이즈로 배정된 비율)가 임계값을 넘거나
+  모델이 오래되면 전체 재학습
+을 수행합니다. 삭제만으로는 재학습하지 않습니다.
+
+메모리에는 최근 사용한 모델 CLUSTER_MODEL_MAX_LOADED개만, 디스크에는 CLUSTER_MODEL_MAX_FILES개만
+유지합니다 (오래 사용하지 않은 것부터 제거).
+"""
+import hashlib
+import logging
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import umap
+    import hdbscan
+    CLUSTERING_AVAILABLE = True
+except ImportError:
+    CLUSTERING_AVAILABLE = False
+
+# 증분 배정 시 이 강도 미만이면 기존 클러스터로 설명되지 않는 점(드리프트)으로 봄
+_WEAK_MEMBERSHIP = 0.05
+
+
+def embedding_fingerprint(vector: np.ndarray) -> str:
+    """임베딩 변경 감지용 지문"""
+    return hashlib.blake2b(np.ascontiguousarray(vector, dtype=np.float32).tobytes(), digest_size=8).hexdigest()
+
+
+def fit_semantic_model(embeddings: np.ndarray) -> Tuple[Any, Any, np.ndarray]:
+    """
+    UMAP + HDBSCAN 전체 학습
+
+    Returns:
+        (reducer, clusterer, labels)
+    """
+    n_samples = len(embeddings)
+    n_components = min(5, n_samples - 1)  # 샘플 수보다 작게
+    n_neighbors = max(2, min(15, n_samples - 1))  # 최소 2, 최대 15
+
+    reducer = umap.UMAP(
+        n_components=n_components,
+        n_neighbors=n_neighbors,
+        min_dist=0.1,
+        metric='cosine',
+        random_state=42
+    )
+    reduced_embeddings = reducer.fit_transform(embeddings)
+
+    logger.info(f"UMAP completed: {embeddings.shape} → {reduced_embeddings.shape}")
+
+    # 더 세분화된 클러스터링을 위한 파라미터 조정
+    # - min_cluster_size: 작을수록 더 많은 작은 클러스터 허용
+    # - min_samples: 1이면 노이즈 최소화
+    # - cluster_selection_epsilon: 작을수록 더 세분화됨
+    # - prediction_data: approximate_predict(증분 배정)에 필요
+    min_cluster_size = max(5, n_samples // 50)  # 더 작은 클러스터 허용 (5개 또는 노트의 2%)
+
+    clusterer = hdbscan.HDBSCAN(
+        min_cluster_size=min_cluster_size,
+        min_samples=2,
+        cluster_selection_epsilon=0.1,  # 더 세분화
+        cluster_selection_method='eom',  # Excess of Mass - 계층적 클러스터링에 적합
+        metric='euclidean',
+        prediction_data=True
+    )
+    labels = clusterer.fit_predict(reduced_embeddings)
+    return reducer, clusterer, np.asarray(labels)
+
+
+class SemanticClusterModelStore:
+    """
+    Vault(+폴더)별 학습된 모델과 노트 배정 상태 저장소
+
+    상태는 pickle 파일로 저장하고(임시 파일 → os.replace), 프로세스 메모리에도 보관합니다.
+    메모리는 max_loaded개, 디스크는 max_files개를 넘으면 가장 오래 사용하지 않은 것부터 제거합니다
+    (디스크는 파일 수정 시각 기준, 불러올 때도 갱신).
+    """
+
+    def __init__(self, model_dir: str, max_loaded: int = 8, max_files: int = 256):
+        self.model_dir = model_dir
+        self.max_loaded = max_loaded
+        self.max_files = max_files
+        self._states: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, vault_id: str, folder_prefix: Optional[str]) -> str:
+        return hashlib.sha1(f"{vault_id}\n{folder_prefix or ''}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.model_dir, f"{key}.pkl")
+
+    def _remember(self, key: str, state: Dict[str, Any]):
+        self._states[key] = state
+        self._states.move_to_end(key)
+        while len(self._states) > self.max_loaded:
+            self._states.popitem(last=False)
+
+    def _touch(self, key: str):
+        """파일 수정 시각을 사용 시각으로 갱신 (디스크 LRU 기준)"""
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+
+    def _prune_files(self, keep: str):
+        """max_files를 넘는 모델 파일을 오래 사용하지 않은 순서로 삭제"""
+        try:
+            entries = [
+                entry for entry in os.scandir(self.model_dir)
+                if entry.name.endswith(".pkl") and entry.name != f"{keep}.pkl"
+            ]
+        except FileNotFoundError:
+            return
+        excess = len(entries) + 1 - self.max_files
+        if excess <= 0:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:excess]:
+            self._states.pop(entry.name[:-len(".pkl")], None)
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+        logger.info(f"Evicted {excess} cluster model files (max_files={self.max_files})")
+
+    def load(self, vault_id: str, folder_prefix: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        key = self._key(vault_id, folder_prefix)
+        with self._lock:
+            if key in self._states:
+                self._states.move_to_end(key)
+                self._touch(key)
+                return self._states[key]
+            try:
+                with open(self._path(key), "rb") as f:
+                    state = pickle.load(f)
+                self._touch(key)
+            except FileNotFoundError:
+                return None
+            except Exception as e:
+                logger.warning(f"Failed to load cluster model for vault {vault_id}: {e}")
+                return None
+            self._remember(key, state)
+            return state
+
+    def save(self, vault_id: str, folder_prefix: Optional[str], state: Dict[str, Any]):
+        key = self._key(vault_id, folder_prefix)
+        with self._lock:
+            self._remember(key, state)
+            try:
+                os.makedirs(self.model_dir, exist_ok=True)
+                tmp_path = f"{self._path(key)}.tmp"
+                with open(tmp_path, "wb") as f:
+                    pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, self._path(key))
+                self._prune_files(keep=key)
+            except Exception as e:
+                logger.warning(f"Failed to persist cluster model for vault {vault_id}: {e}")
+
+    def delete(self, vault_id: str, folder_prefix: Optional[str] = None):
+        key = self._key(vault_id, folder_prefix)
+        with self._lock:
+            self._states.pop(key, None)
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+
+def _refit_reason(state: Optional[Dict[str, Any]], n_changed: int) -> Optional[str]:
+    """
+    전체 재학습이 필요한 이유 (없으면 None)
+
+    학습 이후 증분 배정한 노트 수만 셉니다 (삭제는 남은 노트의 배정을 바꾸지 않음).
+    """
+    if state is None:
+        return "no_model"
+
+    fitted_count = max(state["fitted_count"], 1)
+    churn = (state["incremental_count"] + n_changed) / fitted_count
+    if churn > settings.cluster_refit_new_fraction:
+        return f"new_fraction={churn:.2f}"
+
+    fitted_at = state.get("fitted_at")
+    if fitted_at:
+        age_hours = (datetime.utcnow() - fitted_at).total_seconds() / 3600
+        if age_hours > settings.cluster_refit_max_age_hours:
+            return f"model_age={age_hours:.0f}h"
+
+    return None
+
+
+def assign_semantic_labels(
+    vault_id: str,
+    note_ids: List[str],
+    embeddings: np.ndarray,
+    folder_prefix: Optional[str] = None,
+    full_refit: bool = False
+) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """
+    노트별 클러스터 라벨 계산 (증분 배정 또는 전체 재학습)
+
+    Args:
+        vault_id: Vault ID
+        note_ids: 노트 ID 리스트
+        embeddings: (n_notes, dim) 임베딩 배열 (note_ids 순서)
+        folder_prefix: 폴더 필터 (모델은 폴더별로 따로 유지)
+        full_refit: True면 항상 전체 재학습
+
+    Returns:
+        (note_ids 순서의 라벨 배열, {"mode", "reason", "assigned", "removed", "drift"})
+    """
+    fingerprints = [embedding_fingerprint(vec) for vec in embeddings]
+    state = None if full_refit else semantic_model_store.load(vault_id, folder_prefix)
+
+    changed_idx: List[int] = []
+    removed = 0
+    if state is not None:
+        known = state["fingerprints"]
+        changed_idx = [i for i, nid in enumerate(note_ids) if known.get(nid) != fingerprints[i]]
+        current = set(note_ids)
+        removed = sum(1 for nid in known if nid not in current)
+
+    reason = "forced" if full_refit else _refit_reason(state, len(changed_idx))
+
+    if reason is None:
+        labels_by_note = dict(state["labels"])
+        drift = 0.0
+        if changed_idx:
+            reduced = state["reducer"].transform(embeddings[changed_idx])
+            new_labels, strengths = hdbscan.approximate_predict(state["clusterer"], reduced)
+            drift = float(np.mean(np.asarray(strengths) < _WEAK_MEMBERSHIP))
+            for i, label in zip(changed_idx, new_labels):
+                labels_by_note[note_ids[i]] = int(label)
+
+        total_drift_points = state["drift_points"] + drift * len(changed_idx)
+        total_incremental = state["incremental_count"] + len(changed_idx)
+        drift_rate = total_drift_points / max(total_incremental, 1)
+
+        if drift_rate <= settings.cluster_refit_drift_threshold:
+            current = set(note_ids)
+            state = {
+                **state,
+                "labels": {nid: labels_by_note[nid] for nid in note_ids},
+                "fingerprints": {
+                    **{nid: fp for nid, fp in state["fingerprints"].items() if nid in current},
+                    **{note_ids[i]: fingerprints[i] for i in changed_idx},
+                },
+                "incremental_count": total_incremental,
+                "drift_points": total_drift_points,
+            }
+            if changed_idx or removed:
+                semantic_model_store.save(vault_id, folder_prefix, state)
+            logger.info(
+                f"Incremental clustering: {len(changed_idx)} assigned, {removed} removed, drift={drift_rate:.2f}"
+            )
+            return np.array([state["labels"][nid] for nid in note_ids]), {
+                "mode": "incremental",
+                "reason": None,
+                "assigned": len(changed_idx),
+                "removed": removed,
+                "drift": round(drift_rate, 3),
+            }
+        reason = f"drift={drift_rate:.2f}"
+
+    logger.info(f"Full UMAP+HDBSCAN refit for vault {vault_id} ({len(note_ids)} notes, reason={reason})")
+    reducer, clusterer, labels = fit_semantic_model(embeddings)
+    semantic_model_store.save(vault_id, folder_prefix, {
+        "reducer": reducer,
+        "clusterer": clusterer,
+        "labels": {nid: int(label) for nid, label in zip(note_ids, labels)},
+        "fingerprints": dict(zip(note_ids, fingerprints)),
+        "fitted_count": len(note_ids),
+        "fitted_at": datetime.utcnow(),
+        "incremental_count": 0,
+        "drift_points": 0.0,
+    })
+    return labels, {
+        "mode": "full",
+        "reason": reason,
+        "assigned": len(note_ids),
+        "removed": removed,
+        "drift": 0.0,
+    }
+
+
+# Global instance
+semantic_model_store = SemanticClusterModelStore(
+    settings.cluster_model_dir,
+    max_loaded=settings.cluster_model_max_loaded,
+    max_files=settings.cluster_model_max_files,
+)
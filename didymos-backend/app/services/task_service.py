@@ -2,12 +2,15 @@
 Task 관리 서비스
 """
 from typing import List, Dict, Any, Optional
+import asyncio
 import logging
 
+from app.services.vault_version import vault_versions
+
 logger = logging.getLogger(__name__)
 
 
-def update_task(client, task_id: str, updates: Dict[str, Any]) -> bool:
+async def update_task(client, task_id: str, updates: Dict[str, Any]) -> bool:
     """
     Task 상태/우선순위 업데이트
     """
@@ -28,11 +31,17 @@ def update_task(client, task_id: str, updates: Dict[str, Any]) -> bool:
     set_clause = ", ".join(set_clauses)
 
     try:
-        result = client.query(
+        result = await client.query(
             f"""
             MATCH (t:Task {{id: $task_id}})
             SET {set_clause}, t.updated_at = datetime()
-            RETURN t.id AS id
+            // Task를 언급하는 노트의 Vault 버전 증가 (리뷰/약점/추천 캐시와 ETag 무효화)
+            WITH t
+            OPTIONAL MATCH (v:Vault)-[:HAS_NOTE]->(:Note)-[:MENTIONS|HAS_TASK]->(t)
+            WITH t, collect(DISTINCT v) AS vaults
+            FOREACH (v IN vaults | SET v.version = coalesce(v.version, 0) + 1)
+            RETURN t.id AS id,
+                   [v IN vaults | {{vault_id: v.id, version: v.version}}] AS vaults
             """,
             params,
         )
@@ -40,13 +49,15 @@ def update_task(client, task_id: str, updates: Dict[str, Any]) -> bool:
         success = bool(result and result[0].get("id"))
         if success:
             logger.info(f"✅ Task updated: {task_id}")
+            for vault in result[0].get("vaults") or []:
+                await asyncio.to_thread(vault_versions.changed, vault["vault_id"], vault["version"])
         return success
     except Exception as e:
         logger.error(f"Error updating task {task_id}: {e}")
         return False
 
 
-def list_tasks(
+async def list_tasks(
     client,
     vault_id: str,
     status: Optional[str] = None,
@@ -71,7 +82,7 @@ def list_tasks(
         where_clause = "AND " + " AND ".join(where_clauses)
 
     try:
-        result = client.query(
+        result = await client.query(
             f"""
             MATCH (v:Vault {{id: $vault_id}})-[:HAS_NOTE]->(n:Note)-[:MENTIONS]->(t:Task)
             WHERE 1=1 {where_clause}
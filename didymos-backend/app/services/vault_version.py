@@ -0,0 +1,197 @@
+"""
+Vault 버전 카운터 (이벤트 기반 캐시 무효화)
+
+노트 저장/삭제/AI 처리 시 Vault 노드의 version을 1씩 증가시키고,
+캐시는 저장 시점의 버전과 현재 버전을 비교(O(1))해 유효성을 판단합니다.
+max(n.updated_at) 같은 Vault 전체 스캔이 필요 없습니다.
+
+여러 API 레플리카는 pub/sub 채널(CACHE_PUBSUB_URL, Redis)로 버전 변경을 전달받아
+함께 무효화합니다. pub/sub이 없으면 로컬 버전을 VAULT_VERSION_REFRESH_SECONDS마다
+Neo4j에서 다시 읽습니다.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+CHANNEL = "didymos:vault-version"
+
+# (vault_id, version, note_ids) -> None
+VersionListener = Callable[[str, int, List[str]], None]
+
+
+class VaultVersions:
+    """프로세스 로컬 Vault 버전 레지스트리 + pub/sub 전파"""
+
+    def __init__(self, pubsub_url: str = "", refresh_seconds: float = 5.0):
+        self.pubsub_url = pubsub_url
+        self.refresh_seconds = refresh_seconds
+        self.origin = f"{os.getpid()}-{id(self):x}"
+        self._versions: Dict[str, Tuple[int, float]] = {}  # vault_id -> (version, checked_at)
+        self._listeners: List[VersionListener] = []
+        self._lock = threading.Lock()
+        self._redis = None
+        self._subscriber: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    # ------------------------------------------------------------------ versions
+
+    def current(self, vault_id: str, client=None) -> int:
+        """
+        현재 Vault 버전 (로컬 값, 오래되었으면 Neo4j에서 갱신)
+
+        pub/sub이 연결된 경우 다른 레플리카의 변경은 즉시 반영됩니다.
+        """
+        with self._lock:
+            entry = self._versions.get(vault_id)
+        refresh = self.refresh_seconds * (12 if self._subscriber else 1)
+        if entry and time.time() - entry[1] < refresh:
+            return entry[0]
+        return self.refresh(vault_id, client)
+
+    def refresh(self, vault_id: str, client=None) -> int:
+        """Neo4j에서 Vault 버전 조회 (Vault id 인덱스 조회 1회)"""
+        try:
+            if client is None:
+                from app.db.neo4j import get_neo4j_client
+                client = get_neo4j_client()
+            result = client.query(
+                "MATCH (v:Vault {id: $vault_id}) RETURN coalesce(v.version, 0) AS version",
+                {"vault_id": vault_id}
+            )
+            version = result[0]["version"] if result else 0
+        except Exception as e:
+            logger.warning(f"Failed to read vault version for {vault_id}: {e}")
+            with self._lock:
+                entry = self._versions.get(vault_id)
+            return entry[0] if entry else 0
+        self.observe(vault_id, version)
+        return version
+
+    def bump(self, client, vault_id: str, note_ids: Optional[List[str]] = None) -> int:
+        """Vault 버전 증가 후 로컬 반영 + 다른 레플리카에 알림"""
+        result = client.query(
+            """
+            MATCH (v:Vault {id: $vault_id})
+            SET v.version = coalesce(v.version, 0) + 1
+            RETURN v.version AS version
+            """,
+            {"vault_id": vault_id}
+        )
+        version = result[0]["version"] if result else 0
+        self.changed(vault_id, version, note_ids)
+        return version
+
+    def bump_for_note(self, client, note_id: str) -> Optional[int]:
+        """노트가 속한 Vault의 버전 증가 (vault_id를 모르는 경로용)"""
+        result = client.query(
+            """
+            MATCH (v:Vault)-[:HAS_NOTE]->(:Note {note_id: $note_id})
+            SET v.version = coalesce(v.version, 0) + 1
+            RETURN v.id AS vault_id, v.version AS version
+            """,
+            {"note_id": note_id}
+        )
+        if not result:
+            return None
+        self.changed(result[0]["vault_id"], result[0]["version"], [note_id])
+        return result[0]["version"]
+
+    def changed(self, vault_id: str, version: int, note_ids: Optional[List[str]] = None):
+        """이 프로세스에서 일어난 변경을 반영하고 발행 (버전은 DB 쓰기에서 받은 값)"""
+        self.observe(vault_id, version, note_ids, event=True)
+        self._publish(vault_id, version, note_ids or [])
+
+    def observe(self, vault_id: str, version: int, note_ids: Optional[List[str]] = None, event: bool = False):
+        """
+        관측한 버전 반영, 알고 있던 버전보다 크면 리스너 호출
+
+        event=True(변경 이벤트)면 처음 보는 Vault여도 리스너를 호출합니다.
+        """
+        with self._lock:
+            entry = self._versions.get(vault_id)
+            known = entry[0] if entry else None
+            self._versions[vault_id] = (version if known is None else max(version, known), time.time())
+            newer = version > known if known is not None else event
+            listeners = list(self._listeners) if newer else []
+        for listener in listeners:
+            try:
+                listener(vault_id, version, note_ids or [])
+            except Exception as e:
+                logger.warning(f"Vault version listener failed: {e}")
+
+    def add_listener(self, listener: VersionListener):
+        """버전 변경 콜백 등록 (로컬 변경과 다른 레플리카의 변경 모두)"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    # ------------------------------------------------------------------ pub/sub
+
+    def _publish(self, vault_id: str, version: int, note_ids: List[str]):
+        if not self.pubsub_url or redis is None:
+            return
+        try:
+            if self._redis is None:
+                self._redis = redis.Redis.from_url(self.pubsub_url)
+            self._redis.publish(CHANNEL, json.dumps({
+                "origin": self.origin,
+                "vault_id": vault_id,
+                "version": version,
+                "note_ids": note_ids[:500],
+            }))
+        except Exception as e:
+            logger.warning(f"Vault version publish failed: {e}")
+
+    def start(self):
+        """pub/sub 구독 스레드 시작 (CACHE_PUBSUB_URL이 없으면 아무것도 안 함)"""
+        if not self.pubsub_url:
+            return
+        if redis is None:
+            logger.warning("CACHE_PUBSUB_URL is set but redis is not installed; cross-replica invalidation disabled")
+            return
+        if self._subscriber is not None and self._subscriber.is_alive():
+            return
+        self._stopping.clear()
+        self._subscriber = threading.Thread(target=self._listen, name="vault-version-sub", daemon=True)
+        self._subscriber.start()
+        logger.info("📡 Vault version pub/sub subscriber started")
+
+    def stop(self):
+        self._stopping.set()
+        self._subscriber = None
+
+    def _listen(self):
+        while not self._stopping.is_set():
+            try:
+                pubsub = redis.Redis.from_url(self.pubsub_url).pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(CHANNEL)
+                while not self._stopping.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if not message:
+                        continue
+                    event = json.loads(message["data"])
+                    if event.get("origin") == self.origin:
+                        continue
+                    self.observe(event["vault_id"], int(event["version"]), event.get("note_ids"), event=True)
+                pubsub.close()
+            except Exception as e:
+                logger.warning(f"Vault version subscriber error, reconnecting: {e}")
+                self._stopping.wait(5.0)
+
+
+# Global instance
+vault_versions = VaultVersions(
+    pubsub_url=settings.cache_pubsub_url,
+    refresh_seconds=settings.vault_version_refresh_seconds,
+)
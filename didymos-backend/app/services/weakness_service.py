@@ -12,9 +12,34 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import logging
 
+import numpy as np
+from scipy import sparse
+
 logger = logging.getLogger(__name__)
 
 
+def topic_internal_link_counts(links, incidence) -> np.ndarray:
+    """
+    Topic별로 그 Topic을 언급한 노트들끼리의 연결 수 (자기 자신 링크 제외)
+
+    노트 쌍을 Topic마다 모두 비교하면 O(Σ 노트 수²)이므로,
+    링크 하나(a, b)가 a와 b가 함께 언급한 Topic마다 한 번씩 세어지도록
+    diag(Mᵀ L M) = colsum((L M) ∘ M)로 계산합니다 (O(링크 수 × 노트당 Topic 수)).
+
+    Args:
+        links: 노트 × 노트 0/1 대칭 인접 행렬 (CSR)
+        incidence: 노트 × Topic 0/1 언급 행렬 (CSR)
+
+    Returns:
+        Topic별 내부 연결 수 (대칭 행렬이므로 연결 하나가 2로 셈)
+    """
+    if incidence.shape[1] == 0:
+        return np.zeros(0, dtype=np.int64)
+    links = links - sparse.diags(links.diagonal())
+    reached = (links @ incidence).multiply(incidence)
+    return np.asarray(reached.sum(axis=0)).ravel()
+
+
 def find_isolated_topics(
     user_id: str,
     vault_id: str,
@@ -33,57 +58,42 @@ def find_isolated_topics(
     Returns:
         고립된 Topic 리스트
     """
-    from app.db.neo4j import get_neo4j_client
+    from app.services.graph_snapshot import graph_snapshots
 
-    client = get_neo4j_client()
+    try:
+        snapshot = graph_snapshots.get(user_id, vault_id)
+        # 노트 간 MENTIONS/RELATES_TO 연결 (방향 무시)
+        links = snapshot.note_link_matrix(types=("MENTIONS", "RELATES_TO"), symmetric=True)
+        degrees = snapshot.entity_degrees()
 
-    cypher = """
-    MATCH (u:User {id: $user_id})-[:OWNS]->(v:Vault {id: $vault_id})
-    MATCH (v)-[:HAS_NOTE]->(n:Note)-[:MENTIONS]->(topic:Topic)
-    WITH topic, collect(DISTINCT n) AS notes
-    WHERE size(notes) >= $min_notes_threshold
-
-    // 이 Topic을 언급한 노트들끼리 연결이 있는지 확인
-    UNWIND notes AS n1
-    UNWIND notes AS n2
-    WITH topic, notes, n1, n2
-    WHERE n1.note_id < n2.note_id
-    OPTIONAL MATCH (n1)-[rel:MENTIONS|:RELATES_TO]-(n2)
-
-    WITH topic, notes, count(rel) AS connections
-    WHERE connections = 0
-
-    RETURN topic.name AS topic_name,
-           [n IN notes | n.note_id] AS note_ids,
-           [n IN notes | n.title] AS note_titles,
-           size(notes) AS note_count
-    ORDER BY note_count DESC
-    LIMIT 10
-    """
+        topics = snapshot.entities_with_label("Topic")
+        topics = topics[degrees[topics] >= min_notes_threshold]
+        internal = topic_internal_link_counts(links, snapshot.mentions[:, topics])
 
-    try:
-        result = client.query(cypher, {
-            "user_id": user_id,
-            "vault_id": vault_id,
-            "min_notes_threshold": min_notes_threshold
-        })
+        # 언급 노트들끼리 연결이 전혀 없는 Topic (노트 수 내림차순, 동률은 엔티티 순서)
+        isolated_topics = topics[internal == 0]
+        isolated_topics = isolated_topics[np.argsort(-degrees[isolated_topics], kind="stable")]
 
         isolated = []
-        for row in result:
+        for topic in isolated_topics[:10]:
+            note_count = int(degrees[topic])
+            notes = snapshot.notes_of_entity(topic)
+            topic_name = snapshot.entity_names[topic]
+            note_ids = [snapshot.note_ids[i] for i in notes]
             isolated.append({
-                "topic_name": row["topic_name"],
-                "note_count": row["note_count"],
-                "note_ids": row["note_ids"],
-                "note_titles": row.get("note_titles", row["note_ids"]),
-                "severity": "high" if row["note_count"] >= 5 else "medium",
-                "recommendation": f"Connect {row['note_count']} notes about '{row['topic_name']}' to integrate this knowledge area"
+                "topic_name": topic_name,
+                "note_count": note_count,
+                "note_ids": note_ids,
+                "note_titles": [snapshot.note_titles[i] for i in notes],
+                "severity": "high" if note_count >= 5 else "medium",
+                "recommendation": f"Connect {note_count} notes about '{topic_name}' to integrate this knowledge area"
             })
 
         return isolated
 
     except Exception as e:
         logger.error(f"Failed to find isolated topics: {e}")
-        return []
+        raise
 
 
 def find_stale_projects(
@@ -174,7 +184,7 @@ def find_stale_projects(
 
     except Exception as e:
         logger.error(f"Failed to find stale projects: {e}")
-        return []
+        raise
 
 
 def find_chronic_overdue(
@@ -262,7 +272,7 @@ def find_chronic_overdue(
 
     except Exception as e:
         logger.error(f"Failed to find chronic overdue tasks: {e}")
-        return []
+        raise
 
 
 def find_weak_clusters(
@@ -285,40 +295,32 @@ def find_weak_clusters(
     Returns:
         약한 클러스터 리스트
     """
-    from app.db.neo4j import get_neo4j_client
-    from app.services.pattern_service import detect_communities, analyze_vault_patterns
+    from app.services.pattern_service import (
+        fetch_vault_graph,
+        detect_louvain_communities,
+        summarize_communities,
+    )
 
     try:
-        # Pattern analysis로 community 먼저 탐지
-        patterns = analyze_vault_patterns(user_id, vault_id)
-        communities = patterns.get("communities", [])
+        # 그래프를 한 번만 가져와 community와 내부 밀집도를 메모리에서 계산
+        notes, typed_edges = fetch_vault_graph(user_id, vault_id)
+        edges = [(from_node, to_node) for from_node, to_node, _ in typed_edges]
+        # 밀집도는 노트 간 MENTIONS/RELATES_TO 연결만 셈
+        link_edges = [
+            (from_node, to_node) for from_node, to_node, rel_type in typed_edges
+            if rel_type in ("MENTIONS", "RELATES_TO")
+        ]
+
+        communities_map = detect_louvain_communities(notes, edges)
 
         weak = []
 
-        for comm in communities:
+        for comm in summarize_communities(communities_map, link_edges):
             if comm["size"] < min_size:
                 continue
 
-            # 밀집도 계산: actual_edges / possible_edges
-            # possible_edges = n * (n-1) / 2
-            n = comm["size"]
-            possible_edges = n * (n - 1) / 2
-
-            # 실제 edge 수 계산 (community 내부 노트들 간 연결)
-            client = get_neo4j_client()
-
-            cypher = """
-            MATCH (n1:Note)-[rel:MENTIONS|:RELATES_TO]-(n2:Note)
-            WHERE n1.note_id IN $note_ids
-              AND n2.note_id IN $note_ids
-              AND n1.note_id < n2.note_id
-            RETURN count(DISTINCT rel) AS edge_count
-            """
-
-            result = client.query(cypher, {"note_ids": comm["notes"]})
-            actual_edges = result[0]["edge_count"] if result else 0
-
-            density = actual_edges / possible_edges if possible_edges > 0 else 0
+            density = comm["density"]
+            actual_edges = comm["internal_edges"]
 
             if density <= max_density:
                 weak.append({
@@ -327,7 +329,7 @@ def find_weak_clusters(
                     "note_ids": comm["notes"][:10],  # 일부만
                     "density": round(density, 3),
                     "actual_edges": actual_edges,
-                    "possible_edges": int(possible_edges),
+                    "possible_edges": comm["possible_edges"],
                     "severity": "high" if density < 0.1 else "medium",
                     "recommendation": f"This cluster has {comm['size']} notes but only {actual_edges} connections. Add more links to integrate this knowledge area."
                 })
@@ -339,7 +341,7 @@ def find_weak_clusters(
 
     except Exception as e:
         logger.error(f"Failed to find weak clusters: {e}")
-        return []
+        raise
 
 
 def detect_knowledge_gaps(
@@ -362,76 +364,71 @@ def detect_knowledge_gaps(
     Returns:
         지식 공백 리스트
     """
-    from app.db.neo4j import get_neo4j_client
-
-    client = get_neo4j_client()
-
-    cypher = """
-    MATCH (u:User {id: $user_id})-[:OWNS]->(v:Vault {id: $vault_id})
-    MATCH (v)-[:HAS_NOTE]->(n:Note)-[:MENTIONS]->(topic:Topic)
-
-    WITH topic, collect(DISTINCT n) AS notes
-    WHERE size(notes) >= $min_mentions
-
-    // 실제 내용이 있는 노트 필터링 (TODO: 임시로 모든 노트 카운트)
-    WITH topic, notes, size(notes) AS total_mentions
-
-    RETURN topic.name AS topic_name,
-           total_mentions,
-           [n IN notes | n.note_id][..5] AS sample_note_ids,
-           [n IN notes | n.title][..5] AS sample_note_titles
-    ORDER BY total_mentions DESC
-    LIMIT 10
-    """
+    from app.services.graph_snapshot import graph_snapshots
 
     try:
-        result = client.query(cypher, {
-            "user_id": user_id,
-            "vault_id": vault_id,
-            "min_mentions": min_topic_mentions
-        })
+        snapshot = graph_snapshots.get(user_id, vault_id)
+        degrees = snapshot.entity_degrees()
+
+        # 실제 내용이 있는 노트 필터링 (TODO: 임시로 모든 노트 카운트)
+        topics = snapshot.entities_with_label("Topic")
+        topics = topics[degrees[topics] >= min_topic_mentions]
+        topics = topics[np.argsort(-degrees[topics], kind="stable")][:10]
 
         gaps = []
-        for row in result:
+        for topic in topics:
+            topic_name = snapshot.entity_names[topic]
+            total_mentions = int(degrees[topic])
+            sample = snapshot.notes_of_entity(topic)[:5]
             gaps.append({
-                "topic_name": row["topic_name"],
-                "mention_count": row["total_mentions"],
-                "sample_note_ids": row.get("sample_note_ids", []),
-                "sample_note_titles": row.get("sample_note_titles", []),
-                "severity": "high" if row["total_mentions"] >= 10 else "medium",
-                "recommendation": f"'{row['topic_name']}' is mentioned {row['total_mentions']} times but may lack deep coverage. Consider creating a comprehensive note."
+                "topic_name": topic_name,
+                "mention_count": total_mentions,
+                "sample_note_ids": [snapshot.note_ids[i] for i in sample],
+                "sample_note_titles": [snapshot.note_titles[i] for i in sample],
+                "severity": "high" if total_mentions >= 10 else "medium",
+                "recommendation": f"'{topic_name}' is mentioned {total_mentions} times but may lack deep coverage. Consider creating a comprehensive note."
             })
 
         return gaps
 
     except Exception as e:
         logger.error(f"Failed to detect knowledge gaps: {e}")
-        return []
+        raise
 
 
 def analyze_weaknesses(
     user_id: str,
-    vault_id: str
+    vault_id: str,
+    timeout: Optional[float] = None
 ) -> Dict[str, Any]:
     """
     종합 약점 분석
     "The chain is only as strong as its weakest link" 원칙
 
+    탐지들은 서로 독립이므로 동시에 실행하고, 제한 시간을 넘기거나 예외가 난 탐지는
+    빈 결과 + status "timed_out"/"failed"로 채워 나머지 결과는 그대로 반환합니다.
+    (탐지는 예외를 삼키지 않아야 analysis_status.partial이 실패를 반영합니다)
+
     Args:
         user_id: 사용자 ID
         vault_id: Vault ID
+        timeout: 탐지별 제한 시간 (초, None이면 설정값)
 
     Returns:
-        모든 약점 분석 결과 + 우선순위 추천
+        모든 약점 분석 결과 + 우선순위 추천 + 탐지별 실행 상태
     """
+    from app.services.analysis_fanout import analysis_fanout, outcome_statuses
+
     logger.info(f"Analyzing weaknesses for user {user_id}, vault {vault_id}")
 
-    # 모든 약점 탐지
-    isolated_topics = find_isolated_topics(user_id, vault_id)
-    stale_projects = find_stale_projects(user_id, vault_id, days_threshold=30)
-    chronic_tasks = find_chronic_overdue(user_id, vault_id, overdue_threshold=7)
-    weak_clusters = find_weak_clusters(user_id, vault_id)
-    knowledge_gaps = detect_knowledge_gaps(user_id, vault_id)
+    # 모든 약점 탐지 (카테고리 이름 → 탐지)
+    outcomes = analysis_fanout.run({
+        "isolated_topics": lambda: find_isolated_topics(user_id, vault_id),
+        "stale_projects": lambda: find_stale_projects(user_id, vault_id, days_threshold=30),
+        "chronic_overdue_tasks": lambda: find_chronic_overdue(user_id, vault_id, overdue_threshold=7),
+        "weak_clusters": lambda: find_weak_clusters(user_id, vault_id),
+        "knowledge_gaps": lambda: detect_knowledge_gaps(user_id, vault_id),
+    }, timeout=timeout)
 
     # 각 카테고리별 심각도 점수 계산
     def calculate_severity_score(items: List[Dict]) -> float:
@@ -442,34 +439,16 @@ def analyze_weaknesses(
         total = sum(severity_weights.get(item.get("severity", "low"), 0) for item in items)
         return round(total / len(items), 2)
 
-    # 가장 심각한 약점 식별
-    weaknesses_summary = {
-        "isolated_topics": {
-            "count": len(isolated_topics),
-            "severity_score": calculate_severity_score(isolated_topics),
-            "items": isolated_topics[:5]
-        },
-        "stale_projects": {
-            "count": len(stale_projects),
-            "severity_score": calculate_severity_score(stale_projects),
-            "items": stale_projects[:5]
-        },
-        "chronic_overdue_tasks": {
-            "count": len(chronic_tasks),
-            "severity_score": calculate_severity_score(chronic_tasks),
-            "items": chronic_tasks[:5]
-        },
-        "weak_clusters": {
-            "count": len(weak_clusters),
-            "severity_score": calculate_severity_score(weak_clusters),
-            "items": weak_clusters[:5]
-        },
-        "knowledge_gaps": {
-            "count": len(knowledge_gaps),
-            "severity_score": calculate_severity_score(knowledge_gaps),
-            "items": knowledge_gaps[:5]
+    # 가장 심각한 약점 식별 (시간 초과/실패한 카테고리는 빈 결과)
+    weaknesses_summary = {}
+    for category, outcome in outcomes.items():
+        items = outcome.value or []
+        weaknesses_summary[category] = {
+            "count": len(items),
+            "severity_score": calculate_severity_score(items),
+            "items": items[:5],
+            "status": outcome.status
         }
-    }
 
     # 전체 약점 점수 계산
     total_weakness_score = sum(
@@ -491,7 +470,8 @@ def analyze_weaknesses(
             "count": critical_category[1]["count"],
             "top_items": critical_category[1]["items"][:3]
         },
-        "strengthening_plan": generate_strengthening_plan(weaknesses_summary)
+        "strengthening_plan": generate_strengthening_plan(weaknesses_summary),
+        "analysis_status": outcome_statuses(outcomes)
     }
 
 
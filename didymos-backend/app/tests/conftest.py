@@ -0,0 +1,12 @@
+"""
+테스트 공통 설정
+
+Settings의 필수 값이 없으면 app.config 임포트가 실패하므로 더미 값을 채웁니다
+(실제 Neo4j/OpenAI에는 연결하지 않음).
+"""
+import os
+
+os.environ.setdefault("NEO4J_URI", "bolt://localhost:7687")
+os.environ.setdefault("NEO4J_USERNAME", "neo4j")
+os.environ.setdefault("NEO4J_PASSWORD", "test")
+os.environ.setdefault("OPENAI_API_KEY", "test")
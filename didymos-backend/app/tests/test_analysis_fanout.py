@@ -0,0 +1,98 @@
+"""
+분석 팬아웃 테스트 (ok / timed_out / failed, 포화 시 거절)
+"""
+import threading
+import time
+
+import pytest
+
+from app.services.analysis_fanout import (
+    STATUS_FAILED,
+    STATUS_OK,
+    STATUS_TIMED_OUT,
+    AnalysisFanout,
+    AnalysisPoolSaturated,
+    outcome_statuses,
+)
+
+
+def _fail():
+    raise ValueError("boom")
+
+
+def test_ok_timed_out_and_failed_outcomes():
+    fanout = AnalysisFanout(max_workers=4)
+    release = threading.Event()
+    try:
+        outcomes = fanout.run(
+            {"fast": lambda: [1], "slow": lambda: release.wait(5), "broken": _fail},
+            timeout=0.2,
+            defaults={"slow": [], "broken": []},
+        )
+    finally:
+        release.set()
+
+    assert outcomes["fast"].status == STATUS_OK and outcomes["fast"].value == [1]
+    assert outcomes["slow"].status == STATUS_TIMED_OUT and outcomes["slow"].value == []
+    assert outcomes["broken"].status == STATUS_FAILED and outcomes["broken"].value == []
+    assert "boom" in outcomes["broken"].error
+
+    statuses = outcome_statuses(outcomes)
+    assert statuses["partial"] is True
+    assert statuses["analyses"]["slow"]["status"] == STATUS_TIMED_OUT
+
+    metrics = fanout.snapshot()["analyses"]
+    assert metrics["slow"][STATUS_TIMED_OUT] == 1
+    assert metrics["broken"][STATUS_FAILED] == 1
+
+
+def test_per_name_timeouts_override_default():
+    fanout = AnalysisFanout(max_workers=2)
+    outcomes = fanout.run(
+        {"a": lambda: time.sleep(0.15) or "done"},
+        timeout=0.05,
+        timeouts={"a": 2.0},
+    )
+    assert outcomes["a"].status == STATUS_OK
+
+
+def test_saturated_pool_rejects_instead_of_queueing():
+    fanout = AnalysisFanout(max_workers=2)
+    release = threading.Event()
+    try:
+        first = fanout.run({"stuck1": lambda: release.wait(5), "stuck2": lambda: release.wait(5)}, timeout=0.05)
+        assert all(o.status == STATUS_TIMED_OUT for o in first.values())
+
+        # 시간 초과된 분석이 두 스레드를 모두 점유 중
+        with pytest.raises(AnalysisPoolSaturated):
+            fanout.run({"next": lambda: "never runs"}, timeout=0.05)
+        assert fanout.snapshot()["rejected_requests"] == 1
+    finally:
+        release.set()
+
+    deadline = time.time() + 5
+    while fanout.snapshot()["busy_threads"] and time.time() < deadline:
+        time.sleep(0.01)
+    assert fanout.run({"next": lambda: "ran"}, timeout=1.0)["next"].value == "ran"
+
+
+def test_detector_error_marks_weakness_analysis_partial(monkeypatch):
+    from app.services import analysis_fanout as fanout_module
+    from app.services import weakness_service
+
+    monkeypatch.setattr(fanout_module, "analysis_fanout", AnalysisFanout(max_workers=8))
+    for name in ("find_isolated_topics", "find_stale_projects", "find_chronic_overdue", "find_weak_clusters"):
+        monkeypatch.setattr(weakness_service, name, lambda *args, **kwargs: [])
+
+    from app.services.graph_snapshot import graph_snapshots
+
+    def broken_snapshot(*args, **kwargs):
+        raise RuntimeError("neo4j unavailable")
+
+    monkeypatch.setattr(graph_snapshots, "get", broken_snapshot)
+
+    result = weakness_service.analyze_weaknesses("user-1", "vault-1", timeout=2.0)
+
+    assert result["weaknesses"]["knowledge_gaps"]["status"] == STATUS_FAILED
+    assert result["weaknesses"]["knowledge_gaps"]["items"] == []
+    assert result["analysis_status"]["partial"] is True
@@ -0,0 +1,105 @@
+"""
+TTLCache L1/L2 동작 테스트
+"""
+import pytest
+
+from app.utils.cache import TTLCache
+from app.utils.cache_backends import CacheBackend
+
+
+class DictBackend(CacheBackend):
+    name = "dict"
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ttl_seconds):
+        self.data[key] = value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def delete_prefix(self, prefix):
+        for key in [k for k in self.data if k.startswith(prefix)]:
+            del self.data[key]
+
+
+def test_backend_missing_methods_fails_on_instantiation():
+    class Incomplete(CacheBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_l2_hit_is_promoted_to_l1():
+    l2 = DictBackend()
+    TTLCache(namespace="t", l2=l2).set("k", "v", version=3)
+
+    other = TTLCache(namespace="t", l2=l2)
+    assert other.get("k", version=3) == "v"
+    assert other.stats["hits_l2"] == 1
+    assert other.get("k", version=3) == "v"
+    assert other.stats["hits_l1"] == 1
+
+
+def test_l2_entry_from_newer_version_is_kept():
+    l2 = DictBackend()
+    TTLCache(namespace="t", l2=l2).set("k", "new", version=5)
+
+    lagging = TTLCache(namespace="t", l2=l2)
+    assert lagging.get("k", version=4) is None
+    assert "t:k" in l2.data
+    assert TTLCache(namespace="t", l2=l2).get("k", version=5) == "new"
+
+
+def test_l2_entry_from_older_version_is_deleted():
+    l2 = DictBackend()
+    TTLCache(namespace="t", l2=l2).set("k", "old", version=4)
+
+    assert TTLCache(namespace="t", l2=l2).get("k", version=5) is None
+    assert "t:k" not in l2.data
+
+
+def test_clear_prefix_removes_only_matching_keys():
+    cache = TTLCache(namespace="t")
+    for key in ("a:1", "a:2", "b:1"):
+        cache.set(key, key)
+    cache.clear_prefix("a:")
+    assert cache.get("a:1") is None
+    assert cache.get("b:1") == "b:1"
+
+
+class _Exploit:
+    triggered = False
+
+    def __reduce__(self):
+        return (_trigger, ())
+
+
+def _trigger():
+    _Exploit.triggered = True
+
+
+def test_l2_payload_is_never_unpickled():
+    import pickle
+    import time
+
+    l2 = DictBackend()
+    l2.data["t:k"] = pickle.dumps((_Exploit(), time.time() + 60, None))
+
+    assert TTLCache(namespace="t", l2=l2).get("k") is None
+    assert _Exploit.triggered is False
+
+
+def test_non_json_value_stays_in_l1_only():
+    l2 = DictBackend()
+    cache = TTLCache(namespace="t", l2=l2)
+    cache.set("k", {1, 2})
+
+    assert cache.get("k") == {1, 2}
+    assert "t:k" not in l2.data
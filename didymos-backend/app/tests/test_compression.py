@@ -0,0 +1,40 @@
+"""
+GZip 압축 미들웨어 테스트 (스트리밍 미디어 타입 제외)
+"""
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.utils.compression import SelectiveGZipMiddleware
+
+
+def _client():
+    app = FastAPI()
+    app.add_middleware(SelectiveGZipMiddleware, minimum_size=10)
+
+    @app.get("/json")
+    async def json_body():
+        return {"items": ["x" * 20] * 20}
+
+    @app.get("/stream")
+    async def stream():
+        async def lines():
+            for i in range(50):
+                yield f'{{"index": {i}, "padding": "{"y" * 20}"}}\n'
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    return TestClient(app)
+
+
+def test_regular_responses_are_gzipped():
+    response = _client().get("/json", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()["items"]) == 20
+
+
+def test_ndjson_stream_is_not_compressed():
+    response = _client().get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert len(response.text.splitlines()) == 50
@@ -0,0 +1,53 @@
+"""
+노트 콘텐츠 해시 (AI 처리 생략 판단) 테스트
+"""
+from app.utils.content_hash import (
+    changed_sections,
+    content_hash,
+    normalize_content,
+    section_hashes,
+    split_sections,
+)
+
+
+def test_normalize_strips_frontmatter_whitespace_and_blank_runs():
+    raw = "---\ntags: [a]\nupdated: 2024-01-01\n---\r\n# Title  \r\n\r\n\r\n\r\nbody \t\n\n"
+    assert normalize_content(raw) == "# Title\n\nbody"
+
+
+def test_normalize_keeps_horizontal_rule_that_is_not_frontmatter():
+    assert normalize_content("text\n---\nmore") == "text\n---\nmore"
+
+
+def test_hash_ignores_frontmatter_and_trailing_whitespace_only():
+    base = "# Title\nbody"
+    assert content_hash(base) == content_hash("---\nmtime: 1\n---\n# Title   \nbody\n\n")
+    assert content_hash(base) != content_hash("# Title\nbody changed")
+    assert content_hash(base, salt="private") != content_hash(base, salt="")
+
+
+def test_split_sections_by_heading_with_preamble():
+    sections = split_sections("intro\n# A\na text\n## B\nb text")
+    assert sections == [("", "intro"), ("# A", "a text"), ("## B", "b text")]
+
+
+def test_split_sections_ignores_headings_inside_code_fences():
+    content = "# A\n```python\n# not a heading\nx = 1\n```\n# B\nb"
+    sections = split_sections(content)
+    assert [heading for heading, _ in sections] == ["# A", "# B"]
+    assert "# not a heading" in sections[0][1]
+
+
+def test_split_sections_requires_space_after_hashes():
+    assert [h for h, _ in split_sections("#tag line\n# Real\ntext")] == ["", "# Real"]
+
+
+def test_changed_sections_returns_only_new_or_edited_sections():
+    before = "# A\none\n# B\ntwo"
+    previous = section_hashes(before)
+
+    assert changed_sections(before, previous) == []
+    # 순서만 바뀐 경우는 변경 아님
+    assert changed_sections("# B\ntwo\n# A\none", previous) == []
+    assert changed_sections("# A\none\n# B\ntwo!\n# C\nthree", previous) == ["# B\ntwo!", "# C\nthree"]
+    assert changed_sections(before, []) == ["# A\none", "# B\ntwo"]
@@ -0,0 +1,114 @@
+"""
+CO_OCCURS 증분 갱신 테스트 (Neo4j 대신 상태를 흉내 내는 가짜 클라이언트 사용)
+"""
+from collections import Counter
+
+from app.services.cooccurrence_service import (
+    COOCCURRENCE_APPLY_QUERY,
+    COOCCURRENCE_STATE_QUERY,
+    cooccurrence_delta,
+    update_note_cooccurrence,
+)
+
+
+class FakeGraph:
+    """노트별 MENTIONS 키, 반영된 키(Note.cooccur_keys), 쌍별 weight만 보관"""
+
+    def __init__(self):
+        self.mentions = {}
+        self.stored = {}
+        self.weights = Counter()
+
+    def query(self, cypher, params):
+        if cypher == COOCCURRENCE_STATE_QUERY:
+            return [
+                {
+                    "note_id": note_id,
+                    "vault_id": "vault-1",
+                    "previous": self.stored.get(note_id, []),
+                    "current": list(self.mentions[note_id]),
+                }
+                for note_id in params["note_ids"]
+                if note_id in self.mentions
+            ]
+        if cypher == COOCCURRENCE_APPLY_QUERY:
+            applied, added, deleted = [], 0, 0
+            for note in params["notes"]:
+                if self.stored.get(note["note_id"], []) != note["previous"]:
+                    continue
+                if not note["clear"] and set(note["current"]) != self.mentions[note["note_id"]]:
+                    continue
+                self.stored[note["note_id"]] = note["current"]
+                for pair in note["added"]:
+                    self.weights[pair["key"]] += 1
+                    added += 1
+                for pair in note["removed"]:
+                    if pair["key"] in self.weights:
+                        self.weights[pair["key"]] -= 1
+                        if self.weights[pair["key"]] <= 0:
+                            del self.weights[pair["key"]]
+                            deleted += 1
+                applied.append(note["note_id"])
+            return [{"applied": applied, "pairs_added": added, "pairs_deleted": deleted}]
+        raise AssertionError(f"unexpected query: {cypher}")
+
+
+def test_delta_orders_pairs_and_skips_kept_pairs():
+    added, removed = cooccurrence_delta(["a", "b"], ["b", "c"])
+    assert added == [("b", "c")]
+    assert removed == [("a", "b")]
+
+
+def test_add_remove_and_clear_return_weights_to_zero():
+    graph = FakeGraph()
+    graph.mentions = {"n1": {"Topic:a", "Topic:b", "uuid-c"}, "n2": {"Topic:a", "Topic:b"}}
+
+    update_note_cooccurrence(graph, ["n1", "n2"])
+    assert graph.weights == Counter({
+        "Topic:a|Topic:b": 2,
+        "Topic:a|uuid-c": 1,
+        "Topic:b|uuid-c": 1,
+    })
+
+    # 다시 실행해도 차이가 없으면 weight가 그대로
+    update_note_cooccurrence(graph, ["n1", "n2"])
+    assert graph.weights["Topic:a|Topic:b"] == 2
+
+    graph.mentions["n1"] = {"Topic:b", "uuid-c", "uuid-d"}
+    update_note_cooccurrence(graph, ["n1"])
+    assert graph.weights == Counter({
+        "Topic:a|Topic:b": 1,
+        "Topic:b|uuid-c": 1,
+        "Topic:b|uuid-d": 1,
+        "uuid-c|uuid-d": 1,
+    })
+
+    update_note_cooccurrence(graph, ["n1", "n2"], clear=True)
+    assert graph.weights == Counter()
+    assert graph.stored == {"n1": [], "n2": []}
+
+
+def test_concurrently_changed_note_is_reread(monkeypatch):
+    graph = FakeGraph()
+    graph.mentions = {"n1": {"Topic:a", "Topic:b"}}
+    original_query = graph.query
+    calls = []
+
+    def racing_query(cypher, params):
+        calls.append(cypher)
+        rows = original_query(cypher, params)
+        # 첫 조회 직후 다른 작업이 MENTIONS를 바꿈
+        if len(calls) == 1:
+            graph.mentions["n1"] = {"Topic:a", "Topic:b", "Topic:c"}
+        return rows
+
+    monkeypatch.setattr(graph, "query", racing_query)
+    stats = update_note_cooccurrence(graph, ["n1"])
+
+    assert stats["notes"] == 1
+    assert calls.count(COOCCURRENCE_STATE_QUERY) == 2
+    assert graph.weights == Counter({
+        "Topic:a|Topic:b": 1,
+        "Topic:a|Topic:c": 1,
+        "Topic:b|Topic:c": 1,
+    })
@@ -0,0 +1,91 @@
+"""
+임베딩 배치 파이프라인 테스트
+"""
+import asyncio
+import threading
+
+from app.services.embedding_pipeline import (
+    EmbeddingBatcher,
+    LocalHashEmbeddingProvider,
+    plan_token_batches,
+    truncate_to_tokens,
+)
+
+
+def test_plan_token_batches_respects_token_budget_and_order():
+    assert plan_token_batches([3, 4, 2, 5, 1], max_batch_tokens=7) == [[0, 1], [2, 3], [4]]
+
+
+def test_plan_token_batches_oversized_input_gets_its_own_batch():
+    assert plan_token_batches([2, 10, 2], max_batch_tokens=5) == [[0], [1], [2]]
+
+
+def test_plan_token_batches_caps_inputs_per_request():
+    assert plan_token_batches([1] * 5, max_batch_tokens=100, max_batch_inputs=2) == [[0, 1], [2, 3], [4]]
+    assert plan_token_batches([], max_batch_tokens=10) == []
+
+
+def test_truncate_to_tokens_caps_long_inputs():
+    text, tokens = truncate_to_tokens("word " * 50, max_tokens=10)
+    assert tokens == 10
+    assert len(text) < len("word " * 50)
+    assert truncate_to_tokens("short", max_tokens=10)[0] == "short"
+
+
+class RecordingClient:
+    def __init__(self):
+        self.rows = []
+
+    def query(self, cypher, params):
+        self.rows.extend(params["rows"])
+        return [{"count": len(params["rows"])}]
+
+
+class SlowProvider(LocalHashEmbeddingProvider):
+    """첫 호출이 시작되면 started를 알리고 release까지 대기"""
+
+    def __init__(self):
+        super().__init__(dimensions=8)
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def embed_documents(self, texts):
+        self.started.set()
+        self.release.wait(5)
+        return super().embed_documents(texts)
+
+
+def test_close_finishes_in_flight_batch():
+    async def scenario():
+        provider, client = SlowProvider(), RecordingClient()
+        batcher = EmbeddingBatcher(provider=provider, client=client, max_batch_notes=1, window_seconds=10)
+
+        submitted = asyncio.create_task(batcher.submit("note-1", "content long enough to embed"))
+        await asyncio.to_thread(provider.started.wait, 5)
+
+        closing = asyncio.create_task(batcher.close())
+        await asyncio.sleep(0.05)
+        provider.release.set()
+        await asyncio.wait_for(closing, 5)
+        return await asyncio.wait_for(submitted, 5), client.rows
+
+    ok, rows = asyncio.run(scenario())
+    assert ok is True
+    assert [row["note_id"] for row in rows] == ["note-1"]
+
+
+def test_close_flushes_requests_submitted_before_the_window():
+    async def scenario():
+        client = RecordingClient()
+        batcher = EmbeddingBatcher(
+            provider=LocalHashEmbeddingProvider(dimensions=8), client=client,
+            max_batch_notes=100, window_seconds=60,
+        )
+        waiters = [asyncio.create_task(batcher.submit(f"note-{i}", f"note body number {i}")) for i in range(3)]
+        await asyncio.sleep(0)
+        await asyncio.wait_for(batcher.close(), 5)
+        return await asyncio.gather(*waiters), client.rows
+
+    results, rows = asyncio.run(scenario())
+    assert results == [True, True, True]
+    assert sorted(row["note_id"] for row in rows) == ["note-0", "note-1", "note-2"]
@@ -0,0 +1,64 @@
+"""
+Vault 버전 ETag / 조건부 GET 테스트
+"""
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from app.utils import etag as etag_module
+from app.utils.etag import VaultETagMiddleware, etag_matches, vault_etag, vault_not_modified
+
+
+def test_etag_matches_weak_lists_and_star():
+    tag = vault_etag("v1", 3, "/path", [])
+    assert tag.startswith('W/"3-')
+    assert etag_matches(tag, tag)
+    assert etag_matches(f'"other", {tag[2:]}', tag)
+    assert etag_matches("*", tag)
+    assert not etag_matches(None, tag)
+    assert not etag_matches(vault_etag("v1", 4, "/path", []), tag)
+
+
+class FakeVersions:
+    def __init__(self, version):
+        self.version = version
+
+    def current(self, vault_id, client=None):
+        return self.version
+
+    def refresh(self, vault_id, client=None):
+        return self.version
+
+
+def _client(monkeypatch, versions, bump_during_request=False):
+    monkeypatch.setattr(etag_module, "vault_versions", versions)
+    app = FastAPI()
+    app.add_middleware(VaultETagMiddleware)
+
+    @app.get("/view")
+    async def view(request: Request, response: Response, vault_id: str):
+        not_modified = await vault_not_modified(request, response, vault_id)
+        if not_modified:
+            return not_modified
+        if bump_during_request:
+            versions.version += 1
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_unchanged_version_keeps_etag_and_returns_304(monkeypatch):
+    client = _client(monkeypatch, FakeVersions(5))
+    first = client.get("/view", params={"vault_id": "v1"})
+    assert first.status_code == 200
+    tag = first.headers["etag"]
+
+    second = client.get("/view", params={"vault_id": "v1"}, headers={"If-None-Match": tag})
+    assert second.status_code == 304
+
+
+def test_version_bumped_during_request_drops_etag(monkeypatch):
+    client = _client(monkeypatch, FakeVersions(5), bump_during_request=True)
+    response = client.get("/view", params={"vault_id": "v1"})
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+    assert response.headers["cache-control"] == "no-store"
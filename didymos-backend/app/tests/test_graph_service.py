@@ -0,0 +1,67 @@
+"""
+노트 목록 키셋 커서 테스트
+"""
+import asyncio
+
+import pytest
+
+from app.services.graph_service import decode_note_cursor, encode_note_cursor, get_notes_page
+
+
+def test_cursor_round_trip_with_unicode_and_separators():
+    cursor = encode_note_cursor("2024-05-01T10:00:00Z", "폴더/노트 | a,b.md")
+    assert "=" not in cursor
+    assert decode_note_cursor(cursor) == ("2024-05-01T10:00:00Z", "폴더/노트 | a,b.md")
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!!", encode_note_cursor("x", "y")[:-3], "WzEsMl0"])
+def test_decode_rejects_malformed_cursors(cursor):
+    with pytest.raises(ValueError):
+        decode_note_cursor(cursor)
+
+
+class KeysetClient:
+    """get_notes_page의 WHERE/ORDER BY/SKIP/LIMIT을 메모리에서 흉내 내는 비동기 클라이언트"""
+
+    def __init__(self, notes):
+        self.notes = notes
+
+    async def query(self, cypher, params):
+        rows = [
+            {"note_id": note_id, "_sort_updated": updated, "_sort_note_id": note_id}
+            for note_id, updated in self.notes
+        ]
+        after_updated, after_id = params["after_updated"], params["after_note_id"]
+        if after_updated is not None:
+            rows = [
+                r for r in rows
+                if r["_sort_updated"] < after_updated
+                or (r["_sort_updated"] == after_updated and r["_sort_note_id"] < after_id)
+            ]
+        rows.sort(key=lambda r: (r["_sort_updated"], r["_sort_note_id"]), reverse=True)
+        return rows[params["offset"]:params["offset"] + params["limit"]]
+
+
+def test_keyset_pages_visit_tied_timestamps_exactly_once():
+    # 같은 updated_at이 페이지 경계를 넘도록 구성, updated_at 없는 노트는 ''로 마지막
+    notes = [(f"n{i:02d}", "2024-01-02" if i < 7 else "2024-01-01") for i in range(10)] + [("z", "")]
+    client = KeysetClient(notes)
+
+    async def collect():
+        seen, cursor = [], None
+        while True:
+            page = await get_notes_page(client, "u", "v", limit=3, cursor=cursor, fields=["note_id"])
+            seen.extend(note["note_id"] for note in page["notes"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return seen
+
+    seen = asyncio.run(collect())
+    assert len(seen) == len(set(seen)) == 11
+    assert seen[:7] == [f"n{i:02d}" for i in range(6, -1, -1)]
+    assert seen[-1] == "z"
+
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(ValueError):
+        asyncio.run(get_notes_page(KeysetClient([]), "u", "v", fields=["nope"]))
@@ -0,0 +1,122 @@
+"""
+SQLite 노트 작업 큐 테스트 (claim / complete / fail / requeue, 리스 토큰)
+"""
+import pytest
+
+from app.services.job_queue import NoteJobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    q = NoteJobQueue(str(tmp_path / "jobs.db"), max_attempts=2, backoff_base_seconds=0.0, backoff_max_seconds=0.0)
+    yield q
+    q.close()
+
+
+def _job(note_id, **extra):
+    return {"note_id": note_id, **extra}
+
+
+def _status(queue, note_id):
+    row = queue._connect().execute("SELECT status FROM note_jobs WHERE note_id = ?", (note_id,)).fetchone()
+    return row["status"] if row else None
+
+
+def test_enqueue_dedupes_by_note_and_keeps_latest_payload(queue):
+    assert queue.enqueue(_job("n1", rev=1)) == 1
+    assert queue.enqueue(_job("n1", rev=2)) == 2
+
+    jobs = queue.claim("w1", limit=10)
+    assert len(jobs) == 1
+    assert jobs[0]["payload"]["rev"] == 2
+    assert jobs[0]["attempt"] == 1
+    assert queue.claim("w2", limit=10) == []
+
+
+def test_complete_removes_job_and_records_history(queue):
+    queue.enqueue_many([_job("n1"), _job("n2")])
+    jobs = queue.claim("w1", limit=1)
+    assert queue.complete(jobs[0]) is True
+
+    stats = queue.stats()
+    assert stats["depth"] == {"pending": 1, "running": 0, "failed": 0}
+    assert stats["recent"]["completed"] == 1
+
+
+def test_reenqueue_while_running_keeps_new_version_pending(queue):
+    queue.enqueue(_job("n1", rev=1))
+    [job] = queue.claim("w1", limit=1)
+    queue.enqueue(_job("n1", rev=2))
+
+    assert queue.complete(job) is True
+    assert _status(queue, "n1") == "pending"
+    [again] = queue.claim("w1", limit=1)
+    assert again["payload"]["rev"] == 2
+
+
+def test_note_is_not_claimed_twice_while_running(queue):
+    queue.enqueue(_job("n1", rev=1))
+    [first] = queue.claim("w1", limit=1)
+    queue.enqueue(_job("n1", rev=2))
+
+    # rev1이 끝나기 전에는 rev2를 다른 워커가 가져가지 않음
+    assert queue.claim("w2", limit=1) == []
+    assert _status(queue, "n1") == "running"
+
+    assert queue.complete(first) is True
+    [second] = queue.claim("w2", limit=1)
+    assert second["payload"]["rev"] == 2
+    assert second["attempt"] == 1
+    assert queue.complete(second) is True
+    assert _status(queue, "n1") is None
+
+
+def test_failed_run_promotes_newer_version_without_backoff(queue):
+    queue.enqueue(_job("n1", rev=1))
+    [first] = queue.claim("w1", limit=1)
+    queue.enqueue(_job("n1", rev=2))
+
+    assert queue.fail(first, "boom") is True
+    [second] = queue.claim("w2", limit=1)
+    assert second["payload"]["rev"] == 2
+    assert second["attempt"] == 1
+
+
+def test_fail_retries_then_fails_permanently(queue):
+    queue.enqueue(_job("n1"))
+    [job] = queue.claim("w1", limit=1)
+    assert queue.fail(job, "boom") is True
+    assert _status(queue, "n1") == "pending"
+
+    [retry] = queue.claim("w1", limit=1)
+    assert retry["attempt"] == 2
+    assert queue.fail(retry, "boom again") is True
+    assert _status(queue, "n1") == "failed"
+    assert queue.stats()["recent"]["failed"] == 1
+
+
+def test_stale_worker_result_is_ignored_after_requeue(queue):
+    queue.enqueue(_job("n1"))
+    [stale] = queue.claim("w1", limit=1)
+
+    assert queue.requeue_stale(lease_seconds=-1) == 1
+    [fresh] = queue.claim("w2", limit=1)
+    assert fresh["lease"] != stale["lease"]
+
+    # 리스가 만료된 첫 워커의 완료/실패는 반영되지 않음
+    assert queue.complete(stale) is False
+    assert queue.fail(stale, "late failure") is False
+    assert _status(queue, "n1") == "running"
+
+    assert queue.complete(fresh) is True
+    assert _status(queue, "n1") is None
+    assert queue.stats()["recent"]["completed"] == 1
+
+
+def test_requeued_job_without_new_claim_ignores_stale_completion(queue):
+    queue.enqueue(_job("n1"))
+    [stale] = queue.claim("w1", limit=1)
+    queue.requeue_stale(lease_seconds=-1)
+
+    assert queue.complete(stale) is False
+    assert _status(queue, "n1") == "pending"
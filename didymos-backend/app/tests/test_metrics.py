@@ -0,0 +1,42 @@
+"""
+라우트별 쿼리 메트릭 라벨 테스트
+"""
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app.utils.metrics import UNMATCHED_ROUTE, RouteLabelMiddleware, current_route
+
+
+def _client(seen):
+    app = FastAPI()
+    app.add_middleware(RouteLabelMiddleware)
+
+    @app.get("/notes/{note_id}")
+    async def get_note(note_id: str):
+        seen.append(current_route.get())
+        return {"note_id": note_id}
+
+    async def not_found(request, exc):
+        seen.append(current_route.get())
+        return JSONResponse({"detail": "Not Found"}, status_code=404)
+
+    app.add_exception_handler(404, not_found)
+
+    return TestClient(app)
+
+
+def test_matched_requests_use_route_template():
+    seen = []
+    client = _client(seen)
+    client.get("/notes/a")
+    client.get("/notes/b")
+    assert seen == ["/notes/{note_id}", "/notes/{note_id}"]
+
+
+def test_unmatched_requests_share_one_label():
+    seen = []
+    client = _client(seen)
+    assert client.get("/wp-login.php").status_code == 404
+    assert client.get("/random/123").status_code == 404
+    assert seen == [UNMATCHED_ROUTE, UNMATCHED_ROUTE]
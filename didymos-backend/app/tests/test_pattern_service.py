@@ -0,0 +1,96 @@
+"""
+그래프 패턴 분석 (PageRank, Union-Find, Louvain) 테스트
+"""
+import numpy as np
+
+from app.services.pattern_service import (
+    build_csr_adjacency,
+    calculate_pagerank,
+    detect_communities,
+    detect_louvain_communities,
+    pagerank_csr,
+)
+
+
+def _dense_pagerank(n, edges, damping=0.85, iterations=500):
+    """참고 구현: 밀집 행렬, dangling은 균등 분배"""
+    adjacency = np.zeros((n, n))
+    for a, b in edges:
+        adjacency[a, b] = 1.0
+    out = adjacency.sum(axis=1)
+    transition = np.where(out[:, None] > 0, adjacency / np.maximum(out[:, None], 1), 1.0 / n)
+    rank = np.full(n, 1.0 / n)
+    for _ in range(iterations):
+        rank = damping * transition.T @ rank + (1 - damping) / n
+    return rank
+
+
+def test_build_csr_adjacency_drops_unknown_and_duplicate_edges():
+    index, matrix = build_csr_adjacency(["a", "b", "c", "a"], [("a", "b"), ("a", "b"), ("b", "x")])
+    assert index == {"a": 0, "b": 1, "c": 2}
+    assert matrix.shape == (3, 3)
+    assert matrix.nnz == 1 and matrix[0, 1] == 1.0
+
+
+def test_pagerank_matches_dense_reference_with_dangling_nodes():
+    edges = [(0, 1), (1, 2), (2, 0), (2, 3), (4, 2)]  # 3은 dangling
+    nodes = [str(i) for i in range(5)]
+    scores = calculate_pagerank(nodes, [(str(a), str(b)) for a, b in edges], tol=1e-12, iterations=500)
+
+    expected = _dense_pagerank(5, edges)
+    assert np.allclose([scores[n] for n in nodes], expected, atol=1e-8)
+    assert abs(sum(scores.values()) - 1.0) < 1e-9
+
+
+def test_pagerank_personalization_biases_teleport():
+    nodes = ["a", "b", "c"]
+    uniform = calculate_pagerank(nodes, [])
+    assert all(abs(v - 1 / 3) < 1e-9 for v in uniform.values())
+
+    biased = calculate_pagerank(nodes, [], personalization={"a": 1.0})
+    assert biased["a"] > 0.99
+
+
+def test_pagerank_csr_empty_edges_is_uniform():
+    index, matrix = build_csr_adjacency(["a", "b"], [])
+    rank = pagerank_csr(matrix, index=index)
+    assert np.allclose(rank, [0.5, 0.5])
+
+
+def test_detect_communities_connected_components_without_recursion_limit():
+    n = 50_000
+    nodes = [f"n{i}" for i in range(n)] + ["lonely"]
+    chain = [(f"n{i}", f"n{i + 1}") for i in range(n - 1)]
+    communities = detect_communities(nodes, chain)
+    assert communities["n0"] == communities[f"n{n - 1}"] == 0
+    assert communities["lonely"] == 1
+
+
+def _two_cliques(size=5):
+    left = [f"l{i}" for i in range(size)]
+    right = [f"r{i}" for i in range(size)]
+    edges = [(a, b) for group in (left, right) for i, a in enumerate(group) for b in group[i + 1:]]
+    edges.append(("l0", "r0"))  # 두 클리크를 잇는 다리 하나
+    return left, right, edges
+
+
+def test_louvain_splits_bridged_cliques_that_union_find_merges():
+    left, right, edges = _two_cliques()
+    nodes = left + right
+
+    assert len(set(detect_communities(nodes, edges).values())) == 1
+
+    communities = detect_louvain_communities(nodes, edges)
+    assert {communities[n] for n in left} != {communities[n] for n in right}
+    assert len({communities[n] for n in left}) == 1
+    assert len({communities[n] for n in right}) == 1
+
+
+def test_louvain_is_deterministic_and_numbers_by_size():
+    left, right, edges = _two_cliques()
+    nodes = left + right + ["isolated"]
+    first = detect_louvain_communities(nodes, edges, seed=7)
+    assert first == detect_louvain_communities(nodes, edges, seed=7)
+    # 커뮤니티 번호는 크기 내림차순이므로 혼자인 노드가 마지막
+    assert first["isolated"] == max(first.values())
+    assert detect_louvain_communities([], []) == {}
@@ -0,0 +1,52 @@
+"""
+의미론적 클러스터 모델 저장소 / 재학습 판단 테스트
+"""
+import os
+
+from app.config import settings
+from app.services.semantic_cluster_model import SemanticClusterModelStore, _refit_reason
+
+
+def _model_files(path):
+    return sorted(name for name in os.listdir(path) if name.endswith(".pkl"))
+
+
+def test_loaded_models_are_capped_lru(tmp_path):
+    store = SemanticClusterModelStore(str(tmp_path), max_loaded=2, max_files=10)
+    store.save("v1", None, {"n": 1})
+    store.save("v2", None, {"n": 2})
+    store.load("v1")
+    store.save("v3", None, {"n": 3})
+
+    assert len(store._states) == 2
+    assert store._key("v2", None) not in store._states
+    # 메모리에서 빠진 모델은 디스크에서 다시 읽음
+    assert store.load("v2") == {"n": 2}
+
+
+def test_model_files_are_capped_by_last_use(tmp_path):
+    store = SemanticClusterModelStore(str(tmp_path), max_loaded=10, max_files=2)
+    store.save("v1", None, {"n": 1})
+    store.save("v2", None, {"n": 2})
+    os.utime(os.path.join(tmp_path, f"{store._key('v1', None)}.pkl"), (1, 1))
+    os.utime(os.path.join(tmp_path, f"{store._key('v2', None)}.pkl"), (2, 2))
+    store.load("v1")  # 사용하면 수정 시각이 갱신됨
+
+    store.save("v3", "folder/", {"n": 3})
+
+    assert _model_files(tmp_path) == sorted([
+        f"{store._key('v1', None)}.pkl",
+        f"{store._key('v3', 'folder/')}.pkl",
+    ])
+    assert store.load("v2") is None
+
+
+def test_removals_alone_do_not_force_refit(monkeypatch):
+    monkeypatch.setattr(settings, "cluster_refit_new_fraction", 0.2)
+    monkeypatch.setattr(settings, "cluster_refit_max_age_hours", 1e9)
+    state = {"fitted_count": 100, "incremental_count": 10, "fitted_at": None}
+
+    assert _refit_reason(state, n_changed=0) is None
+    assert _refit_reason(state, n_changed=10) is None
+    assert _refit_reason(state, n_changed=11).startswith("new_fraction=")
+    assert _refit_reason(None, n_changed=0) == "no_model"
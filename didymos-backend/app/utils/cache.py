@@ -1,57 +1,298 @@
 """
-단순 TTL 캐시 (인메모리) with LRU eviction
+TTL 캐시 (L1 인메모리 + 선택적 공유 L2) with LRU eviction
+
+- L1: 프로세스 로컬 OrderedDict. 만료 항목은 백그라운드 스위퍼가 만료 힙을 보고 정리하고,
+  정렬된 키 인덱스로 clear_prefix를 O(log n + k)에 처리합니다.
+- L2: 여러 uvicorn 워커/레플리카가 공유하는 백엔드 (app.utils.cache_backends, Redis 또는 SQLite).
+  L1 미스 시 L2를 조회해 L1로 올리고, 저장/삭제는 양쪽에 반영합니다.
+  L2 값은 JSON으로 직렬화합니다 (pickle은 L2에 쓸 수 있는 누구나 모든 레플리카에서 코드를
+  실행할 수 있으므로 사용하지 않음). JSON으로 표현할 수 없는 값은 L1에만 저장합니다.
+
+version을 함께 저장하면 조회 시 현재 버전(예: Vault 버전)과 다를 때 무효로 처리합니다.
+캐시는 namespace별로 등록되어 cache_metrics()로 적중률/제거 수/메모리를 조회할 수 있습니다.
 """
+import bisect
+import heapq
+import itertools
+import json
+import logging
+import sys
+import threading
 import time
-from typing import Any, Dict, Optional
+import weakref
 from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.utils.cache_backends import CacheBackend, get_backend
+
+logger = logging.getLogger(__name__)
+
+# 백그라운드 만료 스위퍼 주기 (초)
+SWEEP_INTERVAL_SECONDS = 15.0
+
+# 메모리 추정 시 샘플링할 최대 항목 수
+_SIZE_SAMPLE = 200
+
+_registry: "weakref.WeakSet[TTLCache]" = weakref.WeakSet()
+_registry_lock = threading.Lock()
+_sweeper: Optional[threading.Thread] = None
+_anonymous = itertools.count(1)
 
 
 class TTLCache:
-    def __init__(self, ttl_seconds: int = 30, maxsize: int = 1000):
+    def __init__(
+        self,
+        ttl_seconds: int = 30,
+        maxsize: int = 1000,
+        namespace: Optional[str] = None,
+        l2: Optional[CacheBackend] = None
+    ):
         """
         TTL 기반 캐시 with LRU eviction
 
         Args:
             ttl_seconds: TTL in seconds
             maxsize: 최대 캐시 항목 수 (메모리 누수 방지)
+            namespace: 메트릭 및 L2 키 구분용 이름
+            l2: 공유 L2 백엔드 (None이면 L1만 사용)
         """
         self.ttl = ttl_seconds
         self.maxsize = maxsize
+        self.namespace = namespace or f"cache{next(_anonymous)}"
+        self.l2 = l2
         self.store: OrderedDict[str, tuple] = OrderedDict()
+        self._keys: List[str] = []  # 정렬된 키 (prefix 인덱스)
+        self._expiry: List[Tuple[float, str]] = []  # (expires_at, key) 최소 힙
+        self._lock = threading.RLock()
+        self.stats = {
+            "hits_l1": 0,
+            "hits_l2": 0,
+            "misses": 0,
+            "sets": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+        _register(self)
 
-    def get(self, key: str) -> Any:
-        now = time.time()
-        item = self.store.get(key)
-        if not item:
-            return None
-        value, expires_at = item
-        if expires_at < now:
-            self.store.pop(key, None)
-            return None
-        # LRU: 접근 시 최신으로 이동
-        self.store.move_to_end(key)
-        return value
-
-    def set(self, key: str, value: Any):
-        expires_at = time.time() + self.ttl
+    # ------------------------------------------------------------------ L1 내부
 
-        # 기존 키면 업데이트
+    def _insert(self, key: str, value: Any, expires_at: float, version: Optional[int]):
         if key in self.store:
             self.store.pop(key)
+        else:
+            # maxsize 초과 시 가장 오래된 항목 제거 (LRU)
+            if len(self.store) >= self.maxsize:
+                oldest, _ = self.store.popitem(last=False)
+                self._unindex(oldest)
+                self.stats["evictions"] += 1
+            bisect.insort(self._keys, key)
+        self.store[key] = (value, expires_at, version)
+        heapq.heappush(self._expiry, (expires_at, key))
+        # 같은 키를 자주 덮어쓰면 힙에 지난 항목이 쌓이므로 주기적으로 재구성
+        if len(self._expiry) > 4 * max(self.maxsize, 16):
+            self._expiry = [(item[1], k) for k, item in self.store.items()]
+            heapq.heapify(self._expiry)
+
+    def _unindex(self, key: str):
+        idx = bisect.bisect_left(self._keys, key)
+        if idx < len(self._keys) and self._keys[idx] == key:
+            del self._keys[idx]
 
-        # maxsize 초과 시 가장 오래된 항목 제거 (LRU)
-        if len(self.store) >= self.maxsize:
-            self.store.popitem(last=False)
+    def _remove(self, key: str) -> bool:
+        if self.store.pop(key, None) is None:
+            return False
+        self._unindex(key)
+        return True
 
-        self.store[key] = (value, expires_at)
+    def _l2_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    # ------------------------------------------------------------------ public API
+
+    def get(self, key: str, version: Optional[int] = None) -> Any:
+        now = time.time()
+        with self._lock:
+            item = self.store.get(key)
+            if item:
+                value, expires_at, stored_version = item
+                if expires_at >= now and (version is None or stored_version == version):
+                    # LRU: 접근 시 최신으로 이동
+                    self.store.move_to_end(key)
+                    self.stats["hits_l1"] += 1
+                    return value
+                self._remove(key)
+
+        if self.l2 is not None:
+            raw = self.l2.get(self._l2_key(key))
+            if raw is not None:
+                try:
+                    value, expires_at, stored_version = _loads(raw)
+                except Exception as e:
+                    logger.warning(f"Cache L2 entry for {self.namespace}:{key} is unreadable: {e}")
+                    expires_at, stored_version = 0, None
+                if expires_at >= now and (version is None or stored_version == version):
+                    with self._lock:
+                        self._insert(key, value, expires_at, stored_version)
+                        self.stats["hits_l2"] += 1
+                    return value
+                # 다른 레플리카가 이 프로세스보다 새 버전으로 저장한 항목은 남겨 둠 (미스로만 처리)
+                if not _newer(stored_version, version):
+                    self.l2.delete(self._l2_key(key))
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def set(self, key: str, value: Any, version: Optional[int] = None):
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._insert(key, value, expires_at, version)
+            self.stats["sets"] += 1
+
+        if self.l2 is not None:
+            try:
+                raw = _dumps(value, expires_at, version)
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Cache value for {self.namespace}:{key} is not JSON serializable, L1 only: {e}")
+                return
+            self.l2.set(self._l2_key(key), raw, self.ttl)
 
     def clear(self, key: str):
-        self.store.pop(key, None)
+        with self._lock:
+            if self._remove(key):
+                self.stats["invalidations"] += 1
+        if self.l2 is not None:
+            self.l2.delete(self._l2_key(key))
 
     def clear_prefix(self, prefix: str):
-        for k in list(self.store.keys()):
-            if k.startswith(prefix):
+        with self._lock:
+            lo = bisect.bisect_left(self._keys, prefix)
+            hi = bisect.bisect_left(self._keys, prefix + "\U0010ffff", lo)
+            for k in self._keys[lo:hi]:
                 self.store.pop(k, None)
+            del self._keys[lo:hi]
+            self.stats["invalidations"] += hi - lo
+        if self.l2 is not None:
+            self.l2.delete_prefix(self._l2_key(prefix))
 
     def clear_all(self):
-        self.store.clear()
+        with self._lock:
+            self.stats["invalidations"] += len(self.store)
+            self.store.clear()
+            self._keys.clear()
+            self._expiry.clear()
+        if self.l2 is not None:
+            self.l2.delete_prefix(self._l2_key(""))
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """만료된 L1 항목 정리 (만료 힙 기준, 만료된 항목 수만큼만 처리)"""
+        now = time.time() if now is None else now
+        removed = 0
+        with self._lock:
+            while self._expiry and self._expiry[0][0] < now:
+                _, key = heapq.heappop(self._expiry)
+                item = self.store.get(key)
+                # 덮어써진 키는 힙에 이전 만료 시각이 남아 있으므로 실제 만료 시각 확인
+                if item is not None and item[1] < now:
+                    self._remove(key)
+                    removed += 1
+            self.stats["expirations"] += removed
+        return removed
+
+    def snapshot(self) -> Dict[str, Any]:
+        """namespace 메트릭 (적중률, 제거/만료 수, 항목 수, 추정 메모리)"""
+        with self._lock:
+            stats = dict(self.stats)
+            entries = len(self.store)
+            sample = [item[0] for item in itertools.islice(reversed(self.store.values()), _SIZE_SAMPLE)]
+        approx_bytes = 0
+        if sample:
+            approx_bytes = int(sum(_approx_size(v) for v in sample) / len(sample) * entries)
+        hits = stats["hits_l1"] + stats["hits_l2"]
+        lookups = hits + stats["misses"]
+        return {
+            **stats,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "entries": entries,
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "approx_bytes": approx_bytes,
+            "l2": self.l2.name if self.l2 is not None else None,
+        }
+
+
+def _dumps(value: Any, expires_at: float, version: Optional[int]) -> bytes:
+    """L2 저장 형식: [value, expires_at, version] JSON (tuple은 list로 복원됨)"""
+    return json.dumps([value, expires_at, version], ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(raw: bytes) -> Tuple[Any, float, Optional[int]]:
+    value, expires_at, version = json.loads(raw)
+    return value, float(expires_at), version
+
+
+def _newer(stored_version: Optional[int], version: Optional[int]) -> bool:
+    """L2 항목의 버전이 조회한 버전보다 새로운지 여부 (버전 정보가 없으면 False)"""
+    return stored_version is not None and version is not None and stored_version > version
+
+
+def _approx_size(obj: Any, depth: int = 0) -> int:
+    """컨테이너를 따라가며 대략적인 메모리 크기 추정 (깊이 제한)"""
+    size = sys.getsizeof(obj, 0)
+    if depth >= 6:
+        return size
+    if isinstance(obj, dict):
+        size += sum(_approx_size(k, depth + 1) + _approx_size(v, depth + 1) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_approx_size(v, depth + 1) for v in obj)
+    elif hasattr(obj, "__dict__"):
+        size += _approx_size(vars(obj), depth + 1)
+    return size
+
+
+def _register(cache: TTLCache):
+    global _sweeper
+    with _registry_lock:
+        _registry.add(cache)
+        if _sweeper is None or not _sweeper.is_alive():
+            _sweeper = threading.Thread(target=_sweep_loop, name="cache-sweeper", daemon=True)
+            _sweeper.start()
+
+
+def _sweep_loop():
+    while True:
+        time.sleep(SWEEP_INTERVAL_SECONDS)
+        with _registry_lock:
+            caches = list(_registry)
+        for cache in caches:
+            try:
+                cache.sweep()
+            except Exception as e:
+                logger.warning(f"Cache sweep failed for {cache.namespace}: {e}")
+
+
+def cache_metrics() -> Dict[str, Dict[str, Any]]:
+    """등록된 모든 캐시의 namespace별 메트릭 (같은 namespace의 인스턴스는 합산)"""
+    with _registry_lock:
+        caches = list(_registry)
+    result: Dict[str, Dict[str, Any]] = {}
+    for cache in caches:
+        snap = cache.snapshot()
+        merged = result.get(cache.namespace)
+        if merged is None:
+            result[cache.namespace] = snap
+            continue
+        for field in (*cache.stats.keys(), "entries", "maxsize", "approx_bytes"):
+            merged[field] += snap[field]
+        hits = merged["hits_l1"] + merged["hits_l2"]
+        lookups = hits + merged["misses"]
+        merged["hit_rate"] = round(hits / lookups, 3) if lookups else 0.0
+    return dict(sorted(result.items()))
+
+
+def shared_l2_backend() -> Optional[CacheBackend]:
+    """설정(CACHE_L2_URL)에 따른 공유 L2 백엔드 (미설정이면 None)"""
+    from app.config import settings
+    return get_backend(settings.cache_l2_url)
+
@@ -0,0 +1,191 @@
+"""
+TTLCache 공유 L2 백엔드
+
+여러 uvicorn 워커/레플리카가 같은 캐시를 보도록 하는 저장소입니다.
+- RedisCacheBackend: redis://, rediss:// (Redis 프로토콜, redis 패키지 필요)
+- SQLiteCacheBackend: sqlite:///경로 (같은 호스트 프로세스끼리 공유하는 디스크 대체 구현)
+
+값은 TTLCache가 직렬화한 bytes(JSON)이며, 백엔드 오류는 경고만 남기고 캐시 미스로 처리합니다.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+# Redis 키 접두사 (다른 용도의 키와 구분)
+KEY_PREFIX = "didymos:cache:"
+
+# 이 횟수의 저장마다 만료 항목 정리 (SQLite)
+_PURGE_EVERY = 200
+
+_backends: Dict[str, "CacheBackend"] = {}
+_backends_lock = threading.Lock()
+
+
+class CacheBackend(ABC):
+    """L2 백엔드 인터페이스"""
+
+    name = "base"
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl_seconds: float):
+        ...
+
+    @abstractmethod
+    def delete(self, key: str):
+        ...
+
+    @abstractmethod
+    def delete_prefix(self, prefix: str):
+        ...
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis 프로토콜 L2 (키별 PX 만료, prefix 삭제는 SCAN + UNLINK)"""
+
+    name = "redis"
+
+    def __init__(self, url: str):
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self._client.get(KEY_PREFIX + key)
+        except Exception as e:
+            logger.warning(f"Redis cache get failed: {e}")
+            return None
+
+    def set(self, key: str, value: bytes, ttl_seconds: float):
+        try:
+            self._client.set(KEY_PREFIX + key, value, px=max(int(ttl_seconds * 1000), 1))
+        except Exception as e:
+            logger.warning(f"Redis cache set failed: {e}")
+
+    def delete(self, key: str):
+        try:
+            self._client.unlink(KEY_PREFIX + key)
+        except Exception as e:
+            logger.warning(f"Redis cache delete failed: {e}")
+
+    def delete_prefix(self, prefix: str):
+        pattern = KEY_PREFIX + "".join(f"\\{c}" if c in "*?[]\\" else c for c in prefix) + "*"
+        try:
+            batch = []
+            for key in self._client.scan_iter(match=pattern, count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    self._client.unlink(*batch)
+                    batch = []
+            if batch:
+                self._client.unlink(*batch)
+        except Exception as e:
+            logger.warning(f"Redis cache prefix delete failed: {e}")
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """SQLite L2 (WAL, 키 범위 조회로 prefix 삭제)"""
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_l2 (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT value FROM cache_l2 WHERE key = ? AND expires_at > ?", (key, time.time())
+                ).fetchone()
+            return row[0] if row else None
+        except Exception as e:
+            logger.warning(f"SQLite cache get failed: {e}")
+            return None
+
+    def set(self, key: str, value: bytes, ttl_seconds: float):
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache_l2 (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, sqlite3.Binary(value), now + ttl_seconds),
+                )
+                self._writes += 1
+                if self._writes % _PURGE_EVERY == 0:
+                    conn.execute("DELETE FROM cache_l2 WHERE expires_at <= ?", (now,))
+        except Exception as e:
+            logger.warning(f"SQLite cache set failed: {e}")
+
+    def delete(self, key: str):
+        try:
+            with self._lock:
+                self._connect().execute("DELETE FROM cache_l2 WHERE key = ?", (key,))
+        except Exception as e:
+            logger.warning(f"SQLite cache delete failed: {e}")
+
+    def delete_prefix(self, prefix: str):
+        try:
+            with self._lock:
+                self._connect().execute(
+                    "DELETE FROM cache_l2 WHERE key >= ? AND key < ?", (prefix, prefix + "\U0010ffff")
+                )
+        except Exception as e:
+            logger.warning(f"SQLite cache prefix delete failed: {e}")
+
+
+def get_backend(url: str) -> Optional[CacheBackend]:
+    """
+    URL에 맞는 L2 백엔드 (같은 URL은 프로세스 내에서 공유)
+
+    "" → None, redis://… → Redis, sqlite:///경로 → SQLite
+    """
+    if not url:
+        return None
+    with _backends_lock:
+        backend = _backends.get(url)
+        if backend is not None:
+            return backend
+        if url.startswith(("redis://", "rediss://", "unix://")):
+            if redis is None:
+                logger.warning("CACHE_L2_URL is a Redis URL but redis is not installed; using L1 cache only")
+                return None
+            backend = RedisCacheBackend(url)
+        elif url.startswith("sqlite:///"):
+            backend = SQLiteCacheBackend(url[len("sqlite:///"):])
+        else:
+            logger.warning(f"Unsupported CACHE_L2_URL scheme: {url.split(':', 1)[0]}; using L1 cache only")
+            return None
+        _backends[url] = backend
+        logger.info(f"Cache L2 backend: {backend.name}")
+        return backend
@@ -0,0 +1,54 @@
+"""
+응답 압축 (GZip, 스트리밍 미디어 타입 제외)
+
+Starlette GZipMiddleware는 스트리밍 응답도 gzip 블록 단위로 모아 보내므로,
+NDJSON 진행 상황(/notes/sync/batch)처럼 줄 단위로 바로 전달돼야 하는 응답이 늦게 도착합니다.
+SelectiveGZipMiddleware는 응답 시작 시 Content-Type을 보고 제외 대상이면 압축 없이 그대로 전달합니다.
+"""
+from typing import Iterable
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# 기본 제외 미디어 타입 (줄/이벤트 단위 스트림)
+STREAMING_MEDIA_TYPES = ("application/x-ndjson", "text/event-stream")
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware + 압축하지 않을 미디어 타입"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 500,
+        compresslevel: int = 9,
+        exclude_media_types: Iterable[str] = STREAMING_MEDIA_TYPES,
+    ) -> None:
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        self.exclude_media_types = frozenset(exclude_media_types)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = _SelectiveGZipResponder(
+                self.app, self.minimum_size, self.compresslevel, self.exclude_media_types
+            )
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+class _SelectiveGZipResponder(GZipResponder):
+    def __init__(self, app: ASGIApp, minimum_size: int, compresslevel: int, exclude_media_types: frozenset):
+        super().__init__(app, minimum_size, compresslevel=compresslevel)
+        self.exclude_media_types = exclude_media_types
+        self.passthrough = False
+
+    async def send_with_gzip(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            media_type = Headers(raw=message["headers"]).get("content-type", "").split(";")[0].strip()
+            self.passthrough = media_type in self.exclude_media_types
+        if self.passthrough:
+            await self.send(message)
+            return
+        await super().send_with_gzip(message)
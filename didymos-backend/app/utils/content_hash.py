@@ -0,0 +1,94 @@
+"""
+노트 콘텐츠 해시 (변경 감지용)
+
+mtime만 바뀌었거나 공백/프론트매터만 수정된 경우를 "변경 없음"으로 판단하기 위해
+정규화된 본문과 섹션(마크다운 헤딩) 단위로 해시를 계산합니다.
+"""
+import hashlib
+import re
+from typing import List, Tuple
+
+_FRONTMATTER_RE = re.compile(r"\A---[ \t]*\r?\n.*?\r?\n---[ \t]*(\r?\n|\Z)", re.DOTALL)
+_HEADING_RE = re.compile(r"^#{1,6}\s")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+def strip_frontmatter(content: str) -> str:
+    """YAML 프론트매터 제거"""
+    return _FRONTMATTER_RE.sub("", content or "", count=1)
+
+
+def normalize_content(content: str) -> str:
+    """
+    해시 계산용 정규화
+
+    - 프론트매터 제거
+    - 줄바꿈 통일, 줄 끝 공백 제거
+    - 연속 빈 줄 축소, 앞뒤 공백 제거
+    """
+    text = strip_frontmatter(content).replace("\r\n", "\n").replace("\r", "\n")
+    text = "\n".join(line.rstrip() for line in text.split("\n"))
+    text = _BLANK_LINES_RE.sub("\n\n", text)
+    return text.strip()
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def content_hash(content: str, salt: str = "") -> str:
+    """
+    정규화된 본문의 SHA-256 해시
+
+    Args:
+        content: 노트 원문 (프론트매터 포함 가능)
+        salt: 처리 방식 구분자 (예: privacy_mode) - 달라지면 다른 해시
+    """
+    return _sha256(f"{salt}\n{normalize_content(content)}")
+
+
+def split_sections(content: str) -> List[Tuple[str, str]]:
+    """
+    정규화된 본문을 헤딩 기준 섹션으로 분할 (코드 블록 내부 '#'은 무시)
+
+    Returns:
+        [(heading, section_text), ...] - 첫 헤딩 이전 본문은 heading이 ""
+    """
+    sections: List[Tuple[str, str]] = []
+    heading = ""
+    lines: List[str] = []
+    in_fence = False
+
+    for line in normalize_content(content).split("\n"):
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+        if not in_fence and _HEADING_RE.match(line):
+            if heading or any(l.strip() for l in lines):
+                sections.append((heading, "\n".join(lines).strip()))
+            heading = line.strip()
+            lines = []
+            continue
+        lines.append(line)
+
+    if heading or any(l.strip() for l in lines):
+        sections.append((heading, "\n".join(lines).strip()))
+    return sections
+
+
+def section_hashes(content: str) -> List[str]:
+    """섹션별 해시 (본문 순서 유지)"""
+    return [_sha256(f"{heading}\n{text}") for heading, text in split_sections(content)]
+
+
+def changed_sections(content: str, previous_hashes: List[str]) -> List[str]:
+    """
+    이전 섹션 해시 집합에 없는 섹션의 텍스트 반환 (헤딩 포함)
+
+    섹션 순서만 바뀐 경우는 변경으로 보지 않습니다.
+    """
+    previous = set(previous_hashes or [])
+    changed = []
+    for heading, text in split_sections(content):
+        if _sha256(f"{heading}\n{text}") not in previous:
+            changed.append(f"{heading}\n{text}".strip())
+    return changed
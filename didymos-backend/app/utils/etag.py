@@ -0,0 +1,150 @@
+"""
+Vault 버전 기반 ETag / 조건부 GET
+
+Obsidian 뷰는 열 때마다 같은 읽기 API를 다시 호출하지만, 응답은 Vault가 바뀌지 않으면 같습니다.
+ETag를 (Vault 버전, 요청 경로 + 쿼리)의 해시로 만들어 If-None-Match가 일치하면
+계산/직렬화 없이 304를 반환합니다. 버전 확인은 vault_versions.current (로컬 캐시, 오래되면 Vault 노드 조회 1회)입니다.
+
+- Cache-Control: private, no-cache → 클라이언트(Electron fetch)의 HTTP 캐시가 매번 재검증
+- daily=True: 오늘 날짜도 ETag에 포함 (주간 리뷰, 최근 활동 등 날짜에 따라 달라지는 응답)
+- 부분/임시 응답(stale 캐시, 워밍업, 시간 초과 포함)은 drop_etag로 태그를 제거해 재사용되지 않게 함
+- ETag는 작업 전에 읽은 버전으로 만들어지므로, VaultETagMiddleware가 200 응답을 보내기 직전에
+  버전을 다시 읽어 그 사이 바뀌었으면 태그를 제거함 (이전 데이터로 만든 응답이 새 버전으로 재사용되지 않게)
+"""
+import asyncio
+import hashlib
+import json
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.services.vault_version import vault_versions
+
+CACHE_CONTROL = "private, no-cache"
+
+# request.state에 (vault_id, ETag를 만든 버전)을 남기는 키 (VaultETagMiddleware가 확인)
+_STATE_KEY = "vault_etag"
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def vault_etag(vault_id: str, version: int, *parts: Any) -> str:
+    """Vault 버전 + 요청 구분값(경로, 쿼리 등)으로 weak ETag 생성"""
+    raw = json.dumps([vault_id, *parts], ensure_ascii=False, default=str, separators=(",", ":"))
+    digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+    return f'W/"{version}-{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 ETag와 일치하는지 (weak 비교, 여러 값 / * 지원)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def _record(route: str, outcome: str) -> None:
+    with _stats_lock:
+        stats = _stats.setdefault(route, {"not_modified": 0, "modified": 0, "version_changed": 0})
+        stats[outcome] += 1
+
+
+async def vault_not_modified(
+    request: Request,
+    response: Response,
+    vault_id: str,
+    daily: bool = False,
+) -> Optional[Response]:
+    """
+    조건부 GET 처리
+
+    If-None-Match가 현재 ETag와 같으면 304 응답을 반환하고,
+    아니면 response에 ETag/Cache-Control 헤더를 설정한 뒤 None을 반환합니다 (라우트는 평소대로 계산).
+
+    Args:
+        request: 현재 요청 (경로 + 쿼리 파라미터가 ETag에 포함됨)
+        response: 라우트의 Response (헤더 설정용)
+        vault_id: Vault ID
+        daily: 날짜(UTC)를 ETag에 포함할지 여부
+
+    Returns:
+        304 Response 또는 None
+    """
+    version = await asyncio.to_thread(vault_versions.current, vault_id)
+    parts = [request.url.path, sorted(request.query_params.multi_items())]
+    if daily:
+        parts.append(datetime.now(timezone.utc).date().isoformat())
+    etag = vault_etag(vault_id, version, *parts)
+
+    route = request.scope.get("route")
+    route_path = getattr(route, "path", request.url.path)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        _record(route_path, "not_modified")
+        return Response(status_code=304, headers=headers)
+
+    _record(route_path, "modified")
+    response.headers.update(headers)
+    setattr(request.state, _STATE_KEY, (vault_id, version, route_path))
+    return None
+
+
+def drop_etag(response: Response) -> None:
+    """재사용하면 안 되는 응답(부분 결과, stale 캐시 등)에서 ETag 제거"""
+    if "etag" in response.headers:
+        del response.headers["etag"]
+    response.headers["Cache-Control"] = "no-store"
+
+
+class VaultETagMiddleware:
+    """
+    vault_not_modified로 ETag를 붙인 200 응답을 보내기 직전에 Vault 버전을 다시 읽어,
+    작업 중에 버전이 바뀌었으면 ETag를 제거하는 ASGI 미들웨어 (Vault 노드 조회 1회)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_checked(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                tagged = (scope.get("state") or {}).get(_STATE_KEY)
+                headers = MutableHeaders(scope=message)
+                # drop_etag로 이미 태그를 제거한 응답은 확인하지 않음
+                if tagged and "etag" in headers:
+                    vault_id, version, route_path = tagged
+                    latest = await asyncio.to_thread(vault_versions.refresh, vault_id)
+                    if latest != version:
+                        del headers["etag"]
+                        headers["Cache-Control"] = "no-store"
+                        _record(route_path, "version_changed")
+            await send(message)
+
+        await self.app(scope, receive, send_checked)
+
+
+def etag_metrics() -> Dict[str, Any]:
+    """라우트별 304 / 200 응답 수 (/metrics/etag)"""
+    with _stats_lock:
+        routes = {route: dict(stats) for route, stats in _stats.items()}
+    for stats in routes.values():
+        total = stats["not_modified"] + stats["modified"]
+        stats["not_modified_ratio"] = round(stats["not_modified"] / total, 3) if total else 0.0
+    return {"routes": routes}
@@ -0,0 +1,83 @@
+"""
+라우트별 Neo4j 쿼리 메트릭
+
+요청을 처리 중인 라우트 경로를 contextvar로 전파하여,
+공유 드라이버를 통해 실행된 쿼리를 라우트 단위로 집계합니다.
+"""
+import threading
+from contextvars import ContextVar
+from typing import Any, Dict
+
+from starlette.routing import Match
+
+# 현재 요청의 라우트 경로 (요청 밖에서 실행되는 작업은 "background")
+current_route: ContextVar[str] = ContextVar("current_route", default="background")
+
+# 매칭되는 라우트가 없는 요청의 라벨 (원본 경로를 쓰면 ID/스캐너 경로마다 메트릭 키가 생김)
+UNMATCHED_ROUTE = "unmatched"
+
+
+class QueryMetrics:
+    """라우트별 쿼리 호출 수 / 오류 수 / 지연 시간 집계 (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, Dict[str, float]] = {}
+
+    def record(self, route: str, elapsed_ms: float, ok: bool = True):
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                stats = {"queries": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0}
+                self._routes[route] = stats
+            stats["queries"] += 1
+            if not ok:
+                stats["errors"] += 1
+            stats["total_ms"] += elapsed_ms
+            if elapsed_ms > stats["max_ms"]:
+                stats["max_ms"] = elapsed_ms
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                route: {
+                    "queries": int(s["queries"]),
+                    "errors": int(s["errors"]),
+                    "avg_ms": round(s["total_ms"] / s["queries"], 2) if s["queries"] else 0.0,
+                    "max_ms": round(s["max_ms"], 2),
+                }
+                for route, s in sorted(self._routes.items())
+            }
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+class RouteLabelMiddleware:
+    """
+    요청 경로를 라우트 템플릿(예: /api/v1/notes/get/{note_id})으로 매칭해
+    current_route에 설정하는 ASGI 미들웨어 (매칭 실패 시 UNMATCHED_ROUTE)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        label = UNMATCHED_ROUTE
+        router = getattr(scope.get("app"), "router", None)
+        for route in getattr(router, "routes", []):
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                label = getattr(route, "path", label)
+                break
+
+        token = current_route.set(label)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_route.reset(token)
@@ -0,0 +1,55 @@
+"""
+Didymos Note AI Worker
+
+API 프로세스와 별도로 노트 AI 처리 작업 큐를 소비합니다.
+API 쪽은 JOB_WORKER_EMBEDDED=false로 설정하고, 같은 JOB_QUEUE_PATH를 공유하세요.
+
+사용법:
+    python -m app.worker
+"""
+import asyncio
+import logging
+import signal
+
+from app.config import settings
+from app.db.neo4j import close_neo4j_client, close_async_neo4j_client
+from app.services.job_queue import note_job_worker
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    if settings.use_graphiti:
+        try:
+            from app.services.graphiti_service import GraphitiService
+            await GraphitiService.get_instance()
+        except Exception as e:
+            logger.error(f"❌ Failed to initialize Graphiti: {e}")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    note_job_worker.start()
+    await stop.wait()
+    logger.info("Stopping note AI worker...")
+    await note_job_worker.stop()
+
+    if settings.use_graphiti:
+        try:
+            from app.services.graphiti_service import GraphitiService
+            if GraphitiService._instance:
+                await GraphitiService._instance.close()
+        except Exception as e:
+            logger.error(f"Error closing Graphiti: {e}")
+
+    from app.services.embedding_pipeline import embedding_batcher
+    await embedding_batcher.close()
+    close_neo4j_client()
+    await close_async_neo4j_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
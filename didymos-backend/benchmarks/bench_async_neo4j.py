@@ -0,0 +1,113 @@
+"""
+동기 vs 비동기 Neo4j 클라이언트 동시 요청 처리량 벤치마크
+
+async 라우트 안에서 Neo4jBoltClient.query(동기)를 호출하면 이벤트 루프가
+쿼리 왕복 시간 동안 멈추므로 동시 요청이 직렬화됩니다.
+AsyncNeo4jBoltClient는 대기 중 다른 요청을 처리할 수 있습니다.
+
+사용법:
+    # 오프라인 (쿼리 지연을 시뮬레이션)
+    python benchmarks/bench_async_neo4j.py --requests 200 --concurrency 50 --latency-ms 40
+
+    # 실제 AuraDB (.env 필요)
+    python benchmarks/bench_async_neo4j.py --live --requests 200 --concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+QUERY = "RETURN 1 AS ok"
+
+
+class SimulatedSyncClient:
+    """고정 지연을 갖는 동기 클라이언트 (Neo4jBoltClient 대역)"""
+
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+
+    def query(self, cypher: str, params: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        time.sleep(self.latency_s)
+        return [{"ok": 1}]
+
+
+class SimulatedAsyncClient:
+    """고정 지연을 갖는 비동기 클라이언트 (AsyncNeo4jBoltClient 대역)"""
+
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+
+    async def query(self, cypher: str, params: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        await asyncio.sleep(self.latency_s)
+        return [{"ok": 1}]
+
+
+async def _run(handler, total: int, concurrency: int) -> Dict[str, float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            await handler()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "elapsed_s": elapsed,
+        "throughput_rps": total / elapsed if elapsed else 0.0,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--queries-per-request", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=40.0, help="시뮬레이션 쿼리 왕복 지연")
+    parser.add_argument("--live", action="store_true", help="실제 Neo4j에 연결해 측정")
+    args = parser.parse_args()
+
+    if args.live:
+        from app.db.neo4j import get_neo4j_client, get_async_neo4j_client, close_async_neo4j_client
+        sync_client = get_neo4j_client()
+        async_client = get_async_neo4j_client()
+    else:
+        sync_client = SimulatedSyncClient(args.latency_ms / 1000)
+        async_client = SimulatedAsyncClient(args.latency_ms / 1000)
+
+    async def sync_handler():
+        # 기존 방식: async 라우트 안에서 동기 쿼리 호출 (루프 블로킹)
+        for _ in range(args.queries_per_request):
+            sync_client.query(QUERY)
+
+    async def async_handler():
+        for _ in range(args.queries_per_request):
+            await async_client.query(QUERY)
+
+    print(f"requests={args.requests} concurrency={args.concurrency} "
+          f"queries/request={args.queries_per_request} mode={'live' if args.live else 'simulated'}")
+
+    for name, handler in (("sync (before)", sync_handler), ("async (after)", async_handler)):
+        stats = await _run(handler, args.requests, args.concurrency)
+        print(f"{name:>14}: {stats['throughput_rps']:8.1f} req/s  "
+              f"p50={stats['p50_ms']:8.1f}ms  p95={stats['p95_ms']:8.1f}ms  "
+              f"total={stats['elapsed_s']:.2f}s")
+
+    if args.live:
+        sync_client.close()
+        await close_async_neo4j_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,106 @@
+"""
+노트 임베딩 파이프라인 벤치마크 (노트별 embed_query vs 배치 embed_documents)
+
+로컬 임베딩 제공자(LocalHashEmbeddingProvider)에 API 호출 지연을 더해 오프라인으로
+임베딩 API 호출 수, DB 쓰기 수, 전체 소요 시간을 비교합니다.
+
+사용법:
+    python benchmarks/bench_embedding_batch.py --notes 500 --api-ms 150 --rtt-ms 30
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.embedding_pipeline import (  # noqa: E402
+    EmbeddingBatcher,
+    LocalHashEmbeddingProvider,
+)
+
+WORDS = "knowledge graph note vault cluster entity embedding obsidian 지식 그래프 노트 연결 인사이트".split()
+
+
+class SlowLocalProvider(LocalHashEmbeddingProvider):
+    """요청당 고정 지연 + 입력당 소량 지연을 갖는 로컬 제공자"""
+
+    def __init__(self, api_s: float):
+        super().__init__()
+        self.api_s = api_s
+        self.calls = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls += 1
+        time.sleep(self.api_s + 0.001 * len(texts))
+        return super().embed_documents(texts)
+
+
+class CountingClient:
+    def __init__(self, rtt_s: float):
+        self.rtt_s = rtt_s
+        self.round_trips = 0
+
+    def query(self, cypher: str, params: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        self.round_trips += 1
+        time.sleep(self.rtt_s)
+        return [{"count": len((params or {}).get("rows", [None]))}]
+
+
+def make_notes(count: int) -> List[tuple]:
+    return [
+        (f"note-{i}.md", " ".join(random.choices(WORDS, k=random.randint(50, 1500))))
+        for i in range(count)
+    ]
+
+
+async def per_note(notes, provider, client, concurrency: int):
+    """기존 방식: 노트마다 임베딩 호출 + SET 쿼리 (동시 처리 제한)"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(note_id, content):
+        async with semaphore:
+            vector = (await asyncio.to_thread(provider.embed_documents, [content]))[0]
+            await asyncio.to_thread(client.query, "SET n.embedding = $embedding", {"note_id": note_id, "embedding": vector})
+
+    await asyncio.gather(*(one(n, c) for n, c in notes))
+
+
+async def batched(notes, provider, client, batch_notes: int, window_s: float):
+    batcher = EmbeddingBatcher(provider=provider, client=client, max_batch_notes=batch_notes, window_seconds=window_s)
+    await asyncio.gather(*(batcher.submit(n, c) for n, c in notes))
+    await batcher.close()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--notes", type=int, default=500)
+    parser.add_argument("--api-ms", type=float, default=150.0, help="임베딩 API 요청당 지연")
+    parser.add_argument("--rtt-ms", type=float, default=30.0, help="DB 왕복 지연")
+    parser.add_argument("--concurrency", type=int, default=2, help="기존 방식 동시 처리 수 (_ai_semaphore)")
+    parser.add_argument("--batch-notes", type=int, default=64)
+    parser.add_argument("--window-s", type=float, default=0.5)
+    args = parser.parse_args()
+
+    random.seed(7)
+    notes = make_notes(args.notes)
+    print(f"notes={args.notes} api={args.api_ms}ms rtt={args.rtt_ms}ms")
+
+    for name in ("per-note", "batched"):
+        provider = SlowLocalProvider(args.api_ms / 1000)
+        client = CountingClient(args.rtt_ms / 1000)
+        started = time.perf_counter()
+        if name == "per-note":
+            await per_note(notes, provider, client, args.concurrency)
+        else:
+            await batched(notes, provider, client, args.batch_notes, args.window_s)
+        elapsed = time.perf_counter() - started
+        print(f"{name:>9}: api_calls={provider.calls:5d}  db_writes={client.round_trips:5d}  "
+              f"total={elapsed:7.2f}s  ({args.notes / elapsed:7.1f} notes/s)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+"""
+하이브리드 PKM 레이블링 쓰기 경로 벤치마크 (엔티티별 쿼리 vs 타입별 UNWIND)
+
+노트 하나에서 추출된 엔티티에 PKM 레이블과 MENTIONS를 기록할 때의
+DB 왕복 횟수와 노트당 소요 시간을 비교합니다.
+DB는 고정 왕복 지연을 갖는 카운팅 클라이언트로 시뮬레이션합니다.
+
+사용법:
+    python benchmarks/bench_hybrid_bulk_write.py --notes 20 --entities 40 --rtt-ms 30
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.hybrid_graphiti_service import (  # noqa: E402
+    apply_pkm_labels_bulk,
+    classify_entity_to_pkm_type,
+    create_mentions_bulk,
+    group_entities_by_pkm_type,
+    is_valid_entity,
+)
+
+VOCABULARY = [
+    "Knowledge Graph", "PKM 프로젝트", "논문 리뷰", "GraphRAG", "왜 클러스터링이 느린가?",
+    "인사이트: 연결 밀도", "TODO 정리", "Transformer", "목표 설정", "김민준",
+    "Zettelkasten", "임베딩", "https://arxiv.org/abs/2501.13956", "시스템 설계", "회고",
+]
+
+
+class CountingClient:
+    """왕복 지연을 흉내내고 쿼리 횟수를 세는 클라이언트"""
+
+    def __init__(self, rtt_s: float):
+        self.rtt_s = rtt_s
+        self.round_trips = 0
+
+    def query(self, cypher: str, params: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        self.round_trips += 1
+        time.sleep(self.rtt_s)
+        params = params or {}
+        if "uuids" in params:
+            return [{"count": len(params["uuids"])}]
+        if "pairs" in params:
+            return [{"count": len(params["pairs"])}]
+        return [{"count": 1}]
+
+
+def make_entities(count: int) -> List[Dict[str, Any]]:
+    return [
+        {"uuid": f"uuid-{i}", "name": f"{random.choice(VOCABULARY)} {i}", "summary": ""}
+        for i in range(count)
+    ]
+
+
+def write_per_entity(client, note_id: str, entities: List[Dict[str, Any]]):
+    """기존 방식: 엔티티마다 레이블 쿼리 + 노트당 MENTIONS 쿼리"""
+    for entity in entities:
+        if not is_valid_entity(entity["name"]):
+            continue
+        pkm_type = classify_entity_to_pkm_type(entity["name"], entity["summary"])
+        client.query(f"MATCH (e:Entity {{uuid: $uuid}}) SET e:{pkm_type}", {"uuid": entity["uuid"]})
+    client.query("MERGE (n)-[:MENTIONS]->(e)", {"note_id": note_id})
+
+
+def write_bulk(client, note_id: str, entities: List[Dict[str, Any]]):
+    """새 방식: 타입별 UNWIND + 노트당 MENTIONS UNWIND"""
+    apply_pkm_labels_bulk(client, group_entities_by_pkm_type(entities))
+    create_mentions_bulk(
+        client,
+        [{"note_id": note_id, "entity_uuid": e["uuid"]} for e in entities],
+        source="benchmark"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--notes", type=int, default=20)
+    parser.add_argument("--entities", type=int, default=40, help="노트당 엔티티 수")
+    parser.add_argument("--rtt-ms", type=float, default=30.0, help="AuraDB 왕복 지연 시뮬레이션")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    notes = [(f"note-{i}.md", make_entities(args.entities)) for i in range(args.notes)]
+
+    print(f"notes={args.notes} entities/note={args.entities} rtt={args.rtt_ms}ms")
+    for name, writer in (("per-entity", write_per_entity), ("bulk UNWIND", write_bulk)):
+        client = CountingClient(args.rtt_ms / 1000)
+        started = time.perf_counter()
+        for note_id, entities in notes:
+            writer(client, note_id, entities)
+        elapsed = time.perf_counter() - started
+        print(f"{name:>12}: {client.round_trips / args.notes:6.1f} round-trips/note  "
+              f"{elapsed / args.notes * 1000:8.1f} ms/note")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+고립 Topic 탐지 벤치마크 (노트 쌍 비교 vs Topic별 부분 행렬 vs 선형 시간 희소 곱)
+
+Topic 인기도가 꼬리가 긴 분포(Zipf)를 따르는 합성 Vault 스냅샷을 만들고 세 구현을 비교합니다.
+- pairwise: 기존 Cypher(UNWIND notes AS n1 UNWIND notes AS n2 + 쌍마다 OPTIONAL MATCH)를
+            그대로 흉내 낸 구현, Topic마다 O(노트 수²) 쌍 검사
+- submatrix: Topic마다 인접 행렬의 부분 행렬을 잘라 보는 구현 (Topic마다 O(전체 노트 수))
+- linear: weakness_service.topic_internal_link_counts (O(링크 수 × 노트당 Topic 수))
+
+연결 없는 노트들만 언급하는 인기 Topic을 일부 심어 두어 고립 Topic이 항상 존재하도록 하고,
+세 구현의 고립 Topic 집합이 같은지 확인합니다.
+
+사용법:
+    python benchmarks/bench_isolated_topics.py --notes 2000 20000 100000 --topics 5000 --zipf 1.1
+"""
+import argparse
+import os
+import sys
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.graph_snapshot import LABEL_BITS, VaultGraphSnapshot  # noqa: E402
+from app.services.weakness_service import topic_internal_link_counts  # noqa: E402
+
+
+def make_snapshot(
+    rng: np.random.Generator,
+    n_notes: int,
+    n_topics: int,
+    zipf: float,
+    topics_per_note: int,
+    degree: float,
+    orphan_ratio: float,
+    planted: int,
+) -> VaultGraphSnapshot:
+    """Zipf 인기도 Topic + 랜덤 링크 합성 스냅샷 (orphan 노트만 언급하는 Topic을 planted개 포함)"""
+    n_orphans = int(n_notes * orphan_ratio)
+    linked = np.arange(n_orphans, n_notes)
+
+    # 링크는 orphan이 아닌 노트 사이에만 (MENTIONS/RELATES_TO 반반)
+    n_links = int(len(linked) * degree)
+    link_rows = rng.choice(linked, n_links)
+    link_cols = rng.choice(linked, n_links)
+    link_types = rng.integers(0, 2, n_links).astype(np.int16)
+
+    # 노트마다 Zipf 인기도로 Topic 선택 (앞쪽 Topic일수록 인기)
+    weights = 1.0 / np.arange(1, n_topics + 1) ** zipf
+    weights /= weights.sum()
+    mention_notes = np.repeat(np.arange(n_notes), topics_per_note)
+    mention_entities = rng.choice(n_topics, len(mention_notes), p=weights)
+
+    # 심어 둔 고립 Topic: orphan 노트에서만 언급
+    if planted and n_orphans:
+        planted_topics = np.arange(n_topics, n_topics + planted)
+        sizes = rng.integers(3, max(4, min(n_orphans, 200)), planted)
+        extra_notes = np.concatenate([rng.choice(n_orphans, size, replace=False) for size in sizes])
+        mention_notes = np.concatenate([mention_notes, extra_notes])
+        mention_entities = np.concatenate([mention_entities, np.repeat(planted_topics, sizes)])
+    n_entities = n_topics + planted
+
+    note_ids = [f"note-{i}.md" for i in range(n_notes)]
+    return VaultGraphSnapshot(
+        vault_id="bench",
+        version=0,
+        note_ids=note_ids,
+        note_titles=note_ids,
+        note_paths=note_ids,
+        note_updated_at=[None] * n_notes,
+        link_rows=link_rows.astype(np.int64),
+        link_cols=link_cols.astype(np.int64),
+        link_types=link_types,
+        rel_types=["MENTIONS", "RELATES_TO"],
+        entity_keys=[f"topic-{e}" for e in range(n_entities)],
+        entity_names=[f"Topic {e}" for e in range(n_entities)],
+        entity_labels=np.full(n_entities, LABEL_BITS["Topic"], dtype=np.int16),
+        mention_entities=mention_entities.astype(np.int64),
+        mention_notes=mention_notes.astype(np.int64),
+    )
+
+
+def candidate_topics(snapshot: VaultGraphSnapshot, threshold: int) -> np.ndarray:
+    degrees = snapshot.entity_degrees()
+    topics = snapshot.entities_with_label("Topic")
+    return topics[degrees[topics] >= threshold]
+
+
+def isolated_pairwise(snapshot: VaultGraphSnapshot, topics: np.ndarray) -> Tuple[List[int], int]:
+    """기존 Cypher와 같은 방식: Topic마다 모든 노트 쌍 (n1 < n2)의 연결 여부 검사"""
+    adjacency = snapshot.note_link_matrix(types=("MENTIONS", "RELATES_TO"), symmetric=True)
+    neighbors = [
+        set(adjacency.indices[adjacency.indptr[i]:adjacency.indptr[i + 1]].tolist())
+        for i in range(snapshot.note_count)
+    ]
+    isolated, checks = [], 0
+    for topic in topics.tolist():
+        notes = snapshot.notes_of_entity(topic).tolist()
+        connections = 0
+        for a in range(len(notes)):
+            row = neighbors[notes[a]]
+            for b in range(a + 1, len(notes)):
+                checks += 1
+                if notes[b] in row:
+                    connections += 1
+        if connections == 0:
+            isolated.append(topic)
+    return isolated, checks
+
+
+def isolated_submatrix(snapshot: VaultGraphSnapshot, topics: np.ndarray) -> List[int]:
+    """Topic마다 인접 행렬 부분 행렬의 비대각 원소 수 검사"""
+    links = snapshot.note_link_matrix(types=("MENTIONS", "RELATES_TO"), symmetric=True)
+    isolated = []
+    for topic in topics.tolist():
+        notes = snapshot.notes_of_entity(topic)
+        sub = links[notes][:, notes]
+        if sub.nnz - np.count_nonzero(sub.diagonal()) == 0:
+            isolated.append(topic)
+    return isolated
+
+
+def isolated_linear(snapshot: VaultGraphSnapshot, topics: np.ndarray) -> List[int]:
+    links = snapshot.note_link_matrix(types=("MENTIONS", "RELATES_TO"), symmetric=True)
+    internal = topic_internal_link_counts(links, snapshot.mentions[:, topics])
+    return topics[internal == 0].tolist()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--notes", type=int, nargs="+", default=[2000, 20000, 100000])
+    parser.add_argument("--topics", type=int, default=5000, help="Zipf 인기도 Topic 수")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Topic 인기도 지수 (클수록 꼬리가 김)")
+    parser.add_argument("--topics-per-note", type=int, default=4)
+    parser.add_argument("--degree", type=float, default=2.0, help="연결 노트당 평균 링크 수")
+    parser.add_argument("--orphan-ratio", type=float, default=0.2, help="링크 없는 노트 비율")
+    parser.add_argument("--planted", type=int, default=20, help="orphan 노트만 언급하는 고립 Topic 수")
+    parser.add_argument("--threshold", type=int, default=3, help="min_notes_threshold")
+    parser.add_argument("--legacy-max-pairs", type=int, default=20_000_000,
+                        help="pairwise 구현을 실행할 최대 노트 쌍 수")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    for n in args.notes:
+        snapshot = make_snapshot(rng, n, args.topics, args.zipf, args.topics_per_note,
+                                 args.degree, args.orphan_ratio, args.planted)
+        topics = candidate_topics(snapshot, args.threshold)
+        sizes = snapshot.entity_degrees()[topics].astype(np.int64)
+        pairs = int((sizes * (sizes - 1) // 2).sum())
+        # 인접 행렬은 스냅샷에 캐시되므로 구현 비교 전에 미리 생성
+        snapshot.note_link_matrix(types=("MENTIONS", "RELATES_TO"), symmetric=True)
+        print(f"notes={n:>7} topics>={args.threshold}: {len(topics):>5}  "
+              f"largest topic={int(sizes.max()) if len(sizes) else 0:>6} notes  pairs={pairs:>12,}")
+
+        started = time.perf_counter()
+        linear = isolated_linear(snapshot, topics)
+        linear_s = time.perf_counter() - started
+        line = f"  linear={linear_s * 1000:9.1f}ms isolated={len(linear):>4}"
+
+        started = time.perf_counter()
+        submatrix = isolated_submatrix(snapshot, topics)
+        submatrix_s = time.perf_counter() - started
+        line += (f"  submatrix={submatrix_s * 1000:9.1f}ms ({submatrix_s / linear_s:6.1f}x)"
+                 f" same={sorted(submatrix) == sorted(linear)}")
+
+        if pairs <= args.legacy_max_pairs:
+            started = time.perf_counter()
+            pairwise, checks = isolated_pairwise(snapshot, topics)
+            pairwise_s = time.perf_counter() - started
+            line += (f"  pairwise={pairwise_s * 1000:10.1f}ms ({pairwise_s / linear_s:8.1f}x)"
+                     f" checks={checks:,} same={sorted(pairwise) == sorted(linear)}")
+        else:
+            line += "  pairwise=skipped (O(Σ notes²))"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
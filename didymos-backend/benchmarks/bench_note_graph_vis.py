@@ -0,0 +1,165 @@
+"""
+노트 그래프 시각화 조회 벤치마크 (타입별 순차 쿼리 vs 단일 쿼리)
+
+기존 get_note_graph_vis는 중심 노드/Topic/Project/Task/관련 노트/엔티티 관계를
+각각 별도 쿼리로 순차 조회했습니다 (hops=1: 5회, hops=2: 6회 왕복).
+현재 구현은 NOTE_GRAPH_VIS_QUERY 한 번으로 ego-network 전체를 가져옵니다.
+
+사용법:
+    # 오프라인 (왕복 지연 + 행당 전송 비용 시뮬레이션)
+    python benchmarks/bench_note_graph_vis.py --requests 200 --rtt-ms 30
+
+    # 실제 AuraDB (.env 필요)
+    python benchmarks/bench_note_graph_vis.py --live --note-id "path/to/note.md"
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.graph_visualization_service import (  # noqa: E402
+    NOTE_GRAPH_VIS_QUERY,
+    build_note_graph_vis,
+)
+
+# 기존 구현의 쿼리 (순차 실행)
+LEGACY_QUERIES = {
+    "center": """
+    MATCH (n:Note {note_id: $note_id})
+    RETURN n.note_id AS id, coalesce(n.title, n.note_id) AS label
+    """,
+    "topics": """
+    MATCH (n:Note {note_id: $note_id})-[r:MENTIONS]->(t:Topic)
+    RETURN t.id AS id, coalesce(t.name, t.id) AS label, coalesce(r.confidence, 1.0) AS weight
+    """,
+    "projects": """
+    MATCH (n:Note {note_id: $note_id})-[:MENTIONS]->(p:Project)
+    RETURN p.id AS id, coalesce(p.name, p.id) AS label, coalesce(p.status, 'unknown') AS status
+    """,
+    "tasks": """
+    MATCH (n:Note {note_id: $note_id})-[:MENTIONS]->(t:Task)
+    RETURN t.id AS id, coalesce(t.title, t.id) AS label, coalesce(t.priority, 'normal') AS priority
+    LIMIT 10
+    """,
+    "related_notes": """
+    MATCH (n:Note {note_id: $note_id})-[:MENTIONS]->(t:Topic)<-[:MENTIONS]-(related:Note)
+    WHERE n <> related
+    WITH related, COUNT(t) AS common
+    ORDER BY common DESC
+    LIMIT 5
+    RETURN related.note_id AS id, coalesce(related.title, related.note_id) AS label
+    """,
+    "entity_rels": """
+    MATCH (n:Note {note_id: $note_id})-[:MENTIONS]->(e1)
+    MATCH (e1)-[r]->(e2)
+    WHERE type(r) IN ['RELATED_TO', 'PART_OF', 'HAS_TASK', 'ASSIGNED_TO', 'BROADER', 'NARROWER']
+    RETURN e1.id AS from_id, labels(e1)[0] AS from_type, e2.id AS to_id, labels(e2)[0] AS to_type, type(r) AS rel_type
+    """,
+}
+
+
+def make_fixture(note_id: str, topics: int, projects: int, tasks: int, rels: int) -> Dict[str, Any]:
+    return {
+        "id": note_id,
+        "label": "Center",
+        "topics": [{"id": f"t{i}", "label": f"Topic {i}"} for i in range(topics)],
+        "projects": [{"id": f"p{i}", "label": f"Project {i}", "status": "active"} for i in range(projects)],
+        "tasks": [{"id": f"k{i}", "label": f"Task {i}", "priority": "high"} for i in range(tasks)],
+        "related_notes": [{"id": f"r{i}.md", "label": f"Related {i}"} for i in range(5)],
+        "entity_rels": [
+            {"from_id": f"t{i % max(topics, 1)}", "from_type": "Topic", "to_id": f"p{i % max(projects, 1)}",
+             "to_type": "Project", "rel_type": "PART_OF"}
+            for i in range(rels)
+        ],
+    }
+
+
+class SimulatedClient:
+    """왕복 지연(지터 포함) + 행당 전송 비용을 흉내내는 클라이언트"""
+
+    def __init__(self, fixture: Dict[str, Any], rtt_s: float, row_s: float = 0.00002):
+        self.fixture = fixture
+        self.rtt_s = rtt_s
+        self.row_s = row_s
+        self.round_trips = 0
+
+    def query(self, cypher: str, params: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        self.round_trips += 1
+        if cypher is NOTE_GRAPH_VIS_QUERY:
+            rows = [self.fixture]
+            size = sum(len(v) for v in self.fixture.values() if isinstance(v, list))
+        else:
+            key = next(k for k, q in LEGACY_QUERIES.items() if q is cypher)
+            rows = [{"id": self.fixture["id"], "label": self.fixture["label"]}] if key == "center" else self.fixture[key]
+            size = len(rows)
+        time.sleep(self.rtt_s * random.uniform(0.8, 1.5) + size * self.row_s)
+        return rows
+
+
+def legacy_note_graph_vis(client, note_id: str, hops: int) -> Dict[str, Any]:
+    """기존 방식: 쿼리별 순차 왕복 후 결과 병합"""
+    keys = ["center", "topics", "projects", "tasks"] + (["related_notes"] if hops >= 2 else []) + ["entity_rels"]
+    record: Dict[str, Any] = {}
+    for key in keys:
+        rows = client.query(LEGACY_QUERIES[key], {"note_id": note_id}) or []
+        if key == "center":
+            if not rows:
+                return {"nodes": [], "edges": []}
+            record.update(rows[0])
+        else:
+            record[key] = rows
+    return build_note_graph_vis(note_id, record, hops)
+
+
+def single_query_note_graph_vis(client, note_id: str, hops: int) -> Dict[str, Any]:
+    rows = client.query(NOTE_GRAPH_VIS_QUERY, {"note_id": note_id, "hops": hops}) or []
+    return build_note_graph_vis(note_id, rows[0] if rows else None, hops)
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    samples = sorted(samples)
+    return {
+        "p50": samples[len(samples) // 2] * 1000,
+        "p95": samples[max(0, int(len(samples) * 0.95) - 1)] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--rtt-ms", type=float, default=30.0, help="AuraDB 왕복 지연 시뮬레이션")
+    parser.add_argument("--live", action="store_true", help="실제 Neo4j에 연결해 측정")
+    parser.add_argument("--note-id", default="bench/note.md")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    if args.live:
+        from app.db.neo4j import get_neo4j_client
+        client = get_neo4j_client()
+    else:
+        client = SimulatedClient(make_fixture(args.note_id, 12, 3, 10, 20), args.rtt_ms / 1000)
+
+    print(f"requests={args.requests} mode={'live' if args.live else f'simulated rtt={args.rtt_ms}ms'}")
+    for hops in (1, 2):
+        for name, fetch in (("sequential", legacy_note_graph_vis), ("single query", single_query_note_graph_vis)):
+            latencies = []
+            for _ in range(args.requests):
+                started = time.perf_counter()
+                graph = fetch(client, args.note_id, hops)
+                latencies.append(time.perf_counter() - started)
+            stats = _percentiles(latencies)
+            print(f"hops={hops} {name:>12}: p50={stats['p50']:7.1f}ms  p95={stats['p95']:7.1f}ms  "
+                  f"nodes={len(graph['nodes'])} edges={len(graph['edges'])}")
+
+    if args.live:
+        from app.db.neo4j import close_neo4j_client
+        close_neo4j_client()
+
+
+if __name__ == "__main__":
+    main()
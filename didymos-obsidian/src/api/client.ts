@@ -40,6 +40,20 @@ export interface NotePayload {
   updated_at: string;
 }
 
+export interface BatchSyncEvent {
+  type: "note" | "summary";
+  status: string;
+  note_id?: string;
+  ai_scheduled?: boolean | number;
+  ai_status?: string;
+  ai_skipped?: number;
+  ai_partial?: number;
+  message?: string;
+  total?: number;
+  synced?: number;
+  failed?: number;
+}
+
 export interface GraphData {
   nodes: Array<{
     id: string;
@@ -359,6 +373,59 @@ export class DidymosAPI {
     return response.json();
   }
 
+  /**
+   * 여러 노트를 한 번에 동기화하고 NDJSON 스트림으로 노트별 상태를 전달
+   * 마지막 이벤트(type: "summary")를 반환
+   */
+  async syncNotesBatch(
+    notes: NotePayload[],
+    privacyMode: string = "full",
+    onEvent?: (event: BatchSyncEvent) => void
+  ): Promise<BatchSyncEvent> {
+    const payload = {
+      user_token: this.settings.userToken,
+      vault_id: this.settings.vaultId,
+      notes,
+      privacy_mode: privacyMode,
+    };
+
+    const response = await fetch(this.baseUrl("/notes/sync/batch"), {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+      },
+      body: JSON.stringify(payload),
+    });
+
+    if (!response.ok || !response.body) {
+      throw new Error(`API error: ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    let summary: BatchSyncEvent = { type: "summary", status: "error", message: "Stream ended without summary" };
+
+    const handleLine = (line: string) => {
+      if (!line.trim()) return;
+      const event = JSON.parse(line) as BatchSyncEvent;
+      if (event.type === "summary") summary = event;
+      onEvent?.(event);
+    };
+
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      const lines = buffer.split("\n");
+      buffer = lines.pop() ?? "";
+      lines.forEach(handleLine);
+    }
+    handleLine(buffer + decoder.decode());
+
+    return summary;
+  }
+
   async deleteNote(noteId: string): Promise<{
     status: string;
     message: string;
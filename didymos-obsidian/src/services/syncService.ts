@@ -3,6 +3,9 @@ import { DidymosAPI, NotePayload } from '../api/client';
 import { DidymosSettings } from '../settings';
 import { DidymosContextView, DIDYMOS_CONTEXT_VIEW_TYPE } from '../views/contextView';
 
+// 한 번의 /notes/sync/batch 요청에 담을 노트 수 (서버 최대 500)
+const BULK_SYNC_BATCH_SIZE = 100;
+
 export class SyncService {
     private lastRealtimeSync: number = 0;
 
@@ -30,20 +33,7 @@ export class SyncService {
         }
 
         try {
-            const content = await this.app.vault.read(file);
-            const metadata = this.app.metadataCache.getFileCache(file);
-
-            const notePayload: NotePayload = {
-                note_id: file.path,
-                title: file.basename,
-                path: file.path,
-                content: content,
-                yaml: metadata?.frontmatter || {},
-                tags: metadata?.tags?.map(t => t.tag.replace('#', '')) || [],
-                links: metadata?.links?.map(l => l.link) || [],
-                created_at: new Date(file.stat.ctime).toISOString(),
-                updated_at: new Date(file.stat.mtime).toISOString()
-            };
+            const notePayload = await this.buildPayload(file);
 
             this.incrementUsage();
 
@@ -64,26 +54,69 @@ export class SyncService {
     }
 
     async bulkProcessVault(): Promise<void> {
-        const files = this.app.vault.getMarkdownFiles();
+        if (!this.settings.userToken || !this.settings.vaultId) {
+            new Notice('Please configure Didymos settings first');
+            return;
+        }
+        this.ensureUsageReset();
+
+        const files = this.app.vault.getMarkdownFiles().filter((file) =>
+            !this.settings.excludedFolders.some((folder) => folder && file.path.startsWith(folder))
+        );
         if (!files.length) {
             new Notice("No markdown files found for bulk processing");
             return;
         }
         new Notice(`Bulk processing ${files.length} notes...`);
+
         let processed = 0;
-        for (const file of files) {
+        let failed = 0;
+        let unchanged = 0;
+        for (let i = 0; i < files.length; i += BULK_SYNC_BATCH_SIZE) {
+            const chunk = files.slice(i, i + BULK_SYNC_BATCH_SIZE);
             try {
-                await this.syncNote(file);
-                processed++;
-                // Only show progress at 10-unit increments
-                if (processed % 10 === 0) {
-                    new Notice(`Progress: ${processed}/${files.length} notes processed`);
-                }
+                const payloads = await Promise.all(chunk.map((file) => this.buildPayload(file)));
+                this.incrementUsage(payloads.length);
+
+                await this.api.syncNotesBatch(payloads, this.settings.privacyMode, (event) => {
+                    if (event.type !== "note") return;
+                    if (event.status === "success") {
+                        processed++;
+                        if (event.ai_status === "skipped") unchanged++;
+                        // Only show progress at 50-unit increments
+                        if (processed % 50 === 0) {
+                            new Notice(`Progress: ${processed}/${files.length} notes processed`);
+                        }
+                    } else {
+                        failed++;
+                        console.error(`Bulk sync failed for ${event.note_id}: ${event.message}`);
+                    }
+                });
             } catch (e) {
-                console.error(`Bulk sync failed for ${file.path}:`, e);
+                failed += chunk.length;
+                console.error(`Bulk sync failed for batch starting at ${chunk[0].path}:`, e);
             }
         }
-        new Notice(`Bulk processing complete: ${processed}/${files.length} notes`);
+        const failedInfo = failed ? ` (${failed} failed)` : "";
+        const unchangedInfo = unchanged ? `, ${unchanged} unchanged` : "";
+        new Notice(`Bulk processing complete: ${processed}/${files.length} notes${unchangedInfo}${failedInfo}`);
+    }
+
+    private async buildPayload(file: TFile): Promise<NotePayload> {
+        const content = await this.app.vault.read(file);
+        const metadata = this.app.metadataCache.getFileCache(file);
+
+        return {
+            note_id: file.path,
+            title: file.basename,
+            path: file.path,
+            content: content,
+            yaml: metadata?.frontmatter || {},
+            tags: metadata?.tags?.map(t => t.tag.replace('#', '')) || [],
+            links: metadata?.links?.map(l => l.link) || [],
+            created_at: new Date(file.stat.ctime).toISOString(),
+            updated_at: new Date(file.stat.mtime).toISOString()
+        };
     }
 
     checkRealtimeSyncCooldown(): boolean {
@@ -105,8 +138,8 @@ export class SyncService {
         }
     }
 
-    private incrementUsage() {
-        this.settings.usageUsedToday += 1;
+    private incrementUsage(count: number = 1) {
+        this.settings.usageUsedToday += count;
         const remaining = this.settings.usageBudgetPerDay - this.settings.usageUsedToday;
         if (remaining <= Math.max(5, this.settings.usageBudgetPerDay * 0.1)) {
             new Notice(`⚠️ Usage remaining today: ${remaining}/${this.settings.usageBudgetPerDay}`);